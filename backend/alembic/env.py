@@ -33,6 +33,7 @@ try:
     from src.models.application import Application  # noqa: F401
     from src.models.site import OperationSite  # noqa: F401
     from src.models.usage_record import UsageRecord  # noqa: F401
+    from src.models.usage_rollup import UsageHourlyRollup  # noqa: F401
     from src.models.transaction import TransactionRecord  # noqa: F401
     from src.models.authorization import OperatorAppAuthorization  # noqa: F401
     from src.models.refund import RefundRecord  # noqa: F401
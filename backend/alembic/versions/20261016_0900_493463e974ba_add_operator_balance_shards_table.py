@@ -0,0 +1,60 @@
+"""add_operator_balance_shards_table
+
+Create operator_balance_shards table for sharded operator balances.
+Operators in tiers listed in BALANCE_SHARD_TIERS split their balance into
+N sub-balance rows so concurrent authorizations lock different rows.
+
+Revision ID: 493463e974ba
+Revises: 0bd27f43a475
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
+
+
+# revision identifiers, used by Alembic.
+revision: str = '493463e974ba'
+down_revision: Union[str, None] = '0bd27f43a475'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create operator_balance_shards table."""
+
+    op.create_table(
+        'operator_balance_shards',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, comment='主键'),
+        sa.Column('operator_id', UUID(as_uuid=True), sa.ForeignKey('operator_accounts.id', ondelete='CASCADE'), nullable=False, comment='所属运营商'),
+        sa.Column('shard_index', sa.Integer, nullable=False, comment='分片序号(0..N-1)'),
+        sa.Column('balance', sa.DECIMAL(10, 2), nullable=False, server_default='0.00', comment='分片余额(单位:元)'),
+        sa.Column('updated_at', TIMESTAMP(timezone=True), nullable=False, server_default=sa.func.now(), comment='更新时间'),
+        sa.CheckConstraint('balance >= 0', name='chk_shard_balance_non_negative'),
+        sa.UniqueConstraint('operator_id', 'shard_index', name='uq_operator_balance_shard'),
+        comment='运营商余额分片表'
+    )
+
+
+def downgrade() -> None:
+    """Remove operator_balance_shards table.
+
+    Shard balances are folded back into operator_accounts.balance before dropping.
+    """
+
+    op.execute(
+        """
+        UPDATE operator_accounts oa
+        SET balance = oa.balance + s.total
+        FROM (
+            SELECT operator_id, SUM(balance) AS total
+            FROM operator_balance_shards
+            GROUP BY operator_id
+        ) s
+        WHERE oa.id = s.operator_id
+        """
+    )
+    op.drop_table('operator_balance_shards')
@@ -0,0 +1,51 @@
+"""widen_usage_authorization_token
+
+Authorization tokens are now Ed25519 signed, self-describing tokens
+(session, operator, site, application, player count, expiry) instead of
+random UUIDs, so usage_records.authorization_token needs more room.
+
+Revision ID: 7c2e5d1a9b40
+Revises: 493463e974ba
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5d1a9b40'
+down_revision: Union[str, None] = '493463e974ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Widen usage_records.authorization_token to hold signed tokens."""
+
+    op.alter_column(
+        'usage_records',
+        'authorization_token',
+        existing_type=sa.String(length=64),
+        type_=sa.String(length=1024),
+        existing_nullable=False,
+        comment='授权令牌(Ed25519签名的自描述令牌, 返回给头显Server)'
+    )
+
+
+def downgrade() -> None:
+    """Shrink usage_records.authorization_token back to 64 characters.
+
+    Fails if signed tokens longer than 64 characters are still stored.
+    """
+
+    op.alter_column(
+        'usage_records',
+        'authorization_token',
+        existing_type=sa.String(length=1024),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+        comment='授权令牌(返回给头显Server)'
+    )
@@ -0,0 +1,52 @@
+"""add_usage_player_histograms
+
+Create the daily player-count histogram table. Each row holds, per operator,
+application and UTC day, the sessions and cost (cents) for every player count
+as packed little-endian int64 vectors. The player distribution statistics merge
+these rows instead of grouping usage_records.
+
+The usage rollup watermark is reset so the rollup worker rebuilds all closed
+days, including their histograms; statistics read usage_records until it has
+caught up (or run scripts/backfill_usage_rollups.py --rebuild-all).
+
+Revision ID: 9d4a6c2e8f13
+Revises: 5b8e1f0c3d27
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a6c2e8f13'
+down_revision: Union[str, None] = '5b8e1f0c3d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the player-count histogram table and rebuild rollups."""
+
+    op.create_table(
+        'usage_player_histograms_daily',
+        sa.Column('operator_id', UUID(as_uuid=True), sa.ForeignKey('operator_accounts.id', ondelete='RESTRICT'), primary_key=True, comment='运营商ID'),
+        sa.Column('bucket_start', TIMESTAMP(timezone=True), primary_key=True, comment='日期(UTC零点)'),
+        sa.Column('application_id', UUID(as_uuid=True), sa.ForeignKey('applications.id', ondelete='RESTRICT'), primary_key=True, comment='应用ID'),
+        sa.Column('session_counts', sa.LargeBinary, nullable=False, comment='各玩家数的场次(int64向量)'),
+        sa.Column('cost_cents', sa.LargeBinary, nullable=False, comment='各玩家数的消费金额(分, int64向量)'),
+        comment='玩家数量日直方图表'
+    )
+    op.create_index('idx_usage_player_histogram_bucket', 'usage_player_histograms_daily', ['bucket_start'])
+
+    op.execute("DELETE FROM usage_rollup_watermarks WHERE name = 'usage'")
+
+
+def downgrade() -> None:
+    """Remove the player-count histogram table."""
+
+    op.drop_index('idx_usage_player_histogram_bucket', table_name='usage_player_histograms_daily')
+    op.drop_table('usage_player_histograms_daily')
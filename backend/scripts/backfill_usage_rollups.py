@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""回填使用记录小时/日汇总表和玩家数量日直方图
+
+首次部署汇总表后执行一次, 把已有的 usage_records 汇总到水位线(最近一个已关闭的小时)。
+之后由应用内的后台汇总任务增量维护。可重复执行(已汇总的小时会跳过)。
+
+用法:
+    python scripts/backfill_usage_rollups.py
+    python scripts/backfill_usage_rollups.py --rebuild-from 2026-01-01   # 重建该日(UTC)之后的汇总
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.session import close_db, get_session_maker, init_db
+from src.services.usage_rollup import UsageRollupService, UsageRollupWorker
+
+
+async def backfill(rebuild_from: datetime | None, rebuild_all: bool) -> int:
+    """回填汇总表, 返回汇总的小时数"""
+    init_db()
+    session_maker = get_session_maker()
+    try:
+        if rebuild_from or rebuild_all:
+            async with session_maker() as session:
+                await UsageRollupService(session).reset_watermark(rebuild_from)
+                await session.commit()
+
+        worker = UsageRollupWorker(session_factory=session_maker)
+        hours = await worker.run_once()
+
+        async with session_maker() as session:
+            watermark = await UsageRollupService(session).get_watermark()
+        print(f"汇总完成: 本次汇总 {hours} 小时, 水位线 {watermark.isoformat() if watermark else '无使用记录'}")
+        return hours
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="回填使用记录小时/日汇总表")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--rebuild-from",
+        type=lambda value: datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc),
+        help="从该日期(UTC, YYYY-MM-DD)开始重建汇总"
+    )
+    group.add_argument(
+        "--rebuild-all",
+        action="store_true",
+        help="从最早的使用记录开始重建全部汇总"
+    )
+    args = parser.parse_args()
+    asyncio.run(backfill(args.rebuild_from, args.rebuild_all))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,30 +7,56 @@ User Story 2 - 运营商账户与财务管理:
 - /auth/operators/register - 运营商注册
 - /auth/operators/login - 运营商登录
 - /operators/me - 运营商个人信息管理
+
+路由模块在注册时才导入，并直接挂到应用上：FastAPI每次include_router都会
+重建全部路由(依赖解析、响应模型)，先汇总到api_router再挂到应用会多做一遍。
 """
 
-from fastapi import APIRouter
-
-from .admin_auth import router as admin_auth_router
-from .admin_operations import router as admin_operations_router
-from .auth import router as auth_router
-from .finance import router as finance_router
-from .messages import router as messages_router
-from .operators import router as operators_router
-# from .performance import router as performance_router  # 临时禁用
-from .webhooks import router as webhooks_router
-
-# Create main API v1 router
-api_router = APIRouter()
-
-# Include all v1 routers
-api_router.include_router(admin_auth_router)
-api_router.include_router(admin_operations_router)  # Admin business operations
-api_router.include_router(auth_router)  # User Story 1: 游戏授权 & User Story 2: 运营商认证 & User Story 6: 财务认证
-api_router.include_router(finance_router)  # User Story 6: 财务后台业务 (T175-T186)
-api_router.include_router(messages_router)  # 运营商消息通知 (T188+)
-api_router.include_router(operators_router)  # User Story 2: 运营商个人信息管理
-# api_router.include_router(performance_router)  # 性能优化和监控 (临时禁用)
-api_router.include_router(webhooks_router)  # User Story 2: 支付回调webhooks (T078)
-
-__all__ = ["api_router"]
+import importlib
+from typing import Any
+
+from fastapi import APIRouter, FastAPI
+
+# v1路由模块（按注册顺序）
+ROUTER_MODULES = (
+    "admin_auth",
+    "admin_operations",  # Admin business operations
+    "auth",  # User Story 1: 游戏授权 & User Story 2: 运营商认证 & User Story 6: 财务认证
+    "finance",  # User Story 6: 财务后台业务 (T175-T186)
+    "messages",  # 运营商消息通知 (T188+)
+    "operators",  # User Story 2: 运营商个人信息管理
+    # "performance",  # 性能优化和监控 (临时禁用)
+    "webhooks",  # User Story 2: 支付回调webhooks (T078)
+)
+
+
+def iter_routers():
+    """按注册顺序导入并返回各路由模块的router"""
+    for module_name in ROUTER_MODULES:
+        yield importlib.import_module(f".{module_name}", __name__).router
+
+
+def include_api_routers(app: FastAPI, prefix: str) -> None:
+    """
+    把v1路由直接注册到应用
+
+    Args:
+        app: FastAPI应用实例
+        prefix: API前缀（如 /api/v1）
+    """
+    for router in iter_routers():
+        app.include_router(router, prefix=prefix)
+
+
+def __getattr__(name: str) -> Any:
+    """兼容旧用法：访问 api_router 时才构建汇总路由"""
+    if name == "api_router":
+        api_router = APIRouter()
+        for router in iter_routers():
+            api_router.include_router(router)
+        globals()["api_router"] = api_router
+        return api_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["api_router", "include_api_routers", "ROUTER_MODULES"]
@@ -4,6 +4,9 @@
 
 端点:
 - POST /v1/auth/game/authorize - 游戏授权请求 (T046)
+- POST /v1/auth/game/authorize/batch - 批量游戏授权请求(多房间运营点)
+- POST /v1/auth/game/token/verify - 验证授权令牌(不查询数据库)
+- GET /v1/auth/game/token/keys - 授权令牌验证公钥(JWK Set)
 - POST /v1/auth/operators/register - 运营商注册 (T066)
 - POST /v1/auth/operators/login - 运营商登录 (T067)
 - POST /v1/auth/operators/logout - 运营商登出 (T068)
@@ -14,6 +17,8 @@
 - 运营商登出: JWT Token认证 (Authorization: Bearer {token})
 """
 
+from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
@@ -21,9 +26,23 @@ from fastapi import APIRouter, Body, Depends, Header, HTTPException, Request, st
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import require_operator
+from ...core.config import get_settings
+from ...core.security.hmac import HMACSignature
+from ...core.security.authorization_token import (
+    AuthorizationTokenError,
+    get_public_jwks,
+    verify_authorization_token,
+)
 from ...db.session import get_db
 from ...schemas.auth import (
+    AuthorizationTokenClaims,
+    AuthorizationTokenVerifyRequest,
+    AuthorizationTokenVerifyResponse,
     ErrorResponse,
+    GameAuthorizeBatchData,
+    GameAuthorizeBatchRequest,
+    GameAuthorizeBatchResponse,
+    GameAuthorizeBatchResult,
     GameAuthorizeData,
     GameAuthorizeRequest,
     GameAuthorizeResponse,
@@ -34,12 +53,18 @@ from ...schemas.operator import (
     OperatorRegisterRequest,
     OperatorRegisterResponse,
 )
-from ...services.auth_service import AuthService
-from ...services.billing_service import BillingService
+from ...services.auth_context_cache import AuthorizationContext, get_auth_context_cache
+from ...services.auth_service import AuthorizationChain, AuthService
+from ...services.billing_queue import get_billing_queue
+from ...services.billing_service import BatchDebitItem, BillingService
 from ...services.operator import OperatorService
+from ...services.session_index import SessionIdempotencyIndex, get_session_index
 
 router = APIRouter(prefix="/auth", tags=["授权"])
 
+# 游戏授权签名验证: 会话ID已保证幂等, X-Nonce可选(携带时参与签名并防重放)
+game_signature = HMACSignature(require_nonce=False)
+
 
 @router.post(
     "/game/authorize",
@@ -52,7 +77,7 @@ router = APIRouter(prefix="/auth", tags=["授权"])
         },
         401: {
             "model": ErrorResponse,
-            "description": "认证失败(API Key无效)"
+            "description": "认证失败(API Key无效、签名无效或时间戳过期)"
         },
         402: {
             "model": ErrorResponse,
@@ -80,8 +105,10 @@ router = APIRouter(prefix="/auth", tags=["授权"])
 
     **认证要求**:
     - X-API-Key: 运营商API Key (64位字符串)
-    - X-Signature: HMAC-SHA256签名 (Base64编码)
+    - X-Signature: HMAC-SHA256签名 (十六进制), 密钥为API Key,
+      待签名串为 METHOD\\nPATH\\nX-Timestamp\\nX-Nonce\\n原始请求体 (未携带X-Nonce时为空)
     - X-Timestamp: Unix时间戳 (秒，5分钟有效)
+    - X-Nonce: 可选随机数 (至少16位, 5分钟内不可重复使用)
     - X-Session-ID: 会话ID (格式: {operatorId}_{timestamp}_{random16})
 
     **业务逻辑**:
@@ -127,90 +154,498 @@ async def authorize_game(
     # 初始化服务
     auth_service = AuthService(db)
     billing_service = BillingService(db)
+    context_cache = get_auth_context_cache()
+
+    # 授权上下文缓存: 命中时跳过运营商/运营点/应用/授权查询
+    context = context_cache.get(x_api_key, request_body.site_id, request_body.app_id)
 
     # ========== STEP 1: 验证API Key ==========
-    operator = await auth_service.verify_operator_by_api_key(x_api_key)
+    chain: Optional[AuthorizationChain] = None
+    if context:
+        operator = context.operator
+    else:
+        # 冷缓存: 一条联表查询取回运营商、运营点、应用和授权关系, 之后按原顺序逐项检查
+        chain = await auth_service.load_authorization_chain(
+            x_api_key,
+            _parse_uuid(request_body.site_id),
+            _parse_uuid(request_body.app_id)
+        )
+        operator = auth_service.check_operator(chain.operator)
+
+    # ========== STEP 1.1: 验证HMAC签名和时间戳 ==========
+    # 请求体已在解析时读取并缓存, 签名直接使用同一份原始字节
+    # 签名密钥即运营商API Key(与运营商查询的匹配条件一致)
+    await game_signature.authenticate(request, operator.id, x_api_key, await request.body())
 
     # ========== STEP 2: 验证会话ID格式 (FR-061) ==========
     await auth_service.verify_session_id_format(x_session_id, operator.id)
 
     # ========== STEP 3: 检查会话ID幂等性 ==========
-    existing_record = await billing_service.check_session_idempotency(x_session_id)
-    if existing_record:
+    session_index = get_session_index()
+    authorized_data = await _find_authorized_session(session_index, billing_service, x_session_id)
+    if authorized_data:
         # 会话已存在,返回已授权信息(幂等性保护)
-        return GameAuthorizeResponse(
-            success=True,
-            data=GameAuthorizeData(
-                authorization_token=existing_record.authorization_token,
-                session_id=existing_record.session_id,
-                app_name=existing_record.application.app_name if existing_record.application else "未知应用",
-                player_count=existing_record.player_count,
-                unit_price=str(existing_record.price_per_player),
-                total_cost=str(existing_record.total_cost),
-                balance_after="0.00",  # 已授权记录不再查询余额
-                authorized_at=existing_record.game_started_at
+        return GameAuthorizeResponse(success=True, data=authorized_data)
+
+    if context:
+        site_id = context.site.id
+        application = context.application
+    else:
+        # ========== STEP 4-6: 解析参数, 验证运营点归属和应用授权 ==========
+        site_id, application = await _resolve_site_and_application(
+            auth_service,
+            context_cache,
+            x_api_key,
+            operator,
+            request_body.site_id,
+            request_body.app_id,
+            chain
+        )
+
+    # ========== STEP 7: 验证玩家数量 ==========
+    await auth_service.verify_player_count(request_body.player_count, application)
+
+    # ========== STEP 8: 余额检查 ==========
+    # 费用计算和余额充足性检查由扣费事务在行锁内完成(不足时返回402)
+
+    # ========== STEP 9: 执行扣费事务 ==========
+    client_ip = request.client.host if request.client else None
+
+    debit_kwargs = dict(
+        session_id=x_session_id,
+        operator_id=operator.id,
+        site_id=site_id,
+        application=application,
+        player_count=request_body.player_count,
+        client_ip=client_ip,
+        customer_tier=operator.customer_tier
+    )
+    if get_settings().BILLING_GROUP_COMMIT_ENABLED:
+        # 突发流量下合并为组提交(每个请求一个保存点, 结果与单独提交一致)
+        usage_record, transaction_record, balance_after = await get_billing_queue().submit(**debit_kwargs)
+    else:
+        usage_record, transaction_record, balance_after = await billing_service.create_authorization_transaction(
+            **debit_kwargs
+        )
+
+    # ========== STEP 10: 构造响应 ==========
+    response_data = _authorized_data(usage_record, application.app_name, balance_after)
+    await session_index.remember_response(x_session_id, response_data.model_dump(mode="json"))
+
+    return GameAuthorizeResponse(success=True, data=response_data)
+
+
+@router.post(
+    "/game/authorize/batch",
+    response_model=GameAuthorizeBatchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "请求参数错误或批量授权被拒绝(all_or_nothing模式下任一会话无法授权)"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "认证失败(API Key无效、签名无效或时间戳过期)"
+        },
+        402: {
+            "model": ErrorResponse,
+            "description": "余额不足(all_or_nothing模式)"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "应用未授权或账户已锁定"
+        },
+        409: {
+            "model": ErrorResponse,
+            "description": "会话ID被并发请求授权(重试即可获取已授权信息)"
+        },
+        500: {
+            "model": ErrorResponse,
+            "description": "服务器内部错误"
+        }
+    },
+    summary="批量游戏授权请求",
+    description="""
+    多房间运营点一次授权多个游戏会话。
+
+    **认证要求**: 同单次授权(X-API-Key、X-Signature、X-Timestamp), 整批一个签名;
+    会话ID随每个会话在请求体中传递。
+
+    **模式**:
+    - all_or_nothing(默认): 任一会话校验失败或总余额不足时全部不扣费
+    - best_effort: 逐个返回结果, 余额按请求顺序分配给靠前的会话
+
+    **业务逻辑**:
+    1. 验证API Key(整批一次)
+    2. 逐个验证会话ID格式和幂等性(已授权的会话直接返回已授权信息, 不重复扣费)
+    3. 按(运营点, 应用)验证运营点归属和应用授权(相同组合只验证一次)
+    4. 验证玩家数量
+    5. 一个数据库事务中对总额扣费, 写入各会话的使用记录和交易记录
+
+    **响应**: 每个会话的结果与请求顺序一致, 成功时 data 与单次授权响应数据相同。
+    """
+)
+async def authorize_game_batch(
+    request_body: GameAuthorizeBatchRequest,
+    request: Request,
+    x_api_key: str = Header(..., alias="X-API-Key", description="运营商API Key"),
+    x_timestamp: int = Header(..., alias="X-Timestamp", description="Unix时间戳(秒)"),
+    x_signature: str = Header(..., alias="X-Signature", description="HMAC-SHA256签名"),
+    db: AsyncSession = Depends(get_db)
+) -> GameAuthorizeBatchResponse:
+    """批量游戏授权API
+
+    Args:
+        request_body: 请求体(items, mode)
+        request: FastAPI Request对象
+        x_api_key: API Key (Header)
+        x_timestamp: 时间戳 (Header)
+        x_signature: HMAC签名 (Header)
+        db: 数据库会话
+
+    Returns:
+        GameAuthorizeBatchResponse: 各会话的授权结果
+    """
+    auth_service = AuthService(db)
+    billing_service = BillingService(db)
+    context_cache = get_auth_context_cache()
+    session_index = get_session_index()
+    items = request_body.items
+    all_or_nothing = request_body.mode == "all_or_nothing"
+
+    # ========== STEP 1: 验证API Key (授权上下文缓存命中时跳过) ==========
+    contexts = {
+        (item.site_id, item.app_id): context_cache.get(x_api_key, item.site_id, item.app_id)
+        for item in items
+    }
+    cached_context = next((context for context in contexts.values() if context), None)
+    if cached_context:
+        operator = cached_context.operator
+    else:
+        operator = await auth_service.verify_operator_by_api_key(x_api_key)
+
+    # 整批一个签名
+    await game_signature.authenticate(request, operator.id, x_api_key, await request.body())
+
+    # ========== STEP 2-4: 逐个校验会话 ==========
+    results: list[Optional[GameAuthorizeBatchResult]] = [None] * len(items)
+    pending: list[tuple[int, BatchDebitItem]] = []
+    resolved: dict[tuple[str, str], object] = {}
+    seen_session_ids: set[str] = set()
+    rejection: Optional[HTTPException] = None
+
+    for index, item in enumerate(items):
+        try:
+            if item.session_id in seen_session_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "error_code": "DUPLICATE_SESSION_IN_BATCH",
+                        "message": f"同一批次中会话ID重复: {item.session_id}"
+                    }
+                )
+            seen_session_ids.add(item.session_id)
+
+            await auth_service.verify_session_id_format(item.session_id, operator.id)
+
+            authorized_data = await _find_authorized_session(session_index, billing_service, item.session_id)
+            if authorized_data:
+                results[index] = GameAuthorizeBatchResult(
+                    session_id=item.session_id, success=True, data=authorized_data
+                )
+                continue
+
+            key = (item.site_id, item.app_id)
+            if key not in resolved:
+                context = contexts[key]
+                if context:
+                    resolved[key] = (context.site.id, context.application)
+                else:
+                    try:
+                        resolved[key] = await _resolve_site_and_application(
+                            auth_service, context_cache, x_api_key, operator, item.site_id, item.app_id
+                        )
+                    except HTTPException as e:
+                        resolved[key] = e
+            if isinstance(resolved[key], HTTPException):
+                raise resolved[key]
+            site_id, application = resolved[key]
+
+            await auth_service.verify_player_count(item.player_count, application)
+
+            pending.append((index, BatchDebitItem(
+                session_id=item.session_id,
+                site_id=site_id,
+                application=application,
+                player_count=item.player_count
+            )))
+
+        except HTTPException as e:
+            rejection = rejection or e
+            results[index] = _batch_failure(item.session_id, e)
+
+    if all_or_nothing and rejection:
+        for index, _ in pending:
+            results[index] = GameAuthorizeBatchResult(
+                session_id=items[index].session_id,
+                success=False,
+                error={
+                    "error_code": "BATCH_ABORTED",
+                    "message": "同批其他会话无法授权，本会话未扣费"
+                }
             )
+        raise HTTPException(
+            status_code=rejection.status_code,
+            detail={
+                "error_code": "BATCH_AUTHORIZATION_REJECTED",
+                "message": "批量授权中存在无法授权的会话，整批未扣费",
+                "details": {
+                    "results": [result.model_dump(mode="json") for result in results]
+                }
+            }
+        )
+
+    # ========== STEP 5: 一个事务中扣费 ==========
+    total_cost = Decimal("0.00")
+    balance_after: Optional[Decimal] = None
+
+    if pending:
+        client_ip = request.client.host if request.client else None
+        debits, balance_after = await billing_service.create_batch_authorization_transaction(
+            operator_id=operator.id,
+            items=[debit_item for _, debit_item in pending],
+            client_ip=client_ip,
+            customer_tier=operator.customer_tier,
+            all_or_nothing=all_or_nothing
+        )
+
+        for (index, debit_item), debit in zip(pending, debits):
+            if debit is None:
+                required_amount = debit_item.application.price_per_player * debit_item.player_count
+                results[index] = _batch_failure(debit_item.session_id, HTTPException(
+                    status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                    detail={
+                        "error_code": "INSUFFICIENT_BALANCE",
+                        "message": f"账户余额不足，当前余额: {balance_after}元，需要: {required_amount}元",
+                        "details": {
+                            "current_balance": str(balance_after),
+                            "required_amount": str(required_amount)
+                        }
+                    }
+                ))
+                continue
+
+            usage_record, transaction_record = debit
+            total_cost += usage_record.total_cost
+            data = _authorized_data(
+                usage_record, debit_item.application.app_name, transaction_record.balance_after
+            )
+            await session_index.remember_response(debit_item.session_id, data.model_dump(mode="json"))
+            results[index] = GameAuthorizeBatchResult(
+                session_id=debit_item.session_id, success=True, data=data
+            )
+
+    authorized_count = sum(1 for result in results if result.success)
+    return GameAuthorizeBatchResponse(
+        success=True,
+        data=GameAuthorizeBatchData(
+            mode=request_body.mode,
+            authorized_count=authorized_count,
+            failed_count=len(results) - authorized_count,
+            total_cost=str(total_cost),
+            balance_after=None if balance_after is None else str(balance_after),
+            results=results
+        )
+    )
+
+
+@router.post(
+    "/game/token/verify",
+    response_model=AuthorizationTokenVerifyResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {
+            "model": ErrorResponse,
+            "description": "令牌无效(格式错误、签名错误)或已过期"
+        }
+    },
+    summary="验证授权令牌",
+    description="""
+    验证游戏授权返回的授权令牌并返回其中的授权信息。
+
+    只做签名和有效期校验, 不查询数据库。SDK也可以使用
+    GET /auth/game/token/keys 发布的公钥在本地离线验证。
+    """
+)
+async def verify_game_authorization_token(
+    request_body: AuthorizationTokenVerifyRequest
+) -> AuthorizationTokenVerifyResponse:
+    """验证授权令牌API
+
+    Args:
+        request_body: 请求体(token)
+
+    Returns:
+        AuthorizationTokenVerifyResponse: 令牌中的授权信息
+
+    Raises:
+        HTTPException 401: 令牌无效或已过期
+    """
+    try:
+        claims = verify_authorization_token(request_body.token)
+    except AuthorizationTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "error_code": e.error_code,
+                "message": "授权令牌已过期" if e.error_code == "AUTHORIZATION_TOKEN_EXPIRED" else "授权令牌无效"
+            }
+        )
+
+    return AuthorizationTokenVerifyResponse(
+        success=True,
+        data=AuthorizationTokenClaims(
+            session_id=claims["sid"],
+            operator_id=claims["op"],
+            site_id=claims["site"],
+            app_id=claims["app"],
+            player_count=claims["pc"],
+            issued_at=datetime.fromtimestamp(claims["iat"], tz=timezone.utc),
+            expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
         )
+    )
+
+
+@router.get(
+    "/game/token/keys",
+    status_code=status.HTTP_200_OK,
+    summary="授权令牌验证公钥",
+    description="""
+    以JWK Set格式发布授权令牌的验证公钥(Ed25519, alg=EdDSA)。
+
+    SDK和头显Server缓存该公钥后即可离线验证授权令牌, 令牌头部的 kid 对应公钥的 kid。
+    """
+)
+async def get_game_token_keys() -> dict:
+    """获取授权令牌验证公钥(JWK Set)"""
+    return get_public_jwks()
+
+
+async def _find_authorized_session(
+    session_index: SessionIdempotencyIndex,
+    billing_service: BillingService,
+    session_id: str
+) -> Optional[GameAuthorizeData]:
+    """检查会话ID幂等性, 会话已授权时返回已授权信息
+
+    快速路径: Bloom过滤器 + Redis占位确认是新会话时跳过数据库查询;
+    可能重复时先读取缓存的授权响应, 再回退到数据库。
+    """
+    if await session_index.claim(session_id):
+        return None
+
+    cached_response = await session_index.get_response(session_id)
+    if cached_response:
+        return GameAuthorizeData.model_validate(cached_response)
+
+    existing_record = await billing_service.check_session_idempotency(session_id)
+    if not existing_record:
+        return None
+
+    balance_after = await billing_service.get_authorization_balance_after(existing_record.id)
+    return GameAuthorizeData(
+        authorization_token=existing_record.authorization_token,
+        session_id=existing_record.session_id,
+        app_name=existing_record.application.app_name if existing_record.application else "未知应用",
+        player_count=existing_record.player_count,
+        unit_price=str(existing_record.price_per_player),
+        total_cost=str(existing_record.total_cost),
+        balance_after=str(balance_after if balance_after is not None else "0.00"),
+        authorized_at=existing_record.game_started_at
+    )
+
+
+def _parse_uuid(value: str) -> Optional[UUID]:
+    """解析UUID, 格式错误时返回None(错误在后续步骤按原顺序报告)"""
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
+async def _resolve_site_and_application(
+    auth_service: AuthService,
+    context_cache,
+    api_key: str,
+    operator,
+    site_id_str: str,
+    app_id_str: str,
+    chain: Optional[AuthorizationChain] = None
+):
+    """解析并验证运营点和应用(授权上下文缓存未命中时)
+
+    验证全部通过后写入授权上下文缓存。
+
+    Args:
+        chain: 已执行的联表查询结果(未提供时查询一次)
+
+    Returns:
+        tuple[UUID, Application]: (运营点ID, 应用对象)
 
+    Raises:
+        HTTPException 400: ID格式错误
+        HTTPException 403/404: 运营点不属于运营商或应用未授权
+    """
     # ========== STEP 4: 解析并验证请求参数 ==========
     try:
-        app_id = UUID(request_body.app_id)
+        app_id = UUID(app_id_str)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
                 "error_code": "INVALID_APP_ID",
-                "message": f"应用ID格式错误: {request_body.app_id}"
+                "message": f"应用ID格式错误: {app_id_str}"
             }
         )
 
     try:
-        site_id = UUID(request_body.site_id)
+        site_id = UUID(site_id_str)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
                 "error_code": "INVALID_SITE_ID",
-                "message": f"运营点ID格式错误: {request_body.site_id}"
+                "message": f"运营点ID格式错误: {site_id_str}"
             }
         )
 
+    if chain is None:
+        chain = await auth_service.load_authorization_chain(api_key, site_id, app_id)
+
     # ========== STEP 5: 验证运营点归属 ==========
-    site = await auth_service.verify_site_ownership(site_id, operator.id)
+    site = auth_service.check_site(chain.site, site_id, operator.id)
 
     # ========== STEP 6: 验证应用授权 ==========
-    application, authorization = await auth_service.verify_application_authorization(
-        app_id,
-        operator.id
-    )
-
-    # ========== STEP 7: 验证玩家数量 ==========
-    await auth_service.verify_player_count(request_body.player_count, application)
-
-    # ========== STEP 8: 计算费用并检查余额 ==========
-    total_cost = billing_service.calculate_total_cost(
-        application.price_per_player,
-        request_body.player_count
+    application = auth_service.check_application(chain.application, app_id)
+    authorization = auth_service.check_authorization(chain.authorization, application)
+
+    # 全部验证通过,写入授权上下文缓存
+    context_cache.set(
+        api_key,
+        site_id_str,
+        app_id_str,
+        AuthorizationContext.from_models(operator, site, application, authorization)
     )
-    await billing_service.check_balance_sufficiency(operator, total_cost)
-
-    # ========== STEP 9: 执行扣费事务 ==========
-    client_ip = request.client.host if request.client else None
+    return site_id, application
 
-    usage_record, transaction_record, balance_after = await billing_service.create_authorization_transaction(
-        session_id=x_session_id,
-        operator_id=operator.id,
-        site_id=site_id,
-        application=application,
-        player_count=request_body.player_count,
-        client_ip=client_ip
-    )
 
-    # ========== STEP 10: 构造响应 ==========
-    response_data = GameAuthorizeData(
+def _authorized_data(usage_record, app_name: str, balance_after: Decimal) -> GameAuthorizeData:
+    """由使用记录构造授权响应数据"""
+    return GameAuthorizeData(
         authorization_token=usage_record.authorization_token,
         session_id=usage_record.session_id,
-        app_name=application.app_name,
+        app_name=app_name,
         player_count=usage_record.player_count,
         unit_price=str(usage_record.price_per_player),
         total_cost=str(usage_record.total_cost),
@@ -218,7 +653,14 @@ async def authorize_game(
         authorized_at=usage_record.game_started_at
     )
 
-    return GameAuthorizeResponse(success=True, data=response_data)
+
+def _batch_failure(session_id: str, error: HTTPException) -> GameAuthorizeBatchResult:
+    """将单个会话的HTTP异常转换为批量结果"""
+    detail = error.detail if isinstance(error.detail, dict) else {
+        "error_code": "AUTHORIZATION_FAILED",
+        "message": str(error.detail)
+    }
+    return GameAuthorizeBatchResult(session_id=session_id, success=False, error=detail)
 
 
 # ==================== 运营商注册和登录 (User Story 2) ====================
@@ -2246,7 +2246,9 @@ async def get_player_distribution(
                     }
                 ],
                 "total_sessions": 100,
-                "most_common_player_count": 4
+                "most_common_player_count": 4,
+                "average_player_count": 4.2,
+                "percentiles": {"p50": 4, "p90": 6, "p99": 8}
             }
         }
 
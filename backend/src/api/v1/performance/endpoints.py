@@ -16,7 +16,7 @@ from ....core.performance import (
     DatabaseOptimizer,
     ApiOptimizer
 )
-from ....core.cache.enhanced_cache import get_multi_cache
+from ....core.multilevel_cache import get_multi_cache
 from ....core.database.optimized_pool import get_db_pool
 from ....schemas.admin_operator import AdminOperatorResponse
 
@@ -118,25 +118,24 @@ async def warm_cache(
     "/cache/invalidate",
     response_model=Dict[str, Any],
     summary="缓存失效",
-    description="按键或模式失效缓存"
+    description="按键或标签失效缓存(标签见 cache_result(tags=...), 如 operator:{id})"
 )
 async def invalidate_cache(
-    pattern: Optional[str] = Query(None, description="缓存模式"),
+    tag: Optional[str] = Query(None, description="缓存标签"),
     keys: Optional[List[str]] = Query(None, description="缓存键列表"),
     current_user: AdminOperatorResponse = Depends(get_current_admin_user)
 ) -> Dict[str, Any]:
     """缓存失效"""
     try:
-        if not pattern and not keys:
-            raise HTTPException(status_code=400, detail="必须提供pattern或keys参数")
+        if not tag and not keys:
+            raise HTTPException(status_code=400, detail="必须提供tag或keys参数")
 
         cache = get_multi_cache()
         success_count = 0
 
-        if pattern:
-            await cache.invalidate_pattern(pattern)
-            success_count = 1  # 模式失效无法统计具体数量
-            logger.info("cache_invalidated_by_pattern", pattern=pattern)
+        if tag:
+            success_count = await cache.invalidate_tags(tag)
+            logger.info("cache_invalidated_by_tag", tag=tag, deleted=success_count)
         elif keys:
             for key in keys:
                 if await cache.delete(key):
@@ -146,7 +145,7 @@ async def invalidate_cache(
         return {
             "message": "缓存失效操作完成",
             "invalidated_count": success_count,
-            "pattern": pattern,
+            "tag": tag,
             "keys_count": len(keys) if keys else 0,
             "timestamp": datetime.now().isoformat()
         }
@@ -23,6 +23,8 @@ from ...api.dependencies import get_db
 from ...schemas.payment import PaymentCallbackRequest, PaymentCallbackResponse
 from ...models.transaction import RechargeOrder, TransactionRecord
 from ...models.operator import OperatorAccount
+from ...services.balance_ledger import BalanceLedger
+from ...services.finance_counters import record_transactions
 
 router = APIRouter(prefix="/webhooks/payment", tags=["支付回调"])
 
@@ -242,7 +244,8 @@ async def _process_payment_callback(
             order.transaction_id = request.transaction_id
             order.paid_at = request.paid_at
 
-            # 记录余额变化
+            # 把余额分片归集回主行后记录余额变化
+            await BalanceLedger(db).consolidate(operator)
             balance_before = operator.balance
             balance_after = balance_before + order.amount
 
@@ -265,6 +268,7 @@ async def _process_payment_callback(
 
             db.add(transaction)
             await db.commit()
+            await record_transactions([transaction])
 
             return PaymentCallbackResponse(
                 success=True,
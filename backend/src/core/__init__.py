@@ -1,12 +1,14 @@
-"""Core module containing configuration, security, and utilities."""
+"""Core module containing configuration, security, and utilities.
+
+Configuration, exceptions and logging are imported eagerly. Cache (redis),
+security (jose, cryptography) and utils (passlib) are imported on first
+attribute access, so `from src.core import get_settings` stays cheap for
+processes that never touch them.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from .cache import RedisCache, get_cache, cache_result
-# from .cache.enhanced_cache import (
-#     get_multi_cache,
-#     get_cache_warmer,
-#     MultiLevelCache,
-#     CacheOptimizer
-# )
 from .config import Settings, get_settings, settings
 from .exceptions import (
     AppException,
@@ -26,51 +28,114 @@ from .logging import (
     get_logger,
     unbind_context,
 )
-from .security import (
-    create_access_token,
-    decode_token,
-    get_token_subject,
-    get_token_user_type,
-    is_token_expired,
-    refresh_token,
-    verify_token,
-    EncryptionService,
-    EncryptionError,
-    get_encryption_service,
-)
-from .utils import (
-    MoneyInput,
-    add_money,
-    cents_to_yuan,
-    compare_money,
-    datetime_to_timestamp,
-    divide_money,
-    format_money,
-    format_timestamp,
-    get_current_timestamp,
-    get_timestamp_age,
-    hash_password,
-    is_negative,
-    is_positive,
-    is_timestamp_valid,
-    is_zero,
-    multiply_money,
-    needs_rehash,
-    parse_timestamp,
-    round_money,
-    subtract_money,
-    timestamp_to_datetime,
-    to_decimal,
-    validate_timestamp,
-    verify_password,
-    yuan_to_cents,
-)
+
+if TYPE_CHECKING:
+    from .cache import (
+        RedisCache,
+        get_cache,
+        cache_result,
+        invalidate_cache_tags,
+    )
+    from .security import (
+        create_access_token,
+        decode_token,
+        get_token_subject,
+        get_token_user_type,
+        is_token_expired,
+        refresh_token,
+        verify_token,
+        EncryptionService,
+        EncryptionError,
+        get_encryption_service,
+    )
+    from .utils import (
+        MoneyInput,
+        add_money,
+        cents_to_yuan,
+        compare_money,
+        datetime_to_timestamp,
+        divide_money,
+        format_money,
+        format_timestamp,
+        get_current_timestamp,
+        get_timestamp_age,
+        hash_password,
+        is_negative,
+        is_positive,
+        is_timestamp_valid,
+        is_zero,
+        multiply_money,
+        needs_rehash,
+        parse_timestamp,
+        round_money,
+        subtract_money,
+        timestamp_to_datetime,
+        to_decimal,
+        validate_timestamp,
+        verify_password,
+        yuan_to_cents,
+    )
+
+# Lazily imported names -> submodule
+_LAZY_IMPORTS = {
+    "RedisCache": ".cache",
+    "get_cache": ".cache",
+    "cache_result": ".cache",
+    "invalidate_cache_tags": ".cache",
+    "create_access_token": ".security",
+    "decode_token": ".security",
+    "get_token_subject": ".security",
+    "get_token_user_type": ".security",
+    "is_token_expired": ".security",
+    "refresh_token": ".security",
+    "verify_token": ".security",
+    "EncryptionService": ".security",
+    "EncryptionError": ".security",
+    "get_encryption_service": ".security",
+    "MoneyInput": ".utils",
+    "add_money": ".utils",
+    "cents_to_yuan": ".utils",
+    "compare_money": ".utils",
+    "datetime_to_timestamp": ".utils",
+    "divide_money": ".utils",
+    "format_money": ".utils",
+    "format_timestamp": ".utils",
+    "get_current_timestamp": ".utils",
+    "get_timestamp_age": ".utils",
+    "hash_password": ".utils",
+    "is_negative": ".utils",
+    "is_positive": ".utils",
+    "is_timestamp_valid": ".utils",
+    "is_zero": ".utils",
+    "multiply_money": ".utils",
+    "needs_rehash": ".utils",
+    "parse_timestamp": ".utils",
+    "round_money": ".utils",
+    "subtract_money": ".utils",
+    "timestamp_to_datetime": ".utils",
+    "to_decimal": ".utils",
+    "validate_timestamp": ".utils",
+    "verify_password": ".utils",
+    "yuan_to_cents": ".utils",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import cache/security/utils names on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Cache
     "RedisCache",
     "get_cache",
     "cache_result",
+    "invalidate_cache_tags",
     # "get_multi_cache",
     # "get_cache_warmer",
     # "MultiLevelCache",
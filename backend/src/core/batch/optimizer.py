@@ -17,7 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from ..database.optimized_pool import get_db_pool
-from ..cache.enhanced_cache import get_multi_cache
+from ..multilevel_cache import get_multi_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -152,7 +152,7 @@ class DatabaseBatchProcessor:
                         ON CONFLICT DO NOTHING
                         """
                     elif conflict_strategy == "update":
-                        update_set = ', '.join([f"{col}" = EXCLUDED.{col}" for col in columns])
+                        update_set = ', '.join([f"{col} = EXCLUDED.{col}" for col in columns])
                         sql = f"""
                         INSERT INTO {table_name} ({columns_str})
                         VALUES {values_str}
@@ -207,7 +207,7 @@ class DatabaseBatchProcessor:
             db_pool = get_db_pool()
             async with db_pool.get_session() as session:
                 # 构建更新SQL
-                set_clause = ', '.join([f"{k}" = :{k}" for k in update_data.keys()])
+                set_clause = ', '.join([f"{k} = :{k}" for k in update_data.keys()])
                 sql = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
 
                 # 合并参数
@@ -5,24 +5,79 @@ automatic serialization, and TTL management.
 
 Features:
 - Async Redis client with connection pool
-- JSON serialization for complex objects
+- Typed binary serialization (see core.codec): Decimal/UUID/datetime
+  round-trip, large values compressed
 - Configurable TTL per cache key
 - Cache invalidation support
 - Performance metrics
 """
 
-import json
+import copy
+import inspect
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
 from functools import wraps
 
 import redis.asyncio as redis
+from redis.asyncio.client import PubSub
 from redis.asyncio.connection import ConnectionPool
 
+from .codec import CodecError, get_serializer
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Add a key to tag sets; each set lives at least as long as its longest-lived member
+# (ARGV[2] <= 0 means the member never expires, so neither does the set)
+_TAG_KEY_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+for _, tag_key in ipairs(KEYS) do
+    local existed = redis.call('exists', tag_key)
+    redis.call('sadd', tag_key, ARGV[1])
+    if ttl <= 0 then
+        redis.call('persist', tag_key)
+    else
+        local current = redis.call('ttl', tag_key)
+        if existed == 0 or (current >= 0 and current < ttl) then
+            redis.call('expire', tag_key, ttl)
+        end
+    end
+end
+return #KEYS
+"""
+
+# Keys deleted per DEL command when invalidating a tag
+TAG_DELETE_BATCH = 500
+
+_DELETE_IF_EQUALS_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+# Add integer increments to a counter hash only if it exists (it is created by
+# replace_counters); ARGV: field count, field/increment pairs, set members
+_INCR_COUNTERS_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+local count = tonumber(ARGV[1])
+for i = 0, count - 1 do
+    redis.call('hincrby', KEYS[1], ARGV[2 + i * 2], ARGV[3 + i * 2])
+end
+if #ARGV > 1 + count * 2 then
+    for i = 2 + count * 2, #ARGV do
+        redis.call('sadd', KEYS[2], ARGV[i])
+    end
+    if redis.call('ttl', KEYS[2]) == -1 then
+        redis.call('expire', KEYS[2], redis.call('ttl', KEYS[1]))
+    end
+end
+return 1
+"""
+
 
 class RedisCache:
     """Redis cache manager with connection pooling."""
@@ -30,6 +85,7 @@ class RedisCache:
     def __init__(self):
         """Initialize Redis cache manager."""
         self.settings = get_settings()
+        self.serializer = get_serializer()
         self._pool: Optional[ConnectionPool] = None
         self._client: Optional[redis.Redis] = None
 
@@ -49,7 +105,7 @@ class RedisCache:
                 max_connections=self.settings.REDIS_MAX_CONNECTIONS,
                 socket_timeout=self.settings.REDIS_SOCKET_TIMEOUT,
                 socket_connect_timeout=self.settings.REDIS_SOCKET_CONNECT_TIMEOUT,
-                decode_responses=True,  # Automatically decode bytes to str
+                decode_responses=False,  # Values are framed bytes (see core.codec)
             )
 
             self._client = redis.Redis(connection_pool=self._pool)
@@ -64,6 +120,11 @@ class RedisCache:
             self._pool = None
             self._client = None
 
+    @property
+    def is_connected(self) -> bool:
+        """Whether the Redis client is available."""
+        return self._client is not None
+
     async def disconnect(self) -> None:
         """Close Redis connection pool."""
         if self._client:
@@ -82,7 +143,7 @@ class RedisCache:
             key: Cache key
 
         Returns:
-            Cached value (deserialized from JSON) or None if not found
+            Cached value (decoded) or None if not found
         """
         if not self._client:
             return None
@@ -92,8 +153,7 @@ class RedisCache:
             if value is None:
                 return None
 
-            # Deserialize JSON
-            return json.loads(value)
+            return self.serializer.loads(value)
 
         except Exception as e:
             logger.error(f"Redis GET error for key '{key}': {e}")
@@ -109,7 +169,7 @@ class RedisCache:
 
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (will be encoded)
             ttl: Time-to-live in seconds (None = no expiration)
 
         Returns:
@@ -119,8 +179,7 @@ class RedisCache:
             return False
 
         try:
-            # Serialize to JSON
-            serialized = json.dumps(value)
+            serialized = self.serializer.dumps(value)
 
             if ttl:
                 await self._client.setex(key, ttl, serialized)
@@ -133,6 +192,93 @@ class RedisCache:
             logger.error(f"Redis SET error for key '{key}': {e}")
             return False
 
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Get the encoded value from cache without decoding it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Encoded value or None if not found
+        """
+        if not self._client:
+            return None
+
+        try:
+            return await self._client.get(key)
+
+        except Exception as e:
+            logger.error(f"Redis GET error for key '{key}': {e}")
+            return None
+
+    async def set_raw(
+        self,
+        key: str,
+        payload: bytes,
+        ttl: Optional[int] = None,
+        tags: Optional[list[str]] = None
+    ) -> bool:
+        """Set an already encoded value (Serializer.dumps) in cache.
+
+        Args:
+            key: Cache key
+            payload: Encoded value
+            ttl: Time-to-live in seconds (None = no expiration)
+            tags: Tag set keys to register the key under (see invalidate_tags);
+                  written in the same round trip as the value
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._client:
+            return False
+
+        try:
+            if not tags:
+                if ttl:
+                    await self._client.setex(key, ttl, payload)
+                else:
+                    await self._client.set(key, payload)
+                return True
+
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.set(key, payload, ex=ttl or None)
+                pipe.eval(_TAG_KEY_SCRIPT, len(tags), *tags, key, ttl or 0)
+                await pipe.execute()
+            return True
+
+        except Exception as e:
+            logger.error(f"Redis SET error for key '{key}': {e}")
+            return False
+
+    async def set_if_absent(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None
+    ) -> Optional[bool]:
+        """Set value only if the key does not exist yet (SET NX).
+
+        Args:
+            key: Cache key
+            value: Value to cache (will be encoded)
+            ttl: Time-to-live in seconds (None = no expiration)
+
+        Returns:
+            True if the key was set, False if it already existed,
+            None if Redis is unavailable
+        """
+        if not self._client:
+            return None
+
+        try:
+            result = await self._client.set(key, self.serializer.dumps(value), ex=ttl, nx=True)
+            return bool(result)
+
+        except Exception as e:
+            logger.error(f"Redis SET NX error for key '{key}': {e}")
+            return None
+
     async def delete(self, key: str) -> bool:
         """Delete value from cache.
 
@@ -153,9 +299,69 @@ class RedisCache:
             logger.error(f"Redis DELETE error for key '{key}': {e}")
             return False
 
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        """Delete a key only if it still holds value (atomic compare-and-delete).
+
+        Used to release locks taken with set_if_absent without removing a
+        lock that has expired and been re-acquired by someone else.
+
+        Args:
+            key: Cache key
+            value: Expected value (encoded before comparing)
+
+        Returns:
+            True if the key was deleted, False otherwise
+        """
+        if not self._client:
+            return False
+
+        try:
+            result = await self._client.eval(_DELETE_IF_EQUALS_SCRIPT, 1, key, self.serializer.dumps(value))
+            return bool(result)
+
+        except Exception as e:
+            logger.error(f"Redis DELETE IF EQUALS error for key '{key}': {e}")
+            return False
+
+    async def invalidate_tags(self, tags: list[str]) -> int:
+        """Delete every key registered under any of the tag sets, and the sets.
+
+        Two round trips regardless of keyspace size: one pipelined SMEMBERS
+        per tag, then pipelined DELs in batches of TAG_DELETE_BATCH.
+
+        Args:
+            tags: Tag set keys
+
+        Returns:
+            Number of keys deleted (tag sets not included)
+        """
+        if not self._client or not tags:
+            return 0
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.smembers(tag)
+                members = set().union(*await pipe.execute())
+
+            keys = list(members)
+            async with self._client.pipeline(transaction=False) as pipe:
+                for start in range(0, len(keys), TAG_DELETE_BATCH):
+                    pipe.delete(*keys[start:start + TAG_DELETE_BATCH])
+                pipe.delete(*tags)
+                results = await pipe.execute()
+            return sum(results[:-1])
+
+        except Exception as e:
+            logger.error(f"Redis INVALIDATE_TAGS error for tags {tags}: {e}")
+            return 0
+
     async def delete_pattern(self, pattern: str) -> int:
         """Delete all keys matching a pattern.
 
+        Walks the whole keyspace with SCAN (O(total keys)); prefer tags
+        (set_raw(tags=...) / invalidate_tags) for invalidating groups of keys.
+
         Args:
             pattern: Pattern to match (e.g., "user:*", "session:*")
 
@@ -178,33 +384,320 @@ class RedisCache:
             logger.error(f"Redis DELETE_PATTERN error for pattern '{pattern}': {e}")
             return 0
 
-    async def get_by_pattern(self, pattern: str) -> list:
+    async def get_by_pattern(self, pattern: str, batch_size: Optional[int] = None) -> list:
         """Get all values matching a pattern.
 
+        Keys are scanned and fetched in chunks: one MGET per batch_size keys
+        instead of one GET per key. Still walks the whole keyspace with SCAN;
+        keep groups that are listed often in a hash (hgetall) instead.
+
         Args:
-            pattern: Pattern to match (e.g., "blocked_ip:*")
+            pattern: Pattern to match (e.g., "session:*")
+            batch_size: Keys per SCAN/MGET round trip (default CACHE_SCAN_BATCH_SIZE)
 
         Returns:
-            List of deserialized values
+            List of decoded values
         """
         if not self._client:
             return []
 
+        batch_size = batch_size or get_settings().CACHE_SCAN_BATCH_SIZE
         try:
             values = []
-            async for key in self._client.scan_iter(match=pattern):
-                raw_value = await self._client.get(key)
-                if raw_value:
-                    try:
-                        values.append(json.loads(raw_value))
-                    except json.JSONDecodeError:
-                        logger.warning(f"Failed to decode JSON for key '{key}'")
+            keys = []
+            async for key in self._client.scan_iter(match=pattern, count=batch_size):
+                keys.append(key)
+                if len(keys) >= batch_size:
+                    values.extend(await self._fetch_many(keys))
+                    keys = []
+            if keys:
+                values.extend(await self._fetch_many(keys))
             return values
 
         except Exception as e:
             logger.error(f"Redis GET_BY_PATTERN error for pattern '{pattern}': {e}")
             return []
 
+    async def _fetch_many(self, keys: list) -> list:
+        """MGET a chunk of keys, skipping missing and undecodable values."""
+        values = []
+        for key, raw_value in zip(keys, await self._client.mget(keys)):
+            if raw_value:
+                try:
+                    values.append(self.serializer.loads(raw_value))
+                except CodecError:
+                    logger.warning(f"Failed to decode value for key '{key}'")
+        return values
+
+    async def mget(self, keys: list[str]) -> list[Optional[Any]]:
+        """Get several values in one round trip (MGET).
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Decoded values in key order (None for missing or undecodable keys)
+        """
+        if not self._client or not keys:
+            return [None] * len(keys)
+
+        try:
+            raw_values = await self._client.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+
+        values = []
+        for key, raw_value in zip(keys, raw_values):
+            value = None
+            if raw_value is not None:
+                try:
+                    value = self.serializer.loads(raw_value)
+                except CodecError:
+                    logger.warning(f"Failed to decode value for key '{key}'")
+            values.append(value)
+        return values
+
+    async def mset(self, mapping: dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one round trip.
+
+        Args:
+            mapping: Cache key -> value (values will be encoded)
+            ttl: Time-to-live in seconds applied to every key (None = no expiration)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._client:
+            return False
+        if not mapping:
+            return True
+
+        try:
+            encoded = {key: self.serializer.dumps(value) for key, value in mapping.items()}
+            if not ttl:
+                await self._client.mset(encoded)
+                return True
+
+            # MSET has no expiry option: pipeline SET EX per key instead
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, payload in encoded.items():
+                    pipe.set(key, payload, ex=ttl)
+                await pipe.execute()
+            return True
+
+        except Exception as e:
+            logger.error(f"Redis MSET error for {len(mapping)} keys: {e}")
+            return False
+
+    async def hset(self, key: str, field: str, value: Any) -> bool:
+        """Set one field of a hash.
+
+        Args:
+            key: Hash key
+            field: Field name
+            value: Value to store (will be encoded)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._client:
+            return False
+
+        try:
+            await self._client.hset(key, field, self.serializer.dumps(value))
+            return True
+
+        except Exception as e:
+            logger.error(f"Redis HSET error for key '{key}' field '{field}': {e}")
+            return False
+
+    async def hget(self, key: str, field: str) -> Optional[Any]:
+        """Get one field of a hash.
+
+        Args:
+            key: Hash key
+            field: Field name
+
+        Returns:
+            Decoded value or None if not found
+        """
+        if not self._client:
+            return None
+
+        try:
+            value = await self._client.hget(key, field)
+            if value is None:
+                return None
+
+            return self.serializer.loads(value)
+
+        except Exception as e:
+            logger.error(f"Redis HGET error for key '{key}' field '{field}': {e}")
+            return None
+
+    async def hgetall(self, key: str) -> dict[str, Any]:
+        """Get every field of a hash in one round trip (HGETALL).
+
+        Args:
+            key: Hash key
+
+        Returns:
+            Field name -> decoded value (undecodable fields are skipped)
+        """
+        if not self._client:
+            return {}
+
+        try:
+            raw_fields = await self._client.hgetall(key)
+        except Exception as e:
+            logger.error(f"Redis HGETALL error for key '{key}': {e}")
+            return {}
+
+        values = {}
+        for field, raw_value in raw_fields.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            try:
+                values[field] = self.serializer.loads(raw_value)
+            except CodecError:
+                logger.warning(f"Failed to decode field '{field}' of hash '{key}'")
+        return values
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        """Delete fields from a hash.
+
+        Args:
+            key: Hash key
+            fields: Field names
+
+        Returns:
+            Number of fields deleted
+        """
+        if not self._client or not fields:
+            return 0
+
+        try:
+            return await self._client.hdel(key, *fields)
+        except Exception as e:
+            logger.error(f"Redis HDEL error for key '{key}': {e}")
+            return 0
+
+    async def incr_counters(
+        self,
+        key: str,
+        increments: dict[str, int],
+        members_key: Optional[str] = None,
+        members: Iterable[str] = ()
+    ) -> bool:
+        """Atomically add to integer fields of a counter hash, if it exists.
+
+        Counter hashes hold plain integers (not codec-encoded) so HINCRBY
+        works on them. Increments are dropped while the hash is missing, so a
+        later replace_counters() rebuilt from the source of truth is not
+        double counted.
+
+        Args:
+            key: Counter hash key
+            increments: Field name -> integer increment
+            members_key: Companion set key (e.g. distinct ids seen)
+            members: Members to add to the companion set
+
+        Returns:
+            True if the hash existed and was updated, False otherwise
+        """
+        if not self._client:
+            return False
+
+        members = list(members)
+        keys = [key] + ([members_key] if members_key and members else [])
+        args = [len(increments)]
+        for field, increment in increments.items():
+            args += [field, int(increment)]
+        if len(keys) > 1:
+            args += members
+
+        try:
+            return bool(await self._client.eval(_INCR_COUNTERS_SCRIPT, len(keys), *keys, *args))
+
+        except Exception as e:
+            logger.error(f"Redis INCR COUNTERS error for key '{key}': {e}")
+            return False
+
+    async def get_counters(
+        self,
+        key: str,
+        members_key: Optional[str] = None
+    ) -> Optional[tuple[dict[str, int], int]]:
+        """Read a counter hash and the size of its companion set in one round trip.
+
+        Args:
+            key: Counter hash key
+            members_key: Companion set key
+
+        Returns:
+            (field name -> integer, companion set size), or None if the hash
+            does not exist or Redis is unavailable
+        """
+        if not self._client:
+            return None
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(key)
+                if members_key:
+                    pipe.scard(members_key)
+                results = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis GET COUNTERS error for key '{key}': {e}")
+            return None
+
+        if not results[0]:
+            return None
+        counters = {
+            (field.decode() if isinstance(field, bytes) else field): int(value)
+            for field, value in results[0].items()
+        }
+        return counters, (results[1] if members_key else 0)
+
+    async def replace_counters(
+        self,
+        key: str,
+        counters: dict[str, int],
+        ttl: int,
+        members_key: Optional[str] = None,
+        members: Iterable[str] = ()
+    ) -> bool:
+        """Atomically replace a counter hash and its companion set (MULTI/EXEC).
+
+        Args:
+            key: Counter hash key
+            counters: Field name -> integer value (must not be empty)
+            ttl: Time-to-live in seconds for the hash and the set
+            members_key: Companion set key
+            members: Companion set members
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._client:
+            return False
+
+        members = list(members)
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                pipe.delete(key, *([members_key] if members_key else []))
+                pipe.hset(key, mapping={field: int(value) for field, value in counters.items()})
+                pipe.expire(key, ttl)
+                if members_key and members:
+                    pipe.sadd(members_key, *members)
+                    pipe.expire(members_key, ttl)
+                await pipe.execute()
+            return True
+
+        except Exception as e:
+            logger.error(f"Redis REPLACE COUNTERS error for key '{key}': {e}")
+            return False
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache.
 
@@ -241,6 +734,35 @@ class RedisCache:
             logger.error(f"Redis TTL error for key '{key}': {e}")
             return None
 
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message on a pub/sub channel.
+
+        Args:
+            channel: Channel name
+            message: Message payload
+
+        Returns:
+            Number of subscribers that received the message
+        """
+        if not self._client:
+            return 0
+
+        try:
+            return await self._client.publish(channel, message)
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for channel '{channel}': {e}")
+            return 0
+
+    def pubsub(self) -> Optional[PubSub]:
+        """Create a pub/sub object on the shared connection pool.
+
+        Returns:
+            PubSub instance, or None if Redis is not connected
+        """
+        if not self._client:
+            return None
+        return self._client.pubsub(ignore_subscribe_messages=True)
+
 
 # Global cache instance
 _cache: Optional[RedisCache] = None
@@ -279,7 +801,9 @@ async def close_cache() -> None:
 def cache_result(
     key_prefix: str,
     ttl: int = 300,
-    key_builder: Optional[callable] = None
+    key_builder: Optional[callable] = None,
+    stale_ttl: Optional[int] = None,
+    tags: Optional[Union[Iterable[str], Callable[..., Iterable[str]]]] = None,
 ):
     """Decorator to cache function results.
 
@@ -288,42 +812,129 @@ def cache_result(
         ttl: Time-to-live in seconds (default: 5 minutes)
         key_builder: Optional function to build cache key from args
                     Signature: (func_name, *args, **kwargs) -> str
+        stale_ttl: Seconds an expired result is still served while it is
+                   refreshed in the background (default: CACHE_STALE_TTL_SECONDS)
+        tags: Tags to invalidate the result by (see invalidate_cache_tags).
+              Either templates formatted with the call's arguments, e.g.
+              ["operator:{operator_id}"], or a function taking the call's
+              arguments and returning the tags
+
+    Results go through the multi-level cache (in-process L1 + Redis); with
+    MULTI_LEVEL_CACHE_ENABLED=false only Redis is used. Recomputation is
+    stampede-protected (see MultiLevelCache.get_or_compute): concurrent
+    misses share one call per worker, one worker at a time recomputes under
+    a Redis lease, and popular keys are refreshed shortly before expiry.
+
+    A recomputation can be awaited by other requests, outlive a cancelled
+    caller, or run in the background after the response is sent, so it never
+    uses the caller's database session: when the call holds an AsyncSession
+    (as an argument or as self.db on service methods), the function runs on
+    a new session bound to the same engine.
 
     Example:
         @cache_result("user", ttl=600)
         async def get_user(user_id: str):
             return await db.get_user(user_id)
 
-        # Cache key will be: "user:get_user:{user_id}"
+        # Cache key will be: "{CACHE_NAMESPACE}:user:get_user:{user_id}"
+        # (one segment per argument; self/cls are skipped on methods)
+
+        @cache_result("dashboard", ttl=60, tags=["operator:{operator_id}"])
+        async def get_dashboard(operator_id: str):
+            ...
+
+        await invalidate_cache_tags(f"operator:{operator_id}")
     """
     def decorator(func):
+        signature = inspect.signature(func)
+
+        def build_tags(args, kwargs) -> tuple[str, ...]:
+            if tags is None:
+                return ()
+            if callable(tags):
+                return tuple(tags(*args, **kwargs))
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(tag.format(**bound.arguments) for tag in tags)
+
+        def build_key_args(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = [
+                str(value) for name, value in bound.arguments.items()
+                if name not in ("self", "cls")
+            ]
+            return ":".join(values) if values else "default"
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            cache = get_cache()
+            from .multilevel_cache import get_multi_cache
+            cache = get_multi_cache()
 
             # Build cache key
             if key_builder:
                 cache_key = key_builder(func.__name__, *args, **kwargs)
             else:
-                # Default: use function name and first arg (usually ID)
-                arg_str = str(args[0]) if args else "default"
-                cache_key = f"{key_prefix}:{func.__name__}:{arg_str}"
+                # Default: function name and every argument (self/cls excluded,
+                # so service methods share entries across instances)
+                cache_key = f"{key_prefix}:{func.__name__}:{build_key_args(args, kwargs)}"
+
+            return await cache.get_or_compute(
+                cache_key,
+                _on_own_session(func, args, kwargs),
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                tags=build_tags(args, kwargs),
+            )
+
+        return wrapper
+    return decorator
 
-            # Try to get from cache
-            cached_value = await cache.get(cache_key)
-            if cached_value is not None:
-                logger.debug(f"Cache HIT: {cache_key}")
-                return cached_value
 
-            # Cache miss - execute function
-            logger.debug(f"Cache MISS: {cache_key}")
-            result = await func(*args, **kwargs)
+def _on_own_session(
+    func: Callable[..., Awaitable[Any]], args: tuple, kwargs: dict
+) -> Callable[[], Awaitable[Any]]:
+    """Wrap a cache_result call so it runs on a database session of its own.
 
-            # Store in cache
-            if result is not None:
-                await cache.set(cache_key, result, ttl=ttl)
+    Every AsyncSession the call holds (positional, keyword, or self.db) is
+    replaced by one new session opened for the duration of the call.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    owner = args[0] if args else None
+    owner_session = getattr(owner, "db", None)
+    if not isinstance(owner_session, AsyncSession):
+        owner_session = None
+    sessions = [
+        value for value in (*args, *kwargs.values()) if isinstance(value, AsyncSession)
+    ]
+    if owner_session is None and not sessions:
+        return lambda: func(*args, **kwargs)
+    bind = (owner_session or sessions[0]).bind
+
+    async def compute() -> Any:
+        async with AsyncSession(bind=bind, expire_on_commit=False, autoflush=False) as db:
+            call_args = [db if isinstance(arg, AsyncSession) else arg for arg in args]
+            call_kwargs = {
+                name: db if isinstance(value, AsyncSession) else value
+                for name, value in kwargs.items()
+            }
+            if owner_session is not None:
+                call_args[0] = copy.copy(owner)
+                call_args[0].db = db
+            return await func(*call_args, **call_kwargs)
+
+    return compute
+
+
+async def invalidate_cache_tags(*tags: str) -> int:
+    """Invalidate every cached result stored under any of the tags.
 
-            return result
+    Args:
+        tags: Tags as passed to cache_result, e.g. "operator:{id}"
 
-        return wrapper
-    return decorator
+    Returns:
+        int: Number of Redis keys deleted
+    """
+    from .multilevel_cache import get_multi_cache
+    return await get_multi_cache().invalidate_tags(*tags)
@@ -0,0 +1,246 @@
+"""Typed binary serialization for cached values.
+
+RedisCache and the multi-level cache store values as framed bytes:
+
+    [version byte][flags byte][payload]
+
+- version: frame format version (FORMAT_VERSION)
+- flags: codec id in the low bits, FLAG_COMPRESSED when the payload is
+  zlib-compressed (only applied above a size threshold, and only when it
+  actually saves space)
+
+Codecs:
+- msgpack (optional dependency) with extension types for Decimal, UUID,
+  datetime and date
+- JSON (stdlib, always available) with the same types tagged as
+  {"__mr__": "<type>", "v": "<text>"}
+
+Values round-trip with their types, so services can cache Decimal balances,
+UUID ids and datetimes directly.
+
+Rolling deploys: the frame names its own codec, so every worker decodes
+whatever its peers wrote regardless of its own CACHE_CODEC. Payloads
+without a frame (plain JSON text written before this module existed) are
+still decoded. A new FORMAT_VERSION must be readable by all workers before
+any worker writes it; unknown versions raise CodecError, which the cache
+treats as a miss.
+"""
+
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional, Union
+from uuid import UUID
+
+from .config import get_settings
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, JSON codec is used instead
+    msgpack = None
+
+FORMAT_VERSION = 1
+
+FLAG_COMPRESSED = 0x80
+CODEC_MASK = 0x0F
+
+# zlib level 1: most of the size win for repetitive JSON-like data at a fraction of the CPU
+COMPRESSION_LEVEL = 1
+
+_TYPE_TAG = "__mr__"
+
+
+class CodecError(ValueError):
+    """Raised when a cached payload cannot be decoded."""
+
+
+class JsonCodec:
+    """Stdlib JSON with tagged Decimal/UUID/datetime/date values."""
+
+    codec_id = 1
+    name = "json"
+
+    @staticmethod
+    def _default(value: Any) -> dict:
+        entry = _JSON_TAGS.get(type(value)) or _subclass_entry(_JSON_TAGS, value)
+        if entry is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+        tag, to_text = entry
+        return {_TYPE_TAG: tag, "v": to_text(value)}
+
+    @staticmethod
+    def _object_hook(obj: dict) -> Any:
+        tag = obj.get(_TYPE_TAG)
+        if tag is None or len(obj) != 2:
+            return obj
+        decoder = _TAG_DECODERS.get(tag)
+        return decoder(obj["v"]) if decoder else obj
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=self._default, separators=(",", ":")).encode()
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data, object_hook=self._object_hook)
+
+
+# Exact-type dispatch (checked before isinstance fallbacks, datetime before its base date)
+_JSON_TAGS: dict[type, tuple[str, Callable[[Any], str]]] = {
+    Decimal: ("decimal", str),
+    UUID: ("uuid", str),
+    datetime: ("datetime", datetime.isoformat),
+    date: ("date", date.isoformat),
+}
+
+_TAG_DECODERS: dict[str, Callable[[str], Any]] = {
+    "decimal": Decimal,
+    "uuid": UUID,
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+}
+
+
+class MsgpackCodec:
+    """msgpack with extension types for Decimal/UUID/datetime/date."""
+
+    codec_id = 2
+    name = "msgpack"
+
+    EXT_DECIMAL = 1
+    EXT_UUID = 2
+    EXT_DATETIME = 3
+    EXT_DATE = 4
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        ExtType = msgpack.ExtType
+        self._encoders: dict[type, Callable[[Any], Any]] = {
+            Decimal: lambda v: ExtType(self.EXT_DECIMAL, str(v).encode()),
+            UUID: lambda v: ExtType(self.EXT_UUID, v.bytes),
+            datetime: lambda v: ExtType(self.EXT_DATETIME, v.isoformat().encode()),
+            date: lambda v: ExtType(self.EXT_DATE, v.isoformat().encode()),
+        }
+        self._decoders: dict[int, Callable[[bytes], Any]] = {
+            self.EXT_DECIMAL: lambda data: Decimal(data.decode()),
+            self.EXT_UUID: lambda data: UUID(bytes=data),
+            self.EXT_DATETIME: lambda data: datetime.fromisoformat(data.decode()),
+            self.EXT_DATE: lambda data: date.fromisoformat(data.decode()),
+        }
+
+    def _default(self, value: Any) -> Any:
+        encoder = self._encoders.get(type(value)) or _subclass_entry(self._encoders, value)
+        if encoder is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+        return encoder(value)
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        decoder = self._decoders.get(code)
+        return decoder(data) if decoder else msgpack.ExtType(code, data)
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True, datetime=False)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+def _subclass_entry(table: dict[type, Any], value: Any) -> Any:
+    """Dispatch-table entry for a subclass of a supported type (e.g. a datetime subclass)."""
+    for cls, entry in table.items():
+        if isinstance(value, cls):
+            return entry
+    return None
+
+
+class Serializer:
+    """Frames values with a version byte, codec id and optional compression."""
+
+    def __init__(self, codec: Optional[Any] = None, compress_threshold: int = 1024):
+        """
+        Args:
+            codec: Codec used for writing (default: msgpack if installed, else JSON)
+            compress_threshold: Compress payloads of at least this many bytes (0 disables)
+        """
+        self.codec = codec or default_codec()
+        self.compress_threshold = compress_threshold
+        self._decoders: dict[int, Any] = {JsonCodec.codec_id: JsonCodec()}
+        if msgpack is not None:
+            self._decoders[MsgpackCodec.codec_id] = MsgpackCodec()
+        self._decoders[self.codec.codec_id] = self.codec
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value into a framed payload."""
+        payload = self.codec.encode(value)
+        flags = self.codec.codec_id
+        if self.compress_threshold and len(payload) >= self.compress_threshold:
+            compressed = zlib.compress(payload, COMPRESSION_LEVEL)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= FLAG_COMPRESSED
+        return bytes((FORMAT_VERSION, flags)) + payload
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a framed payload (or a legacy plain JSON payload).
+
+        Raises:
+            CodecError: Unknown version/codec or corrupt payload
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not data:
+            raise CodecError("Empty payload")
+
+        try:
+            if data[0] != FORMAT_VERSION:
+                if data[0] < 0x20:
+                    raise CodecError(f"Unsupported payload version {data[0]}")
+                # Legacy unframed JSON text (never starts with a control byte)
+                return self._decoders[JsonCodec.codec_id].decode(data)
+
+            flags = data[1]
+            decoder = self._decoders.get(flags & CODEC_MASK)
+            if decoder is None:
+                raise CodecError(f"Unsupported codec id {flags & CODEC_MASK}")
+            payload = data[2:]
+            if flags & FLAG_COMPRESSED:
+                payload = zlib.decompress(payload)
+            return decoder.decode(payload)
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Corrupt payload: {e}") from e
+
+
+def default_codec() -> Any:
+    """msgpack when installed, otherwise JSON."""
+    return MsgpackCodec() if msgpack is not None else JsonCodec()
+
+
+def create_codec(name: str) -> Any:
+    """Build a codec by CACHE_CODEC name ("auto", "msgpack" or "json")."""
+    if name == "json":
+        return JsonCodec()
+    if name == "msgpack":
+        return MsgpackCodec()
+    return default_codec()
+
+
+# Global serializer instance
+_serializer: Optional[Serializer] = None
+
+
+def get_serializer() -> Serializer:
+    """Get global serializer instance.
+
+    Returns:
+        Serializer: Serializer configured from CACHE_CODEC / CACHE_COMPRESS_THRESHOLD_BYTES
+    """
+    global _serializer
+    if _serializer is None:
+        settings = get_settings()
+        _serializer = Serializer(
+            codec=create_codec(settings.CACHE_CODEC),
+            compress_threshold=settings.CACHE_COMPRESS_THRESHOLD_BYTES,
+        )
+    return _serializer
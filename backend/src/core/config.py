@@ -6,6 +6,7 @@ loading values from environment variables and .env files.
 
 from functools import lru_cache
 from typing import Literal
+from zoneinfo import ZoneInfo
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -29,6 +30,32 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = Field(default=20, ge=1, le=100)
     DATABASE_MAX_OVERFLOW: int = Field(default=10, ge=0, le=50)
     DATABASE_ECHO: bool = Field(default=False, description="Enable SQL query logging")
+    DATABASE_QUERY_CACHE_SIZE: int = Field(
+        default=1200,
+        ge=0,
+        description="SQLAlchemy compiled statement cache size per engine"
+    )
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = Field(
+        default=500,
+        ge=0,
+        description="asyncpg prepared statement cache size per connection (PostgreSQL only)"
+    )
+    DATABASE_SCHEMA_MODE: Literal["auto", "create_all", "verify"] = Field(
+        default="auto",
+        description=(
+            "Startup schema handling: create_all creates missing tables, verify only checks the "
+            "Alembic revision; auto uses create_all for SQLite/development and verify otherwise"
+        ),
+    )
+    DATABASE_WARMUP_ENABLED: bool = Field(
+        default=True,
+        description="Compile and prepare hot statements on every pooled connection at startup"
+    )
+    FAST_REQUEST_THRESHOLD_MS: int = Field(
+        default=100,
+        ge=1,
+        description="Latency threshold for the time-to-first-fast-request startup metric"
+    )
 
     # ========== Redis Configuration ==========
     REDIS_URL: str = Field(
@@ -40,6 +67,99 @@ class Settings(BaseSettings):
     REDIS_SOCKET_TIMEOUT: int = Field(default=5, ge=1, le=60)
     REDIS_SOCKET_CONNECT_TIMEOUT: int = Field(default=5, ge=1, le=60)
 
+    # ========== In-Process Cache Configuration ==========
+    AUTH_CONTEXT_CACHE_TTL_SECONDS: int = Field(
+        default=60,
+        ge=0,
+        description="TTL of cached authorization contexts for game authorize (0 = disabled)",
+    )
+    AUTH_CONTEXT_CACHE_MAX_SIZE: int = Field(
+        default=10000,
+        ge=0,
+        description="Max cached authorization contexts per worker (0 = disabled)",
+    )
+    SESSION_BLOOM_CAPACITY: int = Field(
+        default=100000,
+        ge=0,
+        description="Session ids remembered per worker per idempotency window (0 = disable fast path)",
+    )
+    SESSION_BLOOM_ERROR_RATE: float = Field(
+        default=0.001,
+        gt=0,
+        lt=1,
+        description="Target false positive rate of the session id Bloom filter",
+    )
+    NONCE_LOCAL_MAX_ENTRIES: int = Field(
+        default=200000,
+        ge=1,
+        description="Request nonces remembered per worker for in-process replay rejection",
+    )
+    NONCE_REQUIRE_REDIS: bool = Field(
+        default=False,
+        description="Reject nonce-signed requests when Redis is unavailable (default: fall back to in-process check)",
+    )
+    MULTI_LEVEL_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Serve hot cache reads from an in-process L1 in front of Redis"
+    )
+    CACHE_NAMESPACE: str = Field(
+        default="mr",
+        description="Key namespace for the multi-level cache (both tiers)"
+    )
+    CACHE_LOCAL_MAX_ENTRIES: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of entries in the in-process (L1) cache per worker"
+    )
+    CACHE_LOCAL_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1024,
+        description="Maximum size of the in-process (L1) cache per worker in bytes"
+    )
+    CACHE_LOCAL_TTL_SECONDS: int = Field(
+        default=30,
+        ge=1,
+        description="Maximum lifetime of an in-process (L1) cache entry"
+    )
+    CACHE_LOCAL_POLICY: Literal["lru", "lfu"] = Field(
+        default="lru",
+        description="Eviction policy of the in-process (L1) cache"
+    )
+    CACHE_STALE_TTL_SECONDS: int = Field(
+        default=60,
+        ge=0,
+        description="How long cache_result keeps serving an expired value while one task refreshes it"
+    )
+    CACHE_XFETCH_BETA: float = Field(
+        default=1.0,
+        ge=0,
+        description="Probabilistic early refresh aggressiveness for cache_result (0 disables early refresh)"
+    )
+    CACHE_RECOMPUTE_LEASE_SECONDS: int = Field(
+        default=10,
+        ge=1,
+        description="Lifetime of the cross-worker Redis lease held while recomputing a cached value"
+    )
+    CACHE_LEASE_WAIT_SECONDS: float = Field(
+        default=5.0,
+        ge=0,
+        description="How long a worker waits for another worker's recompute before computing itself"
+    )
+    CACHE_CODEC: Literal["auto", "msgpack", "json"] = Field(
+        default="auto",
+        description="Codec for cached values (auto: msgpack when installed, otherwise JSON)"
+    )
+    CACHE_COMPRESS_THRESHOLD_BYTES: int = Field(
+        default=1024,
+        ge=0,
+        description="Compress cached values of at least this many bytes (0 disables compression)"
+    )
+    CACHE_SCAN_BATCH_SIZE: int = Field(
+        default=500,
+        ge=1,
+        description="Keys per SCAN/MGET round trip when reading cached values by pattern"
+    )
+
     # ========== Security Configuration ==========
     SECRET_KEY: str = Field(
         default="dev_secret_key_change_in_production",
@@ -57,6 +177,15 @@ class Settings(BaseSettings):
         ge=1,
         description="JWT access token expiration time in minutes",
     )
+    AUTHORIZATION_TOKEN_SIGNING_KEY: str = Field(
+        default="",
+        description="Base64 Ed25519 seed (32 bytes) for game authorization tokens (empty = derive from SECRET_KEY)",
+    )
+    AUTHORIZATION_TOKEN_TTL_SECONDS: int = Field(
+        default=86400,
+        ge=60,
+        description="Lifetime of signed game authorization tokens in seconds",
+    )
     ENCRYPTION_KEY: str = Field(
         default="dev_encryption_key_32_bytes_long",
         min_length=32,
@@ -147,6 +276,51 @@ class Settings(BaseSettings):
         ge=1,
         description="Payment callback timeout in minutes",
     )
+    BALANCE_SHARD_TIERS: str = Field(
+        default="",
+        description="Customer tiers using sharded balances, as tier:shards pairs (e.g. 'vip:8')",
+    )
+    BILLING_GROUP_COMMIT_ENABLED: bool = Field(
+        default=False,
+        description="Batch authorization debits into group-committed transactions",
+    )
+    BILLING_GROUP_COMMIT_WINDOW_MS: float = Field(
+        default=3.0,
+        ge=0,
+        description="Group commit window in milliseconds",
+    )
+    BILLING_GROUP_COMMIT_MAX_BATCH: int = Field(
+        default=32,
+        ge=1,
+        description="Maximum authorization debits per group commit",
+    )
+    USAGE_ROLLUP_ENABLED: bool = Field(
+        default=True,
+        description="Run the background worker that rolls usage records up into hourly/daily tables",
+    )
+    USAGE_ROLLUP_INTERVAL_SECONDS: float = Field(
+        default=60.0,
+        gt=0,
+        description="How often the usage rollup worker checks for closed hours",
+    )
+    USAGE_ROLLUP_GRACE_SECONDS: int = Field(
+        default=120,
+        ge=0,
+        description="An hour is rolled up only this long after it ends (in-flight debits commit first)",
+    )
+    REPORT_TIMEZONE: str = Field(
+        default="UTC",
+        description="Time zone of day/week/month buckets in statistics and finance trends (IANA name)",
+    )
+    FINANCE_COUNTER_RECONCILE_ENABLED: bool = Field(
+        default=True,
+        description="Periodically rebuild today's Redis finance counters from transaction records",
+    )
+    FINANCE_COUNTER_RECONCILE_SECONDS: float = Field(
+        default=300.0,
+        gt=0,
+        description="How often today's finance counters are reconciled with the database",
+    )
 
     @field_validator("CORS_ORIGINS")
     @classmethod
@@ -156,6 +330,16 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",") if origin.strip()]
         return v
 
+    @field_validator("REPORT_TIMEZONE")
+    @classmethod
+    def validate_report_timezone(cls, v: str) -> str:
+        """Reject unknown IANA time zone names at startup."""
+        try:
+            ZoneInfo(v)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Unknown time zone: {v}") from e
+        return v
+
     @field_validator("DEBUG")
     @classmethod
     def parse_debug(cls, v: str | bool) -> bool:
@@ -176,6 +360,13 @@ class Settings(BaseSettings):
         """Check if running in development environment."""
         return self.ENVIRONMENT == "development"
 
+    @property
+    def uses_create_all(self) -> bool:
+        """Check if startup should create tables instead of verifying the Alembic revision."""
+        if self.DATABASE_SCHEMA_MODE == "auto":
+            return self.DATABASE_URL.startswith("sqlite") or self.is_development
+        return self.DATABASE_SCHEMA_MODE == "create_all"
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Get CORS origins as a list."""
@@ -183,6 +374,16 @@ class Settings(BaseSettings):
             return self.CORS_ORIGINS
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
+    @property
+    def balance_shards_by_tier(self) -> dict[str, int]:
+        """Get balance shard count per customer tier (tiers not listed are unsharded)."""
+        shards = {}
+        for pair in self.BALANCE_SHARD_TIERS.split(","):
+            tier, _, count = pair.partition(":")
+            if tier.strip() and count.strip():
+                shards[tier.strip()] = int(count)
+        return shards
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,314 @@
+"""Cross-worker cache invalidation bus over Redis pub/sub.
+
+Per-process caches (e.g. the game-authorize context cache) go stale when an
+admin changes a price or revokes an app on another worker. This module lets
+services publish typed entity-change events; every worker subscribes to a
+shared Redis channel and evicts matching local entries.
+
+Features:
+- Typed entity-change events (operator / site / application / authorization)
+- Publisher applies the event locally first, so the issuing worker is
+  consistent even when Redis is unavailable
+- Subscriber runs on the existing RedisCache connection pool and polls with
+  an explicit read timeout, so an idle channel is not mistaken for a dropped
+  connection (the pool's socket_timeout would otherwise fire while waiting)
+- Events from the local worker are ignored on receipt (already applied)
+- After a dropped subscription, local caches are reset because events may
+  have been missed while disconnected
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Callable, Optional, Union
+from uuid import UUID
+
+import structlog
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from .cache import get_cache
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "mr:cache:invalidate"
+
+
+class EntityType(str, Enum):
+    """Entity kinds whose changes invalidate local caches."""
+
+    OPERATOR = "operator"
+    SITE = "site"
+    APPLICATION = "application"
+    AUTHORIZATION = "authorization"
+    CACHE_KEY = "cache_key"  # multi-level cache L1 entry; entity_id is the key
+    CACHE_TAG = "cache_tag"  # multi-level cache tag; entity_id is the namespaced tag set key
+
+
+class ChangeKind(str, Enum):
+    """What happened to the entity."""
+
+    UPDATED = "updated"
+    DELETED = "deleted"
+    CREDENTIALS_CHANGED = "credentials_changed"
+    DEACTIVATED = "deactivated"
+    LOCKED = "locked"
+    BALANCE_CHANGED = "balance_changed"
+
+
+@dataclass(frozen=True)
+class EntityChangeEvent:
+    """A single entity change, serialized as JSON on the bus.
+
+    Attributes:
+        entity_type: Kind of entity that changed
+        entity_id: Primary key of the changed entity
+        change: What happened to it
+        operator_id: Owning operator (authorization / site events)
+        application_id: Target application (authorization events)
+        origin: Worker id of the publisher
+    """
+
+    entity_type: EntityType
+    entity_id: str
+    change: ChangeKind = ChangeKind.UPDATED
+    operator_id: Optional[str] = None
+    application_id: Optional[str] = None
+    origin: str = ""
+
+    def to_json(self) -> str:
+        """Serialize event for publishing."""
+        payload = asdict(self)
+        payload["entity_type"] = self.entity_type.value
+        payload["change"] = self.change.value
+        return json.dumps(payload)
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]) -> "EntityChangeEvent":
+        """Deserialize event received from the bus."""
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        payload = json.loads(raw)
+        payload["entity_type"] = EntityType(payload["entity_type"])
+        payload["change"] = ChangeKind(payload.get("change", ChangeKind.UPDATED.value))
+        return cls(**payload)
+
+
+EventHandler = Callable[[EntityChangeEvent], None]
+ResetHandler = Callable[[], None]
+
+
+class InvalidationBus:
+    """Publishes entity-change events and dispatches them to local handlers."""
+
+    def __init__(
+        self,
+        channel: str = INVALIDATION_CHANNEL,
+        reconnect_delay: float = 1.0,
+        poll_timeout: float = 1.0
+    ):
+        """Initialize the bus.
+
+        Args:
+            channel: Redis pub/sub channel name
+            reconnect_delay: Seconds to wait before re-subscribing after an error
+            poll_timeout: Seconds to wait for a message per poll; must stay
+                below REDIS_SOCKET_TIMEOUT
+        """
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.poll_timeout = poll_timeout
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: dict[EntityType, list[EventHandler]] = {}
+        self._reset_handlers: list[ResetHandler] = []
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, entity_type: EntityType, handler: EventHandler) -> None:
+        """Register a local handler for one entity type.
+
+        Handlers must be fast and synchronous (they run on the event loop).
+        """
+        self._handlers.setdefault(entity_type, []).append(handler)
+
+    def on_reset(self, handler: ResetHandler) -> None:
+        """Register a handler that drops all local state.
+
+        Called after the subscription was interrupted, since events may have
+        been missed in the meantime.
+        """
+        self._reset_handlers.append(handler)
+
+    def dispatch(self, event: EntityChangeEvent) -> None:
+        """Run local handlers for an event."""
+        for handler in self._handlers.get(event.entity_type, []):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(
+                    "invalidation_handler_failed",
+                    entity_type=event.entity_type.value,
+                    entity_id=event.entity_id,
+                    error=str(e),
+                )
+
+    def reset_local(self) -> None:
+        """Run all reset handlers."""
+        for handler in self._reset_handlers:
+            try:
+                handler()
+            except Exception as e:
+                logger.error("invalidation_reset_failed", error=str(e))
+
+    async def publish(self, event: EntityChangeEvent) -> None:
+        """Apply an event locally and broadcast it to the other workers.
+
+        Publishing never raises: if Redis is down the local worker is still
+        invalidated and the others fall back to their cache TTL.
+        """
+        if not event.origin:
+            event = EntityChangeEvent(**{**asdict(event), "origin": self.worker_id})
+
+        self.dispatch(event)
+
+        try:
+            await get_cache().publish(self.channel, event.to_json())
+        except Exception as e:
+            logger.warning("invalidation_publish_failed", error=str(e))
+
+    def handle_message(self, raw: Union[str, bytes]) -> None:
+        """Handle a raw pub/sub payload from another worker."""
+        try:
+            event = EntityChangeEvent.from_json(raw)
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("invalidation_message_invalid", error=str(e))
+            return
+
+        if event.origin == self.worker_id:
+            return
+
+        self.dispatch(event)
+
+    async def start(self) -> None:
+        """Start the background subscriber task (no-op without Redis)."""
+        if self._listener is not None:
+            return
+        if not get_cache().is_connected:
+            logger.info("invalidation_bus_disabled", reason="redis_unavailable")
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the background subscriber task."""
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self) -> None:
+        """Subscribe and dispatch messages until cancelled, re-subscribing on errors."""
+        interrupted = False
+
+        while True:
+            pubsub = get_cache().pubsub()
+            if pubsub is None:
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            try:
+                await pubsub.subscribe(self.channel)
+                if interrupted:
+                    # Events may have been missed while disconnected
+                    self.reset_local()
+                    interrupted = False
+                logger.info("invalidation_bus_subscribed", channel=self.channel)
+
+                while True:
+                    # An explicit timeout returns None on an idle channel
+                    # instead of raising the pool's socket timeout
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=self.poll_timeout
+                    )
+                    if message is not None and message.get("type") == "message":
+                        self.handle_message(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+                # The connection dropped: events may have been missed
+                interrupted = True
+                logger.warning("invalidation_bus_interrupted", error=str(e))
+                await asyncio.sleep(self.reconnect_delay)
+            except Exception as e:
+                logger.error("invalidation_bus_listener_failed", error=str(e))
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# Global bus instance (per worker process)
+_bus: Optional[InvalidationBus] = None
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get global invalidation bus instance.
+
+    Returns:
+        InvalidationBus: Global bus instance
+    """
+    global _bus
+    if _bus is None:
+        _bus = InvalidationBus()
+    return _bus
+
+
+async def publish_entity_change(
+    entity_type: EntityType,
+    entity_id: Union[UUID, str],
+    change: ChangeKind = ChangeKind.UPDATED,
+    operator_id: Optional[Union[UUID, str]] = None,
+    application_id: Optional[Union[UUID, str]] = None,
+) -> None:
+    """Publish an entity-change event on the global bus.
+
+    Call this after the change has been committed.
+
+    Example:
+        await self.db.commit()
+        await publish_entity_change(EntityType.APPLICATION, app.id)
+    """
+    await get_invalidation_bus().publish(
+        EntityChangeEvent(
+            entity_type=entity_type,
+            entity_id=str(entity_id),
+            change=change,
+            operator_id=str(operator_id) if operator_id else None,
+            application_id=str(application_id) if application_id else None,
+        )
+    )
+
+
+async def init_invalidation_bus() -> None:
+    """Start the invalidation bus subscriber.
+
+    Call this during application startup, after init_cache().
+    """
+    await get_invalidation_bus().start()
+
+
+async def close_invalidation_bus() -> None:
+    """Stop the invalidation bus subscriber.
+
+    Call this during application shutdown, before close_cache().
+    """
+    await get_invalidation_bus().stop()
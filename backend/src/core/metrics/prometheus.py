@@ -111,6 +111,69 @@ http_request_duration_seconds = Histogram(
 )
 
 
+# ========== 额外指标：启动预热 ==========
+startup_warmup_duration_seconds = Gauge(
+    name="mr_startup_warmup_duration_seconds",
+    documentation="Time spent warming up database statements at startup",
+    registry=registry
+)
+
+time_to_first_fast_request_seconds = Gauge(
+    name="mr_time_to_first_fast_request_seconds",
+    documentation="Time from worker boot to the first API request served under the fast threshold",
+    registry=registry
+)
+
+# ========== 额外指标：多级缓存 ==========
+cache_requests_total = Counter(
+    name="mr_cache_requests_total",
+    documentation="Multi-level cache reads by tier (l1 in-process, l2 Redis) and result",
+    labelnames=["tier", "result"],  # tier: l1/l2, result: hit/miss
+    registry=registry
+)
+
+cache_local_evictions_total = Counter(
+    name="mr_cache_local_evictions_total",
+    documentation="Entries evicted from the in-process (L1) cache to stay within its limits",
+    registry=registry
+)
+
+cache_local_bytes = Gauge(
+    name="mr_cache_local_bytes",
+    documentation="Accounted size of the in-process (L1) cache in bytes",
+    registry=registry
+)
+
+cache_local_entries = Gauge(
+    name="mr_cache_local_entries",
+    documentation="Number of entries in the in-process (L1) cache",
+    registry=registry
+)
+
+cache_recomputes_total = Counter(
+    name="mr_cache_recomputes_total",
+    documentation="cache_result recomputations by trigger",
+    labelnames=["trigger"],  # miss/early/stale/lease_timeout
+    registry=registry
+)
+
+cache_tag_invalidated_keys_total = Counter(
+    name="mr_cache_tag_invalidated_keys_total",
+    documentation="Redis cache keys deleted by tag invalidation",
+    registry=registry
+)
+
+cache_coalesced_total = Counter(
+    name="mr_cache_coalesced_total",
+    documentation="cache_result calls that reused another request's recompute instead of running their own",
+    labelnames=["scope"],  # worker: in-process single-flight, cluster: waited on another worker's lease
+    registry=registry
+)
+
+# 进程启动时间（lifespan开始时标记）
+_boot_started_at = time.perf_counter()
+
+
 class PrometheusMiddleware:
     """
     Prometheus监控中间件
@@ -183,6 +246,45 @@ class PrometheusMiddleware:
             raise
 
 
+class FirstFastRequestMiddleware:
+    """
+    首个快速请求中间件（纯ASGI）
+
+    记录worker从启动到第一个耗时低于阈值的API请求完成所用的时间，
+    用于衡量冷启动对首批请求的影响。记录一次后直接透传。
+    """
+
+    def __init__(self, app, threshold_seconds: float = 0.1, path_prefix: str = "/api/"):
+        """
+        Args:
+            app: 下游ASGI应用
+            threshold_seconds: 快速请求阈值（秒）
+            path_prefix: 只统计该前缀下的请求
+        """
+        self.app = app
+        self.threshold_seconds = threshold_seconds
+        self.path_prefix = path_prefix
+        self.recorded = False
+
+    async def __call__(self, scope, receive, send):
+        if self.recorded or scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        await self.app(scope, receive, send)
+        finished_at = time.perf_counter()
+
+        if not self.recorded and finished_at - start_time < self.threshold_seconds:
+            self.recorded = True
+            time_to_first_fast_request_seconds.set(finished_at - _boot_started_at)
+            logger.info(
+                "first_fast_request",
+                path=scope["path"],
+                since_boot_ms=round((finished_at - _boot_started_at) * 1000, 1)
+            )
+
+
 async def metrics_endpoint(request: Request):
     """
     /metrics端点：暴露Prometheus指标
@@ -322,3 +424,19 @@ def record_rate_limit_block(limit_type: str, identifier: str):
         limit_type=limit_type,
         identifier=identifier
     ).inc()
+
+
+def mark_boot_started():
+    """标记worker启动时间（首个快速请求指标的起点）"""
+    global _boot_started_at
+    _boot_started_at = time.perf_counter()
+
+
+def record_startup_warmup(duration_seconds: float):
+    """
+    记录启动预热耗时
+
+    Args:
+        duration_seconds: 预热耗时（秒）
+    """
+    startup_warmup_duration_seconds.set(duration_seconds)
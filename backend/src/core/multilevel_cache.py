@@ -0,0 +1,775 @@
+"""Multi-level cache: in-process L1 in front of Redis L2.
+
+Hot reads (admin lookups, cached query results) are served from a bounded
+in-process cache without a network hop. Misses fall through to Redis and
+populate L1 on the way back.
+
+Features:
+- L1 bounded by entry count and by bytes, with LRU or LFU eviction
+- L1 holds the encoded payload (core.codec): sizes are exact, and callers
+  that mutate returned objects cannot corrupt the cached entry
+- L1 lifetime capped at CACHE_LOCAL_TTL_SECONDS: an entry filled from
+  Redis may outlive its Redis copy by at most that long, and anything
+  changed without an explicit delete still expires quickly
+- Namespaced keys ("{namespace}:{key}") in both tiers
+- Deletes are broadcast on the invalidation bus so every worker drops L1
+- Tag-based invalidation: entries stored under tags (e.g. "operator:{id}")
+  are dropped with a Redis set lookup plus a pipelined DEL instead of a
+  keyspace SCAN, and from every worker's L1 via its tag index
+- Hit/miss/eviction counters and L1 size exported to Prometheus
+- get_or_compute: stampede-protected recomputation (per-worker single
+  flight, cross-worker Redis lease, XFetch early refresh and
+  stale-while-revalidate)
+
+With MULTI_LEVEL_CACHE_ENABLED=false the L1 tier is skipped and every call
+goes straight to Redis.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import structlog
+
+from .cache import RedisCache, get_cache
+from .codec import CodecError, Serializer, get_serializer
+from .config import get_settings
+from .invalidation_bus import (
+    ChangeKind,
+    EntityChangeEvent,
+    EntityType,
+    InvalidationBus,
+    get_invalidation_bus,
+)
+from .metrics import prometheus
+
+logger = structlog.get_logger(__name__)
+
+# Approximate per-entry bookkeeping cost (dict slots, entry object) added to key + payload size
+ENTRY_OVERHEAD_BYTES = 96
+
+# Interval at which a worker polls Redis while another worker holds the recompute lease
+LEASE_POLL_INTERVAL_SECONDS = 0.05
+
+# How long tag invalidation times are remembered to discard results of recomputes
+# that started before the invalidation; trimmed once more tags than this are tracked
+INVALIDATION_MEMORY_SECONDS = 300
+INVALIDATION_MEMORY_MAX_TAGS = 1024
+
+# Field marking a tagged Redis payload: {"__tags__": [...], "value": ...}
+_TAGS_FIELD = "__tags__"
+
+
+class EvictionPolicy(str, Enum):
+    """L1 eviction policy."""
+
+    LRU = "lru"
+    LFU = "lfu"
+
+
+@dataclass
+class CacheStats:
+    """Per-tier hit/miss counters."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of reads served from either tier."""
+        total = self.l1_hits + self.l2_hits + self.misses
+        return (self.l1_hits + self.l2_hits) / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class _Entry:
+    __slots__ = ("payload", "expires_at", "size", "frequency", "tags")
+
+    def __init__(self, payload: bytes, expires_at: float, size: int, tags: tuple[str, ...]):
+        self.payload = payload
+        self.expires_at = expires_at
+        self.size = size
+        self.frequency = 1
+        self.tags = tags
+
+
+class LocalCache:
+    """Bounded in-process cache of encoded values (L1). Thread-safe.
+
+    LRU keeps entries in access order. LFU keeps one insertion-ordered bucket
+    per access frequency and evicts from the lowest bucket (ties broken by
+    age), so both policies evict in O(1). Tagged entries are indexed by tag
+    so delete_tag only touches the entries carrying that tag.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        policy: EvictionPolicy = EvictionPolicy.LRU,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size (key + payload + overhead)
+            policy: Eviction policy
+            clock: Monotonic time source (injected in tests)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = EvictionPolicy(policy)
+        self._clock = clock or time.monotonic
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._buckets: dict[int, "OrderedDict[str, None]"] = {}
+        self._tag_index: dict[str, set[str]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Current accounted size in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _touch(self, key: str, entry: _Entry) -> None:
+        """Record an access (caller holds the lock)."""
+        if self.policy == EvictionPolicy.LRU:
+            self._entries.move_to_end(key)
+            return
+
+        bucket = self._buckets[entry.frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry.frequency]
+        entry.frequency += 1
+        self._buckets.setdefault(entry.frequency, OrderedDict())[key] = None
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        """Drop one entry and its accounting (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._size -= entry.size
+        if self.policy == EvictionPolicy.LFU:
+            bucket = self._buckets[entry.frequency]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[entry.frequency]
+        for tag in entry.tags:
+            keys = self._tag_index[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tag_index[tag]
+        return entry
+
+    def _evict_one(self) -> None:
+        """Evict the least recently / least frequently used entry (caller holds the lock)."""
+        if self.policy == EvictionPolicy.LRU:
+            victim = next(iter(self._entries))
+        else:
+            victim = next(iter(self._buckets[min(self._buckets)]))
+        self._remove(victim)
+        self.evictions += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a payload, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._touch(key, entry)
+            return entry.payload
+
+    def set(self, key: str, payload: bytes, ttl: float, tags: tuple[str, ...] = ()) -> bool:
+        """Store a payload for ttl seconds, optionally under tags.
+
+        Returns:
+            bool: False if the payload alone exceeds max_bytes (not stored)
+        """
+        size = len(key) + len(payload) + ENTRY_OVERHEAD_BYTES
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return False
+
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self._size + size > self.max_bytes
+            ):
+                self._evict_one()
+
+            self._entries[key] = _Entry(payload, self._clock() + ttl, size, tags)
+            self._size += size
+            if self.policy == EvictionPolicy.LFU:
+                self._buckets.setdefault(1, OrderedDict())[key] = None
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            return True
+
+    def delete(self, key: str) -> bool:
+        """Remove one key."""
+        with self._lock:
+            return self._remove(key) is not None
+
+    def delete_tag(self, tag: str) -> int:
+        """Remove all entries stored under tag."""
+        with self._lock:
+            keys = list(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._tag_index.clear()
+            self._size = 0
+
+
+class MultiLevelCache:
+    """L1 (in-process) + L2 (Redis) cache with namespaced keys."""
+
+    def __init__(
+        self,
+        namespace: str = "mr",
+        local: Optional[LocalCache] = None,
+        local_ttl: int = 30,
+        redis_cache: Optional[RedisCache] = None,
+        serializer: Optional[Serializer] = None,
+        stale_ttl: int = 0,
+        beta: float = 1.0,
+        lease_ttl: int = 10,
+        lease_wait: float = 5.0,
+        wall_clock: Optional[Callable[[], float]] = None,
+    ):
+        """
+        Args:
+            namespace: Key prefix shared by both tiers
+            local: L1 cache (None disables L1)
+            local_ttl: Maximum L1 lifetime in seconds
+            redis_cache: L2 cache (default: global RedisCache)
+            serializer: Payload codec shared by both tiers (default: global Serializer)
+            stale_ttl: Default stale-while-revalidate window for get_or_compute
+            beta: XFetch early refresh factor (0 disables early refresh)
+            lease_ttl: Lifetime of the cross-worker recompute lease in seconds
+            lease_wait: Maximum wait for another worker's recompute in seconds
+            wall_clock: Epoch time source shared across workers (injected in tests)
+        """
+        self.namespace = namespace
+        self.local = local
+        self.local_ttl = local_ttl
+        self._redis = redis_cache
+        self.serializer = serializer or get_serializer()
+        self.stats = CacheStats()
+        self.stale_ttl = stale_ttl
+        self.beta = beta
+        self.lease_ttl = lease_ttl
+        self.lease_wait = lease_wait
+        self._wall_clock = wall_clock or time.time
+        self._random = random.random
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._tag_invalidated_at: dict[str, float] = {}
+
+        self._l1_hit = prometheus.cache_requests_total.labels(tier="l1", result="hit")
+        self._l1_miss = prometheus.cache_requests_total.labels(tier="l1", result="miss")
+        self._l2_hit = prometheus.cache_requests_total.labels(tier="l2", result="hit")
+        self._l2_miss = prometheus.cache_requests_total.labels(tier="l2", result="miss")
+
+    @property
+    def redis(self) -> RedisCache:
+        return self._redis or get_cache()
+
+    def make_key(self, key: str) -> str:
+        """Namespace a key."""
+        return f"{self.namespace}:{key}" if self.namespace else key
+
+    def tag_key(self, tag: str) -> str:
+        """Redis set holding the keys stored under tag."""
+        return self.make_key(f"tag:{tag}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value, trying L1 then Redis.
+
+        Args:
+            key: Cache key (without namespace)
+
+        Returns:
+            Deserialized value or None if not cached in either tier
+        """
+        full_key = self.make_key(key)
+
+        if self.local is not None:
+            payload = self.local.get(full_key)
+            if payload is not None:
+                self.stats.l1_hits += 1
+                self._l1_hit.inc()
+                return _unwrap(self.serializer.loads(payload))[0]
+            self._l1_miss.inc()
+
+        payload = await self.redis.get_raw(full_key)
+        if payload is None:
+            self.stats.misses += 1
+            self._l2_miss.inc()
+            return None
+
+        try:
+            value, tags = _unwrap(self.serializer.loads(payload))
+        except CodecError as e:
+            logger.warning("multi_cache_invalid_payload", key=full_key, error=str(e))
+            self.stats.misses += 1
+            self._l2_miss.inc()
+            return None
+
+        self.stats.l2_hits += 1
+        self._l2_hit.inc()
+        if self.local is not None:
+            self._fill_local(full_key, payload, None, tags)
+        return value
+
+    def _fill_local(
+        self,
+        full_key: str,
+        payload: bytes,
+        ttl: Optional[int],
+        tag_keys: tuple[str, ...] = (),
+    ) -> None:
+        """Store in L1 for min(ttl, local_ttl) seconds (ttl None means no expiry in L2)."""
+        local_ttl = self.local_ttl if ttl is None else min(ttl, self.local_ttl)
+        if local_ttl > 0:
+            evictions = self.local.evictions
+            self.local.set(full_key, payload, local_ttl, tag_keys)
+            if self.local.evictions != evictions:
+                prometheus.cache_local_evictions_total.inc(self.local.evictions - evictions)
+                self.stats.evictions = self.local.evictions
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Store a value in both tiers.
+
+        Args:
+            key: Cache key (without namespace)
+            value: Value supported by the codec (JSON types plus Decimal/UUID/datetime/date)
+            ttl: Lifetime in seconds (None = no expiration in Redis)
+            tags: Tags to invalidate the entry by (see invalidate_tags)
+
+        Returns:
+            bool: True if stored in Redis (L1 alone is not reported as success)
+        """
+        full_key = self.make_key(key)
+        tag_keys = tuple(self.tag_key(tag) for tag in tags or ())
+        if tag_keys:
+            # Tags travel with the payload so workers filling L1 from Redis can index them
+            value = {_TAGS_FIELD: list(tag_keys), "value": value}
+        payload = self.serializer.dumps(value)
+        if self.local is not None:
+            self._fill_local(full_key, payload, ttl, tag_keys)
+        if tag_keys:
+            return await self.redis.set_raw(full_key, payload, ttl=ttl, tags=tag_keys)
+        return await self.redis.set_raw(full_key, payload, ttl=ttl)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key from both tiers and from every worker's L1.
+
+        Args:
+            key: Cache key (without namespace)
+
+        Returns:
+            bool: True if the key existed in Redis
+        """
+        full_key = self.make_key(key)
+        if self.local is not None:
+            self.local.delete(full_key)
+            await self._broadcast(full_key)
+        return await self.redis.delete(full_key)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry stored under any of the tags, in both tiers and on every worker.
+
+        This is how groups of entries are invalidated: cost is proportional
+        to the number of tagged entries, not to the size of the keyspace.
+
+        Args:
+            tags: Tags (without namespace), e.g. "operator:{id}"
+
+        Returns:
+            int: Number of Redis keys deleted
+        """
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        for tag_key in tag_keys:
+            self._drop_local_tag(tag_key)
+            await get_invalidation_bus().publish(
+                EntityChangeEvent(entity_type=EntityType.CACHE_TAG, entity_id=tag_key, change=ChangeKind.DELETED)
+            )
+        deleted = await self.redis.invalidate_tags(tag_keys)
+        prometheus.cache_tag_invalidated_keys_total.inc(deleted)
+        return deleted
+
+    def _drop_local_tag(self, tag_key: str) -> None:
+        """Drop L1 entries under a tag and remember when, for in-flight recomputes."""
+        now = time.monotonic()
+        if len(self._tag_invalidated_at) >= INVALIDATION_MEMORY_MAX_TAGS:
+            cutoff = now - INVALIDATION_MEMORY_SECONDS
+            self._tag_invalidated_at = {
+                tag: at for tag, at in self._tag_invalidated_at.items() if at >= cutoff
+            }
+        self._tag_invalidated_at[tag_key] = now
+        if self.local is not None:
+            self.local.delete_tag(tag_key)
+
+    def _invalidated_since(self, tags: Optional[Iterable[str]], started: float) -> bool:
+        """Whether any of the tags was invalidated after started (monotonic)."""
+        return any(
+            self._tag_invalidated_at.get(self.tag_key(tag), float("-inf")) >= started
+            for tag in tags or ()
+        )
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Get a cached value, recomputing it without a stampede.
+
+        The value is stored with its logical expiry and the time the last
+        computation took. Redis keeps it for ttl + stale_ttl seconds.
+
+        - Miss: concurrent callers in this worker share one compute call
+          (single flight). Across workers, only the holder of a short Redis
+          lease computes; the others poll Redis for its result and compute
+          themselves only if it does not appear within lease_wait.
+        - Fresh: returned as is. With probability growing as expiry nears
+          and scaled by the compute time (XFetch), one background refresh
+          starts early so hot keys never actually expire.
+        - Expired but within stale_ttl: the old value is returned and one
+          background refresh runs (stale-while-revalidate).
+
+        None results are not cached, and neither are results of a compute
+        that was running when one of its tags was invalidated.
+
+        Args:
+            key: Cache key (without namespace)
+            compute: Coroutine function producing the value
+            ttl: Freshness lifetime in seconds
+            stale_ttl: Stale-while-revalidate window (default: self.stale_ttl)
+            tags: Tags to invalidate the entry by (see invalidate_tags)
+
+        Returns:
+            Cached or freshly computed value
+        """
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        tags = tuple(tags or ())
+        cached = await self.get(key)
+        if _is_envelope(cached):
+            now = self._wall_clock()
+            expires_at = cached["expires_at"]
+            if now < expires_at:
+                if self._should_refresh_early(now, expires_at, cached["delta"]):
+                    self._refresh_in_background(key, compute, ttl, stale_ttl, tags, "early")
+                return cached["value"]
+            if now < expires_at + stale_ttl:
+                self._refresh_in_background(key, compute, ttl, stale_ttl, tags, "stale")
+                return cached["value"]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start(key, self._recompute(key, compute, ttl, stale_ttl, tags, "miss", wait=True))
+        else:
+            prometheus.cache_coalesced_total.labels(scope="worker").inc()
+        # Shielded: a cancelled caller must not cancel the computation other callers wait on
+        return await asyncio.shield(task)
+
+    def _should_refresh_early(self, now: float, expires_at: float, delta: float) -> bool:
+        """XFetch: refresh when now - delta * beta * ln(rand) >= expiry."""
+        if self.beta <= 0 or delta <= 0:
+            return False
+        return now - delta * self.beta * math.log(1.0 - self._random()) >= expires_at
+
+    def _start(self, key: str, coro: Awaitable[Any]) -> asyncio.Task:
+        """Run a recompute as the single in-flight task for key in this worker."""
+        task = asyncio.ensure_future(coro)
+        self._inflight[key] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+
+        task.add_done_callback(_done)
+        return task
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: Optional[Iterable[str]],
+        trigger: str,
+    ) -> None:
+        """Start a background refresh unless one is already running in this worker."""
+        if key in self._inflight:
+            return
+        self._start(key, self._refresh_quietly(key, compute, ttl, stale_ttl, tags, trigger))
+
+    async def _refresh_quietly(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: Optional[Iterable[str]],
+        trigger: str,
+    ) -> Any:
+        """Background refresh: errors are logged, the cached value stays in place."""
+        try:
+            return await self._recompute(key, compute, ttl, stale_ttl, tags, trigger, wait=False)
+        except Exception as e:
+            logger.warning("multi_cache_refresh_failed", key=key, trigger=trigger, error=str(e))
+            return None
+
+    async def _recompute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: Optional[Iterable[str]],
+        trigger: str,
+        wait: bool,
+    ) -> Any:
+        """Compute and store a value under the cross-worker lease.
+
+        Args:
+            wait: When another worker holds the lease, wait for its result
+                (True, caller has no value) or give up (False, a stale
+                value is still being served)
+        """
+        lease_key = self.make_key(f"lease:{key}")
+        token = uuid.uuid4().hex
+        # None means Redis is unavailable: compute without a lease
+        acquired = await self.redis.set_if_absent(lease_key, token, ttl=self.lease_ttl)
+        if acquired is False:
+            if not wait:
+                return None
+            cached = await self._wait_for_peer(key)
+            if cached is not None:
+                prometheus.cache_coalesced_total.labels(scope="cluster").inc()
+                return cached["value"]
+            trigger = "lease_timeout"
+
+        try:
+            prometheus.cache_recomputes_total.labels(trigger=trigger).inc()
+            started = time.monotonic()
+            value = await compute()
+            delta = time.monotonic() - started
+            if value is not None and not self._invalidated_since(tags, started):
+                envelope = {"value": value, "delta": delta, "expires_at": self._wall_clock() + ttl}
+                await self.set(key, envelope, ttl=ttl + stale_ttl, tags=tags)
+            return value
+        finally:
+            if acquired:
+                await self.redis.delete_if_equals(lease_key, token)
+
+    async def _wait_for_peer(self, key: str) -> Optional[dict]:
+        """Poll Redis until another worker stores a fresh value, or lease_wait elapses."""
+        full_key = self.make_key(key)
+        deadline = time.monotonic() + self.lease_wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LEASE_POLL_INTERVAL_SECONDS)
+            payload = await self.redis.get_raw(full_key)
+            if payload is None:
+                continue
+            try:
+                cached, tag_keys = _unwrap(self.serializer.loads(payload))
+            except CodecError:
+                continue
+            if _is_envelope(cached) and cached["expires_at"] > self._wall_clock():
+                if self.local is not None:
+                    self._fill_local(full_key, payload, None, tag_keys)
+                return cached
+        return None
+
+    async def _broadcast(self, full_key: str) -> None:
+        """Tell the other workers to drop a key from L1."""
+        await get_invalidation_bus().publish(
+            EntityChangeEvent(entity_type=EntityType.CACHE_KEY, entity_id=full_key, change=ChangeKind.DELETED)
+        )
+
+    def handle_event(self, event: EntityChangeEvent) -> None:
+        """Drop an L1 key (or tag) deleted on another worker."""
+        if event.entity_type == EntityType.CACHE_TAG:
+            self._drop_local_tag(event.entity_id)
+            return
+        if self.local is None or event.entity_type != EntityType.CACHE_KEY:
+            return
+        self.local.delete(event.entity_id)
+
+    def register(self, bus: InvalidationBus) -> None:
+        """Subscribe to the invalidation bus."""
+        bus.subscribe(EntityType.CACHE_KEY, self.handle_event)
+        bus.subscribe(EntityType.CACHE_TAG, self.handle_event)
+        if self.local is not None:
+            bus.on_reset(self.local.clear)
+
+    def clear_local(self) -> None:
+        """Drop all L1 entries on this worker."""
+        if self.local is not None:
+            self.local.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit rates per tier and L1 size, in the shape the performance reports read."""
+        l1_reads = self.stats.l1_hits + self.stats.l2_hits + self.stats.misses
+        l2_reads = self.stats.l2_hits + self.stats.misses
+        size_info: dict[str, Any] = {"enabled": self.local is not None}
+        if self.local is not None:
+            size_info.update({
+                "entries": len(self.local),
+                "bytes": self.local.size_bytes,
+                "max_entries": self.local.max_entries,
+                "max_bytes": self.local.max_bytes,
+                "utilization_rate": max(
+                    len(self.local) / self.local.max_entries,
+                    self.local.size_bytes / self.local.max_bytes,
+                ),
+            })
+        return {
+            "global": self.stats.to_dict(),
+            "local_cache": {
+                "stats": {
+                    "hits": self.stats.l1_hits,
+                    "misses": l1_reads - self.stats.l1_hits,
+                    "hit_rate": self.stats.l1_hits / l1_reads if l1_reads else 0.0,
+                    "evictions": self.stats.evictions,
+                },
+                "size_info": size_info,
+            },
+            "redis_cache": {
+                "stats": {
+                    "hits": self.stats.l2_hits,
+                    "misses": self.stats.misses,
+                    "hit_rate": self.stats.l2_hits / l2_reads if l2_reads else 0.0,
+                },
+            },
+        }
+
+
+def _unwrap(decoded: Any) -> tuple[Any, tuple[str, ...]]:
+    """Split a decoded Redis payload into (value, tag keys)."""
+    if isinstance(decoded, dict) and decoded.keys() == {_TAGS_FIELD, "value"}:
+        return decoded["value"], tuple(decoded[_TAGS_FIELD])
+    return decoded, ()
+
+
+def _is_envelope(cached: Any) -> bool:
+    """Whether a cached value was stored by get_or_compute."""
+    return isinstance(cached, dict) and cached.keys() == {"value", "delta", "expires_at"}
+
+
+# Global multi-level cache (per worker process)
+_multi_cache: Optional[MultiLevelCache] = None
+
+
+def get_multi_cache() -> MultiLevelCache:
+    """Get global multi-level cache instance.
+
+    Returns:
+        MultiLevelCache: Global cache (L1 disabled when MULTI_LEVEL_CACHE_ENABLED is false)
+    """
+    global _multi_cache
+    if _multi_cache is None:
+        settings = get_settings()
+        local = None
+        if settings.MULTI_LEVEL_CACHE_ENABLED:
+            local = LocalCache(
+                max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+                max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+                policy=EvictionPolicy(settings.CACHE_LOCAL_POLICY),
+            )
+            prometheus.cache_local_bytes.set_function(lambda: local.size_bytes)
+            prometheus.cache_local_entries.set_function(lambda: len(local))
+
+        _multi_cache = MultiLevelCache(
+            namespace=settings.CACHE_NAMESPACE,
+            local=local,
+            local_ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+            stale_ttl=settings.CACHE_STALE_TTL_SECONDS,
+            beta=settings.CACHE_XFETCH_BETA,
+            lease_ttl=settings.CACHE_RECOMPUTE_LEASE_SECONDS,
+            lease_wait=settings.CACHE_LEASE_WAIT_SECONDS,
+        )
+        _multi_cache.register(get_invalidation_bus())
+    return _multi_cache
+
+
+class CacheWarmer:
+    """Runs named loaders and stores their results under "warm:{name}"."""
+
+    def __init__(self, cache: MultiLevelCache, ttl: int = 3600):
+        self.cache = cache
+        self.ttl = ttl
+
+    async def warm_cache(
+        self,
+        warmers: dict[str, Callable[[], Awaitable[Any]]],
+        max_concurrent: int = 10,
+    ) -> None:
+        """Run the loaders (at most max_concurrent at a time); failures are logged and skipped."""
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def warm_one(name: str, loader: Callable[[], Awaitable[Any]]) -> None:
+            async with semaphore:
+                try:
+                    result = await loader()
+                except Exception as e:
+                    logger.error("cache_warmer_failed", name=name, error=str(e))
+                    return
+                if result is None:
+                    logger.warning("cache_warmer_no_result", name=name)
+                    return
+                await self.cache.set(f"warm:{name}", result, ttl=self.ttl)
+
+        await asyncio.gather(*(warm_one(name, loader) for name, loader in warmers.items()))
+        logger.info("cache_warming_completed", warmers=len(warmers))
+
+
+_cache_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get the global cache warmer (stores into the global multi-level cache)."""
+    global _cache_warmer
+    if _cache_warmer is None:
+        _cache_warmer = CacheWarmer(get_multi_cache())
+    return _cache_warmer
@@ -58,7 +58,7 @@ def get_performance_status() -> dict:
         性能优化系统状态信息
     """
     try:
-        from ..cache.enhanced_cache import get_multi_cache
+        from ..multilevel_cache import get_multi_cache
         from ..database.optimized_pool import get_db_pool
         from ..batch.optimizer import get_batch_manager
 
@@ -17,7 +17,7 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from ..cache.enhanced_cache import get_multi_cache, smart_cache
+from ..multilevel_cache import get_multi_cache
 from ..metrics.enhanced_metrics import record_api_operation
 
 logger = structlog.get_logger(__name__)
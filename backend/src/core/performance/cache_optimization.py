@@ -4,16 +4,13 @@
 提供缓存预热、缓存失效、缓存策略优化等功能
 """
 import asyncio
+import fnmatch
 import time
 import structlog
 from typing import Any, Dict, List, Optional, Callable, TypeVar
 from datetime import datetime, timedelta
 
-from ..cache.enhanced_cache import (
-    get_multi_cache,
-    get_cache_warmer,
-    CacheLevel
-)
+from ..multilevel_cache import get_cache_warmer, get_multi_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -41,7 +38,7 @@ class CacheOptimizer:
         logger.info("warming_strategy_registered", name=name, warmers_count=len(warmers))
 
     def register_invalidation_rule(self, pattern: str, handler: Callable):
-        """注册缓存失效规则"""
+        """注册缓存失效规则(pattern 匹配被失效的标签, 如 "operator:*")"""
         self._invalidation_rules[pattern] = handler
         logger.info("invalidation_rule_registered", pattern=pattern)
 
@@ -65,26 +62,27 @@ class CacheOptimizer:
         await self.cache_warmer.warm_cache(all_warmers, max_concurrent)
         logger.info("all_cache_warming_completed", total_warmers=len(all_warmers))
 
-    async def invalidate_by_pattern(self, pattern: str):
-        """按模式失效缓存"""
+    async def invalidate_by_tag(self, tag: str):
+        """按标签失效缓存(不扫描键空间)"""
         try:
-            await self.cache.invalidate_pattern(pattern)
+            await self.cache.invalidate_tags(tag)
 
-            # 执行注册的失效规则
-            if pattern in self._invalidation_rules:
-                await self._invalidation_rules[pattern]()
+            # 执行匹配的失效规则
+            for pattern, handler in self._invalidation_rules.items():
+                if fnmatch.fnmatch(tag, pattern):
+                    await handler(tag)
 
             self._performance_stats['invalidations'] += 1
-            logger.info("cache_invalidated_by_pattern", pattern=pattern)
+            logger.info("cache_invalidated_by_tag", tag=tag)
 
         except Exception as e:
-            logger.error("cache_invalidation_error", pattern=pattern, error=str(e))
+            logger.error("cache_invalidation_error", tag=tag, error=str(e))
 
-    async def invalidate_by_keys(self, keys: List[str], use_redis: bool = True):
+    async def invalidate_by_keys(self, keys: List[str]):
         """按键失效缓存"""
         success_count = 0
         for key in keys:
-            if await self.cache.delete(key, use_redis=use_redis):
+            if await self.cache.delete(key):
                 success_count += 1
 
         self._performance_stats['invalidations'] += success_count
@@ -238,11 +236,11 @@ async def init_cache_optimization(config: dict) -> CacheOptimizer:
         optimizer.register_warming_strategy('statistics', PredefinedWarmingStrategies.get_statistics_warmers())
 
         # 注册失效规则
-        def operator_invalidation(pattern: str):
+        async def operator_invalidation(tag: str):
             # 运营商数据失效规则
             pass
 
-        def game_session_invalidation(pattern: str):
+        async def game_session_invalidation(tag: str):
             # 游戏会话数据失效规则
             pass
 
@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from ..database.optimized_pool import get_db_pool
-from ..cache.enhanced_cache import get_multi_cache
+from ..multilevel_cache import get_multi_cache
 
 logger = structlog.get_logger(__name__)
 
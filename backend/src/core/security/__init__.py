@@ -1,6 +1,10 @@
-"""Security module containing authentication and authorization utilities."""
+"""Security module containing authentication and authorization utilities.
 
-from typing import Optional
+The encryption service (AES-GCM, PBKDF2) is only used by a few admin flows
+and is imported on first access.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
 
 from .jwt import (
     create_access_token,
@@ -11,13 +15,29 @@ from .jwt import (
     refresh_token,
     verify_token,
 )
-from .encryption import EncryptionService, EncryptionError
+from .authorization_token import (
+    AuthorizationTokenError,
+    create_authorization_token,
+    get_public_jwks,
+    verify_authorization_token,
+)
+
+if TYPE_CHECKING:
+    from .encryption import EncryptionError, EncryptionService
 
 # Global encryption service instance
-_encryption_service: Optional[EncryptionService] = None
+_encryption_service: Optional["EncryptionService"] = None
+
+
+def __getattr__(name: str) -> Any:
+    """Import the encryption classes on first access."""
+    if name in ("EncryptionService", "EncryptionError"):
+        from . import encryption
+        return getattr(encryption, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def get_encryption_service() -> EncryptionService:
+def get_encryption_service() -> "EncryptionService":
     """Get global encryption service instance.
 
     Returns:
@@ -27,6 +47,7 @@ def get_encryption_service() -> EncryptionService:
 
     if _encryption_service is None:
         from ..config import get_settings
+        from .encryption import EncryptionService
         settings = get_settings()
         _encryption_service = EncryptionService(
             master_key=settings.ENCRYPTION_KEY,
@@ -47,4 +68,8 @@ __all__ = [
     "EncryptionService",
     "EncryptionError",
     "get_encryption_service",
+    "AuthorizationTokenError",
+    "create_authorization_token",
+    "verify_authorization_token",
+    "get_public_jwks",
 ]
@@ -0,0 +1,199 @@
+"""Signed game authorization tokens.
+
+Authorization tokens returned by game authorize are self-describing
+EdDSA (Ed25519) signed JWS compact tokens, so headset servers and SDKs can
+check them offline with the published public key instead of looking up
+usage_records.
+
+Token layout (standard JWS compact serialization):
+
+    base64url(header) . base64url(payload) . base64url(signature)
+
+    header:  {"alg": "EdDSA", "typ": "MRAUTH", "kid": "<key id>"}
+    payload: {"sid": session_id, "op": operator_id, "site": site_id,
+              "app": application_id, "pc": player_count,
+              "iat": issued_at, "exp": expires_at}
+
+The signing key is AUTHORIZATION_TOKEN_SIGNING_KEY (base64 encoded 32-byte
+Ed25519 seed). When it is not set, a key is derived from SECRET_KEY so every
+worker signs with the same key. The public key is published as a JWK set.
+"""
+
+import base64
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from ..config import get_settings
+
+TOKEN_TYPE = "MRAUTH"
+TOKEN_ALGORITHM = "EdDSA"
+
+
+class AuthorizationTokenError(Exception):
+    """Authorization token is malformed, has a bad signature or is expired."""
+
+    def __init__(self, error_code: str, message: str):
+        super().__init__(message)
+        self.error_code = error_code
+        self.message = message
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@lru_cache(maxsize=4)
+def _load_signing_key(configured_key: str, secret_key: str) -> Ed25519PrivateKey:
+    """Load the Ed25519 signing key (cached per configuration)."""
+    if configured_key:
+        seed = base64.urlsafe_b64decode(configured_key + "=" * (-len(configured_key) % 4))
+        if len(seed) != 32:
+            raise ValueError("AUTHORIZATION_TOKEN_SIGNING_KEY must encode a 32-byte Ed25519 seed")
+    else:
+        seed = hashlib.sha256(f"authorization-token:{secret_key}".encode()).digest()
+    return Ed25519PrivateKey.from_private_bytes(seed)
+
+
+def _signing_key() -> Ed25519PrivateKey:
+    settings = get_settings()
+    return _load_signing_key(settings.AUTHORIZATION_TOKEN_SIGNING_KEY, settings.SECRET_KEY)
+
+
+def _public_key_bytes(public_key: Ed25519PublicKey) -> bytes:
+    return public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+
+
+def _key_id(public_key: Ed25519PublicKey) -> str:
+    return hashlib.sha256(_public_key_bytes(public_key)).hexdigest()[:16]
+
+
+def get_public_jwks() -> dict[str, Any]:
+    """Return the token verification key as a JWK set.
+
+    Returns:
+        dict[str, Any]: {"keys": [{"kty": "OKP", "crv": "Ed25519", ...}]}
+    """
+    public_key = _signing_key().public_key()
+    return {
+        "keys": [
+            {
+                "kty": "OKP",
+                "crv": "Ed25519",
+                "x": _b64encode(_public_key_bytes(public_key)),
+                "kid": _key_id(public_key),
+                "alg": TOKEN_ALGORITHM,
+                "use": "sig",
+            }
+        ]
+    }
+
+
+def create_authorization_token(
+    session_id: str,
+    operator_id: UUID,
+    site_id: UUID,
+    application_id: UUID,
+    player_count: int,
+    issued_at: datetime,
+    expires_in: Optional[int] = None,
+) -> str:
+    """Create a signed authorization token.
+
+    Signing is deterministic: the same inputs always produce the same token.
+
+    Args:
+        session_id: Game session id
+        operator_id: Operator id
+        site_id: Operation site id
+        application_id: Application id
+        player_count: Authorized player count
+        issued_at: Authorization time (naive datetimes are treated as UTC)
+        expires_in: Lifetime in seconds (default AUTHORIZATION_TOKEN_TTL_SECONDS)
+
+    Returns:
+        str: JWS compact token
+    """
+    if expires_in is None:
+        expires_in = get_settings().AUTHORIZATION_TOKEN_TTL_SECONDS
+    if issued_at.tzinfo is None:
+        issued_at = issued_at.replace(tzinfo=timezone.utc)
+    iat = int(issued_at.timestamp())
+
+    signing_key = _signing_key()
+    header = {"alg": TOKEN_ALGORITHM, "typ": TOKEN_TYPE, "kid": _key_id(signing_key.public_key())}
+    payload = {
+        "sid": session_id,
+        "op": str(operator_id),
+        "site": str(site_id),
+        "app": str(application_id),
+        "pc": player_count,
+        "iat": iat,
+        "exp": iat + expires_in,
+    }
+
+    signing_input = ".".join(
+        _b64encode(json.dumps(part, separators=(",", ":")).encode())
+        for part in (header, payload)
+    )
+    signature = signing_key.sign(signing_input.encode("ascii"))
+    return f"{signing_input}.{_b64encode(signature)}"
+
+
+def verify_authorization_token(token: str, now: Optional[float] = None) -> dict[str, Any]:
+    """Verify an authorization token without touching the database.
+
+    Args:
+        token: JWS compact token
+        now: Current Unix time (defaults to time.time())
+
+    Returns:
+        dict[str, Any]: Verified payload claims
+
+    Raises:
+        AuthorizationTokenError: INVALID_AUTHORIZATION_TOKEN or
+            AUTHORIZATION_TOKEN_EXPIRED
+    """
+    try:
+        encoded_header, encoded_payload, encoded_signature = token.split(".")
+        header = json.loads(_b64decode(encoded_header))
+        payload = json.loads(_b64decode(encoded_payload))
+        signature = _b64decode(encoded_signature)
+    except (ValueError, TypeError, AttributeError):
+        raise AuthorizationTokenError("INVALID_AUTHORIZATION_TOKEN", "Malformed authorization token")
+
+    if not isinstance(header, dict) or header.get("alg") != TOKEN_ALGORITHM or header.get("typ") != TOKEN_TYPE:
+        raise AuthorizationTokenError("INVALID_AUTHORIZATION_TOKEN", "Unsupported authorization token type")
+
+    public_key = _signing_key().public_key()
+    if header.get("kid") != _key_id(public_key):
+        raise AuthorizationTokenError("INVALID_AUTHORIZATION_TOKEN", "Unknown signing key")
+
+    try:
+        public_key.verify(signature, f"{encoded_header}.{encoded_payload}".encode("ascii"))
+    except InvalidSignature:
+        raise AuthorizationTokenError("INVALID_AUTHORIZATION_TOKEN", "Invalid authorization token signature")
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), int):
+        raise AuthorizationTokenError("INVALID_AUTHORIZATION_TOKEN", "Authorization token has no expiry")
+
+    current_time = time.time() if now is None else now
+    if current_time >= payload["exp"]:
+        raise AuthorizationTokenError("AUTHORIZATION_TOKEN_EXPIRED", "Authorization token has expired")
+
+    return payload
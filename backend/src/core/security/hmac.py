@@ -5,17 +5,125 @@ HMAC签名验证中间件
 - 验证请求的HMAC-SHA256签名防止篡改
 - 支持时间戳验证防重放攻击
 - 按照签名规范构造待签名字符串
+- 按运营商缓存预置密钥的HMAC对象，每次请求只需 copy() 后计算消息摘要
+- 签名通过后占用Nonce，拒绝时间戳窗口内的重放请求（见 nonce_store）
 """
 import hmac
 import hashlib
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Optional
 from fastapi import Request, HTTPException, status
 import structlog
 
+from .nonce_store import NonceStore, NonceStoreUnavailableError, get_nonce_store
+
 logger = structlog.get_logger(__name__)
 
 
+class HMACKeyCache:
+    """预置密钥的HMAC对象缓存（进程内，LRU淘汰）
+
+    hmac.new(secret) 需要对密钥做两次填充和两次哈希初始化，按运营商缓存
+    初始化后的HMAC对象，每次请求 copy() 一份再 update() 消息即可。
+    密钥变化（API Key轮换）时自动重建。
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Args:
+            max_size: 最多缓存的运营商数量
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def signer(self, cache_key: Any, secret: str):
+        """
+        获取预置密钥的HMAC对象副本
+
+        Args:
+            cache_key: 缓存键（运营商ID）
+            secret: 签名密钥
+
+        Returns:
+            hmac.HMAC: 可直接 update() 的独立副本
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == secret:
+                self._entries.move_to_end(cache_key)
+                return entry[1].copy()
+
+            prekeyed = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+            self._entries[cache_key] = (secret, prekeyed)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return prekeyed.copy()
+
+    def invalidate(self, cache_key: Any) -> None:
+        """
+        移除运营商的缓存
+
+        Args:
+            cache_key: 缓存键（运营商ID）
+        """
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 全局HMAC密钥缓存（每个worker进程一个）
+_hmac_key_cache: Optional[HMACKeyCache] = None
+
+
+def get_hmac_key_cache() -> HMACKeyCache:
+    """
+    获取全局HMAC密钥缓存
+
+    Returns:
+        HMACKeyCache: 当前worker进程的缓存实例
+    """
+    global _hmac_key_cache
+    if _hmac_key_cache is None:
+        _hmac_key_cache = HMACKeyCache()
+    return _hmac_key_cache
+
+
+def build_sign_message(
+    method: str,
+    path: str,
+    timestamp: str,
+    nonce: str,
+    body: bytes
+) -> bytes:
+    """
+    构造待签名消息（字节形式，直接使用原始请求体，不做解码）
+
+    格式: METHOD\\nPATH\\nTIMESTAMP\\nNONCE\\nBODY
+
+    Args:
+        method: HTTP方法（GET/POST等）
+        path: 请求路径（不含query参数）
+        timestamp: Unix时间戳字符串
+        nonce: 随机数（未使用时为空字符串）
+        body: 原始请求体
+
+    Returns:
+        待签名消息
+    """
+    return f"{method}\n{path}\n{timestamp}\n{nonce}\n".encode('utf-8') + body
+
+
 class HMACSignature:
     """HMAC签名验证依赖"""
 
@@ -24,7 +132,10 @@ class HMACSignature:
         signature_header: str = "X-Signature",
         timestamp_header: str = "X-Timestamp",
         nonce_header: str = "X-Nonce",
-        max_timestamp_diff: int = 300  # 5分钟
+        max_timestamp_diff: int = 300,  # 5分钟
+        require_nonce: bool = True,
+        key_cache: Optional[HMACKeyCache] = None,
+        nonce_store: Optional[NonceStore] = None
     ):
         """
         Args:
@@ -32,11 +143,17 @@ class HMACSignature:
             timestamp_header: 时间戳所在的请求头名称
             nonce_header: 随机数所在的请求头名称
             max_timestamp_diff: 允许的最大时间戳偏差（秒）
+            require_nonce: 是否必须携带随机数（不携带时签名中的NONCE为空字符串）
+            key_cache: 预置密钥的HMAC对象缓存（默认使用全局缓存）
+            nonce_store: Nonce防重放存储（默认使用全局存储）
         """
         self.signature_header = signature_header
         self.timestamp_header = timestamp_header
         self.nonce_header = nonce_header
         self.max_timestamp_diff = max_timestamp_diff
+        self.require_nonce = require_nonce
+        self.key_cache = key_cache
+        self.nonce_store = nonce_store
 
     async def __call__(self, request: Request) -> dict:
         """
@@ -56,6 +173,106 @@ class HMACSignature:
         Raises:
             HTTPException: 签名验证失败时抛出401
         """
+        # 获取API Secret（从request.state.operator获取，需先执行API Key认证）
+        if not hasattr(request.state, "operator"):
+            logger.error(
+                "hmac_no_operator",
+                path=request.url.path,
+                detail="API Key authentication must be performed before HMAC verification"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Authentication order error"
+            )
+
+        operator = request.state.operator
+        api_secret = operator.api_key  # 注意：生产环境应使用单独的api_secret字段
+
+        # 请求体已由Starlette缓存，不会重复读取
+        body = await request.body()
+        return await self.authenticate(request, operator.id, api_secret, body)
+
+    async def authenticate(
+        self,
+        request: Request,
+        operator_id: Any,
+        api_secret: str,
+        body: bytes
+    ) -> dict:
+        """
+        验证HMAC签名并占用Nonce（携带X-Nonce时）
+
+        Args:
+            request: FastAPI请求对象
+            operator_id: 运营商ID
+            api_secret: 签名密钥
+            body: 原始请求体
+
+        Returns:
+            包含验证结果的字典
+
+        Raises:
+            HTTPException: 签名验证失败时抛出401/400，Nonce重放时抛出401，
+                Nonce存储不可用（且要求Redis）时抛出503
+        """
+        result = self.verify(request, operator_id, api_secret, body)
+        nonce = result["nonce"]
+        if not nonce:
+            return result
+
+        # 签名通过后才占用Nonce，避免伪造请求消耗他人的Nonce
+        store = self.nonce_store or get_nonce_store()
+        try:
+            claimed = await store.claim(operator_id, nonce, result["timestamp"])
+        except NonceStoreUnavailableError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error_code": "REPLAY_PROTECTION_UNAVAILABLE",
+                    "message": "Replay protection is temporarily unavailable, please retry"
+                }
+            )
+
+        if not claimed:
+            logger.warning(
+                "hmac_nonce_replayed",
+                operator_id=str(operator_id),
+                path=request.url.path
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "error_code": "NONCE_REPLAYED",
+                    "message": "Nonce has already been used"
+                }
+            )
+
+        return result
+
+    def verify(
+        self,
+        request: Request,
+        operator_id: Any,
+        api_secret: str,
+        body: bytes
+    ) -> dict:
+        """
+        使用已读取的请求体验证HMAC签名
+
+        路由在解析请求体后直接调用本方法，签名与Pydantic解析共用同一份原始请求体。
+
+        Args:
+            request: FastAPI请求对象（读取请求头和路径）
+            operator_id: 运营商ID（HMAC对象缓存键）
+            api_secret: 签名密钥
+            body: 原始请求体
+
+        Returns:
+            包含验证结果的字典
+
+        Raises:
+            HTTPException: 签名缺失、无效或时间戳过期时抛出401，格式错误时抛出400
+        """
         # 1. 提取必需的请求头
         signature = request.headers.get(self.signature_header)
         timestamp = request.headers.get(self.timestamp_header)
@@ -66,33 +283,42 @@ class HMACSignature:
             logger.warning(
                 "hmac_signature_missing",
                 path=request.url.path,
-                client_ip=request.client.host
+                client_ip=request.client.host if request.client else None
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Missing {self.signature_header} header"
+                detail={
+                    "error_code": "INVALID_SIGNATURE",
+                    "message": f"Missing {self.signature_header} header"
+                }
             )
 
         if not timestamp:
             logger.warning(
                 "hmac_timestamp_missing",
                 path=request.url.path,
-                client_ip=request.client.host
+                client_ip=request.client.host if request.client else None
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Missing {self.timestamp_header} header"
+                detail={
+                    "error_code": "INVALID_SIGNATURE",
+                    "message": f"Missing {self.timestamp_header} header"
+                }
             )
 
-        if not nonce:
+        if not nonce and self.require_nonce:
             logger.warning(
                 "hmac_nonce_missing",
                 path=request.url.path,
-                client_ip=request.client.host
+                client_ip=request.client.host if request.client else None
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Missing {self.nonce_header} header"
+                detail={
+                    "error_code": "INVALID_SIGNATURE",
+                    "message": f"Missing {self.nonce_header} header"
+                }
             )
 
         # 3. 验证时间戳（防重放攻击）
@@ -106,7 +332,10 @@ class HMACSignature:
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid timestamp format (must be Unix timestamp)"
+                detail={
+                    "error_code": "INVALID_TIMESTAMP",
+                    "message": "Invalid timestamp format (must be Unix timestamp)"
+                }
             )
 
         current_timestamp = int(time.time())
@@ -121,11 +350,19 @@ class HMACSignature:
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Request timestamp expired (max {self.max_timestamp_diff}s difference)"
+                detail={
+                    "error_code": "TIMESTAMP_EXPIRED",
+                    "message": f"Request timestamp expired (max {self.max_timestamp_diff}s difference)",
+                    "details": {
+                        "server_time": current_timestamp,
+                        "request_time": request_timestamp,
+                        "max_diff_seconds": self.max_timestamp_diff
+                    }
+                }
             )
 
         # 4. 验证Nonce长度（防止过短的随机数）
-        if len(nonce) < 16:
+        if nonce and len(nonce) < 16:
             logger.warning(
                 "hmac_nonce_too_short",
                 nonce_length=len(nonce),
@@ -133,62 +370,41 @@ class HMACSignature:
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Nonce must be at least 16 characters"
-            )
-
-        # 5. 获取API Secret（从request.state.operator获取，需先执行API Key认证）
-        if not hasattr(request.state, "operator"):
-            logger.error(
-                "hmac_no_operator",
-                path=request.url.path,
-                detail="API Key authentication must be performed before HMAC verification"
+                detail={
+                    "error_code": "INVALID_NONCE",
+                    "message": "Nonce must be at least 16 characters"
+                }
             )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Authentication order error"
-            )
-
-        operator = request.state.operator
-        api_secret = operator.api_key  # 注意：生产环境应使用单独的api_secret字段
-
-        # 6. 读取请求体
-        body = await request.body()
-        body_str = body.decode('utf-8') if body else ""
 
-        # 7. 构造待签名字符串
-        sign_string = self._build_sign_string(
+        # 5. 构造待签名消息并计算期望的签名（预置密钥的HMAC对象副本）
+        message = build_sign_message(
             method=request.method,
             path=str(request.url.path),
             timestamp=timestamp,
-            nonce=nonce,
-            body=body_str
+            nonce=nonce or "",
+            body=body
         )
+        signer = (self.key_cache or get_hmac_key_cache()).signer(operator_id, api_secret)
+        signer.update(message)
+        expected_signature = signer.hexdigest()
 
-        # 8. 计算期望的签名
-        expected_signature = self._compute_hmac(api_secret, sign_string)
-
-        # 9. 对比签名（恒定时间比较防时序攻击）
-        if not hmac.compare_digest(signature, expected_signature):
+        # 6. 对比签名（恒定时间比较防时序攻击）
+        if not hmac.compare_digest(signature.encode('utf-8'), expected_signature.encode('ascii')):
             logger.warning(
                 "hmac_signature_mismatch",
-                operator_id=str(operator.id),
-                expected=expected_signature[:16] + "...",
+                operator_id=str(operator_id),
                 received=signature[:16] + "...",
                 path=request.url.path
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid HMAC signature"
+                detail={
+                    "error_code": "INVALID_SIGNATURE",
+                    "message": "Invalid HMAC signature"
+                }
             )
 
-        # 10. 验证成功
-        logger.info(
-            "hmac_verified",
-            operator_id=str(operator.id),
-            timestamp=timestamp,
-            path=request.url.path
-        )
-
+        # 7. 验证成功（热路径不记录日志）
         return {
             "verified": True,
             "timestamp": request_timestamp,
@@ -253,7 +469,7 @@ def generate_signature(
         method: HTTP方法
         path: 请求路径
         timestamp: Unix时间戳
-        nonce: 随机数
+        nonce: 随机数（未使用时为空字符串）
         body: 请求体
         api_secret: API密钥
 
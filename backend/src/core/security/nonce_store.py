@@ -0,0 +1,211 @@
+"""
+请求随机数(Nonce)存储 —— 防重放
+
+签名请求在时间戳窗口(±max_timestamp_diff秒)内都能通过HMAC验证，
+本模块记住窗口内出现过的 (运营商, Nonce)，拒绝重复使用：
+
+1. 进程内时间分桶集合：同一worker内的重放直接拒绝，不经过网络
+2. Redis SET NX EX 原子占位：跨worker判重；键带运营商哈希标签
+   (nonce:{operator_id}:nonce)，Redis Cluster下同一运营商的Nonce落在同一槽位
+3. Redis不可用时降级：只依赖进程内集合(可配置为拒绝请求)，
+   并在一段时间内跳过Redis，避免每个请求都等待连接超时
+
+Nonce只需要记到其时间戳离开窗口为止，过期时间 = 时间戳 + max_timestamp_diff。
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+import structlog
+
+from ..cache import get_cache
+from ..config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+# Redis键前缀
+NONCE_KEY_PREFIX = "nonce:"
+
+# 进程内集合的分桶粒度（秒）
+LOCAL_BUCKET_SECONDS = 10
+
+# Redis失败后跳过Redis的时间（秒）
+REDIS_RETRY_INTERVAL_SECONDS = 5.0
+
+
+class NonceStoreUnavailableError(Exception):
+    """Redis不可用且配置为必须使用Redis判重"""
+
+
+class LocalNonceWindow:
+    """进程内时间分桶的Nonce集合
+
+    每个键按过期时间落入一个时间桶，过期的桶整体丢弃；
+    超过容量时提前丢弃最早过期的桶(跨worker判重仍由Redis兜底)。线程安全。
+    """
+
+    def __init__(self, max_entries: int, bucket_seconds: int = LOCAL_BUCKET_SECONDS):
+        """
+        Args:
+            max_entries: 最多记住的Nonce数量
+            bucket_seconds: 分桶粒度（秒）
+        """
+        self.max_entries = max_entries
+        self.bucket_seconds = bucket_seconds
+        self._expiry: dict[str, float] = {}
+        self._buckets: "defaultdict[int, list[str]]" = defaultdict(list)
+        self._purged_bucket = 0
+        self._lock = threading.Lock()
+
+    def _drop_bucket(self, bucket: int) -> None:
+        """丢弃一个时间桶（需持有锁）"""
+        for key in self._buckets.pop(bucket, ()):
+            expires_at = self._expiry.get(key)
+            if expires_at is not None and int(expires_at // self.bucket_seconds) == bucket:
+                del self._expiry[key]
+
+    def _purge(self, now: float) -> None:
+        """丢弃已过期的桶，并把数量控制在容量以内（需持有锁）"""
+        current_bucket = int(now // self.bucket_seconds)
+        self._purged_bucket = current_bucket
+        for bucket in sorted(self._buckets):
+            if bucket >= current_bucket and len(self._expiry) < self.max_entries:
+                break
+            self._drop_bucket(bucket)
+
+    def add(self, key: str, expires_at: float, now: float) -> bool:
+        """
+        记住一个Nonce
+
+        Args:
+            key: 运营商+Nonce组成的键
+            expires_at: 过期时间（Unix时间）
+            now: 当前时间（Unix时间）
+
+        Returns:
+            bool: True表示首次出现，False表示在有效期内重复出现
+        """
+        with self._lock:
+            seen_until = self._expiry.get(key)
+            if seen_until is not None and seen_until > now:
+                return False
+
+            if len(self._expiry) >= self.max_entries or int(now // self.bucket_seconds) != self._purged_bucket:
+                self._purge(now)
+
+            self._expiry[key] = expires_at
+            self._buckets[int(expires_at // self.bucket_seconds)].append(key)
+            return True
+
+    def clear(self) -> None:
+        """清空集合"""
+        with self._lock:
+            self._expiry.clear()
+            self._buckets.clear()
+            self._purged_bucket = 0
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+class NonceStore:
+    """Nonce判重（进程内集合 + Redis原子占位）"""
+
+    def __init__(
+        self,
+        max_timestamp_diff: int = 300,
+        local_max_entries: int = 200000,
+        require_redis: bool = False,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """
+        Args:
+            max_timestamp_diff: 签名时间戳允许的最大偏差（秒），决定Nonce保留时间
+            local_max_entries: 进程内集合容量
+            require_redis: Redis不可用时是否拒绝请求（默认降级为只用进程内集合）
+            clock: 时间源（测试注入）
+        """
+        self.max_timestamp_diff = max_timestamp_diff
+        self.require_redis = require_redis
+        self._clock = clock or time.time
+        self._local = LocalNonceWindow(local_max_entries)
+        self._redis_retry_at = 0.0
+
+        # 统计
+        self.local_rejections = 0
+        self.redis_rejections = 0
+        self.degraded_claims = 0
+
+    @staticmethod
+    def _redis_key(operator_id: Any, nonce: str) -> str:
+        return f"{NONCE_KEY_PREFIX}{{{operator_id}}}:{nonce}"
+
+    async def claim(self, operator_id: Any, nonce: str, timestamp: int) -> bool:
+        """
+        占用一个Nonce
+
+        Args:
+            operator_id: 运营商ID
+            nonce: 请求随机数（已通过签名验证）
+            timestamp: 请求时间戳（已通过窗口检查）
+
+        Returns:
+            bool: True表示首次使用，False表示重放
+
+        Raises:
+            NonceStoreUnavailableError: Redis不可用且 require_redis=True
+        """
+        now = self._clock()
+        expires_at = timestamp + self.max_timestamp_diff
+
+        if not self._local.add(f"{operator_id}:{nonce}", expires_at, now):
+            self.local_rejections += 1
+            return False
+
+        claimed = None
+        if now >= self._redis_retry_at:
+            claimed = await get_cache().set_if_absent(
+                self._redis_key(operator_id, nonce),
+                1,
+                ttl=max(1, int(expires_at - now) + 1)
+            )
+
+        if claimed is None:
+            if now >= self._redis_retry_at:
+                self._redis_retry_at = now + REDIS_RETRY_INTERVAL_SECONDS
+                logger.warning("nonce_store_redis_unavailable", require_redis=self.require_redis)
+            if self.require_redis:
+                raise NonceStoreUnavailableError("Redis is unavailable for nonce replay protection")
+            self.degraded_claims += 1
+            return True
+
+        if not claimed:
+            self.redis_rejections += 1
+        return claimed
+
+    def clear(self) -> None:
+        """清空进程内集合（测试使用）"""
+        self._local.clear()
+        self._redis_retry_at = 0.0
+
+
+# 全局Nonce存储（每个worker进程一个）
+_nonce_store: Optional[NonceStore] = None
+
+
+def get_nonce_store() -> NonceStore:
+    """
+    获取全局Nonce存储
+
+    Returns:
+        NonceStore: 当前worker进程的Nonce存储
+    """
+    global _nonce_store
+    if _nonce_store is None:
+        settings = get_settings()
+        _nonce_store = NonceStore(
+            local_max_entries=settings.NONCE_LOCAL_MAX_ENTRIES,
+            require_redis=settings.NONCE_REQUIRE_REDIS,
+        )
+    return _nonce_store
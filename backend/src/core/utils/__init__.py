@@ -1,5 +1,6 @@
 """Core utilities module containing security and business logic helpers."""
 
+from .bloom import BloomFilter, RotatingBloomFilter
 from .money import (
     MoneyInput,
     add_money,
@@ -57,4 +58,7 @@ __all__ = [
     "get_timestamp_age",
     "format_timestamp",
     "parse_timestamp",
+    # Bloom filter utilities
+    "BloomFilter",
+    "RotatingBloomFilter",
 ]
@@ -0,0 +1,136 @@
+"""Bloom filter utilities for fast probabilistic membership checks.
+
+This module provides a compact in-memory Bloom filter and a rotating
+variant that forgets entries after a fixed time window.
+
+A Bloom filter never reports a false negative: if ``key in bloom`` is
+False the key was definitely never added. A True answer only means the
+key was *possibly* added (false positive rate bounded by ``error_rate``
+while the filter holds at most ``capacity`` keys).
+"""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false positive rate at ``capacity`` keys
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        """Yield bit positions for a key (Kirsch-Mitzenmacher double hashing)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter.
+
+        Args:
+            key: Key to add
+        """
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RotatingBloomFilter:
+    """Time-windowed Bloom filter built from two generations.
+
+    Keys are added to the current generation. Every ``window_seconds`` the
+    current generation becomes the previous one and the oldest is dropped,
+    so a key is remembered for at least ``window_seconds`` and at most
+    twice that. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        window_seconds: float,
+        error_rate: float = 0.001,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """Initialize the rotating filter.
+
+        Args:
+            capacity: Expected number of keys per window
+            window_seconds: Minimum time a key is remembered
+            error_rate: Target false positive rate per generation
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.error_rate = error_rate
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: Optional[BloomFilter] = None
+        self._rotated_at = self._clock()
+
+    def _rotate(self) -> None:
+        """Advance generations if the window has elapsed (lock held)."""
+        elapsed = self._clock() - self._rotated_at
+        if elapsed < self.window_seconds:
+            return
+
+        # After two idle windows both generations are stale
+        self._previous = self._current if elapsed < 2 * self.window_seconds else None
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = self._clock()
+
+    def add(self, key: str) -> bool:
+        """Add a key, reporting whether it was possibly present already.
+
+        Args:
+            key: Key to add
+
+        Returns:
+            True if the key was possibly added before, False if definitely new
+        """
+        with self._lock:
+            self._rotate()
+            seen = key in self._current or (
+                self._previous is not None and key in self._previous
+            )
+            if not seen:
+                self._current.add(key)
+            return seen
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._rotate()
+            return key in self._current or (
+                self._previous is not None and key in self._previous
+            )
@@ -4,16 +4,30 @@ This module provides secure password hashing using bcrypt algorithm
 with configurable work factor for computational cost.
 """
 
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-# Bcrypt context with optimized work factor
-# rounds=10 provides good security (OWASP minimum) with better performance
-# Reduces password verification time from ~250ms to ~60ms
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=10,
-)
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context() -> "CryptContext":
+    """Get the bcrypt context (passlib is imported on first use, not at worker boot).
+
+    Returns:
+        CryptContext: Bcrypt context
+    """
+    from passlib.context import CryptContext
+
+    # Bcrypt context with optimized work factor
+    # rounds=10 provides good security (OWASP minimum) with better performance
+    # Reduces password verification time from ~250ms to ~60ms
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=10,
+    )
 
 
 def hash_password(password: str) -> str:
@@ -30,7 +44,7 @@ def hash_password(password: str) -> str:
         >>> hashed.startswith("$2b$")
         True
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -50,7 +64,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         >>> verify_password("wrong_password", hashed)
         False
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def needs_rehash(hashed_password: str) -> bool:
@@ -70,4 +84,4 @@ def needs_rehash(hashed_password: str) -> bool:
         >>> needs_rehash(hashed)
         False
     """
-    return pwd_context.needs_update(hashed_password)
+    return get_pwd_context().needs_update(hashed_password)
@@ -4,8 +4,12 @@ This module provides the async engine, sessionmaker, and dependency injection
 for database sessions in FastAPI endpoints.
 """
 
+import ast
+import re
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
@@ -17,6 +21,12 @@ from sqlalchemy.ext.asyncio import (
 
 from ..core.config import get_settings
 
+# Alembic migration scripts (backend/alembic)
+ALEMBIC_SCRIPT_LOCATION = Path(__file__).resolve().parents[2] / "alembic"
+
+# Module-level `revision = ...` / `down_revision: ... = ...` lines in a migration script
+_REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=\n]*=(.+)$", re.MULTILINE)
+
 # Global engine instance (initialized on app startup)
 _engine: AsyncEngine | None = None
 _async_session_maker: async_sessionmaker[AsyncSession] | None = None
@@ -86,8 +96,14 @@ def init_db() -> None:
             settings.DATABASE_URL,
             echo=settings.DEBUG,  # Log SQL queries in debug mode
             connect_args={"check_same_thread": False},  # Allow multi-threading
+            query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
         )
     else:
+        connect_args = {}
+        if settings.DATABASE_URL.startswith("postgresql+asyncpg"):
+            # Prepared statements are cached per connection by asyncpg
+            connect_args["prepared_statement_cache_size"] = settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE
+
         # PostgreSQL/MySQL with connection pooling
         _engine = create_async_engine(
             settings.DATABASE_URL,
@@ -96,6 +112,8 @@ def init_db() -> None:
             max_overflow=settings.DATABASE_MAX_OVERFLOW,
             pool_pre_ping=True,  # Verify connections before using
             pool_recycle=3600,  # Recycle connections after 1 hour
+            query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+            connect_args=connect_args,
         )
 
     # Create session maker
@@ -121,6 +139,84 @@ async def create_tables() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+class SchemaVersionMismatchError(RuntimeError):
+    """Database schema is not at the Alembic head revision."""
+
+
+def _read_revision(path: Path) -> tuple[str | None, tuple[str, ...]]:
+    """Read the `revision` and `down_revision` literals from a migration script."""
+    values = {
+        match.group(1): ast.literal_eval(match.group(2).strip())
+        for match in _REVISION_LINE.finditer(path.read_text(encoding="utf-8"))
+    }
+
+    down = values.get("down_revision") or ()
+    if isinstance(down, str):
+        down = (down,)
+    return values.get("revision"), tuple(down)
+
+
+@lru_cache(maxsize=4)
+def get_alembic_heads(script_location: Path = ALEMBIC_SCRIPT_LOCATION) -> frozenset[str]:
+    """Get the head revisions of the Alembic migration scripts.
+
+    Reads the revision literals directly instead of loading alembic's
+    ScriptDirectory, which imports alembic and every migration module and
+    would cost more at worker boot than the check it replaces. Cached, since
+    the scripts do not change while a worker runs.
+
+    Args:
+        script_location: Alembic script directory
+
+    Returns:
+        frozenset[str]: Head revision ids
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in (script_location / "versions").glob("*.py"):
+        revision, down_revisions = _read_revision(path)
+        if revision:
+            revisions.add(revision)
+            parents.update(down_revisions)
+    return frozenset(revisions - parents)
+
+
+async def verify_schema_version(script_location: Path = ALEMBIC_SCRIPT_LOCATION) -> str:
+    """Check that the database is stamped with the Alembic head revision.
+
+    Used instead of create_tables() outside SQLite/development: a single
+    query against alembic_version rather than reflecting the whole schema.
+
+    Args:
+        script_location: Alembic script directory
+
+    Returns:
+        str: Current database revision(s), comma-separated
+
+    Raises:
+        SchemaVersionMismatchError: If the database revision is missing or
+            differs from the migration head (run `alembic upgrade head`)
+    """
+    expected = get_alembic_heads(script_location)
+
+    engine = get_engine()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = {row[0] for row in result}
+    except Exception as e:
+        raise SchemaVersionMismatchError(
+            f"Cannot read alembic_version ({e}); run `alembic upgrade head`"
+        ) from e
+
+    if current != expected:
+        raise SchemaVersionMismatchError(
+            f"Database revision {sorted(current) or 'none'} does not match migration head "
+            f"{sorted(expected)}; run `alembic upgrade head`"
+        )
+    return ",".join(sorted(current))
+
+
 async def close_db() -> None:
     """Close database engine and dispose of connection pool.
 
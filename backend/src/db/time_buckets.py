@@ -0,0 +1,194 @@
+"""Dialect-aware, time zone correct time bucketing for reporting queries.
+
+time_bucket(granularity, column, tz) truncates a UTC timestamp column to the
+start of its hour/day/week/month in a time zone:
+
+- PostgreSQL: date_trunc('<unit>', column AT TIME ZONE '<tz>')
+- SQLite: strftime('<format>', column, '<offset> minutes'[, week modifiers])
+
+Both return the bucket start as a naive local datetime; weeks start on Monday.
+
+Filter rows with utc_range() (local bucket edges converted to UTC) on the raw
+column so the range predicate can use composite indexes such as
+(operator_id, game_started_at); only the GROUP BY uses the bucket expression.
+bucket_series() and fill_gaps() turn the grouped rows into a gap-filled series.
+
+SQLite has no time zone database: the zone's UTC offset at offset_at (default:
+now) is applied to the whole query, so DST transitions are not honoured there.
+SQLite is only used for development and tests.
+"""
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Callable, Literal, Optional, TypeVar, Union
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+Granularity = Literal["hour", "day", "week", "month"]
+
+GRANULARITIES = ("hour", "day", "week", "month")
+
+# SQLite strftime formats per granularity (weeks are floored to the day, then to Monday)
+_SQLITE_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "week": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+
+T = TypeVar("T")
+
+
+def get_zone(tz: Union[str, tzinfo]) -> tzinfo:
+    """Resolve a time zone name (e.g. "Asia/Shanghai") to a tzinfo.
+
+    Raises:
+        ValueError: Unknown time zone name
+    """
+    if isinstance(tz, tzinfo):
+        return tz
+    try:
+        return ZoneInfo(tz)
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Unknown time zone: {tz!r}") from e
+
+
+def zone_name(tz: Union[str, tzinfo]) -> str:
+    """IANA name of a time zone (UTC for datetime.timezone.utc)."""
+    zone = get_zone(tz)
+    return getattr(zone, "key", None) or str(zone)
+
+
+def is_utc(tz: Union[str, tzinfo]) -> bool:
+    """Whether the zone is UTC (local buckets equal UTC buckets)."""
+    return zone_name(tz) in ("UTC", "Etc/UTC")
+
+
+class time_bucket(FunctionElement):
+    """Start of the hour/day/week/month containing column, in local time.
+
+    Args:
+        granularity: hour / day / week / month
+        column: UTC timestamp column
+        tz: Time zone name or tzinfo
+        offset_at: Instant whose UTC offset SQLite applies (default: now)
+    """
+
+    type = DateTime()
+    name = "time_bucket"
+    inherit_cache = True
+    # Everything the compilers render goes into the statement cache key
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ("granularity", InternalTraversal.dp_string),
+        ("zone", InternalTraversal.dp_plain_obj),
+        ("offset_minutes", InternalTraversal.dp_plain_obj),
+    ]
+
+    def __init__(
+        self,
+        granularity: Granularity,
+        column: Any,
+        tz: Union[str, tzinfo] = "UTC",
+        offset_at: Optional[datetime] = None
+    ):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity!r}")
+        self.granularity = granularity
+        self.zone = get_zone(tz)
+        offset = (offset_at or datetime.now(timezone.utc)).astimezone(self.zone).utcoffset()
+        self.offset_minutes = int(offset.total_seconds() // 60)
+        super().__init__(column)
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+@compiles(time_bucket, "postgresql")
+def _compile_time_bucket_postgresql(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    # The zone is rendered inline so SELECT and GROUP BY compile to the same expression
+    return f"date_trunc({_quote(element.granularity)}, {column} AT TIME ZONE {_quote(zone_name(element.zone))})"
+
+
+@compiles(time_bucket)
+def _compile_time_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    modifiers = [f"'{element.offset_minutes:+d} minutes'"]
+    if element.granularity == "week":
+        # Next Sunday (or today if Sunday), then back to that week's Monday
+        modifiers += ["'weekday 0'", "'-6 days'"]
+    return f"strftime({_quote(_SQLITE_FORMATS[element.granularity])}, {column}, {', '.join(modifiers)})"
+
+
+def floor_bucket(value: datetime, granularity: Granularity) -> datetime:
+    """Start of the bucket containing a naive local datetime."""
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_bucket(bucket: datetime, granularity: Granularity) -> datetime:
+    """Start of the bucket following a bucket start."""
+    if granularity == "hour":
+        return bucket + timedelta(hours=1)
+    if granularity == "day":
+        return bucket + timedelta(days=1)
+    if granularity == "week":
+        return bucket + timedelta(weeks=1)
+    if bucket.month == 12:
+        return bucket.replace(year=bucket.year + 1, month=1)
+    return bucket.replace(month=bucket.month + 1)
+
+
+def to_local(value: datetime, tz: Union[str, tzinfo]) -> datetime:
+    """Convert a timestamp (naive values are UTC) to naive local time."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(get_zone(tz)).replace(tzinfo=None)
+
+
+def to_utc(local: datetime, tz: Union[str, tzinfo]) -> datetime:
+    """Convert a naive local time to an aware UTC datetime."""
+    return local.replace(tzinfo=get_zone(tz)).astimezone(timezone.utc)
+
+
+def utc_range(
+    start_local: datetime,
+    end_local: datetime,
+    tz: Union[str, tzinfo]
+) -> tuple[datetime, datetime]:
+    """UTC bounds [start, end) of a local range, for index-friendly WHERE clauses."""
+    return to_utc(start_local, tz), to_utc(end_local, tz)
+
+
+def bucket_series(
+    first: datetime,
+    last: datetime,
+    granularity: Granularity
+) -> list[datetime]:
+    """Every bucket start from the bucket containing first to the one containing last."""
+    bucket = floor_bucket(first, granularity)
+    last = floor_bucket(last, granularity)
+    series = []
+    while bucket <= last:
+        series.append(bucket)
+        bucket = next_bucket(bucket, granularity)
+    return series
+
+
+def fill_gaps(
+    values: dict[datetime, T],
+    series: list[datetime],
+    default: Callable[[], T]
+) -> list[tuple[datetime, T]]:
+    """Pair every bucket in series with its value, or default() for empty buckets."""
+    return [(bucket, values[bucket] if bucket in values else default()) for bucket in series]
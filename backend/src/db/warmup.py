@@ -0,0 +1,187 @@
+"""Startup statement warm-up.
+
+The first requests after a deploy or worker recycle pay for SQLAlchemy
+statement compilation (once per engine) and, on PostgreSQL, asyncpg
+statement preparation (once per connection). This module runs the hot
+statements once on every pooled connection during startup, so the worker
+only reports ready once both caches are warm.
+
+Each hot statement is produced by the same service method the request path
+uses, so the compiled-cache keys are exactly the ones real requests hit. A
+placeholder operator (zero balance) is flushed first so the methods get past
+their existence checks to the list and aggregate queries. All work runs
+inside a transaction that is rolled back, so nothing is ever committed.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, Awaitable, Callable
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    from ..models.operator import OperatorAccount
+
+logger = get_logger(__name__)
+
+# Matches no site or application row
+WARMUP_ID = UUID(int=0)
+
+# Steps receive the session and the placeholder operator
+WarmupStep = Callable[[AsyncSession, "OperatorAccount"], Awaitable[object]]
+
+
+def _placeholder_operator() -> "OperatorAccount":
+    """Build a throwaway operator; unique per connection so concurrent inserts never contend."""
+    from ..models.operator import OperatorAccount
+
+    marker = uuid4().hex
+    return OperatorAccount(
+        id=uuid4(),
+        username=f"__warmup_{marker[:16]}",
+        full_name="warmup",
+        email=f"warmup_{marker}@invalid",
+        phone="00000000000",
+        password_hash="!",
+        api_key=marker * 2,
+        api_key_hash="!",
+        balance=Decimal("0.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+
+
+async def _authorize_chain(session: AsyncSession, operator: "OperatorAccount") -> None:
+    from ..services.auth_service import AuthService
+    await AuthService(session).load_authorization_chain(operator.api_key, WARMUP_ID, WARMUP_ID)
+
+
+async def _session_idempotency(session: AsyncSession, operator: "OperatorAccount") -> None:
+    from ..services.billing_service import BillingService
+    await BillingService(session).check_session_idempotency(f"warmup_{operator.id.hex}")
+
+
+async def _balance_debit(session: AsyncSession, operator: "OperatorAccount") -> None:
+    from ..services.balance_ledger import BalanceLedger
+    await BalanceLedger(session).debit(operator.id, Decimal("0.00"))
+
+
+async def _operator_balance(session: AsyncSession, operator: "OperatorAccount") -> None:
+    from ..services.operator import OperatorService
+    await OperatorService(session).get_profile(operator.id)
+
+
+async def _usage_records(session: AsyncSession, operator: "OperatorAccount") -> None:
+    from ..services.operator import OperatorService
+    await OperatorService(session).get_usage_records(operator.id)
+
+
+async def _statistics(session: AsyncSession, operator: "OperatorAccount") -> None:
+    from ..services.operator import OperatorService
+    service = OperatorService(session)
+    await service.get_statistics_by_site(operator.id)
+    await service.get_consumption_statistics(operator.id)
+
+
+# Hot endpoints: authorize chain, balance, usage-record list, statistics
+HOT_STATEMENTS: tuple[tuple[str, WarmupStep], ...] = (
+    ("authorize_chain", _authorize_chain),
+    ("session_idempotency", _session_idempotency),
+    ("balance_debit", _balance_debit),
+    ("operator_balance", _operator_balance),
+    ("usage_records", _usage_records),
+    ("statistics", _statistics),
+)
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of a warm-up run."""
+
+    connections: int = 0
+    statements: int = 0
+    duration_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+
+async def _prime_connection(
+    engine: AsyncEngine,
+    steps: tuple[tuple[str, WarmupStep], ...],
+    report: WarmupReport,
+    checked_out: asyncio.Barrier
+) -> None:
+    """Run every warm-up step on one pooled connection."""
+    async with engine.connect() as conn:
+        # Hold the connection until all workers have one, so each primes a distinct connection
+        await checked_out.wait()
+
+        session = AsyncSession(bind=conn, expire_on_commit=False, autoflush=False)
+        try:
+            operator = _placeholder_operator()
+            session.add(operator)
+            await session.flush()
+
+            for name, step in steps:
+                try:
+                    async with session.begin_nested():
+                        await step(session, operator)
+                except HTTPException:
+                    # Not-found errors are expected: the statement still ran
+                    pass
+                except Exception as e:
+                    report.errors.append(f"{name}: {e}")
+                    continue
+                report.statements += 1
+        finally:
+            await session.rollback()
+            await session.close()
+        report.connections += 1
+
+
+async def warm_up_database(
+    engine: AsyncEngine,
+    connections: int | None = None,
+    steps: tuple[tuple[str, WarmupStep], ...] = HOT_STATEMENTS
+) -> WarmupReport:
+    """Compile and prepare the hot statements on every pooled connection.
+
+    Args:
+        engine: Async engine to warm up
+        connections: Number of connections to prime (default: pool size,
+            1 for SQLite)
+        steps: Warm-up steps to run on each connection
+
+    Returns:
+        WarmupReport: Connections primed, statements run, duration and errors
+    """
+    if connections is None:
+        settings = get_settings()
+        connections = 1 if engine.dialect.name == "sqlite" else settings.DATABASE_POOL_SIZE
+
+    report = WarmupReport()
+    started = time.perf_counter()
+    checked_out = asyncio.Barrier(connections)
+
+    results = await asyncio.gather(
+        *(_prime_connection(engine, steps, report, checked_out) for _ in range(connections)),
+        return_exceptions=True
+    )
+    report.errors.extend(str(result) for result in results if isinstance(result, BaseException))
+    report.duration_seconds = time.perf_counter() - started
+
+    logger.info(
+        "database_warmup_completed",
+        connections=report.connections,
+        statements=report.statements,
+        duration_ms=round(report.duration_seconds * 1000, 1),
+        errors=report.errors[:5],
+    )
+    return report
@@ -15,6 +15,7 @@ from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from .core import configure_logging, get_logger, get_settings
 from .core.cache import init_cache, close_cache
+from .core.invalidation_bus import close_invalidation_bus, init_invalidation_bus
 from .core.metrics import prometheus  # Import to register metrics
 # from .core.monitoring import initialize_monitoring_system, get_monitoring_status  # 临时禁用
 # from .core.performance import initialize_performance_system, get_performance_status
@@ -22,6 +23,7 @@ from .core.metrics import prometheus  # Import to register metrics
 from .db import close_db, health_check, init_db
 from .middleware import register_exception_handlers, SecurityHeadersMiddleware
 from .schemas import HealthCheckResponse
+from .services.billing_queue import close_billing_queue
 # from .api.v1.monitoring.endpoints import router as monitoring_router  # 临时禁用
 
 # Configure logging before app initialization
@@ -44,6 +46,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         None
     """
     settings = get_settings()
+    prometheus.mark_boot_started()
 
     # Startup
     logger.info(
@@ -58,15 +61,47 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         init_db()
         logger.info("database_initialized", database_url=settings.DATABASE_URL)
 
-        # Create tables for both SQLite and PostgreSQL
-        from .db.session import create_tables
-        await create_tables()
-        logger.info("database_tables_created")
+        # SQLite/development: create missing tables. Otherwise only check the Alembic revision
+        if settings.uses_create_all:
+            from .db.session import create_tables
+            await create_tables()
+            logger.info("database_tables_created")
+        else:
+            from .db.session import verify_schema_version
+            revision = await verify_schema_version()
+            logger.info("database_schema_verified", revision=revision)
 
         # Initialize Redis cache
         await init_cache()
         logger.info("redis_cache_initialized", redis_url=settings.REDIS_URL)
 
+        # Subscribe to cross-worker cache invalidation events
+        await init_invalidation_bus()
+        logger.info("invalidation_bus_initialized")
+
+        # Move blocked IPs written by older releases into the blocked-IP hash
+        from .services.ip_monitoring_service import migrate_legacy_ip_blocks
+        await migrate_legacy_ip_blocks()
+
+        # Compile and prepare hot statements on every pooled connection before reporting ready
+        if settings.DATABASE_WARMUP_ENABLED:
+            from .db.session import get_engine
+            from .db.warmup import warm_up_database
+            report = await warm_up_database(get_engine())
+            prometheus.record_startup_warmup(report.duration_seconds)
+
+        # Roll closed hours of usage records up for the statistics endpoints
+        if settings.USAGE_ROLLUP_ENABLED:
+            from .services.usage_rollup import init_usage_rollup_worker
+            await init_usage_rollup_worker()
+            logger.info("usage_rollup_worker_started")
+
+        # Reconcile today's finance dashboard counters with the database
+        if settings.FINANCE_COUNTER_RECONCILE_ENABLED:
+            from .services.finance_counters import init_finance_counter_reconciler
+            await init_finance_counter_reconciler()
+            logger.info("finance_counter_reconciler_started")
+
         # Initialize monitoring system
         monitoring_config = {
             'health_monitoring': {
@@ -168,6 +203,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("application_shutdown_started")
 
+    try:
+        # Commit authorization debits still waiting in the group-commit queue
+        await close_billing_queue()
+        logger.info("billing_queue_drained")
+    except Exception as e:
+        logger.error("billing_queue_drain_failed", error=str(e), exc_info=True)
+
+    try:
+        from .services.usage_rollup import close_usage_rollup_worker
+        await close_usage_rollup_worker()
+    except Exception as e:
+        logger.error("usage_rollup_worker_stop_failed", error=str(e), exc_info=True)
+
+    try:
+        from .services.finance_counters import close_finance_counter_reconciler
+        await close_finance_counter_reconciler()
+    except Exception as e:
+        logger.error("finance_counter_reconciler_stop_failed", error=str(e), exc_info=True)
+
+    try:
+        await close_invalidation_bus()
+        logger.info("invalidation_bus_closed")
+    except Exception as e:
+        logger.error("invalidation_bus_close_failed", error=str(e), exc_info=True)
+
     try:
         # Close Redis cache
         await close_cache()
@@ -211,6 +271,13 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Record time from boot to the first fast API request
+    app.add_middleware(
+        prometheus.FirstFastRequestMiddleware,
+        threshold_seconds=settings.FAST_REQUEST_THRESHOLD_MS / 1000,
+        path_prefix="/api/",
+    )
+
     # Add security headers middleware
     # Note: HTTPS redirect is handled by reverse proxy in production
     app.add_middleware(SecurityHeadersMiddleware)
@@ -302,9 +369,9 @@ def register_routes(app: FastAPI) -> None:
             media_type=CONTENT_TYPE_LATEST
         )
 
-    # API v1 routes
-    from .api.v1 import api_router
-    app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+    # API v1 routes (included directly, without an intermediate aggregate router)
+    from .api.v1 import include_api_routers
+    include_api_routers(app, settings.API_V1_PREFIX)
 
     # Monitoring routes (管理员权限) - 临时禁用
     # app.include_router(monitoring_router, prefix=f"{settings.API_V1_PREFIX}/monitoring", tags=["monitoring"])
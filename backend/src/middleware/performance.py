@@ -17,7 +17,7 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import StreamingResponse
 
-from ..core.cache.enhanced_cache import get_multi_cache, smart_cache
+from ..core.multilevel_cache import get_multi_cache
 from ..core.metrics.enhanced_metrics import record_api_operation
 
 logger = structlog.get_logger(__name__)
@@ -9,6 +9,10 @@ User Story 1 - 游戏授权与实时计费:
 - UsageRecord: 游戏会话使用记录
 - TransactionRecord: 资金交易记录
 - OperatorAppAuthorization: 运营商应用授权关系
+- OperatorBalanceShard: 运营商余额分片(热点运营商分散扣费锁竞争)
+- UsageHourlyRollup / UsageDailyRollup: 使用记录小时/日汇总(统计接口)
+- UsagePlayerHistogram: 玩家数量日直方图(玩家分布统计)
+- UsageRollupWatermark: 汇总水位线
 
 User Story 2 - 运营商账户与财务管理:
 - RefundRecord: 退款申请记录
@@ -25,6 +29,7 @@ from .admin import AdminAccount
 from .app_request import ApplicationRequest
 from .application import Application
 from .authorization import OperatorAppAuthorization
+from .balance_shard import OperatorBalanceShard
 from .finance import FinanceAccount
 from .invoice import InvoiceRecord
 from .message import OperatorMessage
@@ -33,6 +38,12 @@ from .refund import RefundRecord
 from .site import OperationSite
 from .transaction import TransactionRecord
 from .usage_record import UsageRecord
+from .usage_rollup import (
+    UsageDailyRollup,
+    UsageHourlyRollup,
+    UsagePlayerHistogram,
+    UsageRollupWatermark,
+)
 
 __all__ = [
     "AdminAccount",
@@ -40,8 +51,13 @@ __all__ = [
     "Application",
     "OperationSite",
     "UsageRecord",
+    "UsageHourlyRollup",
+    "UsageDailyRollup",
+    "UsagePlayerHistogram",
+    "UsageRollupWatermark",
     "TransactionRecord",
     "OperatorAppAuthorization",
+    "OperatorBalanceShard",
     "RefundRecord",
     "InvoiceRecord",
     "ApplicationRequest",
@@ -86,7 +86,7 @@ class AdminAccount(Base):
     created_applications: Mapped[list["Application"]] = relationship(
         "Application",
         back_populates="creator",
-        lazy="selectin",
+        lazy="raise",
         foreign_keys="Application.created_by"
     )
 
@@ -103,7 +103,7 @@ class AdminAccount(Base):
     approved_authorizations: Mapped[list["OperatorAppAuthorization"]] = relationship(
         "OperatorAppAuthorization",
         back_populates="approver",
-        lazy="selectin",
+        lazy="raise",
         foreign_keys="OperatorAppAuthorization.authorized_by"
     )
 
@@ -111,7 +111,7 @@ class AdminAccount(Base):
     reviewed_requests: Mapped[list["ApplicationRequest"]] = relationship(
         "ApplicationRequest",
         back_populates="reviewer",
-        lazy="selectin",
+        lazy="raise",
         foreign_keys="ApplicationRequest.reviewed_by"
     )
 
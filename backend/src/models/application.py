@@ -132,21 +132,21 @@ class Application(Base):
     authorizations: Mapped[list["OperatorAppAuthorization"]] = relationship(
         "OperatorAppAuthorization",
         back_populates="application",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # 1:N - 一个应用产生多条使用记录
     usage_records: Mapped[list["UsageRecord"]] = relationship(
         "UsageRecord",
         back_populates="application",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # 1:N - 一个应用有多个授权申请
     requests: Mapped[list["ApplicationRequest"]] = relationship(
         "ApplicationRequest",
         back_populates="application",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # ==================== 表级约束 ====================
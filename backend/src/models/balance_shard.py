@@ -0,0 +1,98 @@
+"""运营商余额分片模型 (OperatorBalanceShard)
+
+此模型对应 operator_balance_shards 表。
+
+大型连锁运营商在整点会同时启动数十个游戏会话, 所有扣费都在同一行
+operator_accounts 上排队。开启分片模式的客户分类(见 BALANCE_SHARD_TIERS)
+把余额拆分到N个子余额行, 授权扣费轮询命中其中一行, 锁竞争被分散到N行。
+
+关键特性:
+- 运营商总余额 = operator_accounts.balance + SUM(分片余额)
+- 每个分片余额非负, 扣费使用条件UPDATE
+- 分片行由 BalanceLedger 在首次均衡时按需创建
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID as PyUUID, uuid4
+
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    CheckConstraint,
+    ForeignKey,
+    Integer,
+    UniqueConstraint,
+    DECIMAL,
+    TIMESTAMP,
+)
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class OperatorBalanceShard(Base):
+    """运营商余额分片表 (operator_balance_shards)"""
+
+    __tablename__ = "operator_balance_shards"
+
+    # ==================== 主键 ====================
+    id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        comment="主键"
+    )
+
+    # ==================== 分片信息 ====================
+    operator_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("operator_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="所属运营商"
+    )
+
+    shard_index: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="分片序号(0..N-1)"
+    )
+
+    balance: Mapped[Decimal] = mapped_column(
+        DECIMAL(10, 2),
+        nullable=False,
+        default=Decimal("0.00"),
+        comment="分片余额(单位:元)"
+    )
+
+    # ==================== 审计字段 ====================
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+        comment="更新时间"
+    )
+
+    # ==================== 表级约束 ====================
+    __table_args__ = (
+        # CHECK约束: 分片余额非负
+        CheckConstraint(
+            "balance >= 0",
+            name="chk_shard_balance_non_negative"
+        ),
+        # UNIQUE约束: 每个运营商的分片序号唯一(同时作为查询索引)
+        UniqueConstraint(
+            "operator_id",
+            "shard_index",
+            name="uq_operator_balance_shard"
+        ),
+        {"comment": "运营商余额分片表"}
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<OperatorBalanceShard(operator_id={self.operator_id}, "
+            f"shard_index={self.shard_index}, balance={self.balance})>"
+        )
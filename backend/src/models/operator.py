@@ -188,11 +188,15 @@ class OperatorAccount(Base):
     #     lazy="selectin",
     #     foreign_keys=[created_by]
     # )
+    # 加载策略: 1:N集合一律 lazy="raise"，查询运营商时不再连带加载
+    # 全部历史记录(使用/交易/消息等)。确实需要集合的调用方应在查询中
+    # 显式使用 selectinload()/joinedload()，未加载即访问会直接报错。
+
     # 1:N - 一个运营商拥有多个运营点
     operation_sites: Mapped[list["OperationSite"]] = relationship(
         "OperationSite",
         back_populates="operator",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan"
     )
 
@@ -200,7 +204,7 @@ class OperatorAccount(Base):
     app_authorizations: Mapped[list["OperatorAppAuthorization"]] = relationship(
         "OperatorAppAuthorization",
         back_populates="operator",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan"
     )
 
@@ -208,35 +212,35 @@ class OperatorAccount(Base):
     usage_records: Mapped[list["UsageRecord"]] = relationship(
         "UsageRecord",
         back_populates="operator",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # 1:N - 一个运营商有多条交易记录
     transaction_records: Mapped[list["TransactionRecord"]] = relationship(
         "TransactionRecord",
         back_populates="operator",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # 1:N - 一个运营商有多条退款记录
     refund_records: Mapped[list["RefundRecord"]] = relationship(
         "RefundRecord",
         back_populates="operator",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # 1:N - 一个运营商有多条发票记录
     invoice_records: Mapped[list["InvoiceRecord"]] = relationship(
         "InvoiceRecord",
         back_populates="operator",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # 1:N - 一个运营商有多条消息通知
     messages: Mapped[list["OperatorMessage"]] = relationship(
         "OperatorMessage",
         back_populates="operator",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan"
     )
 
@@ -135,7 +135,7 @@ class OperationSite(Base):
     usage_records: Mapped[list["UsageRecord"]] = relationship(
         "UsageRecord",
         back_populates="site",
-        lazy="selectin"
+        lazy="raise"
     )
 
     # ==================== 表级约束 ====================
@@ -99,9 +99,9 @@ class UsageRecord(Base):
 
     # ==================== 授权信息 ====================
     authorization_token: Mapped[str] = mapped_column(
-        String(64),
+        String(1024),
         nullable=False,
-        comment="授权令牌(返回给头显Server)"
+        comment="授权令牌(Ed25519签名的自描述令牌, 返回给头显Server)"
     )
 
     # ==================== 会话生命周期 ====================
@@ -0,0 +1,211 @@
+"""使用记录汇总模型 (UsageHourlyRollup / UsageDailyRollup / UsagePlayerHistogram / UsageRollupWatermark)
+
+此模型对应 usage_rollups_hourly / usage_rollups_daily / usage_player_histograms_daily /
+usage_rollup_watermarks 表。运营商统计接口读取汇总表, 不再随 usage_records 历史增长而变慢。
+
+关键特性:
+- 按 (运营商, 运营点, 应用, 时间桶) 汇总场次、玩家人次、消费金额
+- 按 (运营商, 应用, 日) 保存各玩家数的场次/消费直方图(打包的 int64 向量)
+- 时间桶按UTC划分: 小时桶为整点, 日桶为UTC零点
+- 汇总由 UsageRollupService 按小时增量写入, 进度记录在水位线表中
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID as PyUUID
+
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    DECIMAL,
+    TIMESTAMP,
+)
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from ..db.base import Base
+
+
+class UsageRollupColumns:
+    """小时/日汇总表的公共列"""
+
+    # ==================== 主键(汇总维度) ====================
+    operator_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("operator_accounts.id", ondelete="RESTRICT"),
+        primary_key=True,
+        comment="运营商ID"
+    )
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        primary_key=True,
+        comment="时间桶起点(UTC)"
+    )
+
+    site_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("operation_sites.id", ondelete="RESTRICT"),
+        primary_key=True,
+        comment="运营点ID"
+    )
+
+    application_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("applications.id", ondelete="RESTRICT"),
+        primary_key=True,
+        comment="应用ID"
+    )
+
+    # ==================== 汇总值 ====================
+    total_sessions: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="场次"
+    )
+
+    total_players: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="玩家人次"
+    )
+
+    total_cost: Mapped[Decimal] = mapped_column(
+        DECIMAL(14, 2),
+        nullable=False,
+        default=Decimal("0.00"),
+        comment="消费金额"
+    )
+
+
+class UsageHourlyRollup(UsageRollupColumns, Base):
+    """使用记录小时汇总表 (usage_rollups_hourly)"""
+
+    __tablename__ = "usage_rollups_hourly"
+
+    __table_args__ = (
+        # 普通索引: 按小时重建汇总
+        Index("idx_usage_rollup_hourly_bucket", "bucket_start"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsageHourlyRollup(operator_id={self.operator_id}, "
+            f"bucket_start={self.bucket_start}, "
+            f"sessions={self.total_sessions})>"
+        )
+
+
+class UsageDailyRollup(UsageRollupColumns, Base):
+    """使用记录日汇总表 (usage_rollups_daily)"""
+
+    __tablename__ = "usage_rollups_daily"
+
+    __table_args__ = (
+        # 普通索引: 按天重建汇总
+        Index("idx_usage_rollup_daily_bucket", "bucket_start"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsageDailyRollup(operator_id={self.operator_id}, "
+            f"bucket_start={self.bucket_start}, "
+            f"sessions={self.total_sessions})>"
+        )
+
+
+class UsagePlayerHistogram(Base):
+    """玩家数量日直方图表 (usage_player_histograms_daily)
+
+    向量第 i 个元素对应玩家数为 i 的场次/消费, 以小端 int64 打包
+    (见 services.player_histogram)。
+    """
+
+    __tablename__ = "usage_player_histograms_daily"
+
+    operator_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("operator_accounts.id", ondelete="RESTRICT"),
+        primary_key=True,
+        comment="运营商ID"
+    )
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        primary_key=True,
+        comment="日期(UTC零点)"
+    )
+
+    application_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("applications.id", ondelete="RESTRICT"),
+        primary_key=True,
+        comment="应用ID"
+    )
+
+    session_counts: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        comment="各玩家数的场次(int64向量)"
+    )
+
+    cost_cents: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        comment="各玩家数的消费金额(分, int64向量)"
+    )
+
+    __table_args__ = (
+        # 普通索引: 按天重建直方图
+        Index("idx_usage_player_histogram_bucket", "bucket_start"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsagePlayerHistogram(operator_id={self.operator_id}, "
+            f"application_id={self.application_id}, "
+            f"bucket_start={self.bucket_start})>"
+        )
+
+
+class UsageRollupWatermark(Base):
+    """汇总水位线表 (usage_rollup_watermarks)
+
+    rolled_up_until 之前的每个小时都已写入小时汇总, 之前的每一整天都已写入日汇总和玩家数量直方图。
+    """
+
+    __tablename__ = "usage_rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(
+        String(32),
+        primary_key=True,
+        comment="汇总名称"
+    )
+
+    rolled_up_until: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        comment="已汇总到的时间点(UTC整点, 不含)"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+        comment="更新时间"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsageRollupWatermark(name={self.name}, "
+            f"rolled_up_until={self.rolled_up_until})>"
+        )
@@ -21,6 +21,14 @@ from .auth import (
     GameAuthorizeRequest,
     GameAuthorizeResponse,
     GameAuthorizeData,
+    GameAuthorizeBatchItem,
+    GameAuthorizeBatchRequest,
+    GameAuthorizeBatchResult,
+    GameAuthorizeBatchData,
+    GameAuthorizeBatchResponse,
+    AuthorizationTokenVerifyRequest,
+    AuthorizationTokenClaims,
+    AuthorizationTokenVerifyResponse,
     ErrorDetail,
 )
 from .common import (
@@ -83,6 +91,14 @@ __all__ = [
     "GameAuthorizeRequest",
     "GameAuthorizeResponse",
     "GameAuthorizeData",
+    "GameAuthorizeBatchItem",
+    "GameAuthorizeBatchRequest",
+    "GameAuthorizeBatchResult",
+    "GameAuthorizeBatchData",
+    "GameAuthorizeBatchResponse",
+    "AuthorizationTokenVerifyRequest",
+    "AuthorizationTokenClaims",
+    "AuthorizationTokenVerifyResponse",
     "ErrorDetail",
     # User Story 1: Usage record schemas
     "UsageRecordCreate",
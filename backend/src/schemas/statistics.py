@@ -117,12 +117,22 @@ class PlayerDistributionItem(BaseModel):
         from_attributes = True
 
 
+class PlayerCountPercentiles(BaseModel):
+    """玩家数百分位数(无场次时为0)"""
+
+    p50: int = Field(..., description="中位数", examples=[4], ge=0)
+    p90: int = Field(..., description="90分位", examples=[6], ge=0)
+    p99: int = Field(..., description="99分位", examples=[8], ge=0)
+
+
 class PlayerDistributionResponse(BaseModel):
     """玩家数量分布统计响应"""
 
     distribution: List[PlayerDistributionItem] = Field(..., description="分布数据列表")
     total_sessions: int = Field(..., description="总场次", examples=[100], ge=0)
     most_common_player_count: int = Field(..., description="最常见的玩家数", examples=[4], ge=1)
+    average_player_count: float = Field(..., description="平均每场玩家数", examples=[4.2], ge=0)
+    percentiles: PlayerCountPercentiles = Field(..., description="玩家数百分位数")
 
     class Config:
         from_attributes = True
@@ -13,13 +13,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..core import (
     UnauthorizedException,
     create_access_token,
-    get_cache,
     get_settings,
     get_token_subject,
     hash_password,
     verify_password,
     verify_token,
 )
+from ..core.multilevel_cache import get_multi_cache
 from ..models.admin import AdminAccount
 from ..schemas.admin import AdminLoginResponse, AdminUserInfo
 
@@ -76,7 +76,7 @@ class AdminAuthService:
         await self.db.refresh(admin)
 
         # Invalidate cached admin info (if exists) since we updated login time
-        cache = get_cache()
+        cache = get_multi_cache()
         await cache.delete(f"admin:info:{admin.id}")
 
         # Generate access token with correct user_type based on role
@@ -117,7 +117,7 @@ class AdminAuthService:
             raise UnauthorizedException("Invalid token")
 
         # Try to get from cache first
-        cache = get_cache()
+        cache = get_multi_cache()
         cache_key = f"admin:info:{admin_id}"
         cached_admin = await cache.get(cache_key)
 
@@ -277,7 +277,7 @@ class AdminAuthService:
         await self.db.commit()
 
         # Invalidate cached admin info since password changed
-        cache = get_cache()
+        cache = get_multi_cache()
         await cache.delete(f"admin:info:{admin_id}")
 
         return True
@@ -12,11 +12,15 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core import BadRequestException, NotFoundException
+from ..core.cache import cache_result, invalidate_cache_tags
+from ..core.invalidation_bus import ChangeKind, EntityType, publish_entity_change
 from ..models.app_request import ApplicationRequest
 from ..models.authorization import OperatorAppAuthorization
 from ..models.application import Application
 from ..models.operator import OperatorAccount
+from ..models.transaction import TransactionRecord
 from ..schemas.operator import ApplicationRequestItem, ApplicationRequestListResponse
+from .balance_ledger import BalanceLedger
 
 
 class AdminService:
@@ -183,6 +187,8 @@ class AdminService:
         # Commit changes
         await self.db.commit()
         await self.db.refresh(request)
+        if action == "approve":
+            await invalidate_cache_tags(f"operator:{request.operator_id}")
 
         # Load application relation if not loaded
         if not request.application:
@@ -283,6 +289,8 @@ class AdminService:
         # Execute query
         result = await self.db.execute(query)
         operators = result.scalars().all()
+        # Total balance including balance shards
+        balances = await BalanceLedger(self.db).get_balances(op.id for op in operators)
 
         # Convert to response items
         items = [
@@ -292,7 +300,7 @@ class AdminService:
                 "full_name": op.full_name,
                 "email": op.email,
                 "phone": op.phone,
-                "balance": float(op.balance),
+                "balance": float(balances[op.id]),
                 "customer_tier": op.customer_tier,
                 "is_active": op.is_active,
                 "is_locked": op.is_locked,
@@ -313,6 +321,7 @@ class AdminService:
             "items": items
         }
 
+    @cache_result("catalog", ttl=60, tags=["applications"])
     async def get_applications(
         self,
         search: Optional[str] = None,
@@ -321,6 +330,9 @@ class AdminService:
     ) -> dict:
         """Get applications list for admin.
 
+        Cached per (search, page, page_size) for 60 seconds; application
+        changes invalidate the "applications" tag.
+
         Args:
             search: Search by app_code or app_name
             page: Page number (starts from 1)
@@ -449,6 +461,7 @@ class AdminService:
         self.db.add(app)
         await self.db.commit()
         await self.db.refresh(app)
+        await invalidate_cache_tags("applications")
 
         return {
             "id": str(app.id),
@@ -507,6 +520,8 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(app)
+        await publish_entity_change(EntityType.APPLICATION, app.id)
+        await invalidate_cache_tags("applications")
 
         return {
             "id": str(app.id),
@@ -565,6 +580,8 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(app)
+        await publish_entity_change(EntityType.APPLICATION, app.id)
+        await invalidate_cache_tags("applications")
 
         return {
             "id": str(app.id),
@@ -649,6 +666,13 @@ class AdminService:
         self.db.add(authorization)
         await self.db.commit()
         await self.db.refresh(authorization)
+        await publish_entity_change(
+            EntityType.AUTHORIZATION,
+            authorization.id,
+            operator_id=op_uuid,
+            application_id=app_uuid
+        )
+        await invalidate_cache_tags(f"operator:{op_uuid}")
 
         return {
             "id": str(authorization.id),
@@ -705,6 +729,14 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(authorization)
+        await publish_entity_change(
+            EntityType.AUTHORIZATION,
+            authorization.id,
+            ChangeKind.DELETED,
+            operator_id=op_uuid,
+            application_id=app_uuid
+        )
+        await invalidate_cache_tags(f"operator:{op_uuid}")
 
         return {
             "id": str(authorization.id),
@@ -939,6 +971,8 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(site)
+        await publish_entity_change(EntityType.SITE, site.id)
+        await invalidate_cache_tags(f"operator:{site.operator_id}")
 
         return {
             "site_id": site.id,
@@ -996,6 +1030,8 @@ class AdminService:
         site.updated_at = datetime.now(timezone.utc)
 
         await self.db.commit()
+        await publish_entity_change(EntityType.SITE, site.id, ChangeKind.DELETED)
+        await invalidate_cache_tags(f"operator:{site.operator_id}")
 
     async def create_operator(
         self,
@@ -1093,7 +1129,7 @@ class AdminService:
             "email": operator.email,
             "phone": operator.phone,
             "customer_tier": operator.customer_tier,
-            "balance": float(operator.balance),
+            "balance": float(await BalanceLedger(self.db).get_balance(operator.id)),
             "is_active": operator.is_active,
             "is_locked": operator.is_locked,
             "locked_reason": operator.locked_reason,
@@ -1104,3 +1140,64 @@ class AdminService:
             "created_at": operator.created_at,
             "updated_at": operator.updated_at
         }
+
+    # ==================== Dashboard Statistics ====================
+
+    @cache_result("dashboard", ttl=30, tags=["applications"])
+    async def get_dashboard_stats(self) -> dict:
+        """Get dashboard statistics for the admin panel.
+
+        Cached for 30 seconds (shared by all admins); application changes
+        invalidate the "applications" tag, the other counts follow the TTL.
+
+        Returns:
+            dict: Operator/application/pending request counts and today's
+                consumption count and revenue
+        """
+        # Get operators count
+        operators_result = await self.db.execute(
+            select(func.count(OperatorAccount.id)).where(
+                OperatorAccount.deleted_at.is_(None)
+            )
+        )
+        operators_count = operators_result.scalar() or 0
+
+        # Get applications count
+        apps_result = await self.db.execute(
+            select(func.count(Application.id)).where(
+                Application.is_active == True
+            )
+        )
+        applications_count = apps_result.scalar() or 0
+
+        # Get pending requests count
+        pending_result = await self.db.execute(
+            select(func.count(ApplicationRequest.id)).where(
+                ApplicationRequest.status == "pending"
+            )
+        )
+        pending_requests_count = pending_result.scalar() or 0
+
+        # Get today's transactions count and revenue
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        transactions_result = await self.db.execute(
+            select(
+                func.count(TransactionRecord.id),
+                func.coalesce(func.sum(TransactionRecord.amount), 0)
+            ).where(
+                TransactionRecord.created_at >= today_start,
+                TransactionRecord.transaction_type == "consumption"
+            )
+        )
+        row = transactions_result.first()
+        today_transactions_count = row[0] if row else 0
+        today_revenue = str(row[1]) if row else "0.00"
+
+        return {
+            "operators_count": operators_count,
+            "applications_count": applications_count,
+            "pending_requests_count": pending_requests_count,
+            "today_transactions_count": today_transactions_count,
+            "today_revenue": today_revenue,
+        }
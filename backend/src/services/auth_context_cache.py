@@ -0,0 +1,342 @@
+"""授权上下文缓存 (AuthContextCache)
+
+此模块为 POST /v1/auth/game/authorize 提供进程内的授权上下文缓存。
+
+授权热路径每次都要依次查询运营商、运营点、应用和授权关系，而这些数据
+在两次头显启动之间几乎不会变化。本缓存以 (api_key, site_id, app_id) 为键，
+保存验证通过后的只读快照，命中时热路径只需执行一次扣费事务。
+
+关键特性:
+- 每个worker进程独立(进程内缓存，不经过网络)
+- 有界容量，按LRU淘汰
+- TTL过期，并受授权到期时间约束
+- 只缓存验证成功的上下文(失败结果每次都重新查询数据库)
+- 管理操作后显式失效(按运营商/运营点/应用)
+- 订阅跨worker失效总线(core.invalidation_bus)，其他worker的变更毫秒级生效
+
+注意:
+- 快照中不包含余额，余额始终在扣费事务中读取
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+import structlog
+
+from ..core.config import get_settings
+from ..core.invalidation_bus import (
+    ChangeKind,
+    EntityChangeEvent,
+    EntityType,
+    InvalidationBus,
+    get_invalidation_bus,
+)
+from ..models.application import Application
+from ..models.authorization import OperatorAppAuthorization
+from ..models.operator import OperatorAccount
+from ..models.site import OperationSite
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class OperatorSnapshot:
+    """运营商只读快照(不含余额)"""
+
+    id: UUID
+    is_active: bool
+    is_locked: bool
+    customer_tier: str
+
+
+@dataclass(frozen=True)
+class SiteSnapshot:
+    """运营点只读快照"""
+
+    id: UUID
+    operator_id: UUID
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class ApplicationSnapshot:
+    """应用只读快照
+
+    属性名与 Application 模型保持一致，可直接传给
+    AuthService.verify_player_count 和 BillingService.create_authorization_transaction。
+    """
+
+    id: UUID
+    app_name: str
+    price_per_player: Decimal
+    min_players: int
+    max_players: int
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class AuthorizationContext:
+    """一次授权请求所需的全部验证结果"""
+
+    operator: OperatorSnapshot
+    site: SiteSnapshot
+    application: ApplicationSnapshot
+    authorization_id: UUID
+    authorization_expires_at: Optional[datetime]
+
+    @classmethod
+    def from_models(
+        cls,
+        operator: OperatorAccount,
+        site: OperationSite,
+        application: Application,
+        authorization: OperatorAppAuthorization
+    ) -> "AuthorizationContext":
+        """从已验证的ORM对象构造快照
+
+        Args:
+            operator: 运营商账户
+            site: 运营点
+            application: 应用
+            authorization: 授权关系
+
+        Returns:
+            AuthorizationContext: 授权上下文快照
+        """
+        return cls(
+            operator=OperatorSnapshot(
+                id=operator.id,
+                is_active=operator.is_active,
+                is_locked=operator.is_locked,
+                customer_tier=operator.customer_tier,
+            ),
+            site=SiteSnapshot(
+                id=site.id,
+                operator_id=site.operator_id,
+                is_active=site.is_active,
+            ),
+            application=ApplicationSnapshot(
+                id=application.id,
+                app_name=application.app_name,
+                price_per_player=application.price_per_player,
+                min_players=application.min_players,
+                max_players=application.max_players,
+                is_active=application.is_active,
+            ),
+            authorization_id=authorization.id,
+            authorization_expires_at=authorization.expires_at,
+        )
+
+    def is_authorization_expired(self) -> bool:
+        """授权是否已过期"""
+        expires_at = self.authorization_expires_at
+        if expires_at is None:
+            return False
+        return expires_at < datetime.now(expires_at.tzinfo)
+
+
+CacheKey = tuple[str, str, str]
+
+
+class AuthContextCache:
+    """进程内授权上下文缓存(TTL + LRU)"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        """初始化缓存
+
+        Args:
+            max_size: 最大条目数，超出后淘汰最久未使用的条目
+            ttl_seconds: 条目存活时间(秒)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, tuple[float, AuthorizationContext]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(api_key: str, site_id: str, app_id: str) -> CacheKey:
+        """构造缓存键
+
+        site_id/app_id 使用请求中的原始字符串，避免在命中路径上解析UUID。
+        """
+        return (api_key, site_id, app_id)
+
+    def get(self, api_key: str, site_id: str, app_id: str) -> Optional[AuthorizationContext]:
+        """读取授权上下文
+
+        过期条目(TTL到期或授权到期)会被移除并视为未命中。
+
+        Returns:
+            Optional[AuthorizationContext]: 命中返回快照，否则返回None
+        """
+        key = self.make_key(api_key, site_id, app_id)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, context = entry
+            if expires_at <= now or context.is_authorization_expired():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return context
+
+    def set(
+        self,
+        api_key: str,
+        site_id: str,
+        app_id: str,
+        context: AuthorizationContext
+    ) -> None:
+        """写入授权上下文
+
+        Args:
+            api_key: 运营商API Key
+            site_id: 运营点ID(请求原始字符串)
+            app_id: 应用ID(请求原始字符串)
+            context: 已验证的授权上下文
+        """
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+
+        key = self.make_key(api_key, site_id, app_id)
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._entries[key] = (expires_at, context)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_operator(self, operator_id: UUID) -> int:
+        """失效某运营商的全部上下文(API Key重置、账户锁定/注销、授权变更)
+
+        Returns:
+            int: 移除的条目数
+        """
+        return self._invalidate(lambda ctx: ctx.operator.id == operator_id, operator_id=operator_id)
+
+    def invalidate_site(self, site_id: UUID) -> int:
+        """失效某运营点的全部上下文(运营点更新/删除)
+
+        Returns:
+            int: 移除的条目数
+        """
+        return self._invalidate(lambda ctx: ctx.site.id == site_id, site_id=site_id)
+
+    def invalidate_application(self, application_id: UUID) -> int:
+        """失效某应用的全部上下文(价格、玩家范围、上下架变更)
+
+        Returns:
+            int: 移除的条目数
+        """
+        return self._invalidate(
+            lambda ctx: ctx.application.id == application_id,
+            application_id=application_id
+        )
+
+    def invalidate_authorization(self, operator_id: UUID, application_id: UUID) -> int:
+        """失效某运营商对某应用的上下文(授权/撤销授权)
+
+        Returns:
+            int: 移除的条目数
+        """
+        return self._invalidate(
+            lambda ctx: ctx.operator.id == operator_id and ctx.application.id == application_id,
+            operator_id=operator_id,
+            application_id=application_id
+        )
+
+    def handle_event(self, event: EntityChangeEvent) -> None:
+        """处理失效总线事件
+
+        余额变更不影响快照(快照不含余额)，直接忽略。
+        """
+        if event.change == ChangeKind.BALANCE_CHANGED:
+            return
+
+        if event.entity_type == EntityType.OPERATOR:
+            self.invalidate_operator(UUID(event.entity_id))
+        elif event.entity_type == EntityType.SITE:
+            self.invalidate_site(UUID(event.entity_id))
+        elif event.entity_type == EntityType.APPLICATION:
+            self.invalidate_application(UUID(event.entity_id))
+        elif event.entity_type == EntityType.AUTHORIZATION:
+            if event.operator_id and event.application_id:
+                self.invalidate_authorization(
+                    UUID(event.operator_id), UUID(event.application_id)
+                )
+            elif event.operator_id:
+                self.invalidate_operator(UUID(event.operator_id))
+
+    def register(self, bus: InvalidationBus) -> None:
+        """订阅失效总线"""
+        for entity_type in EntityType:
+            bus.subscribe(entity_type, self.handle_event)
+        bus.on_reset(self.clear)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _invalidate(self, predicate, **log_fields) -> int:
+        """按条件移除条目
+
+        管理操作频率很低，且缓存有界，线性扫描即可。
+        """
+        with self._lock:
+            stale_keys = [
+                key for key, (_, context) in self._entries.items() if predicate(context)
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+
+        if stale_keys:
+            logger.debug(
+                "auth_context_invalidated",
+                removed=len(stale_keys),
+                **{name: str(value) for name, value in log_fields.items()}
+            )
+        return len(stale_keys)
+
+
+# Global cache instance (per worker process)
+_auth_context_cache: Optional[AuthContextCache] = None
+
+
+def get_auth_context_cache() -> AuthContextCache:
+    """获取全局授权上下文缓存实例
+
+    Returns:
+        AuthContextCache: 当前worker进程的缓存实例
+    """
+    global _auth_context_cache
+    if _auth_context_cache is None:
+        settings = get_settings()
+        _auth_context_cache = AuthContextCache(
+            max_size=settings.AUTH_CONTEXT_CACHE_MAX_SIZE,
+            ttl_seconds=settings.AUTH_CONTEXT_CACHE_TTL_SECONDS,
+        )
+        _auth_context_cache.register(get_invalidation_bus())
+    return _auth_context_cache
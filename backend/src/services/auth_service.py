@@ -10,19 +10,34 @@
 5. 运营点验证 - 验证运营点归属
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Load, raiseload
 
 from ..models.application import Application
 from ..models.authorization import OperatorAppAuthorization
 from ..models.operator import OperatorAccount
 from ..models.site import OperationSite
 
+# 会话ID时间戳有效期(秒): 早于当前时间超过该值的会话ID被拒绝
+SESSION_ID_MAX_AGE_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class AuthorizationChain:
+    """授权验证联表查询结果(未经检查, 不存在的记录为None)"""
+
+    operator: Optional[OperatorAccount]
+    site: Optional[OperationSite]
+    application: Optional[Application]
+    authorization: Optional[OperatorAppAuthorization]
+
 
 class AuthService:
     """授权验证服务
@@ -56,14 +71,28 @@ class AuthService:
             HTTPException 401: API Key无效或账户已注销
             HTTPException 403: 账户已锁定
         """
-        # 查询运营商账户(排除软删除记录)
-        stmt = select(OperatorAccount).where(
+        # 查询运营商账户(排除软删除记录, 授权路径不需要任何关联对象)
+        stmt = select(OperatorAccount).options(raiseload("*")).where(
             OperatorAccount.api_key == api_key,
             OperatorAccount.deleted_at.is_(None)
         )
         result = await self.db.execute(stmt)
-        operator = result.scalar_one_or_none()
+        return self.check_operator(result.scalar_one_or_none())
+
+    @staticmethod
+    def check_operator(operator: Optional[OperatorAccount]) -> OperatorAccount:
+        """检查运营商账户状态
+
+        Args:
+            operator: 按API Key查询到的运营商(不存在时为None)
+
+        Returns:
+            OperatorAccount: 验证通过的运营商对象
 
+        Raises:
+            HTTPException 401: API Key无效或账户已注销
+            HTTPException 403: 账户已锁定
+        """
         # 验证API Key存在
         if not operator:
             raise HTTPException(
@@ -120,13 +149,33 @@ class AuthService:
             HTTPException 404: 运营点不存在
             HTTPException 403: 运营点不属于该运营商
         """
-        stmt = select(OperationSite).where(
+        stmt = select(OperationSite).options(raiseload("*")).where(
             OperationSite.id == site_id,
             OperationSite.deleted_at.is_(None)
         )
         result = await self.db.execute(stmt)
-        site = result.scalar_one_or_none()
+        return self.check_site(result.scalar_one_or_none(), site_id, operator_id)
+
+    @staticmethod
+    def check_site(
+        site: Optional[OperationSite],
+        site_id: UUID,
+        operator_id: UUID
+    ) -> OperationSite:
+        """检查运营点归属和状态
 
+        Args:
+            site: 查询到的运营点(不存在或已删除时为None)
+            site_id: 请求的运营点ID
+            operator_id: 运营商ID
+
+        Returns:
+            OperationSite: 验证通过的运营点对象
+
+        Raises:
+            HTTPException 404: 运营点不存在
+            HTTPException 403: 运营点不属于该运营商或已停用
+        """
         if not site:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -180,10 +229,41 @@ class AuthService:
             HTTPException 403: 应用未授权或授权已过期
         """
         # 查询应用
-        stmt = select(Application).where(Application.id == application_id)
+        stmt = select(Application).options(raiseload("*")).where(
+            Application.id == application_id
+        )
         result = await self.db.execute(stmt)
-        application = result.scalar_one_or_none()
+        application = self.check_application(result.scalar_one_or_none(), application_id)
+
+        # 查询授权关系
+        stmt = select(OperatorAppAuthorization).options(raiseload("*")).where(
+            OperatorAppAuthorization.operator_id == operator_id,
+            OperatorAppAuthorization.application_id == application_id,
+            OperatorAppAuthorization.is_active == True
+        )
+        result = await self.db.execute(stmt)
+        authorization = self.check_authorization(result.scalar_one_or_none(), application)
+
+        return application, authorization
+
+    @staticmethod
+    def check_application(
+        application: Optional[Application],
+        application_id: UUID
+    ) -> Application:
+        """检查应用是否存在且已上架
+
+        Args:
+            application: 查询到的应用(不存在时为None)
+            application_id: 请求的应用ID
+
+        Returns:
+            Application: 验证通过的应用对象
 
+        Raises:
+            HTTPException 404: 应用不存在
+            HTTPException 403: 应用已下架
+        """
         if not application:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -202,15 +282,25 @@ class AuthService:
                 }
             )
 
-        # 查询授权关系
-        stmt = select(OperatorAppAuthorization).where(
-            OperatorAppAuthorization.operator_id == operator_id,
-            OperatorAppAuthorization.application_id == application_id,
-            OperatorAppAuthorization.is_active == True
-        )
-        result = await self.db.execute(stmt)
-        authorization = result.scalar_one_or_none()
+        return application
+
+    @staticmethod
+    def check_authorization(
+        authorization: Optional[OperatorAppAuthorization],
+        application: Application
+    ) -> OperatorAppAuthorization:
+        """检查运营商对应用的授权是否有效
+
+        Args:
+            authorization: 查询到的有效授权关系(不存在时为None)
+            application: 已验证的应用对象
+
+        Returns:
+            OperatorAppAuthorization: 验证通过的授权关系
 
+        Raises:
+            HTTPException 403: 应用未授权或授权已过期
+        """
         if not authorization:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -218,7 +308,7 @@ class AuthService:
                     "error_code": "APP_NOT_AUTHORIZED",
                     "message": f"您未被授权使用此应用，请联系管理员申请授权",
                     "details": {
-                        "app_id": str(application_id),
+                        "app_id": str(application.id),
                         "app_name": application.app_name
                     }
                 }
@@ -238,7 +328,65 @@ class AuthService:
                 }
             )
 
-        return application, authorization
+        return authorization
+
+    async def load_authorization_chain(
+        self,
+        api_key: str,
+        site_id: Optional[UUID],
+        application_id: Optional[UUID]
+    ) -> "AuthorizationChain":
+        """一条联表查询取回授权验证所需的全部记录
+
+        以运营商为主表, 左连接运营点、应用和有效授权关系, 冷缓存时
+        把四次顺序查询合并为一次往返。不做任何检查, 由调用方按原有顺序调用
+        check_operator / check_site / check_application / check_authorization,
+        保证错误码与逐个查询时一致。
+
+        Args:
+            api_key: 运营商API Key
+            site_id: 运营点ID(格式错误时传None, 运营点为空)
+            application_id: 应用ID(格式错误时传None, 应用和授权为空)
+
+        Returns:
+            AuthorizationChain: 查询结果(API Key无效时全部为None)
+        """
+        stmt = (
+            select(OperatorAccount, OperationSite, Application, OperatorAppAuthorization)
+            .select_from(OperatorAccount)
+            .outerjoin(
+                OperationSite,
+                and_(
+                    OperationSite.id == site_id,
+                    OperationSite.deleted_at.is_(None)
+                )
+            )
+            .outerjoin(Application, Application.id == application_id)
+            .outerjoin(
+                OperatorAppAuthorization,
+                and_(
+                    OperatorAppAuthorization.operator_id == OperatorAccount.id,
+                    OperatorAppAuthorization.application_id == Application.id,
+                    OperatorAppAuthorization.is_active == True
+                )
+            )
+            .where(
+                OperatorAccount.api_key == api_key,
+                OperatorAccount.deleted_at.is_(None)
+            )
+            .options(
+                Load(OperatorAccount).raiseload("*"),
+                Load(OperationSite).raiseload("*"),
+                Load(Application).raiseload("*"),
+                Load(OperatorAppAuthorization).raiseload("*")
+            )
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        row = result.first()
+        if row is None:
+            return AuthorizationChain(None, None, None, None)
+        return AuthorizationChain(*row)
 
     async def verify_player_count(
         self,
@@ -325,7 +473,7 @@ class AuthService:
             current_timestamp = int(datetime.utcnow().timestamp())
             time_diff = current_timestamp - session_timestamp
 
-            if time_diff > 300:  # 5分钟 = 300秒
+            if time_diff > SESSION_ID_MAX_AGE_SECONDS:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail={
@@ -335,7 +483,7 @@ class AuthService:
                             "session_timestamp": session_timestamp,
                             "current_timestamp": current_timestamp,
                             "time_diff_seconds": time_diff,
-                            "max_allowed_seconds": 300
+                            "max_allowed_seconds": SESSION_ID_MAX_AGE_SECONDS
                         }
                     }
                 )
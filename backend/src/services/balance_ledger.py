@@ -0,0 +1,367 @@
+"""余额账本 (BalanceLedger)
+
+运营商余额的统一读写入口, 屏蔽余额分片模式的细节。
+
+分片模式(按客户分类开启, 见 Settings.BALANCE_SHARD_TIERS):
+- 总余额 = operator_accounts.balance(主行) + SUM(operator_balance_shards.balance)
+- 授权扣费轮询选择一个分片, 在该分片上执行条件UPDATE, 只锁一行
+- 分片余额不足(或分片尚未创建)时执行合并扣费: 锁定主行和未被占用的分片,
+  从这些行的合计余额中扣费后把剩余余额平均分配到这些分片(自动均衡)
+- 充值/退款前先把分片余额归集回主行, 原有基于 operator.balance 的逻辑不变
+
+未开启分片的运营商只使用主行, 行为与原来一致。
+
+锁顺序: 组提交批次可能先扣过某个分片(持有分片锁)再对同一运营商合并扣费(等待主行锁)。
+- 合并扣费持有主行锁后只用 SKIP LOCKED 锁分片, 跳过被占用的分片而不是等待,
+  不会形成死锁环。代价是被跳过的分片余额不计入本次合并扣费的可用余额。
+- 归集(充值/退款)不能跳过分片, 否则未归集的分片余额在退款清零后仍可消费:
+  先按序号等待并锁定全部分片, 再锁主行, 同样不会在持有主行锁时等待已有分片。
+"""
+
+import itertools
+from decimal import ROUND_DOWN, Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.utils.money import round_money
+from ..models.balance_shard import OperatorBalanceShard
+from ..models.operator import OperatorAccount
+
+CENT = Decimal("0.01")
+
+# 进程内轮询计数器(各worker独立, 只需大致均匀)
+_round_robin = itertools.count()
+
+
+class BalanceLedger:
+    """余额账本
+
+    负责条件扣费、分片合并扣费与均衡、总余额查询和分片归集。
+    """
+
+    def __init__(self, db: AsyncSession):
+        """初始化余额账本
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+
+    @staticmethod
+    def shard_count(customer_tier: Optional[str]) -> int:
+        """获取客户分类对应的分片数(0表示不分片)
+
+        Args:
+            customer_tier: 客户分类 vip/standard/trial
+
+        Returns:
+            int: 分片数
+        """
+        if not customer_tier:
+            return 0
+        return get_settings().balance_shards_by_tier.get(customer_tier, 0)
+
+    @staticmethod
+    def next_shard(shard_count: int) -> Optional[int]:
+        """轮询选择本次扣费的分片
+
+        Args:
+            shard_count: 分片数
+
+        Returns:
+            Optional[int]: 分片序号, 不分片时返回None(扣主行)
+        """
+        if shard_count <= 0:
+            return None
+        return next(_round_robin) % shard_count
+
+    @staticmethod
+    def debit_update(operator_id: UUID, amount: Decimal, shard_index: Optional[int] = None):
+        """构造条件扣费语句(余额不足时不更新任何行)
+
+        不同步会话中已加载的对象, 扣费后余额以 RETURNING 结果为准。
+
+        Args:
+            operator_id: 运营商ID
+            amount: 扣费金额
+            shard_index: 分片序号, None表示扣主行
+
+        Returns:
+            Update: 条件UPDATE语句(未附加RETURNING)
+        """
+        if shard_index is None:
+            return (
+                update(OperatorAccount)
+                .where(
+                    OperatorAccount.id == operator_id,
+                    OperatorAccount.balance >= amount
+                )
+                .values(balance=OperatorAccount.balance - amount)
+                .execution_options(synchronize_session=False)
+            )
+
+        return (
+            update(OperatorBalanceShard)
+            .where(
+                OperatorBalanceShard.operator_id == operator_id,
+                OperatorBalanceShard.shard_index == shard_index,
+                OperatorBalanceShard.balance >= amount
+            )
+            .values(balance=OperatorBalanceShard.balance - amount)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def total_balance_expr(operator_id: UUID):
+        """总余额表达式(主行余额 + 分片余额合计)
+
+        需在 FROM operator_accounts WHERE id = :operator_id 的查询中使用, 例如:
+            select(BalanceLedger.total_balance_expr(op_id)).where(OperatorAccount.id == op_id)
+        传入 OperatorAccount.id 列时为按行关联的子查询, 可用于列表查询(见 get_balances)。
+
+        Returns:
+            ColumnElement: 总余额列表达式
+        """
+        shard_total = (
+            select(func.coalesce(func.sum(OperatorBalanceShard.balance), 0))
+            .where(OperatorBalanceShard.operator_id == operator_id)
+            .scalar_subquery()
+        )
+        return OperatorAccount.balance + shard_total
+
+    async def get_balance(self, operator_id: UUID) -> Optional[Decimal]:
+        """查询总余额(合并视图)
+
+        Args:
+            operator_id: 运营商ID
+
+        Returns:
+            Optional[Decimal]: 总余额, 运营商不存在时返回None
+        """
+        result = await self.db.execute(
+            select(self.total_balance_expr(operator_id))
+            .where(OperatorAccount.id == operator_id)
+        )
+        balance = result.scalar_one_or_none()
+        return None if balance is None else round_money(balance)
+
+    async def get_balances(self, operator_ids: Iterable[UUID]) -> dict[UUID, Decimal]:
+        """批量查询总余额(列表页使用, 一次查询)
+
+        Args:
+            operator_ids: 运营商ID列表
+
+        Returns:
+            dict[UUID, Decimal]: 运营商ID -> 总余额, 不存在的运营商不在结果中
+        """
+        operator_ids = set(operator_ids)
+        if not operator_ids:
+            return {}
+        result = await self.db.execute(
+            select(OperatorAccount.id, self.total_balance_expr(OperatorAccount.id))
+            .where(OperatorAccount.id.in_(operator_ids))
+        )
+        return {operator_id: round_money(balance) for operator_id, balance in result.all()}
+
+    async def debit(
+        self,
+        operator_id: UUID,
+        amount: Decimal,
+        shard_index: Optional[int] = None
+    ) -> Optional[Decimal]:
+        """条件扣费(热路径)
+
+        Args:
+            operator_id: 运营商ID
+            amount: 扣费金额
+            shard_index: 分片序号, None表示扣主行
+
+        Returns:
+            Optional[Decimal]: 扣费后总余额; 余额不足或行不存在时返回None
+        """
+        stmt = self.debit_update(operator_id, amount, shard_index)
+        if shard_index is None:
+            stmt = stmt.returning(OperatorAccount.balance)
+        else:
+            stmt = stmt.returning(OperatorBalanceShard.balance)
+
+        result = await self.db.execute(stmt)
+        balance = result.scalar_one_or_none()
+
+        if balance is None or shard_index is None:
+            return balance
+        return await self.get_balance(operator_id)
+
+    async def pooled_debit(
+        self,
+        operator_id: UUID,
+        amount: Decimal,
+        shard_count: int
+    ) -> Optional[Decimal]:
+        """合并扣费并重新均衡
+
+        锁定主行和未被其他事务占用的分片(SKIP LOCKED), 按这些行的合计余额
+        判断是否足够; 扣费后把剩余余额平均分配到已锁定和新建的分片(不足一分的
+        零头留在主行), 被跳过的分片保持不变。shard_count 为0时剩余余额全部归集
+        到主行。
+
+        Args:
+            operator_id: 运营商ID
+            amount: 扣费金额(0表示只均衡)
+            shard_count: 目标分片数
+
+        Returns:
+            Optional[Decimal]: 扣费后总余额(被跳过的分片按读取时的余额计入);
+                可用余额不足或运营商不存在时返回None
+        """
+        result = await self.db.execute(
+            select(OperatorAccount.balance)
+            .where(OperatorAccount.id == operator_id)
+            .with_for_update()
+        )
+        main_balance = result.scalar_one_or_none()
+        if main_balance is None:
+            return None
+
+        result = await self.db.execute(
+            select(OperatorBalanceShard.shard_index, OperatorBalanceShard.balance)
+            .where(OperatorBalanceShard.operator_id == operator_id)
+        )
+        existing = {index: balance for index, balance in result.all()}
+        shards = await self._lock_shards(operator_id)
+        skipped_total = sum(
+            (balance for index, balance in existing.items() if index not in shards),
+            Decimal("0.00")
+        )
+
+        total = main_balance + sum(shards.values(), Decimal("0.00"))
+        if total < amount:
+            return None
+
+        remaining = total - amount
+        await self._distribute(operator_id, remaining, shard_count, set(existing), set(shards))
+        return remaining + skipped_total
+
+    async def rebalance(self, operator_id: UUID, shard_count: int) -> Optional[Decimal]:
+        """重新均衡分片余额
+
+        Args:
+            operator_id: 运营商ID
+            shard_count: 目标分片数
+
+        Returns:
+            Optional[Decimal]: 总余额, 运营商不存在时返回None
+        """
+        return await self.pooled_debit(operator_id, Decimal("0.00"), shard_count)
+
+    async def consolidate(self, operator: OperatorAccount) -> Decimal:
+        """把分片余额归集回主行
+
+        充值、退款等低频操作在读写 operator.balance 之前调用: 锁定全部分片和
+        主行并刷新主行, 再把全部分片余额并入 operator.balance, 之后调用方可按
+        原逻辑处理(operator.balance 即总余额)。
+        分片会在下一次合并扣费时自动重新均衡。
+
+        Args:
+            operator: 运营商账户对象
+
+        Returns:
+            Decimal: 归集的金额
+        """
+        # 先锁全部分片(等待正在扣费的事务)再锁主行, 见模块说明中的锁顺序
+        shards = await self._lock_shards(operator.id, skip_locked=False)
+        await self.db.refresh(operator, attribute_names=["balance"], with_for_update=True)
+        # 等待主行锁期间合并扣费可能新建了分片, 一并锁定归集
+        shards.update(await self._lock_shards(operator.id, skip_locked=False))
+        moved = sum(shards.values(), Decimal("0.00"))
+
+        if moved:
+            await self.db.execute(
+                update(OperatorBalanceShard)
+                .where(
+                    OperatorBalanceShard.operator_id == operator.id,
+                    OperatorBalanceShard.shard_index.in_(shards)
+                )
+                .values(balance=Decimal("0.00"))
+                .execution_options(synchronize_session=False)
+            )
+            operator.balance = operator.balance + moved
+
+        return moved
+
+    async def _lock_shards(
+        self, operator_id: UUID, skip_locked: bool = True
+    ) -> dict[int, Decimal]:
+        """按序号锁定分片
+
+        Args:
+            operator_id: 运营商ID
+            skip_locked: 跳过被其他事务占用的分片(调用方已持有主行锁时必须为True);
+                False时等待并锁定全部分片
+
+        Returns:
+            dict[int, Decimal]: 已锁定分片的 序号 -> 余额
+        """
+        result = await self.db.execute(
+            select(OperatorBalanceShard.shard_index, OperatorBalanceShard.balance)
+            .where(OperatorBalanceShard.operator_id == operator_id)
+            .order_by(OperatorBalanceShard.shard_index)
+            .with_for_update(skip_locked=skip_locked)
+        )
+        return {index: balance for index, balance in result.all()}
+
+    async def _distribute(
+        self,
+        operator_id: UUID,
+        total: Decimal,
+        shard_count: int,
+        existing_shards: set[int],
+        locked_shards: set[int]
+    ) -> None:
+        """把余额分配到主行、已锁定的分片和新建的分片(调用方已持有这些行锁)"""
+        missing = [index for index in range(shard_count) if index not in existing_shards]
+        targets = sum(1 for index in locked_shards if index < shard_count) + len(missing)
+        if targets > 0:
+            per_shard = (total / targets).quantize(CENT, rounding=ROUND_DOWN)
+        else:
+            per_shard = Decimal("0.00")
+        main_balance = total - per_shard * targets
+
+        await self.db.execute(
+            update(OperatorAccount)
+            .where(OperatorAccount.id == operator_id)
+            .values(balance=main_balance)
+            .execution_options(synchronize_session=False)
+        )
+
+        if locked_shards:
+            await self.db.execute(
+                update(OperatorBalanceShard)
+                .where(
+                    OperatorBalanceShard.operator_id == operator_id,
+                    OperatorBalanceShard.shard_index.in_(locked_shards)
+                )
+                .values(
+                    # 分片数调小时, 多出的分片清零
+                    balance=case(
+                        (OperatorBalanceShard.shard_index < shard_count, per_shard),
+                        else_=Decimal("0.00")
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        if missing:
+            self.db.add_all([
+                OperatorBalanceShard(
+                    operator_id=operator_id,
+                    shard_index=index,
+                    balance=per_shard
+                )
+                for index in missing
+            ])
+            await self.db.flush()
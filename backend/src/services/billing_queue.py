@@ -0,0 +1,263 @@
+"""计费组提交队列 (BillingQueue)
+
+突发流量下每个授权请求各自提交一次事务(各自一次WAL刷盘)。开启组提交后
+(BILLING_GROUP_COMMIT_ENABLED), 授权扣费先进入本队列:
+
+- 在时间窗口(BILLING_GROUP_COMMIT_WINDOW_MS)内到达, 或达到批大小
+  (BILLING_GROUP_COMMIT_MAX_BATCH)的请求合并为一批
+- 整批在一个数据库事务中执行, 每个请求一个保存点(SAVEPOINT)
+- 单个请求失败(402余额不足、409会话ID重复)只回滚自己的保存点, 不影响同批其他请求
+- 整批一次提交, 提交后再逐个完成调用方的 Future
+
+关键特性:
+- 每个worker进程一个队列
+- 批内按运营商ID排序, 不同批之间加锁顺序一致
+- 保存点内出现数据库错误(如死锁)的请求, 以及整批提交失败时的全部请求,
+  退回为单独事务重试(整批已回滚, 会话ID幂等性保证不会重复扣费)
+- 调用方取消(客户端断开)不会取消已入队的扣费, 头显重试时命中幂等性检查
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+import structlog
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models.transaction import TransactionRecord
+from ..models.usage_record import UsageRecord
+from .billing_service import BillingService
+from .finance_counters import record_transactions
+
+logger = structlog.get_logger(__name__)
+
+DebitResult = tuple[UsageRecord, TransactionRecord, Decimal]
+
+
+@dataclass(eq=False)
+class DebitRequest:
+    """队列中的一次授权扣费请求"""
+
+    session_id: str
+    operator_id: UUID
+    site_id: UUID
+    application: Any  # Application 或 ApplicationSnapshot
+    player_count: int
+    client_ip: Optional[str] = None
+    customer_tier: Optional[str] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def debit_kwargs(self) -> dict:
+        """BillingService 扣费方法的参数"""
+        return {
+            "session_id": self.session_id,
+            "operator_id": self.operator_id,
+            "site_id": self.site_id,
+            "application": self.application,
+            "player_count": self.player_count,
+            "client_ip": self.client_ip,
+            "customer_tier": self.customer_tier,
+        }
+
+    def resolve(self, result: Optional[DebitResult], error: Optional[BaseException]) -> None:
+        """完成调用方的 Future(调用方已取消时忽略)"""
+        if self.future is None or self.future.done():
+            return
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+
+class BillingQueue:
+    """授权扣费组提交队列"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        window_ms: float = 3.0,
+        max_batch: int = 32
+    ):
+        """初始化队列
+
+        Args:
+            session_factory: 数据库会话工厂, 默认使用全局 session maker
+            window_ms: 攒批时间窗口(毫秒)
+            max_batch: 批大小上限, 达到后立即执行
+        """
+        self._session_factory = session_factory
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._pending: list[DebitRequest] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(
+        self,
+        session_id: str,
+        operator_id: UUID,
+        site_id: UUID,
+        application: Any,
+        player_count: int,
+        client_ip: Optional[str] = None,
+        customer_tier: Optional[str] = None
+    ) -> DebitResult:
+        """提交一次授权扣费并等待所在批次提交
+
+        参数与返回值同 BillingService.create_authorization_transaction。
+
+        Raises:
+            HTTPException 402: 余额不足
+            HTTPException 409: 会话ID重复(幂等性冲突)
+            HTTPException 500: 扣费事务失败
+        """
+        loop = asyncio.get_running_loop()
+        request = DebitRequest(
+            session_id=session_id,
+            operator_id=operator_id,
+            site_id=site_id,
+            application=application,
+            player_count=player_count,
+            client_ip=client_ip,
+            customer_tier=customer_tier,
+            future=loop.create_future()
+        )
+        self._pending.append(request)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+
+        # 调用方取消不取消扣费本身
+        return await asyncio.shield(request.future)
+
+    async def drain(self) -> None:
+        """立即执行待处理请求并等待所有批次完成(应用关闭时调用)"""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _flush(self) -> None:
+        """取出当前批次并在后台执行"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._apply_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from ..db.session import get_session_maker
+            self._session_factory = get_session_maker()
+        return self._session_factory()
+
+    async def _apply_batch(self, batch: list[DebitRequest]) -> None:
+        """在一个事务中执行整批扣费, 每个请求一个保存点"""
+        # 固定加锁顺序, 降低不同批次之间死锁的概率
+        batch.sort(key=lambda request: str(request.operator_id))
+
+        outcomes: list[tuple[DebitRequest, Optional[DebitResult], Optional[HTTPException]]] = []
+        retry: list[DebitRequest] = []
+
+        try:
+            async with self._new_session() as db:
+                service = BillingService(db)
+
+                for request in batch:
+                    try:
+                        async with db.begin_nested():
+                            result = await service.apply_authorization_debit(**request.debit_kwargs())
+                        outcomes.append((request, result, None))
+                    except HTTPException as e:
+                        outcomes.append((request, None, e))
+                    except IntegrityError as e:
+                        error = await service.integrity_error_response(request.session_id, e)
+                        outcomes.append((request, None, error))
+                    except Exception as e:
+                        logger.warning(
+                            "billing_batch_request_deferred",
+                            session_id=request.session_id,
+                            error=str(e)
+                        )
+                        retry.append(request)
+
+                await db.commit()
+
+        except Exception as e:
+            # 整批已回滚, 全部改为单独事务执行
+            logger.warning("billing_batch_commit_failed", size=len(batch), error=str(e))
+            outcomes = []
+            retry = batch
+
+        self.batches += 1
+        self.requests += len(batch)
+        logger.debug("billing_batch_committed", size=len(batch), retried=len(retry))
+
+        for request, result, error in outcomes:
+            request.resolve(result, error)
+
+        # 整批提交后累加一次财务今日计数器
+        await record_transactions(result[1] for _, result, _ in outcomes if result is not None)
+
+        for request in retry:
+            await self._apply_single(request)
+
+    async def _apply_single(self, request: DebitRequest) -> None:
+        """单独事务执行一次扣费(组提交失败时的退路)"""
+        try:
+            async with self._new_session() as db:
+                result = await BillingService(db).create_authorization_transaction(
+                    **request.debit_kwargs()
+                )
+            request.resolve(result, None)
+        except HTTPException as e:
+            request.resolve(None, e)
+        except Exception as e:
+            request.resolve(None, HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={
+                    "error_code": "BILLING_TRANSACTION_FAILED",
+                    "message": "扣费事务失败，请重试",
+                    "details": str(e)
+                }
+            ))
+
+
+# Global queue instance (per worker process)
+_billing_queue: Optional[BillingQueue] = None
+
+
+def get_billing_queue() -> BillingQueue:
+    """获取全局计费组提交队列
+
+    Returns:
+        BillingQueue: 当前worker进程的队列实例
+    """
+    global _billing_queue
+    if _billing_queue is None:
+        settings = get_settings()
+        _billing_queue = BillingQueue(
+            window_ms=settings.BILLING_GROUP_COMMIT_WINDOW_MS,
+            max_batch=settings.BILLING_GROUP_COMMIT_MAX_BATCH,
+        )
+    return _billing_queue
+
+
+async def close_billing_queue() -> None:
+    """执行剩余的排队请求(应用关闭时调用)"""
+    if _billing_queue is not None:
+        await _billing_queue.drain()
@@ -5,32 +5,48 @@
 核心职责:
 1. 余额检查 - 确保账户余额充足
 2. 会话ID幂等性检查 - 防止重复扣费
-3. 扣费事务 - 使用行级锁确保并发安全
+3. 扣费事务 - 条件UPDATE原子扣费确保并发安全
 4. 使用记录创建 - 记录游戏会话详情
 5. 交易记录创建 - 记录资金流动
+6. 批量授权扣费 - 多个会话一次扣费(全部成功或尽力授权)
 
 关键特性:
 - 数据库事务保证原子性
-- SELECT FOR UPDATE行级锁防止并发冲突
+- 条件UPDATE(balance >= cost)原子扣费, 行锁只在单条语句内持有
 - 会话ID唯一约束保证幂等性
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import insert, literal, select, true
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
 
+from ..core.security.authorization_token import create_authorization_token
 from ..models.application import Application
+from ..models.balance_shard import OperatorBalanceShard
 from ..models.operator import OperatorAccount
 from ..models.site import OperationSite
 from ..models.transaction import TransactionRecord
 from ..models.usage_record import UsageRecord
-from ..core.utils.db_lock import select_for_update
+from .balance_ledger import BalanceLedger
+from .finance_counters import record_transactions
+
+
+@dataclass(frozen=True)
+class BatchDebitItem:
+    """批量授权中的单个待扣费会话"""
+
+    session_id: str
+    site_id: UUID
+    application: Any  # Application 或 ApplicationSnapshot
+    player_count: int
 
 
 class BillingService:
@@ -51,6 +67,7 @@ class BillingService:
         """检查会话ID幂等性
 
         如果会话ID已存在,返回已有的使用记录(防重复扣费)。
+        仅随记录加载 application (幂等响应需要应用名称), 其余关联不加载。
 
         Args:
             session_id: 游戏会话ID
@@ -58,10 +75,35 @@ class BillingService:
         Returns:
             Optional[UsageRecord]: 已存在的使用记录,如果不存在则返回None
         """
-        stmt = select(UsageRecord).where(UsageRecord.session_id == session_id)
+        stmt = (
+            select(UsageRecord)
+            .options(
+                joinedload(UsageRecord.application).raiseload("*"),
+                raiseload("*"),
+            )
+            .where(UsageRecord.session_id == session_id)
+        )
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_authorization_balance_after(self, usage_record_id: UUID) -> Optional[Decimal]:
+        """查询授权扣费后的余额(幂等响应使用)
+
+        Args:
+            usage_record_id: 使用记录ID
+
+        Returns:
+            Optional[Decimal]: 扣费交易记录中的扣费后余额, 不存在时返回None
+        """
+        result = await self.db.execute(
+            select(TransactionRecord.balance_after)
+            .where(
+                TransactionRecord.related_usage_id == usage_record_id,
+                TransactionRecord.transaction_type == "consumption"
+            )
+        )
+        return result.scalars().first()
+
     async def check_balance_sufficiency(
         self,
         operator: OperatorAccount,
@@ -98,19 +140,25 @@ class BillingService:
         site_id: UUID,
         application: Application,
         player_count: int,
-        client_ip: Optional[str] = None
+        client_ip: Optional[str] = None,
+        customer_tier: Optional[str] = None
     ) -> tuple[UsageRecord, TransactionRecord, Decimal]:
         """创建授权扣费事务
 
-        使用数据库事务和行级锁确保并发安全。
+        扣费使用条件UPDATE原子完成, 不再先 SELECT FOR UPDATE 再在Python中改余额:
+
+            UPDATE operator_accounts SET balance = balance - :cost
+            WHERE id = :id AND balance >= :cost RETURNING balance
+
+        使用记录和交易记录的主键在客户端生成, 无需flush回填ID。
+        - PostgreSQL: 扣费和两条插入合并为一条CTE语句, 行锁只持有一次往返
+        - 其他数据库(SQLite开发/测试): 条件UPDATE后批量插入两条记录
+
+        开启余额分片的客户分类(BALANCE_SHARD_TIERS)轮询扣减一个分片行, 详见 BalanceLedger。
+        条件UPDATE未命中时退回合并扣费(锁定主行和未被占用的分片, 扣费并重新均衡);
+        总余额仍不足时回滚并返回402; 会话ID唯一约束冲突返回409。
 
-        事务流程:
-        1. 锁定运营商账户行(SELECT FOR UPDATE)
-        2. 计算总费用
-        3. 验证余额充足
-        4. 扣减余额
-        5. 创建使用记录
-        6. 创建交易记录
+        注意: 扣费不同步会话中已加载的 OperatorAccount 对象, 扣费后余额以返回值为准。
 
         Args:
             session_id: 游戏会话ID
@@ -119,135 +167,222 @@ class BillingService:
             application: 应用对象
             player_count: 玩家数量
             client_ip: 客户端IP(可选)
+            customer_tier: 客户分类(决定是否使用余额分片)
 
         Returns:
-            tuple[UsageRecord, TransactionRecord, Decimal]: (使用记录, 交易记录, 扣费后余额)
+            tuple[UsageRecord, TransactionRecord, Decimal]: (使用记录, 交易记录, 扣费后总余额)
 
         Raises:
             HTTPException 402: 余额不足
             HTTPException 409: 会话ID重复(幂等性冲突)
             HTTPException 500: 数据库并发冲突
         """
-        # 计算费用
-        total_cost = application.price_per_player * player_count
-
         try:
-            # STEP 1: 使用SELECT FOR UPDATE锁定运营商账户行
-            # 防止并发扣费导致余额计算错误
-            operator = await select_for_update(
-                self.db,
-                OperatorAccount,
-                operator_id
+            result = await self.apply_authorization_debit(
+                session_id=session_id,
+                operator_id=operator_id,
+                site_id=site_id,
+                application=application,
+                player_count=player_count,
+                client_ip=client_ip,
+                customer_tier=customer_tier
             )
+            await self.db.commit()
+            # 提交后累加财务今日计数器
+            await record_transactions([result[1]])
+            return result
 
-            if not operator:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail={
-                        "error_code": "OPERATOR_NOT_FOUND_IN_TRANSACTION",
-                        "message": "事务中未找到运营商记录，请重试"
-                    }
-                )
+        except HTTPException:
+            # HTTPException直接向上传播(包括402余额不足等业务异常)
+            await self.db.rollback()
+            raise
 
-            # STEP 2: 验证余额充足
-            balance_before = operator.balance
-            if balance_before < total_cost:
-                shortage = total_cost - balance_before
-                raise HTTPException(
-                    status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                    detail={
-                        "error_code": "INSUFFICIENT_BALANCE",
-                        "message": f"账户余额不足，当前余额: {balance_before}元，需要: {total_cost}元",
-                        "details": {
-                            "current_balance": str(balance_before),
-                            "required_amount": str(total_cost),
-                            "shortage": str(shortage)
-                        }
-                    }
-                )
+        except IntegrityError as e:
+            # 捕获session_id唯一约束冲突(幂等性保护)
+            await self.db.rollback()
+            raise await self.integrity_error_response(session_id, e)
 
-            # STEP 3: 扣减余额
-            operator.balance = balance_before - total_cost
-            balance_after = operator.balance
+        except Exception as e:
+            await self.db.rollback()
+            # 记录日志并抛出通用错误
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={
+                    "error_code": "BILLING_TRANSACTION_FAILED",
+                    "message": "扣费事务失败，请重试",
+                    "details": str(e)
+                }
+            )
 
-            # STEP 4: 生成授权令牌
-            authorization_token = str(uuid4())
+    async def apply_authorization_debit(
+        self,
+        session_id: str,
+        operator_id: UUID,
+        site_id: UUID,
+        application: Application,
+        player_count: int,
+        client_ip: Optional[str] = None,
+        customer_tier: Optional[str] = None
+    ) -> tuple[UsageRecord, TransactionRecord, Decimal]:
+        """在当前事务中执行扣费并写入使用记录/交易记录(不提交)
 
-            # STEP 5: 创建使用记录
-            usage_record = UsageRecord(
-                session_id=session_id,
-                operator_id=operator_id,
-                site_id=site_id,
-                application_id=application.id,
-                player_count=player_count,
-                price_per_player=application.price_per_player,
-                total_cost=total_cost,
-                authorization_token=authorization_token,
-                game_started_at=datetime.utcnow(),
-                client_ip=client_ip
+        由 create_authorization_transaction 和 BillingQueue(组提交, 每个请求一个保存点)共用,
+        参数同 create_authorization_transaction。
+
+        Returns:
+            tuple[UsageRecord, TransactionRecord, Decimal]: (使用记录, 交易记录, 扣费后总余额)
+
+        Raises:
+            HTTPException 402: 余额不足
+            HTTPException 500: 运营商记录不存在
+            IntegrityError: 会话ID重复等约束冲突(由调用方回滚并转换)
+        """
+        usage_record, transaction_record = self._build_authorization_records(
+            session_id, operator_id, site_id, application, player_count, client_ip
+        )
+        total_cost = usage_record.total_cost
+
+        ledger = BalanceLedger(self.db)
+        shard_count = ledger.shard_count(customer_tier)
+        shard_index = ledger.next_shard(shard_count)
+
+        single_statement = self.db.get_bind().dialect.name == "postgresql"
+
+        if single_statement:
+            # 扣费 + 两条插入, 一次往返
+            result = await self.db.execute(
+                self.build_debit_statement(usage_record, transaction_record, shard_index)
             )
-            self.db.add(usage_record)
+            balance_after = result.scalar_one_or_none()
+        else:
+            balance_after = await ledger.debit(operator_id, total_cost, shard_index)
+        rows_inserted = single_statement and balance_after is not None
+
+        if balance_after is None:
+            # 主行/分片余额不足或分片尚未创建: 按总余额合并扣费并重新均衡
+            balance_after = await ledger.pooled_debit(operator_id, total_cost, shard_count)
 
-            # 需要flush来获取usage_record.id用于交易记录关联
+        if balance_after is None:
+            await self._raise_debit_rejected(operator_id, total_cost)
+
+        transaction_record.balance_before = balance_after + total_cost
+        transaction_record.balance_after = balance_after
+
+        if not rows_inserted:
+            # 主键已在客户端生成, 两条插入一次flush下发
+            self.db.add_all([usage_record, transaction_record])
             await self.db.flush()
 
-            # STEP 6: 创建交易记录
-            transaction_record = TransactionRecord(
-                operator_id=operator_id,
-                transaction_type="consumption",
-                amount=-total_cost,  # 消费为负数
-                balance_before=balance_before,
-                balance_after=balance_after,
-                related_usage_id=usage_record.id,
-                description=f"游戏消费：{application.app_name} - {player_count}人"
+        return usage_record, transaction_record, balance_after
+
+    async def create_batch_authorization_transaction(
+        self,
+        operator_id: UUID,
+        items: list[BatchDebitItem],
+        client_ip: Optional[str] = None,
+        customer_tier: Optional[str] = None,
+        all_or_nothing: bool = True
+    ) -> tuple[list[Optional[tuple[UsageRecord, TransactionRecord]]], Decimal]:
+        """创建批量授权扣费事务
+
+        整批在一个事务中扣费: 先对总额执行一次条件扣费(分片模式下扣一个分片),
+        未命中时退回合并扣费(锁定主行和未被占用的分片)。
+        - all_or_nothing: 总余额不足时回滚并返回402, 不授权任何会话
+        - best_effort: 在持有行锁的情况下按顺序接受余额足够的会话, 其余会话不扣费
+
+        各会话的交易记录按顺序记录连续的扣费前/后余额。
+
+        Args:
+            operator_id: 运营商ID
+            items: 待扣费的会话列表
+            client_ip: 客户端IP(可选)
+            customer_tier: 客户分类(决定是否使用余额分片)
+            all_or_nothing: 是否全部成功或全部失败
+
+        Returns:
+            tuple[list, Decimal]: (与 items 顺序一致的 (使用记录, 交易记录),
+                余额不足未授权的会话为None; 扣费后总余额)
+
+        Raises:
+            HTTPException 402: 余额不足(all_or_nothing)
+            HTTPException 409: 会话ID重复(并发重复提交)
+            HTTPException 500: 数据库并发冲突
+        """
+        records = [
+            self._build_authorization_records(
+                item.session_id, operator_id, item.site_id,
+                item.application, item.player_count, client_ip
             )
-            self.db.add(transaction_record)
+            for item in items
+        ]
+        accepted = list(range(len(records)))
+        accepted_total = sum((usage.total_cost for usage, _ in records), Decimal("0.00"))
 
-            # STEP 7: 提交事务
-            await self.db.commit()
+        try:
+            ledger = BalanceLedger(self.db)
+            shard_count = ledger.shard_count(customer_tier)
 
-            return usage_record, transaction_record, balance_after
+            balance_after = await ledger.debit(
+                operator_id, accepted_total, ledger.next_shard(shard_count)
+            )
+            if balance_after is None:
+                balance_after = await ledger.pooled_debit(operator_id, accepted_total, shard_count)
+
+            if balance_after is None:
+                if all_or_nothing:
+                    await self._raise_debit_rejected(operator_id, accepted_total)
+
+                # 合并扣费已锁定主行和未被占用的分片, 按顺序分配可用余额
+                available = await ledger.get_balance(operator_id)
+                if available is None:
+                    await self._raise_debit_rejected(operator_id, accepted_total)
+
+                accepted = []
+                for index, (usage_record, _) in enumerate(records):
+                    if usage_record.total_cost <= available:
+                        accepted.append(index)
+                        available -= usage_record.total_cost
+                accepted_total = sum(
+                    (records[index][0].total_cost for index in accepted), Decimal("0.00")
+                )
+
+                if not accepted:
+                    await self.db.rollback()
+                    return [None] * len(records), available
+
+                balance_after = await ledger.pooled_debit(operator_id, accepted_total, shard_count)
+                if balance_after is None:
+                    # 部分分片正被其他事务扣费(已跳过), 可用余额少于总余额
+                    await self._raise_debit_rejected(operator_id, accepted_total)
+
+            running_balance = balance_after + accepted_total
+            for index in accepted:
+                usage_record, transaction_record = records[index]
+                transaction_record.balance_before = running_balance
+                running_balance -= usage_record.total_cost
+                transaction_record.balance_after = running_balance
+                self.db.add_all([usage_record, transaction_record])
+
+            await self.db.flush()
+            await self.db.commit()
 
         except HTTPException:
-            # HTTPException直接向上传播(包括402余额不足等业务异常)
             await self.db.rollback()
             raise
 
-        except IntegrityError as e:
-            # 捕获session_id唯一约束冲突(幂等性保护)
+        except IntegrityError:
+            # 会话ID已被并发请求授权, 重试时由幂等性检查返回已授权信息
             await self.db.rollback()
-
-            if "uq_session_id" in str(e).lower() or "session_id" in str(e).lower():
-                # 会话ID重复,返回已有记录
-                existing_record = await self.check_session_idempotency(session_id)
-                if existing_record:
-                    raise HTTPException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        detail={
-                            "error_code": "SESSION_ID_DUPLICATE",
-                            "message": "会话已存在，返回已授权信息(幂等性保护)",
-                            "data": {
-                                "session_id": existing_record.session_id,
-                                "authorization_token": existing_record.authorization_token,
-                                "total_cost": str(existing_record.total_cost),
-                                "created_at": existing_record.created_at.isoformat()
-                            }
-                        }
-                    )
-
-            # 其他完整性错误
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                status_code=status.HTTP_409_CONFLICT,
                 detail={
-                    "error_code": "DATABASE_INTEGRITY_ERROR",
-                    "message": "数据库完整性错误，请重试",
-                    "details": str(e)
+                    "error_code": "SESSION_ID_DUPLICATE",
+                    "message": "批量授权中存在已授权的会话ID，请重试以获取已授权信息"
                 }
             )
 
         except Exception as e:
             await self.db.rollback()
-            # 记录日志并抛出通用错误
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={
@@ -257,6 +392,225 @@ class BillingService:
                 }
             )
 
+        # 提交后累加财务今日计数器
+        await record_transactions(records[index][1] for index in accepted)
+
+        accepted_set = set(accepted)
+        results = [
+            record if index in accepted_set else None
+            for index, record in enumerate(records)
+        ]
+        return results, balance_after
+
+    @staticmethod
+    def _build_authorization_records(
+        session_id: str,
+        operator_id: UUID,
+        site_id: UUID,
+        application: Application,
+        player_count: int,
+        client_ip: Optional[str] = None
+    ) -> tuple[UsageRecord, TransactionRecord]:
+        """构造授权的使用记录和交易记录(余额字段由扣费后填写)"""
+        # 计算费用
+        total_cost = application.price_per_player * player_count
+
+        # 客户端生成主键和授权令牌, 交易记录可直接关联使用记录
+        # 授权令牌为签名的自描述令牌, 下游可离线验证(见 core.security.authorization_token)
+        game_started_at = datetime.utcnow()
+        usage_record = UsageRecord(
+            id=uuid4(),
+            session_id=session_id,
+            operator_id=operator_id,
+            site_id=site_id,
+            application_id=application.id,
+            player_count=player_count,
+            price_per_player=application.price_per_player,
+            total_cost=total_cost,
+            authorization_token=create_authorization_token(
+                session_id=session_id,
+                operator_id=operator_id,
+                site_id=site_id,
+                application_id=application.id,
+                player_count=player_count,
+                issued_at=game_started_at
+            ),
+            game_started_at=game_started_at,
+            client_ip=client_ip
+        )
+        transaction_record = TransactionRecord(
+            id=uuid4(),
+            operator_id=operator_id,
+            transaction_type="consumption",
+            amount=-total_cost,  # 消费为负数
+            related_usage_id=usage_record.id,
+            description=f"游戏消费：{application.app_name} - {player_count}人"
+        )
+        return usage_record, transaction_record
+
+    async def integrity_error_response(self, session_id: str, error: IntegrityError) -> HTTPException:
+        """将完整性错误转换为HTTP异常(调用方已回滚)
+
+        会话ID唯一约束冲突返回409并携带已有授权信息, 其他约束冲突返回500。
+
+        Args:
+            session_id: 游戏会话ID
+            error: 数据库完整性错误
+
+        Returns:
+            HTTPException: 409 或 500
+        """
+        if "uq_session_id" in str(error).lower() or "session_id" in str(error).lower():
+            # 会话ID重复,返回已有记录
+            existing_record = await self.check_session_idempotency(session_id)
+            if existing_record:
+                return HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={
+                        "error_code": "SESSION_ID_DUPLICATE",
+                        "message": "会话已存在，返回已授权信息(幂等性保护)",
+                        "data": {
+                            "session_id": existing_record.session_id,
+                            "authorization_token": existing_record.authorization_token,
+                            "total_cost": str(existing_record.total_cost),
+                            "created_at": existing_record.created_at.isoformat()
+                        }
+                    }
+                )
+
+        # 其他完整性错误
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error_code": "DATABASE_INTEGRITY_ERROR",
+                "message": "数据库完整性错误，请重试",
+                "details": str(error)
+            }
+        )
+
+    @classmethod
+    def build_debit_statement(
+        cls,
+        usage_record: UsageRecord,
+        transaction_record: TransactionRecord,
+        shard_index: Optional[int] = None
+    ):
+        """构造单语句扣费CTE(PostgreSQL)
+
+        WITH debit AS (UPDATE ... RETURNING balance),
+             usage_insert AS (INSERT INTO usage_records ... SELECT ... FROM debit RETURNING id)
+        INSERT INTO transaction_records ... SELECT ... FROM debit, usage_insert
+        RETURNING balance_after
+
+        余额不足时 debit 为空, 两条INSERT均不插入任何行, 语句返回空结果。
+        扣减分片时, 交易记录的扣费前余额取语句快照中的总余额(主行 + 全部分片)。
+
+        Args:
+            usage_record: 待插入的使用记录(已生成主键)
+            transaction_record: 待插入的交易记录(已生成主键, 余额字段由语句计算)
+            shard_index: 分片序号, None表示扣主行
+
+        Returns:
+            Insert: 返回扣费后总余额的插入语句
+        """
+        amount = usage_record.total_cost
+        operator_id = usage_record.operator_id
+
+        if shard_index is None:
+            debit = (
+                BalanceLedger.debit_update(operator_id, amount)
+                .returning(OperatorAccount.balance.label("balance_after"))
+                .cte("debit")
+            )
+            balance_before = debit.c.balance_after + amount
+        else:
+            debit = (
+                BalanceLedger.debit_update(operator_id, amount, shard_index)
+                .returning(OperatorBalanceShard.balance.label("balance_after"))
+                .cte("debit")
+            )
+            balance_before = (
+                select(BalanceLedger.total_balance_expr(operator_id))
+                .where(OperatorAccount.id == operator_id)
+                .scalar_subquery()
+            )
+
+        usage_columns = {
+            "id": usage_record.id,
+            "session_id": usage_record.session_id,
+            "operator_id": usage_record.operator_id,
+            "site_id": usage_record.site_id,
+            "application_id": usage_record.application_id,
+            "player_count": usage_record.player_count,
+            "price_per_player": usage_record.price_per_player,
+            "total_cost": usage_record.total_cost,
+            "authorization_token": usage_record.authorization_token,
+            "game_started_at": usage_record.game_started_at,
+            "client_ip": usage_record.client_ip,
+        }
+        usage = (
+            insert(UsageRecord)
+            .from_select(
+                list(usage_columns),
+                select(*_literal_columns(UsageRecord, usage_columns)).select_from(debit)
+            )
+            .returning(UsageRecord.id)
+            .cte("usage_insert")
+        )
+
+        transaction_columns = {
+            "id": transaction_record.id,
+            "operator_id": transaction_record.operator_id,
+            "transaction_type": transaction_record.transaction_type,
+            "amount": transaction_record.amount,
+            "description": transaction_record.description,
+        }
+        return (
+            insert(TransactionRecord)
+            .from_select(
+                [*transaction_columns, "balance_before", "balance_after", "related_usage_id"],
+                select(
+                    *_literal_columns(TransactionRecord, transaction_columns),
+                    balance_before,
+                    balance_before - amount,
+                    usage.c.id
+                ).select_from(debit).join(usage, true())
+            )
+            .returning(TransactionRecord.balance_after)
+        )
+
+    async def _raise_debit_rejected(self, operator_id: UUID, required_amount: Decimal) -> None:
+        """条件扣费未命中时区分余额不足与运营商不存在
+
+        Raises:
+            HTTPException 402: 余额不足
+            HTTPException 500: 运营商记录不存在
+        """
+        current_balance = await BalanceLedger(self.db).get_balance(operator_id)
+
+        if current_balance is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={
+                    "error_code": "OPERATOR_NOT_FOUND_IN_TRANSACTION",
+                    "message": "事务中未找到运营商记录，请重试"
+                }
+            )
+
+        shortage = required_amount - current_balance
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail={
+                "error_code": "INSUFFICIENT_BALANCE",
+                "message": f"账户余额不足，当前余额: {current_balance}元，需要: {required_amount}元",
+                "details": {
+                    "current_balance": str(current_balance),
+                    "required_amount": str(required_amount),
+                    "shortage": str(shortage)
+                }
+            }
+        )
+
     async def get_usage_record_with_details(
         self,
         usage_record_id: UUID
@@ -292,3 +646,9 @@ class BillingService:
         total = price_per_player * player_count
         # 确保精度为2位小数
         return total.quantize(Decimal('0.01'))
+
+
+def _literal_columns(model, values: dict) -> list:
+    """将Python值转换为带列类型的字面量(用于 INSERT ... SELECT)"""
+    table = model.__table__
+    return [literal(value, table.c[name].type).label(name) for name, value in values.items()]
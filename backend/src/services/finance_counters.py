@@ -0,0 +1,287 @@
+"""财务今日计数器 (FinanceCounterService)
+
+财务仪表盘今日概览原先每次加载都对当天的 transaction_records 执行多条聚合查询,
+耗时随交易量增长。本模块在Redis中维护当天的计数器, 概览读取一次即可:
+
+- finance:daily:{YYYY-MM-DD}: 哈希, recharge / consumption / refund 为当天金额合计
+  (分, 与交易记录金额同号), rebuilt_at 为最近一次从数据库重建的时间戳
+- finance:daily:{YYYY-MM-DD}:operators: 集合, 当天有交易的运营商ID
+
+日期按 REPORT_TIMEZONE 划分(与财务趋势一致)。
+
+- 写入: 扣费(BillingService/BillingQueue)、支付回调、财务充值、退款在事务提交后调用
+  record_transactions, 由一个Lua脚本原子累加金额并记录运营商。计数器不存在时不累加
+  (之后从数据库重建时已包含这些已提交的交易)
+- 重建: 计数器不存在(跨过零点/Redis数据丢失)时, 读取方用一条分组查询从数据库重建;
+  后台任务(FinanceCounterReconciler)定期重建当天计数器, 修正提交后进程退出、
+  重建与累加并发等情况造成的偏差
+- 补录: 交易的 created_at 早于当天时不累加今日计数器, 而是删除所在月份的趋势快照
+  (见 finance_trends)
+- Redis不可用时直接返回数据库聚合结果
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import get_cache
+from ..core.config import get_settings
+from ..db.time_buckets import to_local, utc_range
+from ..models.transaction import TransactionRecord
+from .finance_trends import invalidate_trend_snapshots
+
+logger = structlog.get_logger(__name__)
+
+COUNTER_KEY_PREFIX = "finance:daily:"
+# 计数的交易类型(哈希字段)
+COUNTER_FIELDS = ("recharge", "consumption", "refund")
+# 计数器保留时间: 覆盖当天和跨零点后的读取
+COUNTER_TTL_SECONDS = 2 * 24 * 3600
+
+
+def counters_key(day: date) -> str:
+    """某天的计数器哈希键"""
+    return f"{COUNTER_KEY_PREFIX}{day.isoformat()}"
+
+
+def operators_key(day: date) -> str:
+    """某天有交易的运营商集合键"""
+    return f"{counters_key(day)}:operators"
+
+
+def report_today(now: Optional[datetime] = None) -> date:
+    """REPORT_TIMEZONE 时区的当天日期"""
+    return to_local(now or datetime.now(timezone.utc), get_settings().REPORT_TIMEZONE).date()
+
+
+def to_cents(amount) -> int:
+    """金额(元)转换为分"""
+    return int((Decimal(amount or 0) * 100).to_integral_value())
+
+
+@dataclass
+class DailyFinanceCounters:
+    """某天的充值/消费/退款合计和有交易的运营商数"""
+
+    day: date
+    recharge: Decimal = Decimal("0.00")
+    consumption: Decimal = Decimal("0.00")
+    refund: Decimal = Decimal("0.00")
+    active_operators: int = 0
+
+    @classmethod
+    def from_cents(cls, day: date, cents: dict[str, int], active_operators: int) -> "DailyFinanceCounters":
+        amounts = {
+            field: (Decimal(cents.get(field, 0)) / 100).quantize(Decimal("0.01"))
+            for field in COUNTER_FIELDS
+        }
+        return cls(day=day, active_operators=active_operators, **amounts)
+
+
+async def record_transactions(
+    transactions: Iterable[TransactionRecord],
+    now: Optional[datetime] = None
+) -> None:
+    """交易提交后累加当天计数器(Redis不可用或计数器不存在时忽略)
+
+    created_at 早于当天的补录交易不计入今日计数器, 改为使所在月份的趋势快照失效。
+
+    Args:
+        transactions: 已提交的交易记录
+        now: 当前时间(默认系统UTC时间)
+    """
+    tz = get_settings().REPORT_TIMEZONE
+    day = report_today(now)
+    increments: dict[str, int] = {}
+    operator_ids: set[str] = set()
+    backdated: set[date] = set()
+    for transaction in transactions:
+        # created_at 由数据库默认值生成时可能未加载, 此时即为当前时间
+        created_at = transaction.__dict__.get("created_at")
+        if created_at is not None and to_local(created_at, tz).date() < day:
+            backdated.add(to_local(created_at, tz).date())
+            continue
+        operator_ids.add(str(transaction.operator_id))
+        if transaction.transaction_type in COUNTER_FIELDS:
+            increments[transaction.transaction_type] = (
+                increments.get(transaction.transaction_type, 0) + to_cents(transaction.amount)
+            )
+    if backdated:
+        await invalidate_trend_snapshots(backdated)
+    if not operator_ids:
+        return
+
+    await get_cache().incr_counters(counters_key(day), increments, operators_key(day), operator_ids)
+
+
+class FinanceCounterService:
+    """财务今日计数器读取与重建"""
+
+    def __init__(self, db: AsyncSession):
+        """初始化计数器服务
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+
+    async def get_today(self, now: Optional[datetime] = None) -> DailyFinanceCounters:
+        """读取当天计数器, 不存在时从数据库重建
+
+        Args:
+            now: 当前时间(默认系统UTC时间)
+
+        Returns:
+            DailyFinanceCounters: 当天合计
+        """
+        day = report_today(now)
+        cached = await get_cache().get_counters(counters_key(day), operators_key(day))
+        if cached is not None:
+            cents, active_operators = cached
+            return DailyFinanceCounters.from_cents(day, cents, active_operators)
+        return await self.rebuild(day)
+
+    async def rebuild(self, day: date) -> DailyFinanceCounters:
+        """用一条分组查询从交易记录重建某天的计数器并写入Redis
+
+        Args:
+            day: 日期(REPORT_TIMEZONE)
+
+        Returns:
+            DailyFinanceCounters: 该天合计
+        """
+        start, end = utc_range(
+            datetime.combine(day, datetime.min.time()),
+            datetime.combine(day + timedelta(days=1), datetime.min.time()),
+            get_settings().REPORT_TIMEZONE
+        )
+        result = await self.db.execute(
+            select(
+                TransactionRecord.operator_id,
+                TransactionRecord.transaction_type,
+                func.sum(TransactionRecord.amount).label("total_amount")
+            )
+            .where(
+                TransactionRecord.created_at >= start,
+                TransactionRecord.created_at < end
+            )
+            .group_by(TransactionRecord.operator_id, TransactionRecord.transaction_type)
+        )
+
+        cents = dict.fromkeys(COUNTER_FIELDS, 0)
+        operator_ids: set[str] = set()
+        for row in result.all():
+            operator_ids.add(str(row.operator_id))
+            if row.transaction_type in cents:
+                cents[row.transaction_type] += to_cents(row.total_amount)
+
+        await get_cache().replace_counters(
+            counters_key(day),
+            {**cents, "rebuilt_at": int(time.time())},
+            COUNTER_TTL_SECONDS,
+            operators_key(day),
+            operator_ids
+        )
+        return DailyFinanceCounters.from_cents(day, cents, len(operator_ids))
+
+
+class FinanceCounterReconciler:
+    """后台对账任务: 定期从数据库重建当天计数器"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        interval_seconds: float = 300.0
+    ):
+        """初始化对账任务
+
+        Args:
+            session_factory: 数据库会话工厂, 默认使用全局 session maker
+            interval_seconds: 对账间隔(秒)
+        """
+        self._session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from ..db.session import get_session_maker
+            self._session_factory = get_session_maker()
+        return self._session_factory()
+
+    async def run_once(self, now: Optional[datetime] = None) -> DailyFinanceCounters:
+        """重建当天计数器, 与重建前的值不一致时记录告警日志
+
+        Returns:
+            DailyFinanceCounters: 重建后的当天合计
+        """
+        day = report_today(now)
+        cached = await get_cache().get_counters(counters_key(day), operators_key(day))
+        async with self._new_session() as session:
+            rebuilt = await FinanceCounterService(session).rebuild(day)
+
+        if cached is not None:
+            previous = DailyFinanceCounters.from_cents(day, *cached)
+            if previous != rebuilt:
+                logger.warning(
+                    "finance_counters_drift",
+                    day=day.isoformat(),
+                    cached=str(previous),
+                    rebuilt=str(rebuilt)
+                )
+        return rebuilt
+
+    def start(self) -> None:
+        """启动后台循环"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台循环"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                # 下一轮重试, 读取方仍可在计数器缺失时自行重建
+                logger.error("finance_counters_reconcile_failed", error=str(e))
+
+
+# Global reconciler instance (per worker process)
+_finance_counter_reconciler: Optional[FinanceCounterReconciler] = None
+
+
+async def init_finance_counter_reconciler() -> None:
+    """启动后台对账任务(FINANCE_COUNTER_RECONCILE_ENABLED 时, 应用启动时调用)"""
+    global _finance_counter_reconciler
+    settings = get_settings()
+    if not settings.FINANCE_COUNTER_RECONCILE_ENABLED or _finance_counter_reconciler is not None:
+        return
+    _finance_counter_reconciler = FinanceCounterReconciler(
+        interval_seconds=settings.FINANCE_COUNTER_RECONCILE_SECONDS
+    )
+    _finance_counter_reconciler.start()
+
+
+async def close_finance_counter_reconciler() -> None:
+    """停止后台对账任务(应用关闭时调用)"""
+    global _finance_counter_reconciler
+    if _finance_counter_reconciler is not None:
+        await _finance_counter_reconciler.stop()
+        _finance_counter_reconciler = None
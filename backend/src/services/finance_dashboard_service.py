@@ -12,6 +12,9 @@ from sqlalchemy import select, and_, func, case, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core import NotFoundException, BadRequestException
+from ..core.cache import cache_result
+from ..core.config import get_settings
+from ..db.time_buckets import to_local
 from ..models.operator import OperatorAccount
 from ..models.transaction import TransactionRecord
 from ..models.usage_record import UsageRecord
@@ -24,6 +27,9 @@ from ..schemas.finance import (
     TopCustomer,
     CustomerFinanceDetails
 )
+from .balance_ledger import BalanceLedger
+from .finance_counters import FinanceCounterService
+from .finance_trends import FinanceTrendSnapshots, month_end
 
 
 class FinanceDashboardService:
@@ -40,51 +46,18 @@ class FinanceDashboardService:
     async def get_dashboard_overview(self) -> DashboardOverview:
         """Get today's income overview.
 
+        Today's recharge/consumption/refund totals and active operators come
+        from the live Redis counters (see services.finance_counters), rebuilt
+        from transaction_records with one grouped query when missing. The only
+        query on every load is the operator count.
+
         Returns:
             DashboardOverview: Today's financial summary
         """
-        # Get today's date range (UTC)
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-
-        # Calculate today's recharge
-        recharge_result = await self.db.execute(
-            select(func.sum(TransactionRecord.amount)).where(
-                and_(
-                    TransactionRecord.transaction_type == "recharge",
-                    TransactionRecord.created_at >= today_start,
-                    TransactionRecord.created_at < today_end
-                )
-            )
-        )
-        today_recharge = recharge_result.scalar() or Decimal("0.00")
-
-        # Calculate today's consumption
-        consumption_result = await self.db.execute(
-            select(func.sum(TransactionRecord.amount)).where(
-                and_(
-                    TransactionRecord.transaction_type == "consumption",
-                    TransactionRecord.created_at >= today_start,
-                    TransactionRecord.created_at < today_end
-                )
-            )
-        )
-        today_consumption = consumption_result.scalar() or Decimal("0.00")
-
-        # Calculate today's refund
-        refund_result = await self.db.execute(
-            select(func.sum(TransactionRecord.amount)).where(
-                and_(
-                    TransactionRecord.transaction_type == "refund",
-                    TransactionRecord.created_at >= today_start,
-                    TransactionRecord.created_at < today_end
-                )
-            )
-        )
-        today_refund = refund_result.scalar() or Decimal("0.00")
+        today = await FinanceCounterService(self.db).get_today()
 
         # Calculate net income (recharge - refund)
-        today_net_income = today_recharge - today_refund
+        today_net_income = today.recharge - today.refund
 
         # Get total operators count (active, not deleted)
         total_operators_result = await self.db.execute(
@@ -97,24 +70,13 @@ class FinanceDashboardService:
         )
         total_operators = total_operators_result.scalar()
 
-        # Get active operators today (operators with transactions today)
-        active_operators_result = await self.db.execute(
-            select(func.count(func.distinct(TransactionRecord.operator_id))).where(
-                and_(
-                    TransactionRecord.created_at >= today_start,
-                    TransactionRecord.created_at < today_end
-                )
-            )
-        )
-        active_operators_today = active_operators_result.scalar() or 0
-
         return DashboardOverview(
-            today_recharge=str(today_recharge),
-            today_consumption=str(today_consumption),
-            today_refund=str(today_refund),
+            today_recharge=str(today.recharge),
+            today_consumption=str(today.consumption),
+            today_refund=str(today.refund),
             today_net_income=str(today_net_income),
             total_operators=total_operators,
-            active_operators_today=active_operators_today
+            active_operators_today=today.active_operators
         )
 
     async def get_dashboard_trends(
@@ -123,6 +85,10 @@ class FinanceDashboardService:
     ) -> DashboardTrends:
         """Get monthly income trends.
 
+        Days are bucketed in REPORT_TIMEZONE; days without transactions are
+        reported as zero. Closed days are read from a cached month snapshot
+        (see finance_trends), so past months do not touch the database.
+
         Args:
             month: Month in YYYY-MM format (default: current month)
 
@@ -132,7 +98,9 @@ class FinanceDashboardService:
         Raises:
             BadRequestException: If month format is invalid
         """
-        # Parse month or use current month
+        tz = get_settings().REPORT_TIMEZONE
+
+        # Parse month or use current month (in the reporting time zone)
         if month:
             try:
                 year, month_num = month.split('-')
@@ -140,56 +108,13 @@ class FinanceDashboardService:
             except (ValueError, IndexError):
                 raise BadRequestException("Invalid month format. Use YYYY-MM format")
         else:
-            now = datetime.now(timezone.utc)
+            now = to_local(datetime.now(timezone.utc), tz)
             target_date = date(now.year, now.month, 1)
             month = target_date.strftime("%Y-%m")
 
-        # Calculate month range
-        month_start = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-        # Get next month's first day
-        if target_date.month == 12:
-            next_month = date(target_date.year + 1, 1, 1)
-        else:
-            next_month = date(target_date.year, target_date.month + 1, 1)
-        month_end = datetime.combine(next_month, datetime.min.time()).replace(tzinfo=timezone.utc)
-
-        # Get daily aggregated data
-        # Group by date and transaction type
-        from sqlalchemy import Date, cast
-
-        daily_query = (
-            select(
-                cast(TransactionRecord.created_at, Date).label('tx_date'),
-                TransactionRecord.transaction_type,
-                func.sum(TransactionRecord.amount).label('total_amount')
-            )
-            .where(
-                and_(
-                    TransactionRecord.created_at >= month_start,
-                    TransactionRecord.created_at < month_end
-                )
-            )
-            .group_by('tx_date', TransactionRecord.transaction_type)
-        )
-
-        daily_result = await self.db.execute(daily_query)
-        daily_data = daily_result.all()
-
-        # Build daily trend items
-        daily_map = {}
-        for row in daily_data:
-            tx_date = row.tx_date
-            tx_type = row.transaction_type
-            amount = row.total_amount or Decimal("0.00")
-
-            if tx_date not in daily_map:
-                daily_map[tx_date] = {
-                    "recharge": Decimal("0.00"),
-                    "consumption": Decimal("0.00"),
-                    "refund": Decimal("0.00")
-                }
-
-            daily_map[tx_date][tx_type] = amount
+        # Closed days come from the month snapshot, today is aggregated live
+        next_month = month_end(target_date)
+        daily_map = await FinanceTrendSnapshots(self.db).get_month(target_date)
 
         # Generate chart data for all days in month
         chart_data = []
@@ -258,6 +183,22 @@ class FinanceDashboardService:
         if limit < 1 or limit > 100:
             raise BadRequestException("Limit must be between 1 and 100")
 
+        return TopCustomersResponse.model_validate(
+            await self._top_customers(limit, start_time, end_time)
+        )
+
+    @cache_result("dashboard", ttl=60)
+    async def _top_customers(
+        self,
+        limit: int,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime]
+    ) -> dict:
+        """Rank customers by consumption (cached for 60 seconds).
+
+        The ranking aggregates the whole transaction table, so it is shared
+        by all finance users and refreshed by TTL rather than on every debit.
+        """
         # Build query for total consumption by operator
         consumption_query = (
             select(
@@ -329,7 +270,7 @@ class FinanceDashboardService:
         return TopCustomersResponse(
             customers=customers,
             total_consumption=str(total_consumption)
-        )
+        ).model_dump()
 
     async def get_customer_finance_details(
         self,
@@ -421,7 +362,7 @@ class FinanceDashboardService:
             operator_id=str(operator.id),
             operator_name=operator.full_name,
             category=operator.customer_tier,
-            current_balance=str(operator.balance),
+            current_balance=str(await BalanceLedger(self.db).get_balance(operator.id)),
             total_recharged=str(total_recharged),
             total_consumed=str(total_consumed),
             total_refunded=str(total_refunded),
@@ -12,10 +12,15 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core import BadRequestException, NotFoundException
+from ..core.cache import invalidate_cache_tags
+from ..core.utils.money import round_money
+from ..core.invalidation_bus import ChangeKind, EntityType, publish_entity_change
 from ..models.operator import OperatorAccount
 from ..models.transaction import TransactionRecord
 from ..models.finance import FinanceOperationLog
 from ..schemas.finance import RechargeResponse
+from .balance_ledger import BalanceLedger
+from .finance_counters import record_transactions
 
 
 class FinanceRechargeService:
@@ -87,6 +92,9 @@ class FinanceRechargeService:
 
         # 开始事务处理
         try:
+            # 把余额分片归集回主行, 充值前后余额均为总余额
+            await BalanceLedger(self.db).consolidate(operator)
+
             # 记录充值前余额
             balance_before = operator.balance
 
@@ -134,6 +142,13 @@ class FinanceRechargeService:
 
             # 提交事务
             await self.db.commit()
+            await record_transactions([transaction])
+
+            # 通知各worker运营商余额已变更, 并失效该运营商的缓存结果
+            await publish_entity_change(
+                EntityType.OPERATOR, operator.id, ChangeKind.BALANCE_CHANGED
+            )
+            await invalidate_cache_tags(f"operator:{operator.id}")
 
             # 构建响应
             return RechargeResponse(
@@ -158,7 +173,7 @@ class FinanceRechargeService:
             operator_id: 运营商ID
 
         Returns:
-            Decimal: 运营商余额
+            Decimal: 运营商总余额(含余额分片)
 
         Raises:
             BadRequestException: 运营商ID格式错误
@@ -170,7 +185,7 @@ class FinanceRechargeService:
             raise BadRequestException(f"无效的运营商ID格式: {operator_id}")
 
         result = await self.db.execute(
-            select(OperatorAccount.balance).where(
+            select(BalanceLedger.total_balance_expr(operator_uuid)).where(
                 OperatorAccount.id == operator_uuid,
                 OperatorAccount.deleted_at.is_(None)
             )
@@ -180,7 +195,7 @@ class FinanceRechargeService:
         if balance is None:
             raise NotFoundException(f"运营商 {operator_id} 不存在")
 
-        return balance
+        return round_money(balance)
 
     async def get_operators_list(self) -> list[dict]:
         """获取运营商列表（用于充值选择）
@@ -195,13 +210,15 @@ class FinanceRechargeService:
             ).order_by(OperatorAccount.username)
         )
         operators = result.scalars().all()
+        # 总余额(含余额分片)
+        balances = await BalanceLedger(self.db).get_balances(op.id for op in operators)
 
         return [
             {
                 "id": str(operator.id),
                 "username": operator.username,
                 "full_name": operator.full_name,
-                "balance": float(operator.balance),
+                "balance": float(balances[operator.id]),
                 "customer_tier": operator.customer_tier
             }
             for operator in operators
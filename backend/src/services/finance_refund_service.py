@@ -24,6 +24,8 @@ from ..schemas.finance import (
     CustomerFinanceDetails
 )
 from .audit_log_service import AuditLogService
+from .balance_ledger import BalanceLedger
+from .finance_counters import record_transactions
 from .message_service import MessageService
 
 
@@ -80,13 +82,18 @@ class FinanceRefundService:
         result = await self.db.execute(query)
         refunds = result.scalars().all()
 
+        # Current total balances (including balance shards) in one query
+        balances = await BalanceLedger(self.db).get_balances(
+            refund.operator_id for refund in refunds
+        )
+
         # Convert to response items
         items = []
         for refund in refunds:
             # Operator relation already loaded via selectinload
             # Get current balance
             operator = refund.operator
-            current_balance = str(operator.balance) if operator else "0.00"
+            current_balance = str(balances[operator.id]) if operator else "0.00"
 
             items.append(RefundItemFinance(
                 refund_id=str(refund.id),
@@ -158,7 +165,9 @@ class FinanceRefundService:
             operator_name=operator.full_name if operator else "Unknown",
             operator_category=operator.customer_tier if operator else None,
             requested_amount=str(refund.requested_amount),
-            current_balance=str(operator.balance) if operator else "0.00",
+            current_balance=(
+                str(await BalanceLedger(self.db).get_balance(operator.id)) if operator else "0.00"
+            ),
             actual_refund_amount=str(refund.actual_amount) if refund.actual_amount else None,
             status=refund.status,
             reason=refund.refund_reason,
@@ -214,6 +223,9 @@ class FinanceRefundService:
 
         operator = refund.operator
 
+        # Move sharded balance back to the main row before reading it
+        await BalanceLedger(self.db).consolidate(operator)
+
         # Get current balance (actual refundable amount)
         current_balance = operator.balance
 
@@ -270,6 +282,7 @@ class FinanceRefundService:
 
         # Commit changes
         await self.db.commit()
+        await record_transactions([transaction])
         await self.db.refresh(refund)
 
         # Return response
@@ -435,7 +448,7 @@ class FinanceRefundService:
             operator_id=str(operator.id),
             operator_name=operator.full_name,
             category=operator.customer_tier,
-            current_balance=str(operator.balance),
+            current_balance=str(await BalanceLedger(self.db).get_balance(operator.id)),
             total_recharged=str(total_recharged),
             total_consumed=str(total_consumed),
             total_refunded=str(total_refunded),
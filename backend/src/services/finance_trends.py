@@ -0,0 +1,162 @@
+"""财务趋势月快照 (FinanceTrendSnapshots)
+
+财务趋势图原先每次加载都对整月的 transaction_records 按天分组聚合。已结束的日期
+除非补录交易(created_at 早于当天)否则不会变化, 因此按月在Redis中保存已结束日期的
+每日合计快照(不设过期时间):
+
+- finance:trends:{YYYY-MM}: {"tz": 时区, "through": 快照覆盖到的日期(不含),
+  "days": {"YYYY-MM-DD": [充值, 消费, 退款](分)}}
+- 历史月份: 快照覆盖整月, 读取一次即可, 不查询数据库
+- 当前月份: 快照覆盖已结束的日期, 之后的日期(当天)实时聚合; 跨过零点后把新结束的
+  日期补进快照。零点后 CLOSE_GRACE 内前一天仍实时聚合, 避免漏掉零点前提交的交易
+- 失效: record_transactions 发现补录交易时删除对应月份的快照;
+  其他直接写库的修正需调用 invalidate_trend_snapshots
+- REPORT_TIMEZONE 变更后快照时区不一致, 视为不存在并重建; Redis不可用时直接聚合数据库
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, Optional
+
+import structlog
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import get_cache
+from ..core.config import get_settings
+from ..db.time_buckets import next_bucket, time_bucket, to_local, utc_range
+from ..models.transaction import TransactionRecord
+
+logger = structlog.get_logger(__name__)
+
+TREND_KEY_PREFIX = "finance:trends:"
+# 快照中每天的字段顺序
+TREND_FIELDS = ("recharge", "consumption", "refund")
+# 零点后前一天仍按实时聚合的时间
+CLOSE_GRACE = timedelta(minutes=5)
+
+
+def snapshot_key(day: date) -> str:
+    """某天所在月份的快照键"""
+    return f"{TREND_KEY_PREFIX}{day.strftime('%Y-%m')}"
+
+
+def month_end(month_start: date) -> date:
+    """下个月的第一天"""
+    return next_bucket(datetime.combine(month_start, datetime.min.time()), "month").date()
+
+
+def closed_until(now: Optional[datetime] = None) -> date:
+    """已结束日期的上界(不含): 早于该日期的每日合计不再变化(补录交易除外)"""
+    now = now or datetime.now(timezone.utc)
+    return to_local(now - CLOSE_GRACE, get_settings().REPORT_TIMEZONE).date()
+
+
+async def invalidate_trend_snapshots(days: Iterable[date]) -> int:
+    """删除这些日期所在月份的快照(补录或修正交易后调用)
+
+    Args:
+        days: 发生变化的日期(REPORT_TIMEZONE)
+
+    Returns:
+        int: 删除的快照数
+    """
+    cache = get_cache()
+    deleted = 0
+    for key in sorted({snapshot_key(day) for day in days}):
+        if await cache.delete(key):
+            deleted += 1
+    if deleted:
+        logger.info("finance_trend_snapshots_invalidated", count=deleted)
+    return deleted
+
+
+class FinanceTrendSnapshots:
+    """按月读取每日充值/消费/退款合计"""
+
+    def __init__(self, db: AsyncSession):
+        """初始化趋势快照服务
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+
+    async def get_month(
+        self,
+        month_start: date,
+        now: Optional[datetime] = None
+    ) -> dict[date, dict[str, Decimal]]:
+        """读取某月每天的合计(没有交易的日期不包含在结果中)
+
+        Args:
+            month_start: 月份第一天(REPORT_TIMEZONE)
+            now: 当前时间(默认系统UTC时间)
+
+        Returns:
+            dict: 日期 -> {"recharge", "consumption", "refund"} 金额
+        """
+        tz = get_settings().REPORT_TIMEZONE
+        end = month_end(month_start)
+        closed = min(max(closed_until(now), month_start), end)
+        key = snapshot_key(month_start)
+
+        cents: dict[date, list[int]] = {}
+        through = month_start
+        cached = await get_cache().get(key)
+        if isinstance(cached, dict) and cached.get("tz") == tz:
+            through = date.fromisoformat(cached["through"])
+            cents = {date.fromisoformat(day): list(values) for day, values in cached["days"].items()}
+
+        if through < closed:
+            cents.update(await self._daily_cents(through, closed, tz))
+            through = closed
+            await get_cache().set(key, {
+                "tz": tz,
+                "through": through.isoformat(),
+                "days": {day.isoformat(): values for day, values in sorted(cents.items())}
+            })
+
+        if through < end:
+            cents.update(await self._daily_cents(through, end, tz))
+
+        return {
+            day: {
+                field: (Decimal(value) / 100).quantize(Decimal("0.01"))
+                for field, value in zip(TREND_FIELDS, values)
+            }
+            for day, values in cents.items()
+        }
+
+    async def _daily_cents(self, start: date, end: date, tz: str) -> dict[date, list[int]]:
+        """按天分组聚合 [start, end) 的交易金额(分)"""
+        range_start, range_end = utc_range(
+            datetime.combine(start, datetime.min.time()),
+            datetime.combine(end, datetime.min.time()),
+            tz
+        )
+        tx_day = time_bucket("day", TransactionRecord.created_at, tz, offset_at=range_start)
+        result = await self.db.execute(
+            select(
+                tx_day.label("tx_day"),
+                TransactionRecord.transaction_type,
+                func.sum(TransactionRecord.amount).label("total_amount")
+            )
+            .where(
+                and_(
+                    TransactionRecord.created_at >= range_start,
+                    TransactionRecord.created_at < range_end
+                )
+            )
+            .group_by(tx_day, TransactionRecord.transaction_type)
+        )
+
+        daily: dict[date, list[int]] = {}
+        for row in result.all():
+            if row.transaction_type not in TREND_FIELDS:
+                continue
+            values = daily.setdefault(row.tx_day.date(), [0] * len(TREND_FIELDS))
+            values[TREND_FIELDS.index(row.transaction_type)] += int(
+                (Decimal(row.total_amount or 0) * 100).to_integral_value()
+            )
+        return daily
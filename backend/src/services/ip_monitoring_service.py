@@ -7,6 +7,9 @@ IP 监控和异常检测服务
 - 异常行为检测（频繁访问敏感端点）
 - 自动解封机制（基于时间的临时封禁）
 - IP 信誉评分系统
+
+封禁记录统一保存在 Redis 哈希 BLOCKED_IPS_KEY 中（字段为 IP），
+列出所有封禁 IP 只需一次 HGETALL；过期记录在读取时清理。
 """
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -21,6 +24,13 @@ from ..models.admin import AdminAccount
 
 logger = structlog.get_logger(__name__)
 
+# 封禁记录哈希（字段: IP 地址, 值: 封禁信息）
+BLOCKED_IPS_KEY = "blocked_ips"
+# 旧版本按 IP 单独存储的封禁键（blocked_ip:{ip}），启动时迁移到哈希
+LEGACY_BLOCK_KEY = "blocked_ip:{ip}"
+LEGACY_BLOCK_KEY_PATTERN = "blocked_ip:*"
+LEGACY_BLOCKS_MIGRATED_KEY = "blocked_ips:legacy_migrated"
+
 
 class BlockReason(str, Enum):
     """IP 封禁原因"""
@@ -157,7 +167,6 @@ class IPMonitoringService:
             ip_address: IP 地址
             failures: 失败记录列表
         """
-        block_key = f"blocked_ip:{ip_address}"
         current_time = get_current_timestamp()
 
         # 分析失败模式
@@ -173,12 +182,8 @@ class IPMonitoringService:
             "auto_blocked": True
         }
 
-        # 保存到缓存
-        await self.cache.set(
-            block_key,
-            block_info,
-            ttl=self.AUTO_BLOCK_DURATION
-        )
+        # 保存到封禁哈希（过期时间由 expires_at 判断）
+        await self.cache.hset(BLOCKED_IPS_KEY, ip_address, block_info)
 
         self.logger.warning(
             "ip_auto_blocked",
@@ -198,8 +203,7 @@ class IPMonitoringService:
         Returns:
             封禁状态信息
         """
-        block_key = f"blocked_ip:{ip_address}"
-        block_info = await self.cache.get(block_key)
+        block_info = await self.cache.hget(BLOCKED_IPS_KEY, ip_address)
 
         if not block_info:
             return {"blocked": False}
@@ -209,7 +213,7 @@ class IPMonitoringService:
 
         # 检查是否已过期
         if current_time > expires_at:
-            await self.cache.delete(block_key)
+            await self.cache.hdel(BLOCKED_IPS_KEY, ip_address)
             self.logger.info(
                 "ip_block_expired",
                 ip_address=ip_address
@@ -243,7 +247,6 @@ class IPMonitoringService:
         Returns:
             封禁信息
         """
-        block_key = f"blocked_ip:{ip_address}"
         current_time = get_current_timestamp()
 
         if duration is None:
@@ -258,7 +261,7 @@ class IPMonitoringService:
             "admin_id": admin_id
         }
 
-        await self.cache.set(block_key, block_info, ttl=duration)
+        await self.cache.hset(BLOCKED_IPS_KEY, ip_address, block_info)
 
         self.logger.warning(
             "ip_manually_blocked",
@@ -285,11 +288,10 @@ class IPMonitoringService:
         Returns:
             是否成功解封
         """
-        block_key = f"blocked_ip:{ip_address}"
         login_failures_key = f"login_failures:{ip_address}"
 
         # 删除封禁记录和失败计数
-        await self.cache.delete(block_key)
+        await self.cache.hdel(BLOCKED_IPS_KEY, ip_address)
         await self.cache.delete(login_failures_key)
 
         self.logger.info(
@@ -307,15 +309,22 @@ class IPMonitoringService:
         Returns:
             封禁 IP 信息列表
         """
-        # 使用缓存模式匹配
-        blocked_ips = await self.cache.get_by_pattern("blocked_ip:*")
+        # 一次 HGETALL 读取全部封禁记录
+        blocked_ips = await self.cache.hgetall(BLOCKED_IPS_KEY)
 
         current_time = get_current_timestamp()
         active_blocks = []
+        expired_ips = []
 
-        for ip_info in blocked_ips:
+        for ip_address, ip_info in blocked_ips.items():
             if ip_info.get("expires_at", 0) > current_time:
                 active_blocks.append(ip_info)
+            else:
+                expired_ips.append(ip_address)
+
+        # 顺便清理已过期的记录
+        if expired_ips:
+            await self.cache.hdel(BLOCKED_IPS_KEY, *expired_ips)
 
         return active_blocks
 
@@ -337,9 +346,15 @@ class IPMonitoringService:
         """
         score = 0
 
+        # 一次 MGET 读取登录失败记录和历史封禁记录
+        failures, history = await self.cache.mget([
+            f"login_failures:{ip_address}",
+            f"block_history:{ip_address}",
+        ])
+        failures = failures or []
+        history = history or []
+
         # 检查登录失败次数
-        failures_key = f"login_failures:{ip_address}"
-        failures = await self.cache.get(failures_key) or []
         score += len(failures) * 10
 
         # 检查是否被封禁
@@ -348,8 +363,6 @@ class IPMonitoringService:
             score += 30
 
         # 检查历史封禁记录
-        history_key = f"block_history:{ip_address}"
-        history = await self.cache.get(history_key) or []
         score += len(history) * 20
 
         # 确定信誉等级
@@ -423,13 +436,13 @@ class IPMonitoringService:
         Returns:
             IP 统计信息
         """
-        # 获取登录失败次数
-        failures_key = f"login_failures:{ip_address}"
-        failures = await self.cache.get(failures_key) or []
-
-        # 获取敏感端点访问
-        sensitive_key = f"sensitive_access:{ip_address}"
-        sensitive_accesses = await self.cache.get(sensitive_key) or []
+        # 一次 MGET 获取登录失败记录和敏感端点访问记录
+        failures, sensitive_accesses = await self.cache.mget([
+            f"login_failures:{ip_address}",
+            f"sensitive_access:{ip_address}",
+        ])
+        failures = failures or []
+        sensitive_accesses = sensitive_accesses or []
 
         # 获取封禁状态
         block_info = await self.check_ip_blocked(ip_address)
@@ -445,3 +458,40 @@ class IPMonitoringService:
             "block_info": block_info if block_info.get("blocked") else None,
             "reputation": reputation
         }
+
+
+async def migrate_legacy_ip_blocks() -> int:
+    """
+    将旧版本的 blocked_ip:{ip} 封禁键迁移到封禁哈希（启动时调用一次）
+
+    迁移标记键保证整个集群只扫描一次键空间；已过期的记录直接丢弃。
+    读到的旧键按 IP 逐个删除，不再为删除而第二次扫描键空间。
+
+    Returns:
+        迁移的封禁记录数量
+    """
+    cache = get_cache()
+    if not await cache.set_if_absent(LEGACY_BLOCKS_MIGRATED_KEY, True):
+        return 0
+
+    current_time = get_current_timestamp()
+    legacy_blocks = await cache.get_by_pattern(LEGACY_BLOCK_KEY_PATTERN)
+
+    migrated = 0
+    for block_info in legacy_blocks:
+        ip_address = block_info.get("ip_address")
+        if not ip_address:
+            continue
+        if block_info.get("expires_at", 0) > current_time:
+            await cache.hset(BLOCKED_IPS_KEY, ip_address, block_info)
+            migrated += 1
+        await cache.delete(LEGACY_BLOCK_KEY.format(ip=ip_address))
+
+    if legacy_blocks:
+        logger.info(
+            "legacy_ip_blocks_migrated",
+            migrated=migrated,
+            expired=len(legacy_blocks) - migrated
+        )
+
+    return migrated
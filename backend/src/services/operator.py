@@ -21,9 +21,12 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.cache import cache_result, invalidate_cache_tags
+from ..core.invalidation_bus import ChangeKind, EntityType, publish_entity_change
 from ..core.security.jwt import create_access_token
 from ..core.utils.password import hash_password, verify_password
 from ..models.operator import OperatorAccount
+from .balance_ledger import BalanceLedger
 from ..schemas.operator import (
     OperatorProfile,
     OperatorRegisterRequest,
@@ -276,7 +279,7 @@ class OperatorService:
             phone=operator.phone,
             email=operator.email,
             category=operator.customer_tier,
-            balance=str(operator.balance),
+            balance=str(await BalanceLedger(self.db).get_balance(operator.id)),
             is_active=operator.is_active,
             is_locked=operator.is_locked,
             last_login_at=operator.last_login_at,
@@ -337,7 +340,7 @@ class OperatorService:
             phone=operator.phone,
             email=operator.email,
             category=operator.customer_tier,
-            balance=str(operator.balance),
+            balance=str(await BalanceLedger(self.db).get_balance(operator.id)),
             is_active=operator.is_active,
             is_locked=operator.is_locked,
             last_login_at=operator.last_login_at,
@@ -376,13 +379,14 @@ class OperatorService:
                 }
             )
 
-        # 检查余额是否为0
-        if operator.balance > 0:
+        # 检查余额是否为0(含余额分片)
+        balance = await BalanceLedger(self.db).get_balance(operator.id)
+        if balance > 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
                     "error_code": "BALANCE_NOT_ZERO",
-                    "message": f"账户余额不为0(当前余额: {operator.balance}元),请先申请退款"
+                    "message": f"账户余额不为0(当前余额: {balance}元),请先申请退款"
                 }
             )
 
@@ -391,6 +395,8 @@ class OperatorService:
         operator.deleted_at = datetime.now(timezone.utc)
 
         await self.db.commit()
+        await publish_entity_change(EntityType.OPERATOR, operator.id, ChangeKind.DEACTIVATED)
+        await invalidate_cache_tags(f"operator:{operator.id}")
 
     async def regenerate_api_key(self, operator_id: UUID) -> str:
         """重新生成API Key
@@ -431,6 +437,10 @@ class OperatorService:
         operator.api_key_hash = new_api_key_hash
 
         await self.db.commit()
+        await publish_entity_change(
+            EntityType.OPERATOR, operator.id, ChangeKind.CREDENTIALS_CHANGED
+        )
+        await invalidate_cache_tags(f"operator:{operator.id}")
 
         return new_api_key  # 返回明文,仅此一次
 
@@ -621,8 +631,9 @@ class OperatorService:
                 }
             )
 
-        # 2. 检查余额是否大于0
-        if operator.balance <= 0:
+        # 2. 检查余额是否大于0(含余额分片)
+        balance = await BalanceLedger(self.db).get_balance(operator.id)
+        if balance <= 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -634,7 +645,7 @@ class OperatorService:
         # 3. 创建退款申请记录
         refund = RefundRecord(
             operator_id=operator_id,
-            requested_amount=operator.balance,  # 申请时的余额
+            requested_amount=balance,  # 申请时的余额
             status="pending",  # 初始状态为待审核
             refund_reason=reason
         )
@@ -1086,6 +1097,8 @@ class OperatorService:
 
         await self.db.commit()
         await self.db.refresh(site)
+        await publish_entity_change(EntityType.SITE, site.id)
+        await invalidate_cache_tags(f"operator:{operator_id}")
 
         return site
 
@@ -1144,6 +1157,8 @@ class OperatorService:
         site.deleted_at = datetime.now(timezone.utc)
 
         await self.db.commit()
+        await publish_entity_change(EntityType.SITE, site.id, ChangeKind.DELETED)
+        await invalidate_cache_tags(f"operator:{operator_id}")
 
     async def get_statistics_by_site(
         self,
@@ -1153,6 +1168,8 @@ class OperatorService:
     ) -> list[dict]:
         """按运营点统计使用情况 (T112)
 
+        读取小时/日汇总表, 只有区间首尾和尚未汇总的部分扫描原始记录(见 UsageRollupService)。
+
         聚合每个运营点的:
         - 总场次 (total_sessions)
         - 总玩家人次 (total_players)
@@ -1169,9 +1186,9 @@ class OperatorService:
         Raises:
             HTTPException 404: 运营商不存在
         """
-        from ..models.usage_record import UsageRecord
         from ..models.site import OperationSite
         from sqlalchemy import func
+        from .usage_rollup import UsageRollupService
 
         # 1. 验证运营商存在
         operator_stmt = select(OperatorAccount).where(
@@ -1190,31 +1207,24 @@ class OperatorService:
                 }
             )
 
-        # 2. 构建查询条件
-        conditions = [
-            UsageRecord.operator_id == operator_id
-        ]
-
-        # 时间范围筛选
-        if start_time:
-            conditions.append(UsageRecord.game_started_at >= start_time)
-        if end_time:
-            conditions.append(UsageRecord.game_started_at <= end_time)
+        # 2. 使用量来源: 汇总表(整天/整点) + 原始记录(区间首尾和未汇总部分)
+        totals = await UsageRollupService(self.db).usage_totals(
+            operator_id, start_time, end_time, group_by="site_id"
+        )
 
         # 3. 聚合查询: 按运营点分组统计
         stmt = (
             select(
                 OperationSite.id.label('site_id'),
                 OperationSite.name.label('site_name'),
-                func.count(UsageRecord.id).label('total_sessions'),
-                func.sum(UsageRecord.player_count).label('total_players'),
-                func.sum(UsageRecord.total_cost).label('total_cost')
+                func.sum(totals.c.total_sessions).label('total_sessions'),
+                func.sum(totals.c.total_players).label('total_players'),
+                func.sum(totals.c.total_cost).label('total_cost')
             )
-            .select_from(UsageRecord)
-            .join(OperationSite, UsageRecord.site_id == OperationSite.id)
-            .where(*conditions)
+            .select_from(totals)
+            .join(OperationSite, totals.c.key == OperationSite.id)
             .group_by(OperationSite.id, OperationSite.name)
-            .order_by(func.sum(UsageRecord.total_cost).desc())  # 按总消费降序
+            .order_by(func.sum(totals.c.total_cost).desc())  # 按总消费降序
         )
 
         result = await self.db.execute(stmt)
@@ -1241,6 +1251,8 @@ class OperatorService:
     ) -> list[dict]:
         """按应用统计使用情况 (T113)
 
+        读取小时/日汇总表, 只有区间首尾和尚未汇总的部分扫描原始记录(见 UsageRollupService)。
+
         聚合每个应用的:
         - 总场次 (total_sessions)
         - 总玩家人次 (total_players)
@@ -1258,9 +1270,9 @@ class OperatorService:
         Raises:
             HTTPException 404: 运营商不存在
         """
-        from ..models.usage_record import UsageRecord
         from ..models.application import Application
         from sqlalchemy import func
+        from .usage_rollup import UsageRollupService
 
         # 1. 验证运营商存在
         operator_stmt = select(OperatorAccount).where(
@@ -1279,31 +1291,24 @@ class OperatorService:
                 }
             )
 
-        # 2. 构建查询条件
-        conditions = [
-            UsageRecord.operator_id == operator_id
-        ]
-
-        # 时间范围筛选
-        if start_time:
-            conditions.append(UsageRecord.game_started_at >= start_time)
-        if end_time:
-            conditions.append(UsageRecord.game_started_at <= end_time)
+        # 2. 使用量来源: 汇总表(整天/整点) + 原始记录(区间首尾和未汇总部分)
+        totals = await UsageRollupService(self.db).usage_totals(
+            operator_id, start_time, end_time, group_by="application_id"
+        )
 
         # 3. 聚合查询: 按应用分组统计
         stmt = (
             select(
                 Application.id.label('app_id'),
                 Application.app_name.label('app_name'),
-                func.count(UsageRecord.id).label('total_sessions'),
-                func.sum(UsageRecord.player_count).label('total_players'),
-                func.sum(UsageRecord.total_cost).label('total_cost')
+                func.sum(totals.c.total_sessions).label('total_sessions'),
+                func.sum(totals.c.total_players).label('total_players'),
+                func.sum(totals.c.total_cost).label('total_cost')
             )
-            .select_from(UsageRecord)
-            .join(Application, UsageRecord.application_id == Application.id)
-            .where(*conditions)
+            .select_from(totals)
+            .join(Application, totals.c.key == Application.id)
             .group_by(Application.id, Application.app_name)
-            .order_by(func.sum(UsageRecord.total_cost).desc())  # 按总消费降序
+            .order_by(func.sum(totals.c.total_cost).desc())  # 按总消费降序
         )
 
         result = await self.db.execute(stmt)
@@ -1338,8 +1343,9 @@ class OperatorService:
     ) -> dict:
         """按时间统计消费趋势 (T114)
 
-        按day/week/month维度聚合:
-        - chart_data: 时间序列数据点列表
+        读取小时/日汇总表(见 UsageRollupService), 在数据库中按 REPORT_TIMEZONE 时区的
+        day/week/month 时间桶聚合:
+        - chart_data: 时间序列数据点列表(没有消费的时间桶补0)
         - summary: 汇总统计(总场次、总玩家、总消费、平均每场玩家数)
 
         Args:
@@ -1358,8 +1364,9 @@ class OperatorService:
         Raises:
             HTTPException 404: 运营商不存在
         """
-        from ..models.usage_record import UsageRecord
-        from sqlalchemy import func, cast, Date
+        from ..core.config import get_settings
+        from ..db.time_buckets import bucket_series, fill_gaps, to_local
+        from .usage_rollup import UsageRollupService
 
         # 1. 验证运营商存在
         operator_stmt = select(OperatorAccount).where(
@@ -1378,77 +1385,62 @@ class OperatorService:
                 }
             )
 
-        # 2. 构建查询条件
-        conditions = [
-            UsageRecord.operator_id == operator_id
-        ]
-
-        # 时间范围筛选
-        if start_time:
-            conditions.append(UsageRecord.game_started_at >= start_time)
-        if end_time:
-            conditions.append(UsageRecord.game_started_at <= end_time)
-
-        # 3. 根据dimension确定分组方式
-        # 使用数据库兼容的函数: strftime对SQLite和PostgreSQL都兼容
-        if dimension == "day":
-            # 按日分组: DATE(game_started_at)
-            date_trunc = cast(UsageRecord.game_started_at, Date).label('date')
-        elif dimension == "week":
-            # 按周分组: 使用strftime('%Y-W%W', game_started_at)
-            # SQLite: strftime('%Y-W%W', datetime)
-            # PostgreSQL也支持类似用法,或使用DATE_TRUNC
-            date_trunc = func.strftime('%Y-W%W', UsageRecord.game_started_at).label('date')
-        elif dimension == "month":
-            # 按月分组: 使用strftime('%Y-%m', game_started_at)
-            date_trunc = func.strftime('%Y-%m', UsageRecord.game_started_at).label('date')
-        else:
-            # 默认按日
-            date_trunc = cast(UsageRecord.game_started_at, Date).label('date')
+        # 2. 时间桶: day/week(周一为一周开始)/month, 按 REPORT_TIMEZONE 的本地时间划分
+        granularity = dimension if dimension in ("week", "month") else "day"
+        tz = get_settings().REPORT_TIMEZONE
 
-        # 4. 聚合查询: 按时间分组统计
-        stmt = (
+        # 3. 使用量来源: 日/小时汇总和原始记录分别在数据库中按时间桶聚合
+        totals = await UsageRollupService(self.db).usage_totals(
+            operator_id, start_time, end_time,
+            group_by="bucket", granularity=granularity, tz=tz
+        )
+        result = await self.db.execute(
             select(
-                date_trunc,
-                func.count(UsageRecord.id).label('total_sessions'),
-                func.sum(UsageRecord.player_count).label('total_players'),
-                func.sum(UsageRecord.total_cost).label('total_cost')
+                totals.c.key,
+                totals.c.total_sessions,
+                totals.c.total_players,
+                totals.c.total_cost
             )
-            .where(*conditions)
-            .group_by(date_trunc)
-            .order_by(date_trunc)  # 按时间升序
         )
 
-        result = await self.db.execute(stmt)
-        rows = result.all()
+        # 4. 合并各来源的同一时间桶
+        buckets: dict[datetime, list] = {}
+        for row in result.all():
+            bucket = buckets.setdefault(row.key, [0, 0, 0])
+            bucket[0] += row.total_sessions or 0
+            bucket[1] += int(row.total_players or 0)
+            bucket[2] += row.total_cost or 0
+
+        # 5. 格式化图表数据(按时间升序, 区间内没有消费的时间桶补0)
+        # day: 2026-01-15, week: 2026-W02, month: 2026-01
+        if granularity == "week":
+            date_format = "%Y-W%W"
+        elif granularity == "month":
+            date_format = "%Y-%m"
+        else:
+            date_format = "%Y-%m-%d"
+
+        series = []
+        if buckets or start_time:
+            first = to_local(start_time, tz) if start_time else min(buckets)
+            last = to_local(end_time or datetime.now(timezone.utc), tz)
+            series = bucket_series(first, max([last, *buckets]), granularity)
 
-        # 5. 格式化图表数据
         chart_data = []
         total_sessions_sum = 0
         total_players_sum = 0
         total_cost_sum = 0
 
-        for row in rows:
-            total_sessions = row.total_sessions or 0
-            total_players = int(row.total_players or 0)
-            total_cost = row.total_cost or 0
-
+        for bucket_start, (total_sessions, total_players, total_cost) in fill_gaps(
+            buckets, series, lambda: [0, 0, 0]
+        ):
             # 累加汇总数据
             total_sessions_sum += total_sessions
             total_players_sum += total_players
             total_cost_sum += total_cost
 
-            # 格式化日期为字符串
-            if isinstance(row.date, str):
-                # week/month分组时已经是字符串格式
-                date_str = row.date
-            elif isinstance(row.date, datetime):
-                date_str = row.date.date().isoformat()
-            else:
-                date_str = row.date.isoformat()
-
             chart_data.append({
-                "date": date_str,
+                "date": bucket_start.strftime(date_format),
                 "total_sessions": total_sessions,
                 "total_players": total_players,
                 "total_cost": f"{float(total_cost):.2f}"  # 确保格式为"0.00"
@@ -1549,6 +1541,9 @@ class OperatorService:
 
         return recharge_order
 
+    @cache_result(
+        "catalog", ttl=60, tags=["operator:{operator_id}", "applications"]
+    )
     async def get_authorized_applications(
         self,
         operator_id: UUID
@@ -1561,6 +1556,9 @@ class OperatorService:
         - 只返回is_active=true的授权
         - 排除已过期的授权(expires_at < now)
         - 联表查询Application获取应用详情
+        - 结果缓存60秒(多级缓存), 授权或应用变更时按标签失效
+          (operator:{id}, applications); 到期的授权最多在缓存中多保留60秒,
+          游戏授权接口仍按实时到期时间校验
 
         Args:
             operator_id: 运营商ID
@@ -1895,11 +1893,15 @@ class OperatorService:
         """玩家数量分布统计 (T115)
 
         统计不同玩家数量的游戏场次分布,用于分析运营商最常见的游戏规模。
+        分布来自按 (应用, 日) 预先汇总的玩家数量直方图(见 UsageRollupService.player_histogram),
+        百分位数、平均值、众数都由合并后的直方图计算, 不扫描使用记录。
 
         返回数据:
         - distribution: 各玩家数量的场次、占比、总消费
         - total_sessions: 总场次
         - most_common_player_count: 最常见的玩家数
+        - average_player_count: 平均每场玩家数
+        - percentiles: 玩家数的 p50/p90/p99
 
         Args:
             operator_id: 运营商ID
@@ -1910,14 +1912,16 @@ class OperatorService:
             dict: {
                 "distribution": list[dict],
                 "total_sessions": int,
-                "most_common_player_count": int
+                "most_common_player_count": int,
+                "average_player_count": float,
+                "percentiles": dict
             }
 
         Raises:
             HTTPException 404: 运营商不存在
         """
-        from ..models.usage_record import UsageRecord
-        from sqlalchemy import func
+        from decimal import Decimal
+        from .usage_rollup import UsageRollupService
 
         # 1. 验证运营商存在
         operator_stmt = select(OperatorAccount).where(
@@ -1936,61 +1940,35 @@ class OperatorService:
                 }
             )
 
-        # 2. 构建查询条件
-        conditions = [
-            UsageRecord.operator_id == operator_id
-        ]
-
-        # 时间范围筛选
-        if start_time:
-            conditions.append(UsageRecord.game_started_at >= start_time)
-        if end_time:
-            conditions.append(UsageRecord.game_started_at <= end_time)
-
-        # 3. 聚合查询: 按玩家数量分组统计
-        stmt = (
-            select(
-                UsageRecord.player_count,
-                func.count(UsageRecord.id).label('session_count'),
-                func.sum(UsageRecord.total_cost).label('total_cost')
-            )
-            .where(*conditions)
-            .group_by(UsageRecord.player_count)
-            .order_by(UsageRecord.player_count)  # 按玩家数升序
+        # 2. 合并区间内的玩家数量直方图
+        histogram = await UsageRollupService(self.db).player_histogram(
+            operator_id, start_time, end_time
         )
+        total_sessions = histogram.total_sessions
 
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        # 4. 计算总场次
-        total_sessions = sum(row.session_count for row in rows)
-
-        # 5. 格式化返回数据
+        # 3. 格式化返回数据(按玩家数升序, 只返回有场次的玩家数)
         distribution = []
-        most_common_count = 0
-        max_sessions = 0
-
-        for row in rows:
-            session_count = row.session_count or 0
-            total_cost = row.total_cost or 0
+        for player_count, session_count in enumerate(histogram.session_counts):
+            if not session_count:
+                continue
 
             # 计算占比
-            percentage = round((session_count / total_sessions * 100), 1) if total_sessions > 0 else 0.0
-
-            # 找出最常见的玩家数
-            if session_count > max_sessions:
-                max_sessions = session_count
-                most_common_count = row.player_count
+            percentage = round((session_count / total_sessions * 100), 1)
 
             distribution.append({
-                "player_count": row.player_count,
+                "player_count": player_count,
                 "session_count": session_count,
                 "percentage": percentage,
-                "total_cost": f"{float(total_cost):.2f}"
+                "total_cost": f"{Decimal(histogram.cost_cents[player_count]) / 100:.2f}"
             })
 
         return {
             "distribution": distribution,
             "total_sessions": total_sessions,
-            "most_common_player_count": most_common_count if total_sessions > 0 else 0
+            "most_common_player_count": histogram.mode(),
+            "average_player_count": round(histogram.mean(), 1),
+            "percentiles": {
+                f"p{percent}": histogram.percentile(percent) or 0
+                for percent in (50, 90, 99)
+            }
         }
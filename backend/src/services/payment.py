@@ -27,6 +27,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.operator import OperatorAccount
 from ..models.transaction import RechargeOrder, TransactionRecord
+from .balance_ledger import BalanceLedger
+from .finance_counters import record_transactions
 
 
 class PaymentService:
@@ -277,7 +279,8 @@ class PaymentService:
                 order.transaction_id = transaction_id
                 order.paid_at = paid_at
 
-                # 记录余额变化
+                # 把余额分片归集回主行后记录余额变化
+                await BalanceLedger(self.db).consolidate(operator)
                 balance_before = operator.balance
                 balance_after = balance_before + order.amount
 
@@ -300,6 +303,7 @@ class PaymentService:
 
                 self.db.add(transaction)
                 await self.db.commit()
+                await record_transactions([transaction])
 
                 return {
                     "success": True,
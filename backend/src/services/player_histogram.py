@@ -0,0 +1,132 @@
+"""玩家数量直方图 (PlayerHistogram)
+
+玩家数量分布统计不再对 usage_records 做 GROUP BY: 汇总任务(UsageRollupService)在每个UTC日
+结束后按 (运营商, 应用, 日) 写入一行直方图(见 models.usage_rollup.UsagePlayerHistogram):
+
+- session_counts: 第 i 个元素为玩家数为 i 的场次
+- cost_cents: 第 i 个元素为玩家数为 i 的消费金额(分)
+
+向量以小端 int64 打包为 bytes 存储。任意区间的分布 = 区间内各行向量逐元素相加,
+安装了 NumPy 时整批向量化合并, 否则逐行相加(结果相同)。
+百分位数、平均值、众数都由合并后的直方图计算(长度为最大玩家数+1), 与场次数量无关。
+"""
+
+import struct
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import accumulate
+from math import ceil
+from typing import Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, vectors are merged in pure Python instead
+    np = None
+
+# 打包格式: 小端 int64
+ITEM_SIZE = 8
+
+
+def pack(values: Sequence[int]) -> bytes:
+    """把整数向量打包为小端 int64 bytes"""
+    return struct.pack(f"<{len(values)}q", *values)
+
+
+def unpack(data: bytes) -> list[int]:
+    """解包小端 int64 bytes 为整数向量"""
+    return list(struct.unpack(f"<{len(data) // ITEM_SIZE}q", data))
+
+
+def merge_vectors(blobs: Sequence[bytes]) -> list[int]:
+    """逐元素相加多个打包向量(长度可不同, 短向量视为末尾补0)
+
+    Args:
+        blobs: 打包向量列表
+
+    Returns:
+        list[int]: 合并后的向量
+    """
+    if not blobs:
+        return []
+    width = max(len(blob) for blob in blobs)
+    if np is not None:
+        padded = b"".join(blob.ljust(width, b"\0") for blob in blobs)
+        matrix = np.frombuffer(padded, dtype="<i8").reshape(len(blobs), width // ITEM_SIZE)
+        return matrix.sum(axis=0).tolist()
+
+    merged = [0] * (width // ITEM_SIZE)
+    for blob in blobs:
+        for index, value in enumerate(unpack(blob)):
+            merged[index] += value
+    return merged
+
+
+def to_cents(amount) -> int:
+    """金额(元)转换为分"""
+    return int((Decimal(amount or 0) * 100).to_integral_value())
+
+
+@dataclass
+class PlayerHistogram:
+    """各玩家数的场次和消费金额(分)"""
+
+    session_counts: list[int] = field(default_factory=list)
+    cost_cents: list[int] = field(default_factory=list)
+
+    @classmethod
+    def merge(cls, rows: Iterable[tuple[bytes, bytes]]) -> "PlayerHistogram":
+        """合并多行打包直方图
+
+        Args:
+            rows: (session_counts, cost_cents) 打包向量对
+
+        Returns:
+            PlayerHistogram: 合并后的直方图
+        """
+        rows = list(rows)
+        return cls(
+            session_counts=merge_vectors([row[0] for row in rows]),
+            cost_cents=merge_vectors([row[1] for row in rows])
+        )
+
+    def add(self, player_count: int, sessions: int, cost) -> None:
+        """累加某个玩家数的场次和消费金额(元)"""
+        width = max(len(self.session_counts), player_count + 1)
+        for vector in (self.session_counts, self.cost_cents):
+            vector.extend([0] * (width - len(vector)))
+        self.session_counts[player_count] += sessions
+        self.cost_cents[player_count] += to_cents(cost)
+
+    def packed(self) -> tuple[bytes, bytes]:
+        """打包为 (session_counts, cost_cents)"""
+        return pack(self.session_counts), pack(self.cost_cents)
+
+    @property
+    def total_sessions(self) -> int:
+        return sum(self.session_counts)
+
+    def mean(self) -> float:
+        """平均每场玩家数(无场次时为0)"""
+        total = self.total_sessions
+        if not total:
+            return 0.0
+        return sum(count * sessions for count, sessions in enumerate(self.session_counts)) / total
+
+    def mode(self) -> int:
+        """最常见的玩家数(场次相同时取较小的玩家数, 无场次时为0)"""
+        if not self.total_sessions:
+            return 0
+        return self.session_counts.index(max(self.session_counts))
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """玩家数的百分位数(最近秩法, 无场次时为None)
+
+        Args:
+            percent: 百分位(0-100)
+        """
+        total = self.total_sessions
+        if not total:
+            return None
+        rank = max(1, ceil(total * percent / 100))
+        return bisect_left(list(accumulate(self.session_counts)), rank)
@@ -24,6 +24,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.operator import OperatorAccount
 from ..models.refund import RefundRecord
 from ..models.transaction import TransactionRecord
+from .balance_ledger import BalanceLedger
+from .finance_counters import record_transactions
 
 
 class RefundService:
@@ -81,8 +83,9 @@ class RefundService:
                 }
             )
 
-        # 2. 检查余额是否大于0
-        if operator.balance <= 0:
+        # 2. 检查余额是否大于0(含余额分片)
+        balance = await BalanceLedger(self.db).get_balance(operator.id)
+        if balance <= 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -94,7 +97,7 @@ class RefundService:
         # 3. 创建退款申请记录
         refund = RefundRecord(
             operator_id=operator_id,
-            requested_amount=operator.balance,  # 申请时的余额快照
+            requested_amount=balance,  # 申请时的余额快照
             status="pending",  # 初始状态为待审核
             refund_reason=reason
         )
@@ -139,8 +142,8 @@ class RefundService:
                 }
             )
 
-        # 返回当前余额作为可退余额
-        return operator.balance
+        # 返回当前总余额(含余额分片)作为可退余额
+        return await BalanceLedger(self.db).get_balance(operator.id)
 
     async def approve_refund(
         self,
@@ -214,6 +217,9 @@ class RefundService:
                 }
             )
 
+        # 把余额分片归集回主行, 之后按主行余额处理
+        await BalanceLedger(self.db).consolidate(operator)
+
         # 4. 确定实际退款金额(默认使用申请金额)
         if actual_refund_amount is None:
             actual_refund_amount = refund.requested_amount
@@ -257,6 +263,7 @@ class RefundService:
 
             self.db.add(transaction)
             await self.db.commit()
+            await record_transactions([transaction])
             await self.db.refresh(refund)
 
             return refund
@@ -0,0 +1,147 @@
+"""会话ID幂等性索引 (SessionIdempotencyIndex)
+
+授权请求绝大多数携带新的会话ID, 但原来每次都要 SELECT usage_records 做幂等性检查。
+本索引在数据库之前加两层快速判断, 只有"可能重复"的会话ID才查询数据库:
+
+1. 进程内Bloom过滤器: 按会话ID有效期(5分钟, 见 AuthService.verify_session_id_format)
+   轮换, 判定"一定没见过"时进入第二层, 判定"可能见过"时直接走慢路径
+2. Redis SET NX 占位(带TTL): 跨worker确认会话ID是新的; 占位成功即跳过数据库查询
+
+扣费成功后把完整的授权响应(含真实的扣费后余额)写入同一个Redis键,
+重复请求直接返回缓存的响应; 缓存缺失时才回退到数据库查询。
+
+关键特性:
+- Bloom过滤器没有漏判, 误判只会多查一次数据库
+- Redis不可用时不走快速路径, 回退到数据库幂等性查询: 只有Redis占位能跨worker
+  确认会话ID是新的, 仅凭本worker的Bloom过滤器会让落到其他worker的重试
+  跳过查询并触发唯一约束(409), 而不是返回已授权信息
+- 时间戳明显超前的会话ID(超过允许的时钟偏差)不走快速路径, 因为其有效期
+  超出了Bloom过滤器和Redis键的保留时间
+"""
+
+import time
+from typing import Any, Optional
+
+import structlog
+
+from ..core.cache import get_cache
+from ..core.config import get_settings
+from ..core.utils.bloom import RotatingBloomFilter
+from .auth_service import SESSION_ID_MAX_AGE_SECONDS
+
+logger = structlog.get_logger(__name__)
+
+# Redis键前缀: 值为 null 表示已占位(授权进行中或失败), 否则为缓存的授权响应
+SESSION_KEY_PREFIX = "session:authorize:"
+
+# 允许的头显与服务器时钟偏差(秒)
+CLOCK_SKEW_SECONDS = 60
+
+# 会话ID需要被记住的最短时间: 时间戳不超前超过 CLOCK_SKEW_SECONDS 的会话ID
+# 在首次出现后最多 SESSION_ID_MAX_AGE_SECONDS + CLOCK_SKEW_SECONDS 秒内仍然有效
+SESSION_RETENTION_SECONDS = SESSION_ID_MAX_AGE_SECONDS + CLOCK_SKEW_SECONDS
+
+
+class SessionIdempotencyIndex:
+    """会话ID幂等性索引(Bloom过滤器 + Redis占位 + 响应缓存)"""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        retention_seconds: int = SESSION_RETENTION_SECONDS
+    ):
+        """初始化索引
+
+        Args:
+            capacity: 每个保留窗口内预计的会话ID数量(0表示关闭快速路径)
+            error_rate: Bloom过滤器误判率
+            retention_seconds: 会话ID保留时间(秒)
+        """
+        self.retention_seconds = retention_seconds
+        self._bloom: Optional[RotatingBloomFilter] = None
+        if capacity > 0:
+            self._bloom = RotatingBloomFilter(capacity, retention_seconds, error_rate)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"{SESSION_KEY_PREFIX}{session_id}"
+
+    @staticmethod
+    def _within_retention(session_id: str) -> bool:
+        """会话ID的时间戳是否在快速路径可覆盖的范围内(格式已校验)"""
+        try:
+            session_timestamp = int(session_id.rsplit("_", 2)[1])
+        except (IndexError, ValueError):
+            return False
+        return session_timestamp <= time.time() + CLOCK_SKEW_SECONDS
+
+    async def claim(self, session_id: str) -> bool:
+        """尝试确认会话ID是新的并占位
+
+        Args:
+            session_id: 会话ID(已通过格式校验)
+
+        Returns:
+            bool: True表示一定是新会话(可跳过数据库幂等性查询),
+                  False表示可能重复, 需要继续检查
+        """
+        if self._bloom is None or not self._within_retention(session_id):
+            return False
+
+        if self._bloom.add(session_id):
+            return False
+
+        claimed = await get_cache().set_if_absent(
+            self._key(session_id), None, ttl=self.retention_seconds
+        )
+        if claimed is False:
+            logger.debug("session_claim_conflict", session_id=session_id)
+            return False
+
+        # claimed is None: Redis不可用, 无法跨worker确认, 回退到数据库查询
+        return claimed is True
+
+    async def get_response(self, session_id: str) -> Optional[dict[str, Any]]:
+        """获取已缓存的授权响应数据
+
+        Args:
+            session_id: 会话ID
+
+        Returns:
+            Optional[dict]: GameAuthorizeData 的JSON数据, 不存在时返回None
+        """
+        if self._bloom is None:
+            return None
+        return await get_cache().get(self._key(session_id))
+
+    async def remember_response(self, session_id: str, data: dict[str, Any]) -> None:
+        """缓存授权成功的响应数据, 供重复请求直接返回
+
+        Args:
+            session_id: 会话ID
+            data: GameAuthorizeData 的JSON数据
+        """
+        if self._bloom is None:
+            return
+        await get_cache().set(self._key(session_id), data, ttl=self.retention_seconds)
+
+
+# Global index instance (per worker process)
+_session_index: Optional[SessionIdempotencyIndex] = None
+
+
+def get_session_index() -> SessionIdempotencyIndex:
+    """获取全局会话ID幂等性索引
+
+    Returns:
+        SessionIdempotencyIndex: 当前worker进程的索引实例
+    """
+    global _session_index
+    if _session_index is None:
+        settings = get_settings()
+        _session_index = SessionIdempotencyIndex(
+            capacity=settings.SESSION_BLOOM_CAPACITY,
+            error_rate=settings.SESSION_BLOOM_ERROR_RATE,
+        )
+    return _session_index
@@ -0,0 +1,563 @@
+"""使用记录汇总服务 (UsageRollupService)
+
+运营商统计接口(按运营点/按应用/按时间)原先每次加载都对 usage_records 做 GROUP BY,
+耗时随历史线性增长。本模块维护小时/日汇总表(见 models.usage_rollup):
+
+- 写入: 后台任务(UsageRollupWorker)按小时增量汇总。整点结束
+  USAGE_ROLLUP_GRACE_SECONDS 后, 该小时从原始记录聚合一次写入小时汇总;
+  一整天结束后再由小时汇总合并为日汇总, 同时写入该日的玩家数量直方图
+  (见 services.player_histogram)。汇总行和水位线在同一事务中提交,
+  重跑某个小时会先删除再写入(幂等)。授权扣费热路径不增加任何语句
+- 读取: 统计区间拆分为 日汇总(整天) + 小时汇总(整点) + 原始记录, 原始记录只覆盖
+  区间首尾不足一小时的部分和水位线之后尚未汇总的(开放)部分。按时间分组时
+  各部分用 db.time_buckets 在数据库中按 REPORT_TIMEZONE 分桶; 非UTC时区不使用
+  UTC日汇总, UTC偏移不是整小时的时区只读原始记录
+- 首次部署时使用 scripts/backfill_usage_rollups.py 回填历史数据
+
+所有时间桶按UTC划分。水位线之前补写的使用记录(如导入历史数据)不会自动汇总,
+需要使用回填脚本的 --rebuild-from 参数重建。
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Callable, Optional, Union
+from uuid import UUID
+
+import structlog
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Subquery
+
+from ..core.config import get_settings
+from ..db.time_buckets import Granularity, get_zone, is_utc, time_bucket
+from ..models.usage_record import UsageRecord
+from ..models.usage_rollup import (
+    UsageDailyRollup,
+    UsageHourlyRollup,
+    UsagePlayerHistogram,
+    UsageRollupWatermark,
+)
+from .player_histogram import PlayerHistogram
+
+logger = structlog.get_logger(__name__)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# 水位线名称(usage_rollup_watermarks 主键)
+WATERMARK_NAME = "usage"
+# 每个事务最多汇总的小时数(回填时分批提交)
+MAX_HOURS_PER_TRANSACTION = 24
+
+# 统计分组维度 -> (汇总表列名, 原始记录列)
+GROUP_COLUMNS = {
+    "site_id": ("site_id", UsageRecord.site_id),
+    "application_id": ("application_id", UsageRecord.application_id),
+    "bucket": ("bucket_start", UsageRecord.game_started_at),
+}
+
+
+def as_utc(value: datetime) -> datetime:
+    """统一为带时区的UTC时间(SQLite读出的无时区时间按UTC处理)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime) -> datetime:
+    floored = floor_hour(value)
+    return floored if floored == value else floored + HOUR
+
+
+def floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_day(value: datetime) -> datetime:
+    floored = floor_day(value)
+    return floored if floored == value else floored + DAY
+
+
+# 时间范围: (起点(含), 终点, 终点是否包含), None 表示不限
+TimeRange = tuple[Optional[datetime], Optional[datetime], bool]
+
+
+@dataclass
+class RollupRanges:
+    """统计区间拆分结果"""
+
+    daily: list[TimeRange] = field(default_factory=list)
+    hourly: list[TimeRange] = field(default_factory=list)
+    raw: list[TimeRange] = field(default_factory=list)
+
+
+def plan_ranges(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    watermark: Optional[datetime],
+    use_daily: bool = True
+) -> RollupRanges:
+    """把统计区间 [start, end] 拆分为日汇总/小时汇总/原始记录三部分
+
+    Args:
+        start: 开始时间(含), None 表示不限
+        end: 结束时间(含), None 表示不限
+        watermark: 汇总水位线, None 表示尚未汇总
+        use_daily: 是否使用日汇总(按非UTC时区分桶时整天也读小时汇总)
+
+    Returns:
+        RollupRanges: 各部分的时间范围(互不重叠, 合起来正好覆盖原区间)
+    """
+    start = as_utc(start) if start else None
+    end = as_utc(end) if end else None
+    if watermark is None:
+        return RollupRanges(raw=[(start, end, True)])
+
+    watermark = as_utc(watermark)
+    lower = ceil_hour(start) if start else None
+    upper = min(floor_hour(end), watermark) if end else watermark
+    if lower is not None and lower >= upper:
+        # 区间太短或全部在水位线之后
+        return RollupRanges(raw=[(start, end, True)])
+
+    ranges = RollupRanges()
+    if start is not None and start < lower:
+        ranges.raw.append((start, lower, False))
+    ranges.raw.append((upper, end, True))
+
+    first_day = ceil_day(lower) if lower else None
+    last_day = floor_day(upper)
+    if not use_daily:
+        ranges.hourly.append((lower, upper, False))
+    elif first_day is None or first_day < last_day:
+        ranges.daily.append((first_day, last_day, False))
+        if lower is not None and lower < first_day:
+            ranges.hourly.append((lower, first_day, False))
+        if last_day < upper:
+            ranges.hourly.append((last_day, upper, False))
+    else:
+        ranges.hourly.append((lower, upper, False))
+    return ranges
+
+
+def _range_condition(column, time_range: TimeRange):
+    lower, upper, inclusive = time_range
+    conditions = []
+    if lower is not None:
+        conditions.append(column >= lower)
+    if upper is not None:
+        conditions.append(column <= upper if inclusive else column < upper)
+    return and_(*conditions) if conditions else true()
+
+
+def _ranges_condition(column, time_ranges: list[TimeRange]):
+    return or_(*(_range_condition(column, time_range) for time_range in time_ranges))
+
+
+class UsageRollupService:
+    """使用记录汇总服务"""
+
+    def __init__(self, db: AsyncSession):
+        """初始化汇总服务
+
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+
+    async def get_watermark(self) -> Optional[datetime]:
+        """获取汇总水位线(此前的小时均已汇总)
+
+        Returns:
+            Optional[datetime]: 水位线(UTC整点), 尚未汇总时为None
+        """
+        watermark = await self.db.scalar(
+            select(UsageRollupWatermark.rolled_up_until)
+            .where(UsageRollupWatermark.name == WATERMARK_NAME)
+        )
+        return as_utc(watermark) if watermark else None
+
+    async def usage_totals(
+        self,
+        operator_id: UUID,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        group_by: str,
+        granularity: Granularity = "day",
+        tz: Union[str, tzinfo] = "UTC"
+    ) -> Subquery:
+        """构造运营商使用量子查询: 汇总表 + 原始记录 UNION ALL
+
+        同一分组键可能出现多行(分别来自日汇总、小时汇总和原始记录),
+        调用方再按 key 求和。
+
+        Args:
+            operator_id: 运营商ID
+            start: 开始时间(含, 可选)
+            end: 结束时间(含, 可选)
+            group_by: 分组维度(site_id / application_id / bucket)
+            granularity: 按时间分组时的时间桶(hour/day/week/month)
+            tz: 按时间分组时的时区, key 为该时区的时间桶起点(无时区)
+
+        Returns:
+            Subquery: 列为 key, total_sessions, total_players, total_cost
+        """
+        rollup_column, raw_column = GROUP_COLUMNS[group_by]
+        watermark = await self.get_watermark()
+        use_daily = True
+        if group_by == "bucket":
+            zone = get_zone(tz)
+            use_daily = is_utc(zone)
+            offset = datetime.now(timezone.utc).astimezone(zone).utcoffset()
+            if offset % HOUR:
+                # 小时汇总无法按该时区的日界线切分
+                watermark = None
+        ranges = plan_ranges(start, end, watermark, use_daily=use_daily)
+
+        def group_key(column):
+            if group_by == "bucket":
+                # SQLite 使用区间结束时的UTC偏移
+                return time_bucket(granularity, column, tz, offset_at=as_utc(end) if end else None)
+            return column
+
+        parts = []
+        for model, time_ranges in (
+            (UsageDailyRollup, ranges.daily),
+            (UsageHourlyRollup, ranges.hourly),
+        ):
+            if not time_ranges:
+                continue
+            key = group_key(getattr(model, rollup_column))
+            parts.append(
+                select(
+                    key.label("key"),
+                    func.sum(model.total_sessions).label("total_sessions"),
+                    func.sum(model.total_players).label("total_players"),
+                    func.sum(model.total_cost).label("total_cost")
+                )
+                .where(
+                    model.operator_id == operator_id,
+                    _ranges_condition(model.bucket_start, time_ranges)
+                )
+                .group_by(key)
+            )
+
+        raw_key = group_key(raw_column)
+        parts.append(
+            select(
+                raw_key.label("key"),
+                func.count(UsageRecord.id).label("total_sessions"),
+                func.sum(UsageRecord.player_count).label("total_players"),
+                func.sum(UsageRecord.total_cost).label("total_cost")
+            )
+            .where(
+                UsageRecord.operator_id == operator_id,
+                _ranges_condition(UsageRecord.game_started_at, ranges.raw)
+            )
+            .group_by(raw_key)
+        )
+
+        if len(parts) == 1:
+            return parts[0].subquery()
+        return union_all(*parts).subquery()
+
+    async def player_histogram(
+        self,
+        operator_id: UUID,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> PlayerHistogram:
+        """运营商在区间 [start, end] 内的玩家数量直方图
+
+        整天读取日直方图并合并, 其余部分(区间首尾和水位线之后)按玩家数聚合原始记录。
+
+        Args:
+            operator_id: 运营商ID
+            start: 开始时间(含, 可选)
+            end: 结束时间(含, 可选)
+
+        Returns:
+            PlayerHistogram: 各玩家数的场次和消费金额
+        """
+        ranges = plan_ranges(start, end, await self.get_watermark())
+
+        rows = []
+        if ranges.daily:
+            result = await self.db.execute(
+                select(UsagePlayerHistogram.session_counts, UsagePlayerHistogram.cost_cents)
+                .where(
+                    UsagePlayerHistogram.operator_id == operator_id,
+                    _ranges_condition(UsagePlayerHistogram.bucket_start, ranges.daily)
+                )
+            )
+            rows = result.all()
+        histogram = PlayerHistogram.merge(rows)
+
+        # 直方图只按天保存, 整点部分也读取原始记录
+        raw_ranges = ranges.hourly + ranges.raw
+        if raw_ranges:
+            result = await self.db.execute(
+                select(
+                    UsageRecord.player_count,
+                    func.count(UsageRecord.id).label("sessions"),
+                    func.sum(UsageRecord.total_cost).label("cost")
+                )
+                .where(
+                    UsageRecord.operator_id == operator_id,
+                    _ranges_condition(UsageRecord.game_started_at, raw_ranges)
+                )
+                .group_by(UsageRecord.player_count)
+            )
+            for row in result.all():
+                histogram.add(row.player_count, row.sessions, row.cost)
+        return histogram
+
+    async def roll_up(
+        self,
+        now: Optional[datetime] = None,
+        max_hours: Optional[int] = MAX_HOURS_PER_TRANSACTION
+    ) -> int:
+        """汇总已关闭的小时并推进水位线(不提交, 由调用方提交)
+
+        Args:
+            now: 当前时间(默认系统UTC时间)
+            max_hours: 本次最多汇总的小时数, None 表示不限
+
+        Returns:
+            int: 本次汇总的小时数
+        """
+        grace = timedelta(seconds=get_settings().USAGE_ROLLUP_GRACE_SECONDS)
+        target = floor_hour(as_utc(now or datetime.now(timezone.utc)) - grace)
+
+        watermark = await self._lock_watermark()
+        if watermark.rolled_up_until is not None:
+            position = as_utc(watermark.rolled_up_until)
+        else:
+            first_started_at = await self.db.scalar(select(func.min(UsageRecord.game_started_at)))
+            if first_started_at is None:
+                return 0
+            position = floor_hour(as_utc(first_started_at))
+
+        hours = 0
+        while position < target and (max_hours is None or hours < max_hours):
+            await self._roll_up_bucket(UsageHourlyRollup, position, self._hourly_source(position))
+            position += HOUR
+            hours += 1
+            if position == floor_day(position):
+                day = position - DAY
+                await self._roll_up_bucket(UsageDailyRollup, day, self._daily_source(day))
+                await self._roll_up_histograms(day)
+
+        if hours:
+            watermark.rolled_up_until = position
+            await self.db.flush()
+            logger.info("usage_rolled_up", hours=hours, rolled_up_until=position.isoformat())
+        return hours
+
+    async def reset_watermark(self, rebuild_from: Optional[datetime]) -> None:
+        """回退水位线, 之后的小时/天在下次汇总时重建(不提交)
+
+        Args:
+            rebuild_from: 从该时间所在的UTC日开始重建, None 表示从最早的使用记录开始
+        """
+        watermark = await self._lock_watermark()
+        watermark.rolled_up_until = floor_day(as_utc(rebuild_from)) if rebuild_from else None
+        await self.db.flush()
+
+    async def _lock_watermark(self) -> UsageRollupWatermark:
+        """锁定水位线行(多个worker同时汇总时串行执行), 不存在时创建"""
+        watermark = await self.db.scalar(
+            select(UsageRollupWatermark)
+            .where(UsageRollupWatermark.name == WATERMARK_NAME)
+            .with_for_update()
+        )
+        if watermark is None:
+            watermark = UsageRollupWatermark(name=WATERMARK_NAME, rolled_up_until=None)
+            self.db.add(watermark)
+            await self.db.flush()
+        return watermark
+
+    @staticmethod
+    def _hourly_source(hour: datetime):
+        """某个小时的原始记录聚合"""
+        return (
+            select(
+                UsageRecord.operator_id,
+                UsageRecord.site_id,
+                UsageRecord.application_id,
+                literal(hour, UsageHourlyRollup.bucket_start.type),
+                func.count(UsageRecord.id),
+                func.sum(UsageRecord.player_count),
+                func.sum(UsageRecord.total_cost)
+            )
+            .where(
+                UsageRecord.game_started_at >= hour,
+                UsageRecord.game_started_at < hour + HOUR
+            )
+            .group_by(UsageRecord.operator_id, UsageRecord.site_id, UsageRecord.application_id)
+        )
+
+    @staticmethod
+    def _daily_source(day: datetime):
+        """某一天的小时汇总合并"""
+        return (
+            select(
+                UsageHourlyRollup.operator_id,
+                UsageHourlyRollup.site_id,
+                UsageHourlyRollup.application_id,
+                literal(day, UsageDailyRollup.bucket_start.type),
+                func.sum(UsageHourlyRollup.total_sessions),
+                func.sum(UsageHourlyRollup.total_players),
+                func.sum(UsageHourlyRollup.total_cost)
+            )
+            .where(
+                UsageHourlyRollup.bucket_start >= day,
+                UsageHourlyRollup.bucket_start < day + DAY
+            )
+            .group_by(
+                UsageHourlyRollup.operator_id,
+                UsageHourlyRollup.site_id,
+                UsageHourlyRollup.application_id
+            )
+        )
+
+    async def _roll_up_bucket(self, model, bucket_start: datetime, source) -> None:
+        """重建一个时间桶: 删除旧汇总行后 INSERT ... SELECT"""
+        await self.db.execute(delete(model).where(model.bucket_start == bucket_start))
+        await self.db.execute(
+            insert(model).from_select(
+                [
+                    "operator_id", "site_id", "application_id", "bucket_start",
+                    "total_sessions", "total_players", "total_cost",
+                ],
+                source
+            )
+        )
+
+    async def _roll_up_histograms(self, day: datetime) -> None:
+        """重建某一天的玩家数量直方图: 删除旧行后按 (运营商, 应用) 写入"""
+        await self.db.execute(delete(UsagePlayerHistogram).where(UsagePlayerHistogram.bucket_start == day))
+        result = await self.db.execute(
+            select(
+                UsageRecord.operator_id,
+                UsageRecord.application_id,
+                UsageRecord.player_count,
+                func.count(UsageRecord.id).label("sessions"),
+                func.sum(UsageRecord.total_cost).label("cost")
+            )
+            .where(
+                UsageRecord.game_started_at >= day,
+                UsageRecord.game_started_at < day + DAY
+            )
+            .group_by(UsageRecord.operator_id, UsageRecord.application_id, UsageRecord.player_count)
+        )
+
+        histograms: dict[tuple[UUID, UUID], PlayerHistogram] = {}
+        for row in result.all():
+            key = (row.operator_id, row.application_id)
+            histograms.setdefault(key, PlayerHistogram()).add(row.player_count, row.sessions, row.cost)
+        if not histograms:
+            return
+
+        values = []
+        for (operator_id, application_id), histogram in histograms.items():
+            session_counts, cost_cents = histogram.packed()
+            values.append({
+                "operator_id": operator_id,
+                "application_id": application_id,
+                "bucket_start": day,
+                "session_counts": session_counts,
+                "cost_cents": cost_cents,
+            })
+        await self.db.execute(insert(UsagePlayerHistogram), values)
+
+
+class UsageRollupWorker:
+    """后台汇总任务: 定期把已关闭的小时写入汇总表"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        interval_seconds: float = 60.0
+    ):
+        """初始化汇总任务
+
+        Args:
+            session_factory: 数据库会话工厂, 默认使用全局 session maker
+            interval_seconds: 检查间隔(秒)
+        """
+        self._session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def _new_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from ..db.session import get_session_maker
+            self._session_factory = get_session_maker()
+        return self._session_factory()
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """汇总到最新的已关闭小时, 每 MAX_HOURS_PER_TRANSACTION 小时提交一次
+
+        Returns:
+            int: 汇总的小时数
+        """
+        total = 0
+        while True:
+            async with self._new_session() as session:
+                hours = await UsageRollupService(session).roll_up(now=now)
+                await session.commit()
+            total += hours
+            if hours < MAX_HOURS_PER_TRANSACTION:
+                return total
+
+    def start(self) -> None:
+        """启动后台循环"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台循环"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                # 水位线未推进, 下一轮重试
+                logger.error("usage_rollup_failed", error=str(e))
+            await asyncio.sleep(self.interval_seconds)
+
+
+# Global worker instance (per worker process)
+_usage_rollup_worker: Optional[UsageRollupWorker] = None
+
+
+async def init_usage_rollup_worker() -> None:
+    """启动后台汇总任务(USAGE_ROLLUP_ENABLED 时, 应用启动时调用)"""
+    global _usage_rollup_worker
+    settings = get_settings()
+    if not settings.USAGE_ROLLUP_ENABLED or _usage_rollup_worker is not None:
+        return
+    _usage_rollup_worker = UsageRollupWorker(interval_seconds=settings.USAGE_ROLLUP_INTERVAL_SECONDS)
+    _usage_rollup_worker.start()
+
+
+async def close_usage_rollup_worker() -> None:
+    """停止后台汇总任务(应用关闭时调用)"""
+    global _usage_rollup_worker
+    if _usage_rollup_worker is not None:
+        await _usage_rollup_worker.stop()
+        _usage_rollup_worker = None
@@ -218,6 +218,28 @@ async def override_get_db(test_engine):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_auth_context_cache():
+    """每个测试前后清空进程内授权上下文缓存,避免测试间互相影响"""
+    from src.services.auth_context_cache import get_auth_context_cache
+
+    cache = get_auth_context_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_multi_cache_local():
+    """每个测试前后清空多级缓存的进程内L1,避免测试间互相影响"""
+    from src.core.multilevel_cache import get_multi_cache
+
+    cache = get_multi_cache()
+    cache.clear_local()
+    yield cache
+    cache.clear_local()
+
+
 # Pytest markers配置
 def pytest_configure(config):
     """配置自定义markers"""
@@ -0,0 +1,66 @@
+"""集成测试：签名授权令牌的验证接口
+
+验证:
+1. 授权返回的令牌可通过 /auth/game/token/verify 验证, 且验证不查询数据库
+2. 无效令牌返回401
+3. /auth/game/token/keys 发布验证公钥
+"""
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from src.core.config import get_settings
+from src.main import app
+from tests.integration.test_authorize_query_budget import (
+    authorize,
+    budget_test_data,  # noqa: F401 (fixture)
+    count_statements,
+    make_session_id,
+)
+
+TOKEN_URL = f"{get_settings().API_V1_PREFIX}/auth/game/token"
+
+
+@pytest.mark.asyncio
+async def test_issued_token_verifies_without_database(budget_test_data, test_engine):  # noqa: F811
+    """授权令牌验证不执行任何SQL语句"""
+    session_id = make_session_id(budget_test_data["operator"].id, "t")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await authorize(client, budget_test_data, session_id)
+        assert response.status_code == status.HTTP_200_OK, response.text
+        token = response.json()["data"]["authorization_token"]
+
+        with count_statements(test_engine) as statements:
+            response = await client.post(f"{TOKEN_URL}/verify", json={"token": token})
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert statements == []
+
+    data = response.json()["data"]
+    assert data["session_id"] == session_id
+    assert data["operator_id"] == str(budget_test_data["operator"].id)
+    assert data["site_id"] == str(budget_test_data["site"].id)
+    assert data["app_id"] == str(budget_test_data["application"].id)
+    assert data["player_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_rejected():
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(f"{TOKEN_URL}/verify", json={"token": "invalid.token.value"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert "INVALID_AUTHORIZATION_TOKEN" in response.text
+
+
+@pytest.mark.asyncio
+async def test_public_keys_published():
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(f"{TOKEN_URL}/keys")
+
+    assert response.status_code == status.HTTP_200_OK
+    key = response.json()["keys"][0]
+    assert key["alg"] == "EdDSA"
+    assert key["crv"] == "Ed25519"
@@ -0,0 +1,186 @@
+"""集成测试：授权路径SQL语句预算
+
+防止授权热路径因关联关系的默认加载策略(lazy="selectin")而连带查询
+运营商/应用/运营点的全部历史记录。
+
+验证:
+1. 冷缓存授权请求的SQL语句数不超过预算
+2. 授权上下文缓存命中时语句数进一步下降
+3. 运营商/应用存在大量历史记录时语句数不随历史增长
+"""
+
+import json
+import pytest
+from contextlib import contextmanager
+from decimal import Decimal
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import event
+from fastapi import status
+
+from src.core.config import get_settings
+from src.core.security.hmac import generate_signature
+from src.main import app
+from src.models.admin import AdminAccount
+from src.models.operator import OperatorAccount
+from src.models.application import Application
+from src.models.site import OperationSite
+from src.models.authorization import OperatorAppAuthorization
+from src.models.usage_record import UsageRecord
+
+
+# 冷缓存: 运营商/运营点/应用/授权联表查询 + 幂等性 + 条件扣费 + 使用记录 + 交易记录
+COLD_STATEMENT_BUDGET = 5
+# 缓存命中: 幂等性 + 条件扣费 + 使用记录 + 交易记录
+WARM_STATEMENT_BUDGET = 4
+
+AUTHORIZE_URL = f"{get_settings().API_V1_PREFIX}/auth/game/authorize"
+
+
+@contextmanager
+def count_statements(engine):
+    """统计代码块内执行的SQL语句"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def budget_test_data(test_db):
+    """准备带有历史使用记录的授权测试数据"""
+    admin = AdminAccount(
+        username="admin_query_budget",
+        password_hash="hashed_pw",
+        full_name="Test Admin",
+        email="admin@test.com",
+        phone="13800138000",
+        role="admin",
+        is_active=True
+    )
+    test_db.add(admin)
+    await test_db.flush()
+
+    operator = OperatorAccount(
+        username="op_query_budget",
+        full_name="Test Operator",
+        email="operator@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="q" * 64,
+        api_key_hash="hashed_secret",
+        balance=Decimal("1000.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    site = OperationSite(
+        operator_id=operator.id,
+        name="语句预算运营点",
+        address="测试地址",
+        server_identifier="server_query_budget",
+        is_active=True
+    )
+    application = Application(
+        app_code="app_query_budget",
+        app_name="语句预算游戏",
+        price_per_player=Decimal("10.00"),
+        min_players=2,
+        max_players=8,
+        is_active=True,
+        created_by=admin.id
+    )
+    test_db.add_all([site, application])
+    await test_db.flush()
+
+    test_db.add(OperatorAppAuthorization(
+        operator_id=operator.id,
+        application_id=application.id,
+        authorized_by=admin.id,
+        expires_at=datetime.utcnow() + timedelta(days=30),
+        is_active=True
+    ))
+
+    # 历史记录: 默认加载策略下会被整表带出
+    for i in range(50):
+        test_db.add(UsageRecord(
+            session_id=f"{operator.id}_history_{i:04d}",
+            operator_id=operator.id,
+            site_id=site.id,
+            application_id=application.id,
+            player_count=2,
+            price_per_player=Decimal("10.00"),
+            total_cost=Decimal("20.00"),
+            authorization_token=f"history_token_{i}",
+            game_started_at=datetime.utcnow() - timedelta(days=1)
+        ))
+    await test_db.commit()
+
+    return {"operator": operator, "site": site, "application": application}
+
+
+def make_session_id(operator_id, suffix: str) -> str:
+    timestamp = int(datetime.utcnow().timestamp())
+    return f"{operator_id}_{timestamp}_{suffix * 16}"
+
+
+def signed_request(api_key: str, url: str, payload: dict) -> dict:
+    """构造带HMAC签名的请求参数(content + headers)"""
+    body = json.dumps(payload)
+    timestamp = int(datetime.utcnow().timestamp())
+    return {
+        "content": body,
+        "headers": {
+            "Content-Type": "application/json",
+            "X-API-Key": api_key,
+            "X-Timestamp": str(timestamp),
+            "X-Signature": generate_signature("POST", url, timestamp, "", body, api_key)
+        }
+    }
+
+
+async def authorize(client, data, session_id):
+    request = signed_request(
+        data["operator"].api_key,
+        AUTHORIZE_URL,
+        {
+            "app_id": str(data["application"].id),
+            "site_id": str(data["site"].id),
+            "player_count": 3
+        }
+    )
+    request["headers"]["X-Session-ID"] = session_id
+    return await client.post(AUTHORIZE_URL, **request)
+
+
+@pytest.mark.asyncio
+async def test_authorize_statement_budget(budget_test_data, test_engine):
+    """冷缓存与缓存命中的授权请求都不超过语句预算"""
+    operator_id = budget_test_data["operator"].id
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with count_statements(test_engine) as cold:
+            response = await authorize(client, budget_test_data, make_session_id(operator_id, "a"))
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+        with count_statements(test_engine) as warm:
+            response = await authorize(client, budget_test_data, make_session_id(operator_id, "b"))
+        assert response.status_code == status.HTTP_200_OK, response.text
+
+    assert len(cold) <= COLD_STATEMENT_BUDGET, "\n".join(cold)
+    assert len(warm) <= WARM_STATEMENT_BUDGET, "\n".join(warm)
+    # 运营点、应用和授权在同一条语句中查询
+    assert sum("FROM operation_sites" in sql or "JOIN operation_sites" in sql for sql in cold) == 1
+    assert sum("JOIN operator_app_authorizations" in sql for sql in cold) == 1
+    # 任何语句都不应读取历史使用记录之外的集合
+    assert not any("FROM transaction_records" in sql for sql in cold + warm)
+    assert not any("FROM operator_messages" in sql for sql in cold + warm)
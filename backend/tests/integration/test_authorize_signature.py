@@ -0,0 +1,62 @@
+"""集成测试：游戏授权HMAC签名验证
+
+验证:
+1. 签名与请求体不匹配时返回401, 不扣费
+2. 时间戳超出5分钟窗口时返回401
+3. 签名验证不增加任何数据库语句(见 test_authorize_query_budget)
+"""
+
+import json
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from src.main import app
+from tests.integration.test_authorize_query_budget import (
+    AUTHORIZE_URL,
+    budget_test_data,  # noqa: F401 (fixture)
+    make_session_id,
+    signed_request,
+)
+
+
+def authorize_payload(data, player_count: int = 3) -> dict:
+    return {
+        "app_id": str(data["application"].id),
+        "site_id": str(data["site"].id),
+        "player_count": player_count
+    }
+
+
+@pytest.mark.asyncio
+async def test_tampered_body_rejected(budget_test_data, test_db):  # noqa: F811
+    """签名后篡改请求体(玩家数量)被拒绝, 不扣费"""
+    data = budget_test_data
+    balance_before = data["operator"].balance
+    request = signed_request(data["operator"].api_key, AUTHORIZE_URL, authorize_payload(data, 3))
+    request["content"] = json.dumps(authorize_payload(data, 2))
+    request["headers"]["X-Session-ID"] = make_session_id(data["operator"].id, "t")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(AUTHORIZE_URL, **request)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["error_code"] == "INVALID_SIGNATURE"
+
+    await test_db.refresh(data["operator"])
+    assert data["operator"].balance == balance_before
+
+
+@pytest.mark.asyncio
+async def test_expired_timestamp_rejected(budget_test_data):  # noqa: F811
+    """时间戳超出允许偏差被拒绝"""
+    data = budget_test_data
+    request = signed_request(data["operator"].api_key, AUTHORIZE_URL, authorize_payload(data))
+    request["headers"]["X-Session-ID"] = make_session_id(data["operator"].id, "e")
+    request["headers"]["X-Timestamp"] = str(int(request["headers"]["X-Timestamp"]) - 600)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(AUTHORIZE_URL, **request)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,256 @@
+"""集成测试：批量游戏授权 (POST /auth/game/authorize/batch)
+
+验证:
+1. all_or_nothing: 全部成功时一次扣费, 各会话返回与单次授权相同的数据
+2. all_or_nothing: 任一会话校验失败或总余额不足时整批不扣费
+3. best_effort: 余额按顺序分配, 余额不足的会话返回402结果
+4. 重复提交同一批次返回已授权信息, 不重复扣费
+5. 相同(运营点, 应用)组合只验证一次
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from fastapi import status
+
+from src.core.config import get_settings
+from src.main import app
+from src.models.admin import AdminAccount
+from src.models.operator import OperatorAccount
+from src.models.application import Application
+from src.models.site import OperationSite
+from src.models.authorization import OperatorAppAuthorization
+from src.models.transaction import TransactionRecord
+from tests.integration.test_authorize_query_budget import count_statements, signed_request
+
+BATCH_AUTHORIZE_URL = f"{get_settings().API_V1_PREFIX}/auth/game/authorize/batch"
+
+
+@pytest.fixture
+async def batch_test_data(test_db):
+    """准备运营商(余额100元)、运营点、应用和授权"""
+    admin = AdminAccount(
+        username="admin_batch_authorize",
+        password_hash="hashed_pw",
+        full_name="Test Admin",
+        email="admin@test.com",
+        phone="13800138000",
+        role="admin",
+        is_active=True
+    )
+    test_db.add(admin)
+    await test_db.flush()
+
+    operator = OperatorAccount(
+        username="op_batch_authorize",
+        full_name="Test Operator",
+        email="operator@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="m" * 64,
+        api_key_hash="hashed_secret",
+        balance=Decimal("100.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    site = OperationSite(
+        operator_id=operator.id,
+        name="多房间运营点",
+        address="测试地址",
+        server_identifier="server_batch_authorize",
+        is_active=True
+    )
+    application = Application(
+        app_code="app_batch_authorize",
+        app_name="批量授权游戏",
+        price_per_player=Decimal("10.00"),
+        min_players=2,
+        max_players=8,
+        is_active=True,
+        created_by=admin.id
+    )
+    test_db.add_all([site, application])
+    await test_db.flush()
+
+    test_db.add(OperatorAppAuthorization(
+        operator_id=operator.id,
+        application_id=application.id,
+        authorized_by=admin.id,
+        expires_at=datetime.utcnow() + timedelta(days=30),
+        is_active=True
+    ))
+    await test_db.commit()
+
+    return {"operator": operator, "site": site, "application": application}
+
+
+def make_item(data, suffix: str, player_count: int) -> dict:
+    timestamp = int(datetime.utcnow().timestamp())
+    return {
+        "session_id": f"{data['operator'].id}_{timestamp}_{suffix * 16}",
+        "app_id": str(data["application"].id),
+        "site_id": str(data["site"].id),
+        "player_count": player_count
+    }
+
+
+async def authorize_batch(client, data, items, mode="all_or_nothing"):
+    return await client.post(
+        BATCH_AUTHORIZE_URL,
+        **signed_request(data["operator"].api_key, BATCH_AUTHORIZE_URL, {"items": items, "mode": mode})
+    )
+
+
+async def operator_balance(test_db, operator_id) -> Decimal:
+    result = await test_db.execute(
+        select(OperatorAccount.balance).where(OperatorAccount.id == operator_id)
+    )
+    return result.scalar_one()
+
+
+async def transaction_count(test_db, operator_id) -> int:
+    result = await test_db.execute(
+        select(func.count()).select_from(TransactionRecord)
+        .where(TransactionRecord.operator_id == operator_id)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_all_or_nothing_success(batch_test_data, test_db, test_engine):
+    """整批成功: 一次扣费, 交易记录余额连续"""
+    items = [make_item(batch_test_data, suffix, 3) for suffix in "abc"]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with count_statements(test_engine) as statements:
+            response = await authorize_batch(client, batch_test_data, items)
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    data = response.json()["data"]
+    assert data["authorized_count"] == 3
+    assert data["failed_count"] == 0
+    assert data["total_cost"] == "90.00"
+    assert data["balance_after"] == "10.00"
+
+    results = data["results"]
+    assert [result["session_id"] for result in results] == [item["session_id"] for item in items]
+    assert all(result["success"] for result in results)
+    assert [result["data"]["balance_after"] for result in results] == ["70.00", "40.00", "10.00"]
+    assert results[0]["data"]["app_name"] == "批量授权游戏"
+    assert results[0]["data"]["total_cost"] == "30.00"
+
+    # 相同(运营点, 应用)只验证一次, 整批只有一次余额扣减
+    assert sum("JOIN operator_app_authorizations" in sql for sql in statements) == 1
+    assert sum(sql.startswith("UPDATE operator_accounts") for sql in statements) == 1
+
+    assert await operator_balance(test_db, batch_test_data["operator"].id) == Decimal("10.00")
+    assert await transaction_count(test_db, batch_test_data["operator"].id) == 3
+
+
+@pytest.mark.asyncio
+async def test_all_or_nothing_rejects_whole_batch(batch_test_data, test_db):
+    """任一会话校验失败时整批不扣费, 返回各会话结果"""
+    items = [
+        make_item(batch_test_data, "d", 3),
+        make_item(batch_test_data, "e", 20),  # 超出最大玩家数
+    ]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await authorize_batch(client, batch_test_data, items)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    detail = response.json()
+    assert detail["error_code"] == "BATCH_AUTHORIZATION_REJECTED"
+    results = detail["details"]["results"]
+    assert results[0]["error"]["error_code"] == "BATCH_ABORTED"
+    assert results[1]["error"]["error_code"] == "PLAYER_COUNT_OUT_OF_RANGE"
+
+    assert await operator_balance(test_db, batch_test_data["operator"].id) == Decimal("100.00")
+    assert await transaction_count(test_db, batch_test_data["operator"].id) == 0
+
+
+@pytest.mark.asyncio
+async def test_all_or_nothing_insufficient_balance(batch_test_data, test_db):
+    """总余额不足时返回402, 不扣费"""
+    items = [make_item(batch_test_data, suffix, 6) for suffix in "fg"]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await authorize_batch(client, batch_test_data, items)
+
+    assert response.status_code == status.HTTP_402_PAYMENT_REQUIRED, response.text
+    assert await operator_balance(test_db, batch_test_data["operator"].id) == Decimal("100.00")
+    assert await transaction_count(test_db, batch_test_data["operator"].id) == 0
+
+
+@pytest.mark.asyncio
+async def test_best_effort_allocates_balance_in_order(batch_test_data, test_db):
+    """尽力模式: 余额按顺序分配, 不足的会话单独返回402"""
+    items = [
+        make_item(batch_test_data, "h", 5),
+        make_item(batch_test_data, "i", 8),  # 剩余50元不足80元
+        make_item(batch_test_data, "j", 4),
+    ]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await authorize_batch(client, batch_test_data, items, mode="best_effort")
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    data = response.json()["data"]
+    assert data["authorized_count"] == 2
+    assert data["failed_count"] == 1
+    assert data["total_cost"] == "90.00"
+    assert data["balance_after"] == "10.00"
+
+    results = data["results"]
+    assert results[0]["data"]["balance_after"] == "50.00"
+    assert results[1]["success"] is False
+    assert results[1]["error"]["error_code"] == "INSUFFICIENT_BALANCE"
+    assert results[2]["data"]["balance_after"] == "10.00"
+
+    assert await operator_balance(test_db, batch_test_data["operator"].id) == Decimal("10.00")
+    assert await transaction_count(test_db, batch_test_data["operator"].id) == 2
+
+
+@pytest.mark.asyncio
+async def test_repeated_batch_is_idempotent(batch_test_data, test_db):
+    """重复提交同一批次返回已授权信息, 不重复扣费"""
+    items = [make_item(batch_test_data, suffix, 2) for suffix in "kl"]
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = await authorize_batch(client, batch_test_data, items)
+        second = await authorize_batch(client, batch_test_data, items)
+
+    assert first.status_code == status.HTTP_200_OK, first.text
+    assert second.status_code == status.HTTP_200_OK, second.text
+
+    first_results = first.json()["data"]["results"]
+    second_data = second.json()["data"]
+    assert second_data["total_cost"] == "0.00"
+    assert second_data["balance_after"] is None
+    assert [r["data"]["authorization_token"] for r in second_data["results"]] == [
+        r["data"]["authorization_token"] for r in first_results
+    ]
+    assert [r["data"]["balance_after"] for r in second_data["results"]] == ["80.00", "60.00"]
+
+    assert await operator_balance(test_db, batch_test_data["operator"].id) == Decimal("60.00")
+    assert await transaction_count(test_db, batch_test_data["operator"].id) == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicate_session_in_batch_rejected(batch_test_data):
+    """同一批次中重复的会话ID被拒绝"""
+    item = make_item(batch_test_data, "m", 2)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await authorize_batch(client, batch_test_data, [item, item], mode="best_effort")
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    results = response.json()["data"]["results"]
+    assert results[0]["success"] is True
+    assert results[1]["error"]["error_code"] == "DUPLICATE_SESSION_IN_BATCH"
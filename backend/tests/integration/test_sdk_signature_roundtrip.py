@@ -0,0 +1,163 @@
+"""集成测试：Python SDK → 服务端授权请求往返
+
+SDK(sdk/python)构造的签名、请求路径和请求体直接发送到授权路由验证,
+防止SDK与服务端的签名格式(METHOD\\nPATH\\nTIMESTAMP\\nNONCE\\nBODY)再次不一致。
+
+验证:
+1. SDK授权请求通过签名验证并扣费, 响应解析为 AuthorizeResponse
+2. 相同会话ID重试返回已授权信息
+3. 签名密钥错误时返回401(MRGameAuthError)
+
+SDK依赖 requests, 未安装时跳过。
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from src.main import app
+from src.models.admin import AdminAccount
+from src.models.application import Application
+from src.models.authorization import OperatorAppAuthorization
+from src.models.operator import OperatorAccount
+from src.models.site import OperationSite
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "sdk" / "python"))
+mr_game_sdk = pytest.importorskip("mr_game_sdk")
+
+BASE_URL = "http://test"
+
+
+@pytest.fixture
+async def sdk_test_data(test_db):
+    """准备运营商、运营点、应用和授权关系"""
+    admin = AdminAccount(
+        username="admin_sdk_roundtrip",
+        password_hash="hashed_pw",
+        full_name="Test Admin",
+        email="admin@test.com",
+        phone="13800138000",
+        role="admin",
+        is_active=True
+    )
+    test_db.add(admin)
+    await test_db.flush()
+
+    operator = OperatorAccount(
+        username="op_sdk_roundtrip",
+        full_name="Test Operator",
+        email="operator@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="k" * 64,
+        api_key_hash="hashed_secret",
+        balance=Decimal("1000.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    site = OperationSite(
+        operator_id=operator.id,
+        name="SDK往返运营点",
+        address="测试地址",
+        server_identifier="server_sdk_roundtrip",
+        is_active=True
+    )
+    application = Application(
+        app_code="app_sdk_roundtrip",
+        app_name="SDK往返游戏",
+        price_per_player=Decimal("10.00"),
+        min_players=2,
+        max_players=8,
+        is_active=True,
+        created_by=admin.id
+    )
+    test_db.add_all([site, application])
+    await test_db.flush()
+
+    test_db.add(OperatorAppAuthorization(
+        operator_id=operator.id,
+        application_id=application.id,
+        authorized_by=admin.id,
+        expires_at=datetime.utcnow() + timedelta(days=30),
+        is_active=True
+    ))
+    await test_db.commit()
+
+    return {"operator": operator, "site": site, "application": application}
+
+
+def route_to_app(sdk_client, http_client: AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+    """把SDK的HTTP请求原样转发到ASGI应用(SDK在工作线程中同步调用)"""
+
+    def request(method, url, params=None, data=None, headers=None, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(
+            http_client.request(
+                method,
+                url,
+                params=params,
+                content=data,
+                headers={**sdk_client.session.headers, **(headers or {})}
+            ),
+            loop
+        )
+        return future.result()
+
+    sdk_client.session.request = request
+
+
+async def sdk_authorize(sdk_client, data, session_id):
+    return await asyncio.to_thread(
+        sdk_client.authorize_game,
+        app_id=str(data["application"].id),
+        player_count=3,
+        session_id=session_id,
+        site_id=str(data["site"].id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_sdk_authorize_round_trip(sdk_test_data):
+    """SDK签名通过服务端验证, 重试返回同一授权"""
+    operator = sdk_test_data["operator"]
+    session_id = f"{operator.id}_{int(datetime.utcnow().timestamp())}_{'r' * 16}"
+    sdk_client = mr_game_sdk.MRGameClient(api_key=operator.api_key, base_url=BASE_URL)
+
+    async with AsyncClient(app=app, base_url=BASE_URL) as http_client:
+        route_to_app(sdk_client, http_client, asyncio.get_running_loop())
+
+        result = await sdk_authorize(sdk_client, sdk_test_data, session_id)
+        retry = await sdk_authorize(sdk_client, sdk_test_data, session_id)
+
+    assert result.success is True
+    assert result.session_id == session_id
+    assert result.player_count == 3
+    assert result.total_cost == "30.00"
+    assert result.balance_after == "970.00"
+    assert result.auth_token
+    assert retry.auth_token == result.auth_token
+
+
+@pytest.mark.asyncio
+async def test_sdk_wrong_secret_rejected(sdk_test_data):
+    """签名密钥与服务端不一致时返回401"""
+    operator = sdk_test_data["operator"]
+    session_id = f"{operator.id}_{int(datetime.utcnow().timestamp())}_{'w' * 16}"
+    sdk_client = mr_game_sdk.MRGameClient(
+        api_key=operator.api_key, api_secret="wrong_secret", base_url=BASE_URL
+    )
+
+    async with AsyncClient(app=app, base_url=BASE_URL) as http_client:
+        route_to_app(sdk_client, http_client, asyncio.get_running_loop())
+
+        with pytest.raises(mr_game_sdk.MRGameAuthError):
+            await sdk_authorize(sdk_client, sdk_test_data, session_id)
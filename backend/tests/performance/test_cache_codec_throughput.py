@@ -0,0 +1,96 @@
+"""缓存值编解码吞吐基准测试
+
+对比典型缓存值(运营商档案/消费记录列表)的编码+解码吞吐:
+- 之前: 先把Decimal/UUID/datetime转成字符串, 再json.dumps/json.loads (读出后类型丢失)
+- 之后: Serializer(JSON编解码器 / msgpack编解码器, 带版本字节与压缩)
+
+同时输出编码后大小(超过阈值的值会被压缩)。
+
+    pytest tests/performance/test_cache_codec_throughput.py -m benchmark -s
+"""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.core import codec as codec_module
+from src.core.codec import JsonCodec, MsgpackCodec, Serializer
+
+ROUNDS = 2000
+
+pytestmark = pytest.mark.benchmark
+
+
+def usage_records(count: int) -> list[dict]:
+    """消费记录列表(类似统计/账单接口的缓存值)"""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    operator_id = uuid4()
+    return [
+        {
+            "id": uuid4(),
+            "operator_id": operator_id,
+            "site_id": uuid4(),
+            "player_count": 4,
+            "unit_price": Decimal("12.50"),
+            "total_cost": Decimal("50.00"),
+            "game_started_at": now + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def stringify(value):
+    """旧路径: 写缓存前手工把不支持的类型转成字符串"""
+    if isinstance(value, list):
+        return [stringify(item) for item in value]
+    if isinstance(value, dict):
+        return {key: stringify(item) for key, item in value.items()}
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+def throughput(encode, decode, value) -> tuple[float, int]:
+    """返回 (每秒编码+解码次数, 编码后字节数)"""
+    payload = encode(value)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        decode(encode(value))
+    elapsed = time.perf_counter() - start
+    return ROUNDS / elapsed, len(payload)
+
+
+@pytest.mark.parametrize("records", [1, 50], ids=["single", "list-50"])
+def test_codec_throughput(records):
+    """输出各编解码路径的吞吐与大小: 类型化编解码不比旧路径慢太多, 大值明显更小"""
+    value = usage_records(records)
+    results = {
+        "json (旧路径, 类型丢失)": throughput(
+            lambda v: json.dumps(stringify(v)).encode(), json.loads, value
+        ),
+    }
+    serializers = {"json": Serializer(codec=JsonCodec())}
+    if codec_module.msgpack is not None:
+        serializers["msgpack"] = Serializer(codec=MsgpackCodec())
+    for name, serializer in serializers.items():
+        assert serializer.loads(serializer.dumps(value)) == value
+        results[f"{name} (类型化)"] = throughput(serializer.dumps, serializer.loads, value)
+
+    print(f"\n{records}条消费记录, {ROUNDS}轮编码+解码:")
+    for name, (ops, size) in results.items():
+        print(f"  {name}: {ops:,.0f} 次/秒, {size} 字节")
+
+    baseline_ops, baseline_size = results["json (旧路径, 类型丢失)"]
+    for name, (ops, size) in results.items():
+        assert ops > baseline_ops / 4, name
+        assert size < baseline_size * 1.6, name
+    if records > 1:
+        # 超过阈值的值被压缩: Redis内存/网络传输明显减少
+        _, default_size = results[f"{Serializer().codec.name} (类型化)"]
+        assert default_size < baseline_size / 3
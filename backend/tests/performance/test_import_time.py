@@ -0,0 +1,91 @@
+"""worker冷启动导入耗时预算测试
+
+在子进程中运行 `python -X importtime -c "import src.main"`, 解析导入图:
+- src.main 累计导入耗时(含建应用、注册路由)低于预算
+- 很少使用的子系统(监控、批处理优化、性能端点、加密服务、密码哈希)不在启动时导入
+- 单独 `import src.core` 不加载 redis/jose/passlib/cryptography
+
+    pytest tests/performance/test_import_time.py -m benchmark -s
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+APP_IMPORT_BUDGET_MS = 2500
+CORE_IMPORT_BUDGET_MS = 400
+
+# 启动时不应导入的模块(首次使用时才加载)
+LAZY_MODULES = (
+    "src.core.monitoring",
+    "src.core.performance",
+    "src.core.batch",
+    "src.core.metrics.enhanced_metrics",
+    "src.api.v1.monitoring",
+    "src.api.v1.performance",
+    "src.core.security.encryption",
+    "passlib",
+)
+
+# src.core 包本身不应拉起的第三方库
+CORE_HEAVY_DEPENDENCIES = ("redis", "jose", "passlib", "cryptography")
+
+pytestmark = pytest.mark.benchmark
+
+
+def import_graph(statement: str) -> dict[str, int]:
+    """运行 -X importtime, 返回 {模块名: 累计导入耗时(微秒)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    graph = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        graph[module.strip()] = int(cumulative)
+    return graph
+
+
+def test_app_import_under_budget():
+    """src.main 导入(含路由注册)低于预算, 且不加载冷门子系统"""
+    graph = import_graph("import src.main")
+
+    app_ms = graph["src.main"] / 1000
+    slowest = sorted(
+        ((module, us) for module, us in graph.items() if module.startswith("src.") and module != "src.main"),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:5]
+    print(f"\nsrc.main 导入耗时 {app_ms:.0f}ms (预算 {APP_IMPORT_BUDGET_MS}ms)")
+    for module, us in slowest:
+        print(f"  {module}: {us / 1000:.1f}ms")
+
+    loaded = [
+        module for module in LAZY_MODULES
+        if any(name == module or name.startswith(f"{module}.") for name in graph)
+    ]
+    assert loaded == []
+    assert app_ms < APP_IMPORT_BUDGET_MS
+
+
+def test_core_package_import_is_light():
+    """import src.core 只加载配置/异常/日志"""
+    graph = import_graph("import src.core")
+
+    core_ms = graph["src.core"] / 1000
+    print(f"\nsrc.core 导入耗时 {core_ms:.0f}ms (预算 {CORE_IMPORT_BUDGET_MS}ms)")
+
+    assert [dep for dep in CORE_HEAVY_DEPENDENCIES if dep in graph] == []
+    assert core_ms < CORE_IMPORT_BUDGET_MS
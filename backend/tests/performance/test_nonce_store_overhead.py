@@ -0,0 +1,85 @@
+"""Nonce防重放开销基准测试
+
+测量 NonceStore.claim 的单次耗时与吞吐量:
+- 进程内路径(Redis不可用时的降级路径, 以及同worker重放拒绝)
+- 指定 PERF_REDIS_URL 时额外测量真实Redis的 SET NX EX 往返
+
+要求 p99 低于 1 毫秒, 吞吐量远高于授权接口峰值(> 100 RPS, 见 README.md)。
+
+    PERF_REDIS_URL=redis://localhost:6379/15 \\
+        pytest tests/performance/test_nonce_store_overhead.py -m benchmark -s
+"""
+
+import os
+import time
+from uuid import uuid4
+
+import pytest
+
+from src.core.cache import RedisCache
+from src.core.security import nonce_store as store_module
+from src.core.security.nonce_store import NonceStore
+
+PERF_REDIS_URL = os.getenv("PERF_REDIS_URL", "")
+
+ITERATIONS = 20000
+OPERATORS = 50
+P99_BUDGET_MS = 1.0
+PEAK_AUTHORIZE_RPS = 100
+
+pytestmark = pytest.mark.benchmark
+
+
+class DisconnectedCache:
+    async def set_if_absent(self, key, value, ttl=None):
+        return None
+
+
+async def measure(store: NonceStore, iterations: int) -> tuple[float, float]:
+    """返回 (p99毫秒, 每秒占用次数)"""
+    operators = [uuid4() for _ in range(OPERATORS)]
+    timestamp = int(time.time())
+    samples = []
+
+    started = time.perf_counter()
+    for i in range(iterations):
+        nonce = f"{i:016d}"
+        start = time.perf_counter()
+        assert await store.claim(operators[i % OPERATORS], nonce, timestamp) is True
+        samples.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    return samples[int(len(samples) * 0.99)], iterations / elapsed
+
+
+@pytest.mark.asyncio
+async def test_local_claim_overhead(monkeypatch):
+    """Redis不可用(降级)时只走进程内集合"""
+    monkeypatch.setattr(store_module, "get_cache", lambda: DisconnectedCache())
+    store = NonceStore()
+
+    p99_ms, rate = await measure(store, ITERATIONS)
+    print(f"\nlocal nonce claim: p99={p99_ms * 1000:.1f}µs rate={rate:,.0f}/s")
+
+    assert p99_ms < P99_BUDGET_MS
+    assert rate > PEAK_AUTHORIZE_RPS * 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not PERF_REDIS_URL, reason="PERF_REDIS_URL未设置")
+async def test_redis_claim_overhead(monkeypatch):
+    """真实Redis的 SET NX EX 往返"""
+    cache = RedisCache()
+    cache.settings = cache.settings.model_copy(update={"REDIS_URL": PERF_REDIS_URL})
+    await cache.connect()
+    assert cache.is_connected
+    monkeypatch.setattr(store_module, "get_cache", lambda: cache)
+
+    try:
+        p99_ms, rate = await measure(NonceStore(), ITERATIONS // 4)
+        print(f"\nredis nonce claim: p99={p99_ms:.3f}ms rate={rate:,.0f}/s")
+        assert p99_ms < P99_BUDGET_MS
+        assert rate > PEAK_AUTHORIZE_RPS * 10
+    finally:
+        await cache.disconnect()
@@ -0,0 +1,67 @@
+"""玩家数量直方图合并基准测试
+
+玩家数量分布统计合并区间内 (应用, 日) 的直方图行后计算百分位数/平均值/众数。
+模拟一个运营商一年、20个应用的直方图(7300行), 输出合并+统计耗时:
+- NumPy 向量化合并(已安装时)
+- 纯Python逐行合并
+
+    pytest tests/performance/test_player_histogram_merge.py -m benchmark -s
+"""
+
+import random
+import time
+
+import pytest
+
+from src.services import player_histogram
+from src.services.player_histogram import PlayerHistogram
+
+DAYS = 365
+APPLICATIONS = 20
+MAX_PLAYERS = 10
+ROUNDS = 20
+
+pytestmark = pytest.mark.benchmark
+
+
+def histogram_rows() -> list[tuple[bytes, bytes]]:
+    """每个 (应用, 日) 一行打包直方图"""
+    rng = random.Random(42)
+    rows = []
+    for _ in range(DAYS * APPLICATIONS):
+        histogram = PlayerHistogram()
+        for player_count in range(1, rng.randint(2, MAX_PLAYERS) + 1):
+            sessions = rng.randint(0, 30)
+            histogram.add(player_count, sessions, sessions * player_count * 10)
+        rows.append(histogram.packed())
+    return rows
+
+
+def merge_and_summarize(rows) -> tuple[float, PlayerHistogram]:
+    """返回 (每次合并+统计的平均耗时(毫秒), 合并结果)"""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        histogram = PlayerHistogram.merge(rows)
+        histogram.mean()
+        histogram.mode()
+        [histogram.percentile(percent) for percent in (50, 90, 99)]
+    return (time.perf_counter() - start) / ROUNDS * 1000, histogram
+
+
+def test_histogram_merge_speed(monkeypatch):
+    """NumPy 与纯Python合并结果一致, 输出两者耗时"""
+    rows = histogram_rows()
+    results = {}
+    if player_histogram.np is not None:
+        results["numpy"] = merge_and_summarize(rows)
+    monkeypatch.setattr(player_histogram, "np", None)
+    results["pure python"] = merge_and_summarize(rows)
+
+    print(f"\n合并 {len(rows)} 行直方图并计算统计值:")
+    for name, (elapsed_ms, histogram) in results.items():
+        print(f"  {name}: {elapsed_ms:.2f} ms ({histogram.total_sessions:,} 场)")
+
+    merged = [histogram for _, histogram in results.values()]
+    assert all(histogram == merged[0] for histogram in merged)
+    if "numpy" in results:
+        assert results["numpy"][0] < results["pure python"][0]
@@ -0,0 +1,115 @@
+"""
+单元测试：签名授权令牌
+
+测试目标：
+- 签发/验证往返, 令牌内容自描述
+- 签名确定性(相同输入得到相同令牌)
+- 篡改、错误密钥、过期令牌被拒绝
+- 发布的JWK公钥可离线验证
+"""
+import base64
+import json
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from src.core.config import get_settings
+from src.core.security.authorization_token import (
+    AuthorizationTokenError,
+    create_authorization_token,
+    get_public_jwks,
+    verify_authorization_token,
+)
+
+SESSION_ID = "op-123_1704067200_a1b2c3d4e5f6g7h8"
+
+
+def b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@pytest.fixture
+def token_ids():
+    return {"operator_id": uuid4(), "site_id": uuid4(), "application_id": uuid4()}
+
+
+def issue(token_ids, issued_at=None, **kwargs):
+    return create_authorization_token(
+        session_id=SESSION_ID,
+        player_count=5,
+        issued_at=issued_at or datetime.utcnow(),
+        **token_ids,
+        **kwargs
+    )
+
+
+class TestAuthorizationToken:
+    """测试授权令牌签发与验证"""
+
+    def test_round_trip(self, token_ids):
+        issued_at = datetime.utcnow()
+        token = issue(token_ids, issued_at)
+
+        claims = verify_authorization_token(token)
+
+        assert claims["sid"] == SESSION_ID
+        assert claims["op"] == str(token_ids["operator_id"])
+        assert claims["site"] == str(token_ids["site_id"])
+        assert claims["app"] == str(token_ids["application_id"])
+        assert claims["pc"] == 5
+        assert claims["exp"] - claims["iat"] == get_settings().AUTHORIZATION_TOKEN_TTL_SECONDS
+
+    def test_signing_is_deterministic(self, token_ids):
+        issued_at = datetime.utcnow()
+
+        assert issue(token_ids, issued_at) == issue(token_ids, issued_at)
+
+    def test_tampered_payload_rejected(self, token_ids):
+        header, payload, signature = issue(token_ids).split(".")
+        claims = json.loads(b64decode(payload))
+        claims["pc"] = 50
+        forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+
+        with pytest.raises(AuthorizationTokenError) as exc_info:
+            verify_authorization_token(f"{header}.{forged}.{signature}")
+
+        assert exc_info.value.error_code == "INVALID_AUTHORIZATION_TOKEN"
+
+    @pytest.mark.parametrize("token", ["", "not-a-token", "a.b.c", "a.b"])
+    def test_malformed_token_rejected(self, token):
+        with pytest.raises(AuthorizationTokenError) as exc_info:
+            verify_authorization_token(token)
+
+        assert exc_info.value.error_code == "INVALID_AUTHORIZATION_TOKEN"
+
+    def test_expired_token_rejected(self, token_ids):
+        token = issue(token_ids, datetime.utcnow() - timedelta(hours=2), expires_in=3600)
+
+        with pytest.raises(AuthorizationTokenError) as exc_info:
+            verify_authorization_token(token)
+
+        assert exc_info.value.error_code == "AUTHORIZATION_TOKEN_EXPIRED"
+
+    def test_token_signed_with_other_key_rejected(self, token_ids, monkeypatch):
+        token = issue(token_ids)
+        other_seed = base64.urlsafe_b64encode(b"\x01" * 32).decode()
+        monkeypatch.setattr(get_settings(), "AUTHORIZATION_TOKEN_SIGNING_KEY", other_seed)
+
+        with pytest.raises(AuthorizationTokenError):
+            verify_authorization_token(token)
+
+    def test_published_key_verifies_offline(self, token_ids):
+        token = issue(token_ids)
+        header, payload, signature = token.split(".")
+        jwk = get_public_jwks()["keys"][0]
+
+        # SDK只需公钥即可验证
+        public_key = Ed25519PublicKey.from_public_bytes(b64decode(jwk["x"]))
+        public_key.verify(b64decode(signature), f"{header}.{payload}".encode())
+
+        assert jwk["kty"] == "OKP" and jwk["crv"] == "Ed25519"
+        assert json.loads(b64decode(header))["kid"] == jwk["kid"]
+        assert json.loads(b64decode(payload))["exp"] > time.time()
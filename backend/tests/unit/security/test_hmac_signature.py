@@ -0,0 +1,176 @@
+"""HMAC签名验证单元测试
+
+验证预置密钥的HMAC对象缓存与签名验证逻辑。
+"""
+
+import hashlib
+import hmac
+import time
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.core.security import nonce_store as store_module
+from src.core.security.hmac import (
+    HMACKeyCache,
+    HMACSignature,
+    build_sign_message,
+    generate_signature,
+)
+from src.core.security.nonce_store import NonceStore
+
+SECRET = "a" * 64
+PATH = "/api/v1/auth/game/authorize"
+BODY = b'{"app_id":"app","site_id":"site","player_count":3}'
+
+
+def make_request(headers: dict, path: str = PATH, method: str = "POST") -> Request:
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 12345),
+        "server": ("test", 80),
+        "scheme": "http",
+    })
+
+
+def signed_headers(body: bytes = BODY, nonce: str = "", timestamp: int = None, secret: str = SECRET) -> dict:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    headers = {
+        "X-Timestamp": str(timestamp),
+        "X-Signature": generate_signature("POST", PATH, timestamp, nonce, body.decode(), secret),
+    }
+    if nonce:
+        headers["X-Nonce"] = nonce
+    return headers
+
+
+class TestHMACKeyCache:
+    """预置密钥缓存"""
+
+    def test_copy_matches_fresh_hmac(self):
+        cache = HMACKeyCache()
+        for _ in range(2):
+            signer = cache.signer("op-1", SECRET)
+            signer.update(b"message")
+            assert signer.hexdigest() == hmac.new(SECRET.encode(), b"message", hashlib.sha256).hexdigest()
+
+    def test_copies_are_independent(self):
+        cache = HMACKeyCache()
+        first = cache.signer("op-1", SECRET)
+        first.update(b"first")
+        second = cache.signer("op-1", SECRET)
+        second.update(b"second")
+        assert second.hexdigest() == hmac.new(SECRET.encode(), b"second", hashlib.sha256).hexdigest()
+
+    def test_secret_rotation_rebuilds_signer(self):
+        cache = HMACKeyCache()
+        cache.signer("op-1", SECRET)
+        signer = cache.signer("op-1", "b" * 64)
+        signer.update(b"message")
+        assert signer.hexdigest() == hmac.new(b"b" * 64, b"message", hashlib.sha256).hexdigest()
+        assert len(cache) == 1
+
+    def test_lru_bound(self):
+        cache = HMACKeyCache(max_size=2)
+        cache.signer("op-1", SECRET)
+        cache.signer("op-2", SECRET)
+        cache.signer("op-1", SECRET)
+        cache.signer("op-3", SECRET)
+        assert len(cache) == 2
+        assert "op-2" not in cache._entries
+
+
+class TestHMACSignatureVerify:
+    """签名验证"""
+
+    def test_valid_signature_without_nonce(self):
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache())
+        result = verifier.verify(make_request(signed_headers()), "op-1", SECRET, BODY)
+        assert result["verified"] is True
+        assert result["nonce"] is None
+
+    def test_valid_signature_with_nonce(self):
+        verifier = HMACSignature(key_cache=HMACKeyCache())
+        nonce = "n" * 16
+        result = verifier.verify(make_request(signed_headers(nonce=nonce)), "op-1", SECRET, BODY)
+        assert result["nonce"] == nonce
+
+    def test_tampered_body_rejected(self):
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache())
+        with pytest.raises(HTTPException) as exc_info:
+            verifier.verify(make_request(signed_headers()), "op-1", SECRET, BODY.replace(b"3", b"9"))
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail["error_code"] == "INVALID_SIGNATURE"
+
+    def test_wrong_secret_rejected(self):
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache())
+        with pytest.raises(HTTPException) as exc_info:
+            verifier.verify(make_request(signed_headers(secret="b" * 64)), "op-1", SECRET, BODY)
+        assert exc_info.value.detail["error_code"] == "INVALID_SIGNATURE"
+
+    def test_expired_timestamp_rejected(self):
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache())
+        headers = signed_headers(timestamp=int(time.time()) - 301)
+        with pytest.raises(HTTPException) as exc_info:
+            verifier.verify(make_request(headers), "op-1", SECRET, BODY)
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail["error_code"] == "TIMESTAMP_EXPIRED"
+
+    def test_missing_nonce_rejected_when_required(self):
+        verifier = HMACSignature(key_cache=HMACKeyCache())
+        with pytest.raises(HTTPException) as exc_info:
+            verifier.verify(make_request(signed_headers()), "op-1", SECRET, BODY)
+        assert exc_info.value.status_code == 401
+
+    def test_sign_message_matches_generate_signature(self):
+        message = build_sign_message("POST", PATH, "1700000000", "", BODY)
+        expected = generate_signature("POST", PATH, 1700000000, "", BODY.decode(), SECRET)
+        assert hmac.new(SECRET.encode(), message, hashlib.sha256).hexdigest() == expected
+
+
+class TestHMACSignatureAuthenticate:
+    """签名验证 + Nonce防重放"""
+
+    @pytest.fixture(autouse=True)
+    def no_redis(self, monkeypatch):
+        class DisconnectedCache:
+            async def set_if_absent(self, key, value, ttl=None):
+                return None
+
+        monkeypatch.setattr(store_module, "get_cache", lambda: DisconnectedCache())
+
+    @pytest.mark.asyncio
+    async def test_replayed_nonce_rejected(self):
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache(), nonce_store=NonceStore())
+        request = make_request(signed_headers(nonce="r" * 16))
+
+        await verifier.authenticate(request, "op-1", SECRET, BODY)
+        with pytest.raises(HTTPException) as exc_info:
+            await verifier.authenticate(request, "op-1", SECRET, BODY)
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail["error_code"] == "NONCE_REPLAYED"
+
+    @pytest.mark.asyncio
+    async def test_invalid_signature_does_not_consume_nonce(self):
+        store = NonceStore()
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache(), nonce_store=store)
+        request = make_request(signed_headers(nonce="r" * 16))
+
+        with pytest.raises(HTTPException):
+            await verifier.authenticate(request, "op-1", SECRET, b"{}")
+        assert len(store._local) == 0
+
+    @pytest.mark.asyncio
+    async def test_without_nonce_skips_store(self):
+        store = NonceStore()
+        verifier = HMACSignature(require_nonce=False, key_cache=HMACKeyCache(), nonce_store=store)
+        request = make_request(signed_headers())
+
+        await verifier.authenticate(request, "op-1", SECRET, BODY)
+        await verifier.authenticate(request, "op-1", SECRET, BODY)
+        assert len(store._local) == 0
@@ -0,0 +1,154 @@
+"""单元测试：NonceStore 请求随机数防重放
+
+测试:
+1. 进程内集合拒绝同一worker内的重放(不访问Redis)
+2. 其他worker已占用的Nonce(Redis SET NX失败)被拒绝
+3. Nonce过期后可以再次使用, 过期时间桶被清理
+4. Redis不可用时降级为进程内判重, 或按配置拒绝
+5. 不同运营商的同一Nonce互不影响
+"""
+
+import json
+
+import pytest
+
+from src.core.security import nonce_store as store_module
+from src.core.security.nonce_store import (
+    LocalNonceWindow,
+    NonceStore,
+    NonceStoreUnavailableError,
+)
+
+NOW = 1_700_000_000.0
+NONCE = "n" * 16
+
+
+class FakeCache:
+    """RedisCache 替身(内存字典实现 SET NX)"""
+
+    def __init__(self, connected: bool = True):
+        self.connected = connected
+        self.store = {}
+        self.calls = []
+
+    async def set_if_absent(self, key, value, ttl=None):
+        self.calls.append((key, ttl))
+        if not self.connected:
+            return None
+        if key in self.store:
+            return False
+        self.store[key] = json.dumps(value)
+        return True
+
+
+class Clock:
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(store_module, "get_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+class TestLocalNonceWindow:
+    def test_duplicate_rejected_until_expiry(self):
+        window = LocalNonceWindow(max_entries=100)
+        assert window.add("op:a", NOW + 300, NOW) is True
+        assert window.add("op:a", NOW + 300, NOW + 299) is False
+        assert window.add("op:a", NOW + 700, NOW + 300) is True
+
+    def test_expired_buckets_are_purged(self):
+        window = LocalNonceWindow(max_entries=100, bucket_seconds=10)
+        for i in range(10):
+            window.add(f"op:{i}", NOW + 5, NOW)
+        window.add("op:late", NOW + 400, NOW + 100)
+        assert len(window) == 1
+
+    def test_capacity_bound(self):
+        window = LocalNonceWindow(max_entries=5, bucket_seconds=10)
+        for i in range(20):
+            window.add(f"op:{i}", NOW + 10 * i, NOW)
+        assert len(window) <= 5
+        # 最晚过期的Nonce仍被记住
+        assert window.add("op:19", NOW + 190, NOW) is False
+
+
+@pytest.mark.asyncio
+async def test_first_claim_succeeds_with_operator_hash_tag(fake_cache, clock):
+    store = NonceStore(clock=clock)
+    assert await store.claim("op-1", NONCE, int(NOW)) is True
+
+    key, ttl = fake_cache.calls[0]
+    assert key == f"nonce:{{op-1}}:{NONCE}"
+    assert 300 <= ttl <= 301
+
+
+@pytest.mark.asyncio
+async def test_local_replay_skips_redis(fake_cache, clock):
+    store = NonceStore(clock=clock)
+    await store.claim("op-1", NONCE, int(NOW))
+    assert await store.claim("op-1", NONCE, int(NOW)) is False
+    assert len(fake_cache.calls) == 1
+    assert store.local_rejections == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_on_other_worker_rejected_by_redis(fake_cache, clock):
+    assert await NonceStore(clock=clock).claim("op-1", NONCE, int(NOW)) is True
+
+    other_worker = NonceStore(clock=clock)
+    assert await other_worker.claim("op-1", NONCE, int(NOW)) is False
+    assert other_worker.redis_rejections == 1
+
+
+@pytest.mark.asyncio
+async def test_same_nonce_different_operators(fake_cache, clock):
+    store = NonceStore(clock=clock)
+    assert await store.claim("op-1", NONCE, int(NOW)) is True
+    assert await store.claim("op-2", NONCE, int(NOW)) is True
+
+
+@pytest.mark.asyncio
+async def test_ttl_follows_request_timestamp(fake_cache, clock):
+    """时间戳较早的请求只需记到其离开时间窗口"""
+    store = NonceStore(clock=clock)
+    await store.claim("op-1", NONCE, int(NOW) - 200)
+    assert fake_cache.calls[0][1] == 101
+
+
+@pytest.mark.asyncio
+async def test_redis_down_degrades_to_local(fake_cache, clock):
+    fake_cache.connected = False
+    store = NonceStore(clock=clock)
+
+    assert await store.claim("op-1", NONCE, int(NOW)) is True
+    assert await store.claim("op-1", NONCE, int(NOW)) is False
+    assert store.degraded_claims == 1
+
+    # 重试间隔内不再访问Redis
+    assert await store.claim("op-1", "m" * 16, int(NOW)) is True
+    assert len(fake_cache.calls) == 1
+
+    clock.now += 10
+    fake_cache.connected = True
+    assert await store.claim("op-1", "k" * 16, int(NOW)) is True
+    assert len(fake_cache.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_down_fail_closed(fake_cache, clock):
+    fake_cache.connected = False
+    store = NonceStore(require_redis=True, clock=clock)
+    with pytest.raises(NonceStoreUnavailableError):
+        await store.claim("op-1", NONCE, int(NOW))
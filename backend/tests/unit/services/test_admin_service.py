@@ -2,7 +2,7 @@
 
 测试AdminService的所有管理功能:
 1. 运营商管理 (T152)
-2. 应用管理 (T153)
+2. 应用管理 (T153), 管理后台统计
 3. 授权管理 (T154)
 
 测试策略:
@@ -24,6 +24,7 @@ from src.models.application import Application
 from src.models.app_request import ApplicationRequest
 from src.models.authorization import OperatorAppAuthorization
 from src.core import BadRequestException, NotFoundException
+from src.core.cache import invalidate_cache_tags
 from src.core.utils.password import hash_password
 
 
@@ -178,6 +179,69 @@ class TestGetApplications:
         assert result["items"][0]["app_code"] == "test_app_0"
 
 
+class TestGetDashboardStats:
+    """测试get_dashboard_stats方法"""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_stats_cached_until_tag_invalidated(
+        self, test_db, test_operators, test_applications
+    ):
+        """统计结果经多级缓存返回, 应用标签失效后重新查询"""
+        service = AdminService(test_db)
+
+        stats = await service.get_dashboard_stats()
+        assert stats["operators_count"] == 3
+        assert stats["applications_count"] == 2
+
+        test_db.add(Application(
+            app_code="test_app_new",
+            app_name="Test App New",
+            price_per_player=Decimal("12.00"),
+            min_players=2,
+            max_players=8,
+            is_active=True,
+        ))
+        await test_db.commit()
+        assert await AdminService(test_db).get_dashboard_stats() == stats
+
+        await invalidate_cache_tags("applications")
+        stats = await service.get_dashboard_stats()
+        assert stats["applications_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh_does_not_use_request_session(
+        self, test_db, test_operators, test_applications, reset_multi_cache_local, monkeypatch
+    ):
+        """过期结果在后台刷新时使用独立会话, 请求会话关闭后刷新仍成功"""
+        cache = reset_multi_cache_local
+        monkeypatch.setattr(cache, "beta", 0)
+        stats = await AdminService(test_db).get_dashboard_stats()
+
+        test_db.add(Application(
+            app_code="test_app_new",
+            app_name="Test App New",
+            price_per_player=Decimal("12.00"),
+            min_players=2,
+            max_players=8,
+            is_active=True,
+        ))
+        await test_db.commit()
+
+        async def closed_session(*args, **kwargs):
+            raise AssertionError("请求会话已关闭")
+
+        # 模拟请求结束: 会话不可再用, 缓存时间越过ttl进入stale窗口
+        monkeypatch.setattr(test_db, "execute", closed_session)
+        monkeypatch.setattr(test_db, "scalar", closed_session)
+        now = cache._wall_clock()
+        monkeypatch.setattr(cache, "_wall_clock", lambda: now + 45)
+
+        assert await AdminService(test_db).get_dashboard_stats() == stats
+        refresh = cache._inflight["dashboard:get_dashboard_stats:default"]
+        assert (await refresh)["applications_count"] == 3
+        assert (await AdminService(test_db).get_dashboard_stats())["applications_count"] == 3
+
+
 class TestCreateApplication:
     """测试create_application方法"""
 
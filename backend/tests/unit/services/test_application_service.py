@@ -1,7 +1,7 @@
 """单元测试：ApplicationService (T101)
 
 测试OperatorService中应用授权管理相关的方法:
-1. get_authorized_applications - 查询已授权应用列表
+1. get_authorized_applications - 查询已授权应用列表(含缓存失效)
 2. create_application_request - 创建应用授权申请
 3. get_application_requests - 查询授权申请列表
 
@@ -18,6 +18,7 @@ from decimal import Decimal
 from fastapi import HTTPException
 from uuid import uuid4, UUID
 
+from src.services.admin_service import AdminService
 from src.services.operator import OperatorService
 from src.models.operator import OperatorAccount
 from src.models.admin import AdminAccount
@@ -280,6 +281,31 @@ class TestGetAuthorizedApplications:
 
         assert exc_info.value.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_get_authorized_apps_cache_invalidated_by_admin_changes(
+        self, test_db, operator_with_apps, admin_account
+    ):
+        """测试授权、调价、撤销授权后缓存的应用列表按标签失效"""
+        service = OperatorService(test_db)
+        admin_service = AdminService(test_db)
+        other_operator = operator_with_apps["other_operator"]
+        app1 = operator_with_apps["app1"]
+
+        assert await service.get_authorized_applications(other_operator.id) == []
+
+        await admin_service.authorize_application(
+            str(other_operator.id), str(app1.id), admin_account.id
+        )
+        apps = await service.get_authorized_applications(other_operator.id)
+        assert [app["app_code"] for app in apps] == ["space_adventure"]
+
+        await admin_service.update_application_price(str(app1.id), 20.0)
+        apps = await service.get_authorized_applications(other_operator.id)
+        assert apps[0]["price_per_player"] == "20.00"
+
+        await admin_service.revoke_authorization(str(other_operator.id), str(app1.id))
+        assert await service.get_authorized_applications(other_operator.id) == []
+
 
 class TestCreateApplicationRequest:
     """测试create_application_request方法"""
@@ -0,0 +1,186 @@
+"""单元测试：AuthContextCache
+
+测试授权上下文缓存:
+1. 命中/未命中与LRU淘汰
+2. TTL过期与授权到期
+3. 按运营商/运营点/应用/授权关系失效
+4. AdminService管理操作后自动失效
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from src.models.application import Application
+from src.models.authorization import OperatorAppAuthorization
+from src.models.operator import OperatorAccount
+from src.models.site import OperationSite
+from src.services.admin_service import AdminService
+from src.services.auth_context_cache import AuthContextCache, AuthorizationContext
+
+
+def make_context(operator_id=None, site_id=None, app_id=None, expires_at=None):
+    """构造内存中的授权上下文(不访问数据库)"""
+    operator = OperatorAccount(id=operator_id or uuid4(), is_active=True, is_locked=False)
+    site = OperationSite(id=site_id or uuid4(), operator_id=operator.id, is_active=True)
+    application = Application(
+        id=app_id or uuid4(),
+        app_name="缓存测试游戏",
+        price_per_player=Decimal("10.00"),
+        min_players=2,
+        max_players=8,
+        is_active=True,
+    )
+    authorization = OperatorAppAuthorization(
+        id=uuid4(),
+        operator_id=operator.id,
+        application_id=application.id,
+        expires_at=expires_at,
+    )
+    return AuthorizationContext.from_models(operator, site, application, authorization)
+
+
+def put(cache, context, api_key="key"):
+    cache.set(api_key, str(context.site.id), str(context.application.id), context)
+
+
+def lookup(cache, context, api_key="key"):
+    return cache.get(api_key, str(context.site.id), str(context.application.id))
+
+
+class TestCacheBasics:
+    """测试读写、TTL与LRU"""
+
+    def test_miss_then_hit(self):
+        cache = AuthContextCache(max_size=10, ttl_seconds=60)
+        context = make_context()
+
+        assert lookup(cache, context) is None
+        put(cache, context)
+        assert lookup(cache, context) is context
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_snapshot_matches_models(self):
+        context = make_context()
+
+        assert context.application.price_per_player == Decimal("10.00")
+        assert context.application.min_players == 2
+        assert context.site.operator_id == context.operator.id
+
+    def test_ttl_expiry(self, monkeypatch):
+        import src.services.auth_context_cache as module
+
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        cache = AuthContextCache(max_size=10, ttl_seconds=30)
+        context = make_context()
+        put(cache, context)
+
+        now[0] += 29
+        assert lookup(cache, context) is context
+
+        now[0] += 2
+        assert lookup(cache, context) is None
+        assert len(cache) == 0
+
+    def test_expired_authorization_not_served(self):
+        cache = AuthContextCache(max_size=10, ttl_seconds=60)
+        context = make_context(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        put(cache, context)
+
+        assert lookup(cache, context) is None
+
+    def test_lru_eviction(self):
+        cache = AuthContextCache(max_size=2, ttl_seconds=60)
+        first, second, third = make_context(), make_context(), make_context()
+        put(cache, first)
+        put(cache, second)
+
+        # 访问first使其成为最近使用
+        assert lookup(cache, first) is first
+        put(cache, third)
+
+        assert lookup(cache, second) is None
+        assert lookup(cache, first) is first
+        assert lookup(cache, third) is third
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = AuthContextCache(max_size=10, ttl_seconds=0)
+        context = make_context()
+        put(cache, context)
+
+        assert len(cache) == 0
+
+
+class TestInvalidation:
+    """测试显式失效"""
+
+    def test_invalidate_operator(self):
+        cache = AuthContextCache()
+        operator_id = uuid4()
+        own_a, own_b, other = (
+            make_context(operator_id=operator_id),
+            make_context(operator_id=operator_id),
+            make_context(),
+        )
+        for context in (own_a, own_b, other):
+            put(cache, context)
+
+        assert cache.invalidate_operator(operator_id) == 2
+        assert lookup(cache, own_a) is None
+        assert lookup(cache, other) is other
+
+    def test_invalidate_site(self):
+        cache = AuthContextCache()
+        context = make_context()
+        put(cache, context)
+
+        assert cache.invalidate_site(context.site.id) == 1
+        assert lookup(cache, context) is None
+
+    def test_invalidate_application(self):
+        cache = AuthContextCache()
+        app_id = uuid4()
+        contexts = [make_context(app_id=app_id) for _ in range(3)]
+        for context in contexts:
+            put(cache, context)
+
+        assert cache.invalidate_application(app_id) == 3
+        assert len(cache) == 0
+
+    def test_invalidate_authorization_only_matching_pair(self):
+        cache = AuthContextCache()
+        operator_id, app_id = uuid4(), uuid4()
+        target = make_context(operator_id=operator_id, app_id=app_id)
+        same_operator = make_context(operator_id=operator_id)
+        put(cache, target)
+        put(cache, same_operator)
+
+        assert cache.invalidate_authorization(operator_id, app_id) == 1
+        assert lookup(cache, same_operator) is same_operator
+
+
+class TestAdminServiceInvalidation:
+    """测试管理操作后自动失效全局缓存"""
+
+    @pytest.mark.asyncio
+    async def test_price_update_evicts_context(self, test_db, reset_auth_context_cache):
+        application = Application(
+            app_code="app_cache_price",
+            app_name="价格变更游戏",
+            price_per_player=Decimal("10.00"),
+            min_players=2,
+            max_players=8,
+            is_active=True,
+        )
+        test_db.add(application)
+        await test_db.commit()
+
+        context = make_context(app_id=application.id)
+        put(reset_auth_context_cache, context)
+
+        await AdminService(test_db).update_application_price(str(application.id), 12.5)
+
+        assert lookup(reset_auth_context_cache, context) is None
@@ -6,6 +6,7 @@
 3. verify_application_authorization - 应用授权验证
 4. verify_player_count - 玩家数量验证
 5. verify_session_id_format - 会话ID格式验证(FR-061)
+6. load_authorization_chain - 联表查询授权验证所需记录
 
 测试策略:
 - 使用真实数据库会话(test_db fixture)
@@ -519,3 +520,78 @@ class TestVerifySessionIdFormat:
 
         assert exc_info.value.status_code == 400
         assert exc_info.value.detail["error_code"] == "INVALID_SESSION_ID_FORMAT"
+
+
+class TestLoadAuthorizationChain:
+    """测试load_authorization_chain方法(一条联表查询)"""
+
+    @pytest.mark.asyncio
+    async def test_loads_all_records(self, auth_test_data, test_db):
+        """API Key、运营点、应用和授权全部命中"""
+        service = AuthService(test_db)
+        operator = auth_test_data["active_operator"]
+
+        chain = await service.load_authorization_chain(
+            operator.api_key, auth_test_data["active_site"].id, auth_test_data["active_app"].id
+        )
+
+        assert chain.operator.id == operator.id
+        assert chain.site.id == auth_test_data["active_site"].id
+        assert chain.application.id == auth_test_data["active_app"].id
+        assert chain.authorization.id == auth_test_data["valid_authorization"].id
+
+    @pytest.mark.asyncio
+    async def test_invalid_api_key_returns_empty_chain(self, auth_test_data, test_db):
+        """API Key不存在时全部为None, check_operator报告INVALID_API_KEY"""
+        service = AuthService(test_db)
+
+        chain = await service.load_authorization_chain(
+            "invalid_api_key_" + "x" * 48, auth_test_data["active_site"].id, auth_test_data["active_app"].id
+        )
+
+        assert chain.operator is None and chain.site is None and chain.application is None
+        with pytest.raises(HTTPException) as exc_info:
+            service.check_operator(chain.operator)
+        assert exc_info.value.detail["error_code"] == "INVALID_API_KEY"
+
+    @pytest.mark.asyncio
+    async def test_missing_site_and_unparsed_ids(self, auth_test_data, test_db):
+        """运营点不存在或ID未解析(None)时对应记录为None, 运营商仍返回"""
+        service = AuthService(test_db)
+        operator = auth_test_data["active_operator"]
+
+        chain = await service.load_authorization_chain(operator.api_key, uuid4(), None)
+
+        assert chain.operator.id == operator.id
+        assert chain.site is None
+        assert chain.application is None
+        assert chain.authorization is None
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_application(self, auth_test_data, test_db):
+        """应用存在但运营商未获授权时, check_authorization报告APP_NOT_AUTHORIZED"""
+        service = AuthService(test_db)
+        locked_operator = auth_test_data["locked_operator"]
+
+        chain = await service.load_authorization_chain(
+            locked_operator.api_key, auth_test_data["active_site"].id, auth_test_data["active_app"].id
+        )
+
+        assert chain.application.id == auth_test_data["active_app"].id
+        assert chain.authorization is None
+        with pytest.raises(HTTPException) as exc_info:
+            service.check_authorization(chain.authorization, chain.application)
+        assert exc_info.value.detail["error_code"] == "APP_NOT_AUTHORIZED"
+
+    @pytest.mark.asyncio
+    async def test_site_owned_by_other_operator(self, auth_test_data, test_db):
+        """其他运营商的运营点仍被查出, check_site报告SITE_NOT_OWNED"""
+        service = AuthService(test_db)
+        locked_operator = auth_test_data["locked_operator"]
+        site = auth_test_data["active_site"]
+
+        chain = await service.load_authorization_chain(locked_operator.api_key, site.id, None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.check_site(chain.site, site.id, locked_operator.id)
+        assert exc_info.value.detail["error_code"] == "SITE_NOT_OWNED"
@@ -0,0 +1,280 @@
+"""单元测试：BalanceLedger 余额分片
+
+测试:
+1. 客户分类分片配置解析
+2. 分片模式下的授权扣费(首次合并扣费创建分片, 之后轮询扣减分片)
+3. 分片余额不足时的合并扣费与自动均衡
+4. 总余额不足返回402
+5. 分片归集(充值/退款前)
+6. 合并扣费跳过被其他事务占用的分片(不等待分片锁), 归集不跳过
+7. 运营商/退款列表和详情展示总余额(含分片)
+"""
+
+import pytest
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from src.core.config import get_settings
+from src.models.application import Application
+from src.models.balance_shard import OperatorBalanceShard
+from src.models.operator import OperatorAccount
+from src.models.site import OperationSite
+from src.models.refund import RefundRecord
+from src.services.admin_service import AdminService
+from src.services.balance_ledger import BalanceLedger
+from src.services.billing_service import BillingService
+from src.services.finance_recharge_service import FinanceRechargeService
+from src.services.finance_refund_service import FinanceRefundService
+
+
+@pytest.fixture
+def vip_shards(monkeypatch):
+    """为VIP客户开启4个余额分片"""
+    monkeypatch.setattr(get_settings(), "BALANCE_SHARD_TIERS", "vip:4")
+    return 4
+
+
+@pytest.fixture
+async def ledger_test_data(test_db):
+    """准备VIP运营商、运营点和应用"""
+    operator = OperatorAccount(
+        username="op_ledger_test",
+        full_name="Test Operator",
+        email="operator@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="ledger_api_key_" + "a" * 49,
+        api_key_hash="hashed_secret",
+        balance=Decimal("1000.00"),
+        customer_tier="vip",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    site = OperationSite(
+        operator_id=operator.id,
+        name="分片测试运营点",
+        address="测试地址",
+        server_identifier="server_ledger_001",
+        is_active=True
+    )
+    application = Application(
+        app_code="app_ledger_test",
+        app_name="分片测试游戏",
+        price_per_player=Decimal("10.00"),
+        min_players=1,
+        max_players=100,
+        is_active=True,
+    )
+    test_db.add_all([site, application])
+    await test_db.commit()
+
+    return {"operator": operator, "site": site, "application": application}
+
+
+async def authorize(test_db, data, session_suffix: str, player_count: int):
+    return await BillingService(test_db).create_authorization_transaction(
+        session_id=f"ledger_session_{session_suffix}_" + "s" * 16,
+        operator_id=data["operator"].id,
+        site_id=data["site"].id,
+        application=data["application"],
+        player_count=player_count,
+        customer_tier=data["operator"].customer_tier
+    )
+
+
+async def shard_balances(test_db, operator_id) -> dict[int, Decimal]:
+    result = await test_db.execute(
+        select(OperatorBalanceShard.shard_index, OperatorBalanceShard.balance)
+        .where(OperatorBalanceShard.operator_id == operator_id)
+        .order_by(OperatorBalanceShard.shard_index)
+    )
+    return dict(result.all())
+
+
+def test_shard_count_by_tier(monkeypatch):
+    monkeypatch.setattr(get_settings(), "BALANCE_SHARD_TIERS", "vip:8, standard:2")
+
+    assert BalanceLedger.shard_count("vip") == 8
+    assert BalanceLedger.shard_count("standard") == 2
+    assert BalanceLedger.shard_count("trial") == 0
+    assert BalanceLedger.shard_count(None) == 0
+
+
+def test_next_shard_round_robin():
+    picks = [BalanceLedger.next_shard(4) for _ in range(8)]
+
+    assert sorted(picks) == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert BalanceLedger.next_shard(0) is None
+
+
+@pytest.mark.asyncio
+async def test_first_sharded_debit_creates_balanced_shards(vip_shards, ledger_test_data, test_db):
+    operator_id = ledger_test_data["operator"].id
+
+    _, transaction_record, balance_after = await authorize(test_db, ledger_test_data, "first", 3)
+
+    assert balance_after == Decimal("970.00")
+    assert transaction_record.balance_before == Decimal("1000.00")
+    assert transaction_record.balance_after == Decimal("970.00")
+    # 970 / 4 = 242.50, 主行不留零头
+    assert await shard_balances(test_db, operator_id) == {
+        index: Decimal("242.50") for index in range(vip_shards)
+    }
+    assert await BalanceLedger(test_db).get_balance(operator_id) == Decimal("970.00")
+
+
+@pytest.mark.asyncio
+async def test_sharded_debits_spread_across_shards(vip_shards, ledger_test_data, test_db):
+    operator_id = ledger_test_data["operator"].id
+    await authorize(test_db, ledger_test_data, "init", 4)  # 960 → 每个分片240
+
+    for i in range(vip_shards):
+        _, transaction_record, balance_after = await authorize(test_db, ledger_test_data, f"rr{i}", 1)
+        assert transaction_record.balance_before - transaction_record.balance_after == Decimal("10.00")
+
+    assert balance_after == Decimal("920.00")
+    # 每个分片各被扣一次
+    assert await shard_balances(test_db, operator_id) == {
+        index: Decimal("230.00") for index in range(vip_shards)
+    }
+
+
+@pytest.mark.asyncio
+async def test_exhausted_shard_falls_back_to_pooled_debit(vip_shards, ledger_test_data, test_db):
+    operator_id = ledger_test_data["operator"].id
+    await authorize(test_db, ledger_test_data, "init", 4)  # 每个分片240
+
+    # 单个分片不足500, 但总余额960足够
+    _, _, balance_after = await authorize(test_db, ledger_test_data, "big", 50)
+
+    assert balance_after == Decimal("460.00")
+    assert await shard_balances(test_db, operator_id) == {
+        index: Decimal("115.00") for index in range(vip_shards)
+    }
+
+
+@pytest.mark.asyncio
+async def test_insufficient_total_balance_returns_402(vip_shards, ledger_test_data, test_db):
+    operator_id = ledger_test_data["operator"].id
+    await authorize(test_db, ledger_test_data, "init", 4)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await authorize(test_db, ledger_test_data, "too_big", 97)
+
+    assert exc_info.value.status_code == 402
+    assert exc_info.value.detail["details"]["current_balance"] == "960.00"
+    assert await BalanceLedger(test_db).get_balance(operator_id) == Decimal("960.00")
+
+
+@pytest.mark.asyncio
+async def test_rebalance_keeps_remainder_on_main_row(ledger_test_data, test_db):
+    operator = ledger_test_data["operator"]
+    ledger = BalanceLedger(test_db)
+
+    total = await ledger.rebalance(operator.id, 3)
+    await test_db.commit()
+    await test_db.refresh(operator)
+
+    assert total == Decimal("1000.00")
+    assert await shard_balances(test_db, operator.id) == {
+        index: Decimal("333.33") for index in range(3)
+    }
+    assert operator.balance == Decimal("0.01")
+
+    # 关闭分片后合并扣费把余额全部归集回主行
+    await ledger.pooled_debit(operator.id, Decimal("0.00"), 0)
+    await test_db.commit()
+    await test_db.refresh(operator)
+
+    assert operator.balance == Decimal("1000.00")
+    assert set((await shard_balances(test_db, operator.id)).values()) == {Decimal("0.00")}
+
+
+@pytest.mark.asyncio
+async def test_consolidate_moves_shards_to_main_row(vip_shards, ledger_test_data, test_db):
+    operator = ledger_test_data["operator"]
+    await authorize(test_db, ledger_test_data, "init", 4)
+
+    moved = await BalanceLedger(test_db).consolidate(operator)
+    await test_db.commit()
+
+    assert moved == Decimal("960.00")
+    assert operator.balance == Decimal("960.00")
+    assert set((await shard_balances(test_db, operator.id)).values()) == {Decimal("0.00")}
+    assert await BalanceLedger(test_db).get_balance(operator.id) == Decimal("960.00")
+
+
+@pytest.mark.asyncio
+async def test_pooled_debit_skips_shards_locked_elsewhere(ledger_test_data, test_db, monkeypatch):
+    operator = ledger_test_data["operator"]
+    ledger = BalanceLedger(test_db)
+    await ledger.rebalance(operator.id, 4)
+    await test_db.commit()
+
+    # 模拟分片1被其他事务持有: SKIP LOCKED 不返回该分片
+    lock_shards = BalanceLedger._lock_shards
+
+    async def skip_shard_one(self, operator_id, skip_locked=True):
+        shards = await lock_shards(self, operator_id, skip_locked)
+        if skip_locked:
+            shards.pop(1, None)
+        return shards
+
+    monkeypatch.setattr(BalanceLedger, "_lock_shards", skip_shard_one)
+
+    balance_after = await ledger.pooled_debit(operator.id, Decimal("300.00"), 4)
+    await test_db.commit()
+
+    assert balance_after == Decimal("700.00")
+    assert await shard_balances(test_db, operator.id) == {
+        0: Decimal("150.00"),
+        1: Decimal("250.00"),
+        2: Decimal("150.00"),
+        3: Decimal("150.00"),
+    }
+    assert await ledger.get_balance(operator.id) == Decimal("700.00")
+
+    # 可用余额(主行 + 未被占用的分片)不足
+    assert await ledger.pooled_debit(operator.id, Decimal("500.00"), 4) is None
+
+    # 归集不跳过分片: 等待占用方释放后连同分片1一起归集
+    moved = await ledger.consolidate(operator)
+    await test_db.commit()
+
+    assert moved == Decimal("700.00")
+    assert operator.balance == Decimal("700.00")
+    assert set((await shard_balances(test_db, operator.id)).values()) == {Decimal("0.00")}
+    assert await ledger.get_balance(operator.id) == Decimal("700.00")
+
+
+@pytest.mark.asyncio
+async def test_balance_readers_include_shards(vip_shards, ledger_test_data, test_db):
+    operator = ledger_test_data["operator"]
+    await authorize(test_db, ledger_test_data, "readers", 4)
+    refund = RefundRecord(
+        operator_id=operator.id,
+        requested_amount=Decimal("960.00"),
+        status="pending",
+        refund_reason="测试",
+    )
+    test_db.add(refund)
+    await test_db.commit()
+    await test_db.refresh(operator)
+    assert operator.balance < Decimal("960.00")
+
+    assert await BalanceLedger(test_db).get_balances([operator.id]) == {
+        operator.id: Decimal("960.00")
+    }
+    operators = await AdminService(test_db).get_operators()
+    assert operators["items"][0]["balance"] == 960.0
+    recharge_list = await FinanceRechargeService(test_db).get_operators_list()
+    assert recharge_list[0]["balance"] == 960.0
+    refunds = await FinanceRefundService(test_db).get_refunds()
+    assert refunds.items[0].current_balance == "960.00"
+    details = await FinanceRefundService(test_db).get_refund_details(str(refund.id))
+    assert details.current_balance == "960.00"
+    assert details.operator_finance.current_balance == "960.00"
@@ -0,0 +1,236 @@
+"""单元测试：BillingQueue 授权扣费组提交
+
+测试:
+1. 同一批次的扣费合并为一次执行, 各调用方拿到各自的结果
+2. 批内单个请求余额不足(402)不影响同批其他请求
+3. 批内会话ID重复返回409, 不重复扣费
+4. 达到批大小上限立即执行
+5. 整批提交失败时退回单独事务执行, 不重复扣费
+"""
+
+import asyncio
+import pytest
+from decimal import Decimal
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.models.application import Application
+from src.models.operator import OperatorAccount
+from src.models.site import OperationSite
+from src.models.transaction import TransactionRecord
+from src.models.usage_record import UsageRecord
+from src.services.billing_queue import BillingQueue
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    """队列使用的会话工厂(与 test_db 共享测试数据库)"""
+    return async_sessionmaker(
+        test_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+@pytest.fixture
+async def queue_test_data(test_db):
+    """准备运营商(余额100元)、运营点、应用和一条已存在的使用记录"""
+    operator = OperatorAccount(
+        username="op_queue_test",
+        full_name="Test Operator",
+        email="operator@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="queue_api_key_" + "a" * 50,
+        api_key_hash="hashed_secret",
+        balance=Decimal("100.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    site = OperationSite(
+        operator_id=operator.id,
+        name="组提交测试运营点",
+        address="测试地址",
+        server_identifier="server_queue_001",
+        is_active=True
+    )
+    application = Application(
+        app_code="app_queue_test",
+        app_name="组提交测试游戏",
+        price_per_player=Decimal("10.00"),
+        min_players=1,
+        max_players=100,
+        is_active=True,
+    )
+    test_db.add_all([site, application])
+    await test_db.flush()
+
+    existing_session_id = "queue_existing_" + "x" * 30
+    test_db.add(UsageRecord(
+        session_id=existing_session_id,
+        operator_id=operator.id,
+        site_id=site.id,
+        application_id=application.id,
+        player_count=2,
+        price_per_player=Decimal("10.00"),
+        total_cost=Decimal("20.00"),
+        authorization_token="queue_existing_token",
+        game_started_at=datetime.utcnow()
+    ))
+    await test_db.commit()
+
+    return {
+        "operator": operator,
+        "site": site,
+        "application": application,
+        "existing_session_id": existing_session_id,
+    }
+
+
+def submit(queue: BillingQueue, data, session_id: str, player_count: int):
+    return queue.submit(
+        session_id=session_id,
+        operator_id=data["operator"].id,
+        site_id=data["site"].id,
+        application=data["application"],
+        player_count=player_count,
+        customer_tier=data["operator"].customer_tier
+    )
+
+
+async def operator_balance(test_db, operator_id) -> Decimal:
+    result = await test_db.execute(
+        select(OperatorAccount.balance).where(OperatorAccount.id == operator_id)
+    )
+    return result.scalar_one()
+
+
+async def transaction_count(test_db, operator_id) -> int:
+    result = await test_db.execute(
+        select(func.count()).select_from(TransactionRecord)
+        .where(TransactionRecord.operator_id == operator_id)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_batch_resolves_each_caller(queue_test_data, session_factory, test_db):
+    queue = BillingQueue(session_factory=session_factory, window_ms=5, max_batch=32)
+
+    results = await asyncio.gather(*(
+        submit(queue, queue_test_data, f"queue_batch_{i}_" + "b" * 20, 1)
+        for i in range(3)
+    ))
+
+    assert queue.batches == 1
+    assert queue.requests == 3
+    assert sorted(balance_after for _, _, balance_after in results) == [
+        Decimal("70.00"), Decimal("80.00"), Decimal("90.00")
+    ]
+    for usage_record, transaction_record, balance_after in results:
+        assert usage_record.total_cost == Decimal("10.00")
+        assert transaction_record.related_usage_id == usage_record.id
+        assert transaction_record.balance_after == balance_after
+
+    assert await operator_balance(test_db, queue_test_data["operator"].id) == Decimal("70.00")
+    assert await transaction_count(test_db, queue_test_data["operator"].id) == 3
+
+
+@pytest.mark.asyncio
+async def test_insufficient_balance_fails_only_that_request(queue_test_data, session_factory, test_db):
+    queue = BillingQueue(session_factory=session_factory, window_ms=5, max_batch=32)
+
+    results = await asyncio.gather(
+        submit(queue, queue_test_data, "queue_ok_1_" + "c" * 20, 3),
+        submit(queue, queue_test_data, "queue_too_big_" + "c" * 20, 20),
+        submit(queue, queue_test_data, "queue_ok_2_" + "c" * 20, 4),
+        return_exceptions=True
+    )
+
+    assert queue.batches == 1
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 402
+    assert results[1].detail["error_code"] == "INSUFFICIENT_BALANCE"
+    assert results[0][2] == Decimal("70.00")
+    assert results[2][2] == Decimal("30.00")
+
+    assert await operator_balance(test_db, queue_test_data["operator"].id) == Decimal("30.00")
+    assert await transaction_count(test_db, queue_test_data["operator"].id) == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicate_session_returns_409(queue_test_data, session_factory, test_db):
+    queue = BillingQueue(session_factory=session_factory, window_ms=5, max_batch=32)
+
+    results = await asyncio.gather(
+        submit(queue, queue_test_data, queue_test_data["existing_session_id"], 2),
+        submit(queue, queue_test_data, "queue_fresh_" + "d" * 20, 2),
+        return_exceptions=True
+    )
+
+    assert isinstance(results[0], HTTPException)
+    assert results[0].status_code == 409
+    assert results[0].detail["error_code"] == "SESSION_ID_DUPLICATE"
+    assert results[1][2] == Decimal("80.00")
+
+    # 重复的会话没有扣费
+    assert await operator_balance(test_db, queue_test_data["operator"].id) == Decimal("80.00")
+    assert await transaction_count(test_db, queue_test_data["operator"].id) == 1
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting(queue_test_data, session_factory):
+    # 时间窗口足够长, 只有达到批大小才会执行
+    queue = BillingQueue(session_factory=session_factory, window_ms=60_000, max_batch=2)
+
+    results = await asyncio.wait_for(asyncio.gather(
+        submit(queue, queue_test_data, "queue_full_1_" + "e" * 20, 1),
+        submit(queue, queue_test_data, "queue_full_2_" + "e" * 20, 1),
+    ), timeout=5)
+
+    assert queue.batches == 1
+    assert len(results) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_commit_retries_without_double_charge(
+    queue_test_data, session_factory, test_db, monkeypatch
+):
+    """整批提交失败后逐个单独重试
+
+    PostgreSQL下整批已回滚, 重试正常扣费; SQLite驱动释放保存点时已落盘,
+    重试命中会话ID幂等性返回409。两种情况都只扣费一次。
+    """
+    queue = BillingQueue(session_factory=session_factory, window_ms=5, max_batch=32)
+    original_new_session = queue._new_session
+    batch_session = original_new_session()
+
+    async def fail_commit():
+        raise RuntimeError("simulated commit failure")
+
+    batch_session.commit = fail_commit
+    # 第一个会话(整批事务)提交失败, 之后的会话(单独事务)正常
+    sessions = iter([batch_session])
+    monkeypatch.setattr(queue, "_new_session", lambda: next(sessions, None) or original_new_session())
+
+    results = await asyncio.gather(
+        submit(queue, queue_test_data, "queue_retry_1_" + "f" * 20, 1),
+        submit(queue, queue_test_data, "queue_retry_2_" + "f" * 20, 2),
+        return_exceptions=True
+    )
+
+    for result in results:
+        if isinstance(result, HTTPException):
+            assert result.status_code == 409
+        else:
+            assert isinstance(result, tuple)
+
+    assert await operator_balance(test_db, queue_test_data["operator"].id) == Decimal("70.00")
+    assert await transaction_count(test_db, queue_test_data["operator"].id) == 2
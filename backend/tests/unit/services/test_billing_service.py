@@ -18,6 +18,7 @@ from decimal import Decimal
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 
+from src.core.security.authorization_token import verify_authorization_token
 from src.services.billing_service import BillingService
 from src.models.admin import AdminAccount
 from src.models.operator import OperatorAccount
@@ -266,7 +267,12 @@ class TestCreateAuthorizationTransaction:
         assert usage_record.player_count == player_count
         assert usage_record.total_cost == Decimal("50.00")  # 5 × 10
         assert usage_record.authorization_token is not None
-        assert len(usage_record.authorization_token) == 36  # UUID格式
+        # 签名的自描述令牌, 无需查询数据库即可验证
+        claims = verify_authorization_token(usage_record.authorization_token)
+        assert claims["sid"] == session_id
+        assert claims["op"] == str(billing_test_data["operator"].id)
+        assert claims["app"] == str(billing_test_data["application"].id)
+        assert claims["pc"] == player_count
 
         # 验证交易记录
         assert transaction_record.transaction_type == "consumption"
@@ -498,6 +504,106 @@ class TestCreateAuthorizationTransaction:
         assert transaction_record.description == expected_description
 
 
+class TestConditionalDebit:
+    """测试条件UPDATE扣费"""
+
+    @pytest.mark.asyncio
+    async def test_debit_issues_no_locking_select(self, billing_test_data, test_db, test_engine):
+        """扣费只发出条件UPDATE和两条INSERT, 不再 SELECT FOR UPDATE"""
+        from sqlalchemy import event
+
+        service = BillingService(test_db)
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            await service.create_authorization_transaction(
+                session_id="test_debit_statements_" + "i" * 20,
+                operator_id=billing_test_data["operator"].id,
+                site_id=billing_test_data["site"].id,
+                application=billing_test_data["application"],
+                player_count=3
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+        assert [sql.split()[0] for sql in statements] == ["UPDATE", "INSERT", "INSERT"]
+        assert "balance >= " in statements[0]
+        assert "RETURNING" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_sequential_debits_never_overdraw(self, billing_test_data, test_db):
+        """连续扣费直到余额不足, 余额不会变为负数"""
+        service = BillingService(test_db)
+        operator = billing_test_data["operator"]
+
+        # 余额500元, 每次 8人 × 10元 = 80元, 第7次应返回402
+        for i in range(6):
+            await service.create_authorization_transaction(
+                session_id=f"test_overdraw_session_{i:02d}_" + "j" * 16,
+                operator_id=operator.id,
+                site_id=billing_test_data["site"].id,
+                application=billing_test_data["application"],
+                player_count=8
+            )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.create_authorization_transaction(
+                session_id="test_overdraw_session_final_" + "j" * 16,
+                operator_id=operator.id,
+                site_id=billing_test_data["site"].id,
+                application=billing_test_data["application"],
+                player_count=8
+            )
+
+        assert exc_info.value.status_code == 402
+        assert exc_info.value.detail["details"]["current_balance"] == "20.00"
+
+        await test_db.refresh(operator)
+        assert operator.balance == Decimal("20.00")
+
+    def test_postgresql_debit_is_single_statement(self):
+        """PostgreSQL下扣费和两条插入合并为一条CTE语句"""
+        from uuid import uuid4
+        from sqlalchemy.dialects.postgresql import asyncpg
+
+        usage_record = UsageRecord(
+            id=uuid4(),
+            session_id="test_cte_session_" + "k" * 20,
+            operator_id=uuid4(),
+            site_id=uuid4(),
+            application_id=uuid4(),
+            player_count=2,
+            price_per_player=Decimal("10.00"),
+            total_cost=Decimal("20.00"),
+            authorization_token=str(uuid4()),
+            game_started_at=datetime.utcnow()
+        )
+        transaction_record = TransactionRecord(
+            id=uuid4(),
+            operator_id=usage_record.operator_id,
+            transaction_type="consumption",
+            amount=Decimal("-20.00"),
+            related_usage_id=usage_record.id,
+            description="游戏消费：测试 - 2人"
+        )
+
+        sql = str(
+            BillingService.build_debit_statement(usage_record, transaction_record)
+            .compile(dialect=asyncpg.dialect())
+        )
+
+        assert sql.startswith("WITH debit AS")
+        assert "UPDATE operator_accounts SET balance=" in sql
+        assert "operator_accounts.balance >= " in sql
+        assert "INSERT INTO usage_records" in sql
+        assert sql.count("INSERT INTO transaction_records") == 1
+        assert sql.rstrip().endswith("RETURNING transaction_records.balance_after")
+
+
 class TestGetUsageRecordWithDetails:
     """测试get_usage_record_with_details方法"""
 
@@ -524,3 +630,31 @@ class TestGetUsageRecordWithDetails:
         result = await service.get_usage_record_with_details(non_existent_id)
 
         assert result is None
+
+
+class TestAuthorizationBalanceAfter:
+    """测试幂等响应的扣费后余额查询"""
+
+    @pytest.mark.asyncio
+    async def test_returns_balance_after_of_debit(self, billing_test_data, test_db):
+        """返回授权扣费交易记录中的扣费后余额"""
+        service = BillingService(test_db)
+
+        usage_record, _, balance_after = await service.create_authorization_transaction(
+            session_id="test_balance_after_session_" + "k" * 16,
+            operator_id=billing_test_data["operator"].id,
+            site_id=billing_test_data["site"].id,
+            application=billing_test_data["application"],
+            player_count=3
+        )
+
+        assert await service.get_authorization_balance_after(usage_record.id) == balance_after
+        assert balance_after == Decimal("470.00")
+
+    @pytest.mark.asyncio
+    async def test_missing_transaction_returns_none(self, billing_test_data, test_db):
+        """没有对应交易记录时返回None"""
+        service = BillingService(test_db)
+        existing = billing_test_data["existing_usage_record"]
+
+        assert await service.get_authorization_balance_after(existing.id) is None
@@ -0,0 +1,189 @@
+"""单元测试：财务今日计数器 (FinanceCounterService)
+
+测试:
+1. Redis不可用时概览使用数据库分组查询的结果
+2. 计数器不存在时从数据库重建, 之后交易提交后的累加直接反映在概览中
+3. 计数器不存在时不累加(跨零点/Redis数据丢失后由重建补齐)
+4. 对账任务从数据库重建并修正偏差
+"""
+
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.cache import RedisCache
+from src.core.config import get_settings
+from src.models.operator import OperatorAccount
+from src.models.transaction import TransactionRecord
+from src.services import finance_counters
+from src.services.finance_counters import (
+    FinanceCounterReconciler,
+    FinanceCounterService,
+    counters_key,
+    operators_key,
+    record_transactions,
+    report_today,
+)
+from src.services.finance_dashboard_service import FinanceDashboardService
+
+
+class FakeCounterCache:
+    """内存中的计数器哈希(与 RedisCache 计数器方法语义一致)"""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, int]] = {}
+        self.sets: dict[str, set] = {}
+
+    async def incr_counters(self, key, increments, members_key=None, members=()):
+        if key not in self.hashes:
+            return False
+        for field, increment in increments.items():
+            self.hashes[key][field] = self.hashes[key].get(field, 0) + increment
+        if members_key:
+            self.sets.setdefault(members_key, set()).update(members)
+        return True
+
+    async def get_counters(self, key, members_key=None):
+        if key not in self.hashes:
+            return None
+        return dict(self.hashes[key]), len(self.sets.get(members_key, ()))
+
+    async def replace_counters(self, key, counters, ttl, members_key=None, members=()):
+        self.hashes[key] = dict(counters)
+        if members_key:
+            self.sets[members_key] = set(members)
+        return True
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCounterCache()
+    monkeypatch.setattr(finance_counters, "get_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+async def operators(test_db):
+    """两个运营商"""
+    accounts = [
+        OperatorAccount(
+            username=f"op_counters_{i}",
+            full_name="Test Operator",
+            email=f"counters{i}@test.com",
+            phone="13900139000",
+            password_hash="hashed_password",
+            api_key=f"counters_api_key_{i}_" + "a" * 45,
+            api_key_hash="hashed_secret",
+            balance=Decimal("1000.00"),
+            customer_tier="standard",
+            is_active=True,
+            is_locked=False,
+        )
+        for i in range(2)
+    ]
+    test_db.add_all(accounts)
+    await test_db.commit()
+    return accounts
+
+
+async def add_transaction(db, operator, transaction_type, amount, created_at=None) -> TransactionRecord:
+    transaction = TransactionRecord(
+        operator_id=operator.id,
+        transaction_type=transaction_type,
+        amount=Decimal(amount),
+        balance_before=Decimal("1000.00"),
+        balance_after=Decimal("1000.00") + Decimal(amount),
+        created_at=created_at or datetime.now(timezone.utc)
+    )
+    db.add(transaction)
+    await db.commit()
+    return transaction
+
+
+@pytest.mark.asyncio
+async def test_overview_without_redis_uses_database(test_db, operators, monkeypatch):
+    """Redis未连接: 概览直接使用数据库聚合"""
+    monkeypatch.setattr(finance_counters, "get_cache", RedisCache)
+    await add_transaction(test_db, operators[0], "recharge", "100.00")
+    await add_transaction(test_db, operators[0], "consumption", "-30.00")
+    await add_transaction(test_db, operators[1], "refund", "-20.00")
+    await add_transaction(test_db, operators[1], "recharge", "999.00", datetime(2020, 1, 1))
+
+    overview = await FinanceDashboardService(test_db).get_dashboard_overview()
+
+    assert overview.today_recharge == "100.00"
+    assert overview.today_consumption == "-30.00"
+    assert overview.today_refund == "-20.00"
+    assert overview.today_net_income == "120.00"
+    assert overview.total_operators == 2
+    assert overview.active_operators_today == 2
+
+
+@pytest.mark.asyncio
+async def test_counters_rebuild_then_increment(test_db, operators, fake_cache):
+    """首次读取时重建, 之后的累加直接反映在概览中"""
+    await add_transaction(test_db, operators[0], "recharge", "100.00")
+    service = FinanceDashboardService(test_db)
+
+    overview = await service.get_dashboard_overview()
+    assert overview.today_recharge == "100.00"
+    assert overview.active_operators_today == 1
+    day = report_today()
+    assert fake_cache.hashes[counters_key(day)]["recharge"] == 10000
+
+    # 提交后累加(包括新的运营商)
+    consumption = await add_transaction(test_db, operators[1], "consumption", "-12.50")
+    await record_transactions([consumption])
+
+    overview = await service.get_dashboard_overview()
+    assert overview.today_consumption == "-12.50"
+    assert overview.today_net_income == "100.00"
+    assert overview.active_operators_today == 2
+    assert fake_cache.sets[operators_key(day)] == {str(operators[0].id), str(operators[1].id)}
+
+
+@pytest.mark.asyncio
+async def test_increments_are_dropped_until_rebuilt(test_db, operators, fake_cache):
+    """计数器不存在时不累加; 重建时已包含这些已提交的交易"""
+    transaction = await add_transaction(test_db, operators[0], "recharge", "50.00")
+    await record_transactions([transaction])
+    assert fake_cache.hashes == {}
+
+    today = await FinanceCounterService(test_db).get_today()
+
+    assert today.recharge == Decimal("50.00")
+
+
+@pytest.mark.asyncio
+async def test_counters_use_report_timezone_day(test_db, operators, fake_cache, monkeypatch):
+    """按 REPORT_TIMEZONE 的当天统计"""
+    monkeypatch.setattr(get_settings(), "REPORT_TIMEZONE", "Asia/Shanghai")
+    now = datetime(2026, 3, 1, 2, 0, tzinfo=timezone.utc)  # 上海 03-01 10:00
+    await add_transaction(test_db, operators[0], "recharge", "10.00", datetime(2026, 2, 28, 17, 0))
+    await add_transaction(test_db, operators[0], "recharge", "20.00", datetime(2026, 2, 28, 15, 0))
+
+    today = await FinanceCounterService(test_db).get_today(now=now)
+
+    assert today.day.isoformat() == "2026-03-01"
+    assert today.recharge == Decimal("10.00")
+
+
+@pytest.mark.asyncio
+async def test_reconciler_fixes_drift(test_engine, test_db, operators, fake_cache):
+    """对账任务按数据库重建当天计数器"""
+    await add_transaction(test_db, operators[0], "recharge", "80.00")
+    service = FinanceCounterService(test_db)
+    await service.get_today()
+
+    # 模拟提交后进程退出: 交易已写入但没有累加
+    await add_transaction(test_db, operators[1], "recharge", "20.00")
+    assert (await service.get_today()).recharge == Decimal("80.00")
+
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    rebuilt = await FinanceCounterReconciler(session_factory=session_factory).run_once()
+
+    assert rebuilt.recharge == Decimal("100.00")
+    assert rebuilt.active_operators == 2
+    assert (await service.get_today()).recharge == Decimal("100.00")
@@ -0,0 +1,85 @@
+"""单元测试：FinanceDashboardService.get_dashboard_trends 按报表时区分日
+
+测试:
+1. 月份边界和每日分桶按 REPORT_TIMEZONE 本地时间划分
+2. 没有交易的日期补0, 每月返回完整日期
+"""
+
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+from src.core.config import get_settings
+from src.models.operator import OperatorAccount
+from src.models.transaction import TransactionRecord
+from src.services.finance_dashboard_service import FinanceDashboardService
+
+
+@pytest.fixture
+async def trend_transactions(test_db):
+    """准备跨越本地月份边界的充值/退款交易(时间为UTC)"""
+    operator = OperatorAccount(
+        username="op_trends_test",
+        full_name="Test Operator",
+        email="trends@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="trends_api_key_" + "a" * 49,
+        api_key_hash="hashed_secret",
+        balance=Decimal("1000.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    for transaction_type, amount, created_at in [
+        ("recharge", "100.00", datetime(2026, 2, 28, 17, 0)),   # 上海 03-01 01:00
+        ("recharge", "50.00", datetime(2026, 3, 15, 3, 0)),     # 上海 03-15 11:00
+        ("refund", "20.00", datetime(2026, 3, 31, 15, 30)),     # 上海 03-31 23:30
+        ("recharge", "70.00", datetime(2026, 3, 31, 16, 30)),   # 上海 04-01 00:30
+    ]:
+        test_db.add(TransactionRecord(
+            operator_id=operator.id,
+            transaction_type=transaction_type,
+            amount=Decimal(amount),
+            balance_before=Decimal("0.00"),
+            balance_after=Decimal(amount),
+            created_at=created_at
+        ))
+    await test_db.commit()
+
+
+def by_date(trends) -> dict:
+    return {item.trend_date: (item.recharge, item.refund) for item in trends.chart_data}
+
+
+@pytest.mark.asyncio
+async def test_trends_bucket_days_in_report_timezone(test_db, trend_transactions, monkeypatch):
+    """上海时区: UTC前一天晚上的交易计入本地次日, 本地下月的交易不计入"""
+    monkeypatch.setattr(get_settings(), "REPORT_TIMEZONE", "Asia/Shanghai")
+
+    trends = await FinanceDashboardService(test_db).get_dashboard_trends("2026-03")
+
+    days = by_date(trends)
+    assert len(trends.chart_data) == 31
+    assert days[date(2026, 3, 1)] == ("100.00", "0.00")
+    assert days[date(2026, 3, 15)] == ("50.00", "0.00")
+    assert days[date(2026, 3, 31)] == ("0.00", "20.00")
+    assert days[date(2026, 3, 2)] == ("0.00", "0.00")
+    assert trends.summary.total_recharge == "150.00"
+    assert trends.summary.total_net_income == "130.00"
+
+
+@pytest.mark.asyncio
+async def test_trends_default_to_utc_days(test_db, trend_transactions, monkeypatch):
+    """UTC: 按UTC日期分桶"""
+    monkeypatch.setattr(get_settings(), "REPORT_TIMEZONE", "UTC")
+
+    trends = await FinanceDashboardService(test_db).get_dashboard_trends("2026-03")
+
+    days = by_date(trends)
+    assert days[date(2026, 3, 1)] == ("0.00", "0.00")
+    assert days[date(2026, 3, 31)] == ("70.00", "20.00")
+    assert trends.summary.total_recharge == "120.00"
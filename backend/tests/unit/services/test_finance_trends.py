@@ -0,0 +1,167 @@
+"""单元测试：财务趋势月快照 (FinanceTrendSnapshots)
+
+测试:
+1. 历史月份第一次读取后写入整月快照, 之后直接读取快照
+2. 补录交易(record_transactions)使所在月份的快照失效
+3. 当前月份快照只覆盖已结束的日期, 当天实时聚合; 跨过零点后补进快照
+4. 快照时区与 REPORT_TIMEZONE 不一致时重建
+"""
+
+import pytest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from src.core.config import get_settings
+from src.models.operator import OperatorAccount
+from src.models.transaction import TransactionRecord
+from src.services import finance_counters, finance_trends
+from src.services.finance_counters import record_transactions
+from src.services.finance_dashboard_service import FinanceDashboardService
+from src.services.finance_trends import FinanceTrendSnapshots, snapshot_key
+
+
+class FakeSnapshotCache:
+    """内存缓存(不过期)"""
+
+    def __init__(self):
+        self.values: dict = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        assert ttl is None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        return self.values.pop(key, None) is not None
+
+    async def incr_counters(self, key, increments, members_key=None, members=()):
+        return False
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeSnapshotCache()
+    monkeypatch.setattr(finance_trends, "get_cache", lambda: cache)
+    monkeypatch.setattr(finance_counters, "get_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+async def operator(test_db):
+    account = OperatorAccount(
+        username="op_trend_snapshots",
+        full_name="Test Operator",
+        email="trend_snapshots@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="trend_snapshots_api_key_" + "a" * 40,
+        api_key_hash="hashed_secret",
+        balance=Decimal("1000.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(account)
+    await test_db.commit()
+    return account
+
+
+async def add_transaction(db, operator, transaction_type, amount, created_at) -> TransactionRecord:
+    transaction = TransactionRecord(
+        operator_id=operator.id,
+        transaction_type=transaction_type,
+        amount=Decimal(amount),
+        balance_before=Decimal("1000.00"),
+        balance_after=Decimal("1000.00") + Decimal(amount),
+        created_at=created_at
+    )
+    db.add(transaction)
+    await db.commit()
+    return transaction
+
+
+@pytest.mark.asyncio
+async def test_past_month_served_from_snapshot(test_db, operator, fake_cache):
+    """历史月份: 写入整月快照, 之后不再读取数据库"""
+    await add_transaction(test_db, operator, "recharge", "100.00", datetime(2025, 3, 2, 10, 0))
+    await add_transaction(test_db, operator, "consumption", "-30.00", datetime(2025, 3, 2, 11, 0))
+    snapshots = FinanceTrendSnapshots(test_db)
+
+    days = await snapshots.get_month(date(2025, 3, 1))
+
+    assert days == {date(2025, 3, 2): {
+        "recharge": Decimal("100.00"),
+        "consumption": Decimal("-30.00"),
+        "refund": Decimal("0.00"),
+    }}
+    snapshot = fake_cache.values[snapshot_key(date(2025, 3, 1))]
+    assert snapshot["through"] == "2025-04-01"
+    assert snapshot["days"] == {"2025-03-02": [10000, -3000, 0]}
+
+    # 直接写库且未调用失效: 仍返回快照
+    await add_transaction(test_db, operator, "recharge", "5.00", datetime(2025, 3, 3, 10, 0))
+    assert date(2025, 3, 3) not in await snapshots.get_month(date(2025, 3, 1))
+
+
+@pytest.mark.asyncio
+async def test_backdated_transaction_invalidates_snapshot(test_db, operator, fake_cache):
+    """补录交易提交后删除所在月份快照, 下次读取包含该交易"""
+    await add_transaction(test_db, operator, "recharge", "100.00", datetime(2025, 3, 2, 10, 0))
+    service = FinanceDashboardService(test_db)
+    await service.get_dashboard_trends("2025-03")
+    await service.get_dashboard_trends("2025-04")
+
+    correction = await add_transaction(test_db, operator, "refund", "-40.00", datetime(2025, 3, 20, 10, 0))
+    await record_transactions([correction])
+
+    assert snapshot_key(date(2025, 3, 1)) not in fake_cache.values
+    assert snapshot_key(date(2025, 4, 1)) in fake_cache.values
+    trends = await service.get_dashboard_trends("2025-03")
+    assert trends.summary.total_recharge == "100.00"
+    assert trends.summary.total_refund == "-40.00"
+
+
+@pytest.mark.asyncio
+async def test_current_month_composes_snapshot_and_today(test_db, operator, fake_cache):
+    """当前月份: 已结束日期进入快照, 当天实时聚合"""
+    await add_transaction(test_db, operator, "recharge", "10.00", datetime(2026, 3, 1, 9, 0))
+    await add_transaction(test_db, operator, "recharge", "20.00", datetime(2026, 3, 2, 9, 0))
+    snapshots = FinanceTrendSnapshots(test_db)
+    now = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+    days = await snapshots.get_month(date(2026, 3, 1), now=now)
+
+    assert days[date(2026, 3, 2)]["recharge"] == Decimal("20.00")
+    snapshot = fake_cache.values[snapshot_key(date(2026, 3, 1))]
+    assert snapshot["through"] == "2026-03-02"
+    assert list(snapshot["days"]) == ["2026-03-01"]
+
+    # 当天新交易实时可见
+    await add_transaction(test_db, operator, "recharge", "5.00", datetime(2026, 3, 2, 13, 0))
+    days = await snapshots.get_month(date(2026, 3, 1), now=datetime(2026, 3, 2, 14, 0, tzinfo=timezone.utc))
+    assert days[date(2026, 3, 2)]["recharge"] == Decimal("25.00")
+
+    # 零点后宽限期内前一天仍实时聚合, 之后补进快照
+    await snapshots.get_month(date(2026, 3, 1), now=datetime(2026, 3, 3, 0, 1, tzinfo=timezone.utc))
+    assert fake_cache.values[snapshot_key(date(2026, 3, 1))]["through"] == "2026-03-02"
+    await snapshots.get_month(date(2026, 3, 1), now=datetime(2026, 3, 3, 1, 0, tzinfo=timezone.utc))
+    snapshot = fake_cache.values[snapshot_key(date(2026, 3, 1))]
+    assert snapshot["through"] == "2026-03-03"
+    assert snapshot["days"]["2026-03-02"] == [2500, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_rebuilt_when_timezone_changes(test_db, operator, fake_cache, monkeypatch):
+    """REPORT_TIMEZONE 变更后按新时区重建快照"""
+    await add_transaction(test_db, operator, "recharge", "100.00", datetime(2025, 2, 28, 17, 0))
+    snapshots = FinanceTrendSnapshots(test_db)
+    assert date(2025, 3, 1) not in await snapshots.get_month(date(2025, 3, 1))
+
+    monkeypatch.setattr(get_settings(), "REPORT_TIMEZONE", "Asia/Shanghai")
+    days = await snapshots.get_month(date(2025, 3, 1))
+
+    assert days[date(2025, 3, 1)]["recharge"] == Decimal("100.00")
+    assert fake_cache.values[snapshot_key(date(2025, 3, 1))]["tz"] == "Asia/Shanghai"
@@ -0,0 +1,79 @@
+"""单元测试：玩家数量直方图 (PlayerHistogram)
+
+测试:
+1. int64 向量打包/解包, 不同长度的向量合并(NumPy 与纯Python结果一致)
+2. 累加场次/消费金额, 平均值、众数、百分位数
+"""
+
+import pytest
+from decimal import Decimal
+
+from src.services import player_histogram
+from src.services.player_histogram import PlayerHistogram, merge_vectors, pack, unpack
+
+
+class TestVectors:
+    """打包与合并"""
+
+    def test_pack_round_trip(self):
+        values = [0, 3, 2**40, -1]
+
+        assert len(pack(values)) == 8 * len(values)
+        assert unpack(pack(values)) == values
+
+    def test_merge_pads_shorter_vectors(self):
+        blobs = [pack([0, 1, 2]), pack([0, 0, 0, 0, 5]), pack([0, 4])]
+
+        assert merge_vectors(blobs) == [0, 5, 2, 0, 5]
+        assert merge_vectors([]) == []
+
+    def test_pure_python_merge_matches(self, monkeypatch):
+        blobs = [pack([0, day % 3, day, 0, day * 2][: 2 + day % 4]) for day in range(50)]
+        expected = merge_vectors(blobs)
+
+        monkeypatch.setattr(player_histogram, "np", None)
+
+        assert merge_vectors(blobs) == expected
+
+
+class TestPlayerHistogram:
+    """直方图统计"""
+
+    @pytest.fixture
+    def histogram(self):
+        histogram = PlayerHistogram()
+        histogram.add(2, 10, Decimal("200.00"))
+        histogram.add(4, 25, Decimal("1000.00"))
+        histogram.add(6, 5, Decimal("300.50"))
+        return histogram
+
+    def test_add_and_merge(self, histogram):
+        merged = PlayerHistogram.merge([histogram.packed(), histogram.packed()])
+
+        assert merged.session_counts == [0, 0, 20, 0, 50, 0, 10]
+        assert merged.cost_cents[6] == 60100
+        assert merged.total_sessions == 80
+
+    def test_statistics(self, histogram):
+        assert histogram.total_sessions == 40
+        assert histogram.mean() == pytest.approx((2 * 10 + 4 * 25 + 6 * 5) / 40)
+        assert histogram.mode() == 4
+        assert histogram.percentile(25) == 2
+        assert histogram.percentile(50) == 4
+        assert histogram.percentile(90) == 6
+        assert histogram.percentile(100) == 6
+
+    def test_mode_prefers_smaller_player_count(self):
+        histogram = PlayerHistogram()
+        histogram.add(5, 3, 0)
+        histogram.add(3, 3, 0)
+
+        assert histogram.mode() == 3
+
+    def test_empty_histogram(self):
+        histogram = PlayerHistogram.merge([])
+
+        assert histogram.total_sessions == 0
+        assert histogram.mean() == 0.0
+        assert histogram.mode() == 0
+        assert histogram.percentile(50) is None
@@ -0,0 +1,125 @@
+"""单元测试：SessionIdempotencyIndex 会话ID幂等性索引
+
+测试:
+1. 新会话ID占位成功(跳过数据库查询)
+2. 同一worker内重复的会话ID由Bloom过滤器拦截
+3. 其他worker已占位的会话ID(Redis SET NX失败)走慢路径
+4. Redis不可用时回退到数据库查询(不走快速路径)
+5. 时间戳超前的会话ID不走快速路径
+6. 授权响应缓存与读取
+"""
+
+import json
+import time
+
+import pytest
+
+from src.services import session_index as index_module
+from src.services.session_index import CLOCK_SKEW_SECONDS, SessionIdempotencyIndex
+
+
+class FakeCache:
+    """RedisCache 替身(内存字典实现 SET NX / GET / SET)"""
+
+    def __init__(self, connected: bool = True):
+        self.connected = connected
+        self.store = {}
+
+    async def set_if_absent(self, key, value, ttl=None):
+        if not self.connected:
+            return None
+        if key in self.store:
+            return False
+        self.store[key] = json.dumps(value)
+        return True
+
+    async def get(self, key):
+        value = self.store.get(key) if self.connected else None
+        return None if value is None else json.loads(value)
+
+    async def set(self, key, value, ttl=None):
+        if not self.connected:
+            return False
+        self.store[key] = json.dumps(value)
+        return True
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(index_module, "get_cache", lambda: cache)
+    return cache
+
+
+def session_id(suffix: str, timestamp: int = None) -> str:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    return f"op-123_{timestamp}_{suffix:a<16}"
+
+
+@pytest.mark.asyncio
+async def test_new_session_is_claimed(fake_cache):
+    index = SessionIdempotencyIndex(capacity=1000)
+
+    assert await index.claim(session_id("new")) is True
+    assert fake_cache.store  # 已在Redis占位
+
+
+@pytest.mark.asyncio
+async def test_repeated_session_in_same_worker_is_not_claimed(fake_cache):
+    index = SessionIdempotencyIndex(capacity=1000)
+    sid = session_id("dup")
+
+    assert await index.claim(sid) is True
+    assert await index.claim(sid) is False
+
+
+@pytest.mark.asyncio
+async def test_session_claimed_by_other_worker_is_not_claimed(fake_cache):
+    sid = session_id("other")
+    assert await SessionIdempotencyIndex(capacity=1000).claim(sid) is True
+
+    # 另一个worker: Bloom过滤器没见过, 但Redis占位失败
+    assert await SessionIdempotencyIndex(capacity=1000).claim(sid) is False
+
+
+@pytest.mark.asyncio
+async def test_database_fallback_when_redis_unavailable(fake_cache):
+    fake_cache.connected = False
+    index = SessionIdempotencyIndex(capacity=1000)
+    sid = session_id("noredis")
+
+    # 其他worker上的重试同样需要查询数据库才能返回已授权信息
+    assert await index.claim(sid) is False
+    assert await SessionIdempotencyIndex(capacity=1000).claim(sid) is False
+
+
+@pytest.mark.asyncio
+async def test_future_timestamp_skips_fast_path(fake_cache):
+    index = SessionIdempotencyIndex(capacity=1000)
+    future = int(time.time()) + CLOCK_SKEW_SECONDS + 600
+
+    assert await index.claim(session_id("future", future)) is False
+    assert not fake_cache.store
+
+
+@pytest.mark.asyncio
+async def test_disabled_index_always_falls_through(fake_cache):
+    index = SessionIdempotencyIndex(capacity=0)
+    sid = session_id("disabled")
+
+    assert await index.claim(sid) is False
+    await index.remember_response(sid, {"balance_after": "70.00"})
+    assert await index.get_response(sid) is None
+
+
+@pytest.mark.asyncio
+async def test_remember_and_get_response(fake_cache):
+    index = SessionIdempotencyIndex(capacity=1000)
+    sid = session_id("cached")
+
+    await index.claim(sid)
+    assert await index.get_response(sid) is None  # 仅占位, 尚无响应
+
+    await index.remember_response(sid, {"session_id": sid, "balance_after": "70.00"})
+
+    assert await index.get_response(sid) == {"session_id": sid, "balance_after": "70.00"}
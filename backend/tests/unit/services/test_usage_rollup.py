@@ -0,0 +1,373 @@
+"""单元测试：UsageRollupService 使用记录小时/日汇总
+
+测试:
+1. 统计区间拆分: 整天读日汇总, 整点读小时汇总, 首尾和水位线之后读原始记录
+2. 汇总后三个统计接口的结果与直接扫描原始记录一致(各种区间和维度)
+3. 汇总后已关闭小时的统计来自汇总表, 水位线之后的新记录仍被统计
+4. 重复汇总/重建幂等, 后台任务分批提交
+5. 按 REPORT_TIMEZONE 本地时间分桶(含半小时时区), 区间内没有消费的时间桶补0
+6. 玩家数量分布来自 (运营商, 应用, 日) 直方图
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.db.time_buckets import floor_bucket, to_local
+from src.models.application import Application
+from src.models.operator import OperatorAccount
+from src.models.site import OperationSite
+from src.models.usage_record import UsageRecord
+from src.models.usage_rollup import UsageDailyRollup, UsageHourlyRollup, UsagePlayerHistogram
+from src.services.operator import OperatorService
+from src.services.usage_rollup import (
+    MAX_HOURS_PER_TRANSACTION,
+    UsageRollupService,
+    UsageRollupWorker,
+    plan_ranges,
+)
+
+UTC = timezone.utc
+NOW = datetime(2026, 3, 10, 15, 30, tzinfo=UTC)
+# NOW 减去汇总宽限期(120秒)后的最近整点
+WATERMARK = datetime(2026, 3, 10, 15, 0, tzinfo=UTC)
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=UTC)
+
+
+class TestPlanRanges:
+    """统计区间拆分"""
+
+    def test_without_watermark_everything_is_raw(self):
+        ranges = plan_ranges(utc(2026, 3, 1), utc(2026, 3, 5), None)
+
+        assert ranges.daily == []
+        assert ranges.hourly == []
+        assert ranges.raw == [(utc(2026, 3, 1), utc(2026, 3, 5), True)]
+
+    def test_open_range_reads_days_then_hours_then_open_bucket(self):
+        ranges = plan_ranges(None, None, WATERMARK)
+
+        assert ranges.daily == [(None, utc(2026, 3, 10), False)]
+        assert ranges.hourly == [(utc(2026, 3, 10), WATERMARK, False)]
+        assert ranges.raw == [(WATERMARK, None, True)]
+
+    def test_partial_edges_are_raw(self):
+        start = utc(2026, 3, 7, 22, 15)
+        end = utc(2026, 3, 9, 3, 45)
+
+        ranges = plan_ranges(start, end, WATERMARK)
+
+        assert ranges.raw == [
+            (start, utc(2026, 3, 7, 23), False),
+            (utc(2026, 3, 9, 3), end, True),
+        ]
+        assert ranges.hourly == [
+            (utc(2026, 3, 7, 23), utc(2026, 3, 8), False),
+            (utc(2026, 3, 9), utc(2026, 3, 9, 3), False),
+        ]
+        assert ranges.daily == [(utc(2026, 3, 8), utc(2026, 3, 9), False)]
+
+    def test_range_within_one_day_uses_hours_only(self):
+        ranges = plan_ranges(utc(2026, 3, 9, 1), utc(2026, 3, 9, 6, 30), WATERMARK)
+
+        assert ranges.daily == []
+        assert ranges.hourly == [(utc(2026, 3, 9, 1), utc(2026, 3, 9, 6), False)]
+        assert ranges.raw == [(utc(2026, 3, 9, 6), utc(2026, 3, 9, 6, 30), True)]
+
+    def test_short_range_is_raw(self):
+        start = utc(2026, 3, 9, 1, 10)
+        end = utc(2026, 3, 9, 1, 50)
+
+        ranges = plan_ranges(start, end, WATERMARK)
+
+        assert ranges.raw == [(start, end, True)]
+        assert ranges.daily == ranges.hourly == []
+
+    def test_range_after_watermark_is_raw(self):
+        start = utc(2026, 3, 10, 15, 5)
+
+        assert plan_ranges(start, None, WATERMARK).raw == [(start, None, True)]
+
+    def test_naive_times_are_utc(self):
+        ranges = plan_ranges(datetime(2026, 3, 9, 1), None, WATERMARK)
+
+        assert ranges.hourly[0][0] == utc(2026, 3, 9, 1)
+
+
+@pytest.fixture
+async def rollup_test_data(test_db):
+    """准备运营商、两个运营点、两个应用和跨多天的使用记录"""
+    operator = OperatorAccount(
+        username="op_rollup_test",
+        full_name="Test Operator",
+        email="operator@test.com",
+        phone="13900139000",
+        password_hash="hashed_password",
+        api_key="rollup_api_key_" + "a" * 49,
+        api_key_hash="hashed_secret",
+        balance=Decimal("1000.00"),
+        customer_tier="standard",
+        is_active=True,
+        is_locked=False,
+    )
+    test_db.add(operator)
+    await test_db.flush()
+
+    sites = [
+        OperationSite(
+            operator_id=operator.id,
+            name=f"汇总测试运营点{i}",
+            address="测试地址",
+            server_identifier=f"server_rollup_{i}",
+            is_active=True
+        )
+        for i in range(2)
+    ]
+    applications = [
+        Application(
+            app_code=f"app_rollup_{i}",
+            app_name=f"汇总测试游戏{i}",
+            price_per_player=Decimal(price),
+            min_players=1,
+            max_players=10,
+            is_active=True,
+        )
+        for i, price in enumerate(["10.00", "12.50"])
+    ]
+    test_db.add_all(sites + applications)
+    await test_db.flush()
+
+    # 2026-02-27 ~ 2026-03-10 15:xx, 每隔约7小时一条, 跨越周/月边界和水位线
+    started_at = datetime(2026, 2, 27, 0, 20)
+    index = 0
+    while started_at < datetime(2026, 3, 10, 15, 25):
+        site = sites[index % 2]
+        application = applications[(index // 2) % 2]
+        player_count = index % 4 + 1
+        test_db.add(UsageRecord(
+            session_id=f"rollup_session_{index:04d}",
+            operator_id=operator.id,
+            site_id=site.id,
+            application_id=application.id,
+            player_count=player_count,
+            price_per_player=application.price_per_player,
+            total_cost=application.price_per_player * player_count,
+            authorization_token=f"rollup_token_{index}",
+            game_started_at=started_at
+        ))
+        index += 1
+        started_at += timedelta(hours=7, minutes=13)
+    await test_db.commit()
+
+    return {"operator": operator, "sites": sites, "applications": applications}
+
+
+async def all_statistics(service: OperatorService, operator_id, start, end) -> dict:
+    return {
+        "site": await service.get_statistics_by_site(operator_id, start, end),
+        "app": await service.get_statistics_by_app(operator_id, start, end),
+        "players": await service.get_player_distribution_statistics(operator_id, start, end),
+        **{
+            dimension: await service.get_consumption_statistics(operator_id, start, end, dimension)
+            for dimension in ("day", "week", "month")
+        },
+    }
+
+
+STATISTICS_RANGES = [
+    (None, None),
+    (datetime(2026, 2, 28, 22, 15), datetime(2026, 3, 9, 3, 45)),
+    (datetime(2026, 3, 1), datetime(2026, 3, 8)),
+    (datetime(2026, 3, 2, 7, 10), datetime(2026, 3, 2, 7, 50)),
+    (datetime(2026, 3, 9, 5), None),
+    (None, datetime(2026, 3, 4, 12, 30)),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("start,end", STATISTICS_RANGES)
+async def test_rolled_up_statistics_match_raw_scan(test_db, rollup_test_data, start, end):
+    """汇总前(全部扫描原始记录)和汇总后的统计结果一致"""
+    operator_id = rollup_test_data["operator"].id
+    service = OperatorService(test_db)
+    expected = await all_statistics(service, operator_id, start, end)
+    assert expected["site"], "测试数据应覆盖统计区间"
+
+    assert await UsageRollupService(test_db).roll_up(now=NOW, max_hours=None) > 0
+    await test_db.commit()
+
+    assert await all_statistics(service, operator_id, start, end) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tz", ["Asia/Shanghai", "America/Sao_Paulo", "Asia/Kolkata"])
+@pytest.mark.parametrize("dimension", ["day", "week", "month"])
+async def test_consumption_statistics_use_report_timezone(
+    test_db, rollup_test_data, monkeypatch, tz, dimension
+):
+    """按本地时间分桶: 汇总前后一致, 且与逐条换算本地时间的结果一致"""
+    monkeypatch.setattr(get_settings(), "REPORT_TIMEZONE", tz)
+    operator_id = rollup_test_data["operator"].id
+    service = OperatorService(test_db)
+    start, end = datetime(2026, 2, 28, 22, 15), datetime(2026, 3, 9, 3, 45)
+
+    before = await service.get_consumption_statistics(operator_id, start, end, dimension)
+    await UsageRollupService(test_db).roll_up(now=NOW, max_hours=None)
+    await test_db.commit()
+    after = await service.get_consumption_statistics(operator_id, start, end, dimension)
+    assert after == before
+
+    date_format = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}[dimension]
+    records = (await test_db.execute(
+        select(UsageRecord).where(UsageRecord.game_started_at.between(start, end))
+    )).scalars().all()
+    expected: dict[str, int] = {}
+    for record in records:
+        bucket = floor_bucket(to_local(record.game_started_at, tz), dimension)
+        label = bucket.strftime(date_format)
+        expected[label] = expected.get(label, 0) + record.player_count
+    # 补0的时间桶之外, 与逐条换算的结果一致
+    assert {
+        item["date"]: item["total_players"] for item in after["chart_data"] if item["total_sessions"]
+    } == expected
+
+
+@pytest.mark.asyncio
+async def test_consumption_statistics_fill_empty_buckets(test_db, rollup_test_data):
+    """区间内没有消费的日期返回0, 日期连续"""
+    operator_id = rollup_test_data["operator"].id
+    service = OperatorService(test_db)
+
+    result = await service.get_consumption_statistics(
+        operator_id, datetime(2026, 2, 20), datetime(2026, 2, 28, 23, 59), "day"
+    )
+
+    dates = [item["date"] for item in result["chart_data"]]
+    assert dates == [f"2026-02-{day:02d}" for day in range(20, 29)]
+    assert all(item["total_sessions"] == 0 for item in result["chart_data"][:7])
+    assert result["chart_data"][7]["total_sessions"] > 0
+    assert result["chart_data"][0]["total_cost"] == "0.00"
+
+
+@pytest.mark.asyncio
+async def test_closed_hours_are_read_from_rollups(test_db, rollup_test_data):
+    """已汇总的小时不再读取原始记录, 水位线之后的记录仍读取原始记录"""
+    operator_id = rollup_test_data["operator"].id
+    service = OperatorService(test_db)
+    expected = await service.get_consumption_statistics(operator_id, dimension="month")
+
+    rollups = UsageRollupService(test_db)
+    await rollups.roll_up(now=NOW, max_hours=None)
+    await test_db.commit()
+    assert await rollups.get_watermark() == WATERMARK
+
+    # 删除已汇总小时的原始记录: 统计结果不变
+    await test_db.execute(delete(UsageRecord).where(UsageRecord.game_started_at < datetime(2026, 3, 10, 15)))
+    await test_db.commit()
+    assert await service.get_consumption_statistics(operator_id, dimension="month") == expected
+
+    # 水位线之后(开放小时)的新记录直接计入
+    site = rollup_test_data["sites"][0]
+    application = rollup_test_data["applications"][0]
+    test_db.add(UsageRecord(
+        session_id="rollup_session_open_hour",
+        operator_id=operator_id,
+        site_id=site.id,
+        application_id=application.id,
+        player_count=2,
+        price_per_player=application.price_per_player,
+        total_cost=application.price_per_player * 2,
+        authorization_token="rollup_token_open_hour",
+        game_started_at=datetime(2026, 3, 10, 15, 28)
+    ))
+    await test_db.commit()
+
+    result = await service.get_consumption_statistics(operator_id, dimension="month")
+    assert result["summary"]["total_sessions"] == expected["summary"]["total_sessions"] + 1
+
+
+@pytest.mark.asyncio
+async def test_player_distribution_is_read_from_histograms(test_db, rollup_test_data):
+    """每个 (应用, 日) 一行直方图; 已关闭的日期不再读取原始记录"""
+    operator_id = rollup_test_data["operator"].id
+    service = OperatorService(test_db)
+    expected = await service.get_player_distribution_statistics(operator_id)
+    assert expected["total_sessions"] > 0
+    assert expected["percentiles"]["p50"] in (2, 3)
+
+    await UsageRollupService(test_db).roll_up(now=NOW, max_hours=None)
+    await test_db.commit()
+
+    histogram_rows = await test_db.scalar(select(func.count()).select_from(UsagePlayerHistogram))
+    days_and_apps = await test_db.scalar(
+        select(func.count()).select_from(
+            select(UsageRecord.application_id, func.date(UsageRecord.game_started_at))
+            .where(UsageRecord.game_started_at < datetime(2026, 3, 10))
+            .distinct()
+            .subquery()
+        )
+    )
+    assert histogram_rows == days_and_apps
+
+    # 删除已汇总日期的原始记录: 分布不变
+    await test_db.execute(delete(UsageRecord).where(UsageRecord.game_started_at < datetime(2026, 3, 10)))
+    await test_db.commit()
+    assert await service.get_player_distribution_statistics(operator_id) == expected
+
+
+@pytest.mark.asyncio
+async def test_roll_up_is_incremental_and_rebuild_is_idempotent(test_db, rollup_test_data):
+    """重复汇总不重复计数, 回退水位线后重建结果一致"""
+    rollups = UsageRollupService(test_db)
+
+    async def rollup_totals():
+        result = await test_db.execute(
+            select(
+                func.sum(UsageHourlyRollup.total_sessions),
+                select(func.sum(UsageDailyRollup.total_sessions)).scalar_subquery()
+            )
+        )
+        return tuple(result.one())
+
+    await rollups.roll_up(now=NOW, max_hours=None)
+    await test_db.commit()
+    totals = await rollup_totals()
+    raw_sessions = await test_db.scalar(
+        select(func.count(UsageRecord.id)).where(UsageRecord.game_started_at < datetime(2026, 3, 10, 15))
+    )
+    raw_daily_sessions = await test_db.scalar(
+        select(func.count(UsageRecord.id)).where(UsageRecord.game_started_at < datetime(2026, 3, 10))
+    )
+    assert totals == (raw_sessions, raw_daily_sessions)
+
+    # 没有新关闭的小时: 不做任何事
+    assert await rollups.roll_up(now=NOW, max_hours=None) == 0
+
+    await rollups.reset_watermark(datetime(2026, 3, 5, 13, 0))
+    await test_db.commit()
+    assert await rollups.get_watermark() == utc(2026, 3, 5)
+
+    await rollups.roll_up(now=NOW, max_hours=None)
+    await test_db.commit()
+    assert await rollup_totals() == totals
+
+
+@pytest.mark.asyncio
+async def test_worker_commits_in_batches(test_engine, rollup_test_data):
+    """后台任务每批最多汇总 MAX_HOURS_PER_TRANSACTION 小时, 一次运行追到最新"""
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    worker = UsageRollupWorker(session_factory=session_factory)
+
+    hours = await worker.run_once(now=NOW)
+
+    first_hour = utc(2026, 2, 27, 0)
+    assert hours == (WATERMARK - first_hour) // timedelta(hours=1)
+    assert hours > MAX_HOURS_PER_TRANSACTION
+    async with session_factory() as session:
+        assert await UsageRollupService(session).get_watermark() == WATERMARK
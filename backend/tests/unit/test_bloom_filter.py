@@ -0,0 +1,71 @@
+"""Unit tests for the Bloom filter utilities.
+
+Tests:
+- No false negatives for added keys
+- False positive rate stays near the configured target at capacity
+- Rotating filter remembers keys for one window and forgets them after two
+"""
+
+import pytest
+
+from src.core.utils.bloom import BloomFilter, RotatingBloomFilter
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_added_keys_are_always_found():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"session_{i}" for i in range(1000)]
+
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"added_{i}")
+
+    false_positives = sum(f"absent_{i}" in bloom for i in range(20000))
+
+    assert false_positives / 20000 < 0.02
+
+
+def test_invalid_parameters_rejected():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, error_rate=1.5)
+
+
+def test_rotating_filter_window():
+    clock = FakeClock()
+    bloom = RotatingBloomFilter(capacity=100, window_seconds=300, clock=clock)
+
+    assert bloom.add("session_a") is False
+    assert bloom.add("session_a") is True
+
+    # 一个窗口后仍在上一代中
+    clock.now = 301
+    assert "session_a" in bloom
+    assert bloom.add("session_b") is False
+
+    # 再过一个窗口, 第一代被丢弃
+    clock.now = 602
+    assert "session_a" not in bloom
+    assert "session_b" in bloom
+
+    # 长时间空闲后两代都过期
+    clock.now = 2000
+    assert "session_b" not in bloom
@@ -0,0 +1,125 @@
+"""Unit tests for the cache value codec (core.codec).
+
+Tests:
+- Decimal/UUID/datetime/date round-trip with the JSON and msgpack codecs
+- Frame header: version byte, codec id, compression above the threshold only
+- Any worker decodes frames written with another codec, and legacy plain JSON
+- Unknown versions / codecs and corrupt payloads raise CodecError
+"""
+
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.core import codec as codec_module
+from src.core.codec import (
+    FLAG_COMPRESSED,
+    FORMAT_VERSION,
+    CodecError,
+    JsonCodec,
+    MsgpackCodec,
+    Serializer,
+)
+
+SAMPLE = {
+    "operator_id": uuid4(),
+    "balance": Decimal("1234.50"),
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc),
+    "local_time": datetime(2026, 1, 2, 3, 4, 5),
+    "day": date(2026, 1, 2),
+    "tags": ["vip", None, True, 3, 1.5],
+    "nested": {"prices": [Decimal("0.01"), Decimal("-7")]},
+}
+
+requires_msgpack = pytest.mark.skipif(codec_module.msgpack is None, reason="msgpack not installed")
+
+
+def codecs():
+    available = [JsonCodec()]
+    if codec_module.msgpack is not None:
+        available.append(MsgpackCodec())
+    return available
+
+
+@pytest.mark.parametrize("codec", codecs(), ids=lambda c: c.name)
+def test_typed_round_trip(codec):
+    serializer = Serializer(codec=codec)
+
+    decoded = serializer.loads(serializer.dumps(SAMPLE))
+
+    assert decoded == SAMPLE
+    assert type(decoded["balance"]) is Decimal
+    assert decoded["created_at"].tzinfo == timezone.utc
+
+
+@pytest.mark.parametrize("codec", codecs(), ids=lambda c: c.name)
+def test_unsupported_type_raises(codec):
+    with pytest.raises(TypeError):
+        Serializer(codec=codec).dumps({"value": object()})
+
+
+def test_frame_header():
+    payload = Serializer(codec=JsonCodec()).dumps({"a": 1})
+
+    assert payload[0] == FORMAT_VERSION
+    assert payload[1] == JsonCodec.codec_id
+    assert payload[2:] == b'{"a":1}'
+
+
+def test_large_payload_is_compressed():
+    serializer = Serializer(codec=JsonCodec(), compress_threshold=256)
+    value = [{"site": "site-a", "amount": Decimal("10.00")}] * 200
+
+    payload = serializer.dumps(value)
+
+    assert payload[1] & FLAG_COMPRESSED
+    assert len(payload) < len(JsonCodec().encode(value)) / 5
+    assert serializer.loads(payload) == value
+
+
+def test_small_or_incompressible_payload_is_not_compressed():
+    serializer = Serializer(codec=JsonCodec(), compress_threshold=16)
+
+    assert not serializer.dumps("short")[1] & FLAG_COMPRESSED
+    assert not serializer.dumps(uuid4().hex)[1] & FLAG_COMPRESSED
+    assert not Serializer(codec=JsonCodec(), compress_threshold=0).dumps("x" * 5000)[1] & FLAG_COMPRESSED
+
+
+@requires_msgpack
+def test_reader_decodes_frames_from_other_codec():
+    json_worker = Serializer(codec=JsonCodec())
+    msgpack_worker = Serializer(codec=MsgpackCodec())
+
+    assert json_worker.loads(msgpack_worker.dumps(SAMPLE)) == SAMPLE
+    assert msgpack_worker.loads(json_worker.dumps(SAMPLE)) == SAMPLE
+
+
+@pytest.mark.parametrize("legacy", ['{"id": "abc", "count": 2}', b'[1, 2]', '"text"', "42"])
+def test_legacy_plain_json_is_decoded(legacy):
+    assert Serializer().loads(legacy) == json.loads(legacy)
+
+
+def test_tag_lookalike_dict_is_left_alone():
+    serializer = Serializer(codec=JsonCodec())
+    value = {"__mr__": "decimal", "v": "1", "extra": True}
+
+    assert serializer.loads(serializer.dumps(value)) == value
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",
+        bytes((FORMAT_VERSION + 1, 1)) + b"{}",
+        bytes((FORMAT_VERSION, 0x0F)) + b"{}",
+        bytes((FORMAT_VERSION, JsonCodec.codec_id)) + b"{not json",
+        bytes((FORMAT_VERSION, JsonCodec.codec_id | FLAG_COMPRESSED)) + b"not zlib",
+    ],
+    ids=["empty", "future-version", "unknown-codec", "corrupt", "corrupt-compressed"],
+)
+def test_undecodable_payload_raises_codec_error(payload):
+    with pytest.raises(CodecError):
+        Serializer().loads(payload)
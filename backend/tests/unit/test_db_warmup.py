@@ -0,0 +1,94 @@
+"""Unit tests for startup statement warm-up and the first-fast-request metric.
+
+Tests:
+- Every hot statement runs on the test engine without errors
+- Warm-up fills the engine's compiled statement cache and leaves no rows behind
+- Failing steps are reported without aborting the remaining steps
+- First-fast-request middleware records once, only for fast API requests
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.core.metrics import prometheus
+from src.db.warmup import HOT_STATEMENTS, warm_up_database
+from src.models.operator import OperatorAccount
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_all_hot_statements(test_engine):
+    report = await warm_up_database(test_engine)
+
+    assert report.errors == []
+    assert report.connections == 1
+    assert report.statements == len(HOT_STATEMENTS)
+    assert report.duration_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_compiled_cache_and_rolls_back(test_engine):
+    test_engine.sync_engine._compiled_cache.clear()
+
+    await warm_up_database(test_engine)
+
+    # Every step reaches its own statements, beyond the operator lookup they share
+    assert len(test_engine.sync_engine._compiled_cache) >= len(HOT_STATEMENTS) + 1
+    async with test_engine.connect() as conn:
+        count = (await conn.execute(select(func.count()).select_from(OperatorAccount))).scalar_one()
+    assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_failing_step_and_continues(test_engine):
+    calls = []
+
+    async def broken(session, operator):
+        raise RuntimeError("boom")
+
+    async def ok(session, operator):
+        calls.append("ok")
+
+    report = await warm_up_database(test_engine, steps=(("broken", broken), ("ok", ok)))
+
+    assert report.errors == ["broken: boom"]
+    assert report.statements == 1
+    assert calls == ["ok"]
+
+
+def _app(delay: float, threshold: float) -> prometheus.FirstFastRequestMiddleware:
+    async def endpoint(request):
+        await asyncio.sleep(delay)
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/api/ping", endpoint), Route("/health", endpoint)])
+    return prometheus.FirstFastRequestMiddleware(app, threshold_seconds=threshold)
+
+
+def test_first_fast_request_recorded_once():
+    prometheus.mark_boot_started()
+    middleware = _app(delay=0, threshold=1.0)
+    client = TestClient(middleware)
+
+    assert client.get("/api/ping").status_code == 200
+    assert middleware.recorded
+    first = prometheus.time_to_first_fast_request_seconds._value.get()
+    assert first > 0
+
+    client.get("/api/ping")
+    assert prometheus.time_to_first_fast_request_seconds._value.get() == first
+
+
+def test_slow_and_non_api_requests_are_not_recorded():
+    middleware = _app(delay=0.02, threshold=0.01)
+    client = TestClient(middleware)
+
+    client.get("/api/ping")
+    client.get("/health")
+
+    assert not middleware.recorded
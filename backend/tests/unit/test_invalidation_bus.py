@@ -0,0 +1,204 @@
+"""Unit tests for the cross-worker cache invalidation bus.
+
+Tests:
+- Event JSON round-trip
+- Local dispatch on publish (with and without Redis)
+- Ignoring self-originated messages
+- Subscriber loop dispatching remote events and resetting after interruption
+- Idle subscriber (poll timeouts) keeps local caches
+- Auth context cache eviction driven by bus events
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.core import invalidation_bus as bus_module
+from src.core.invalidation_bus import (
+    ChangeKind,
+    EntityChangeEvent,
+    EntityType,
+    InvalidationBus,
+)
+from src.services.auth_context_cache import AuthContextCache
+from tests.unit.services.test_auth_context_cache import lookup, make_context, put
+
+
+class FakePubSub:
+    """Minimal async PubSub stand-in fed from a queue."""
+
+    def __init__(self, queue: asyncio.Queue, fail_first: bool = False):
+        self.queue = queue
+        self.fail_first = fail_first
+        self.channels = []
+        self.polls = 0
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        self.polls += 1
+        if self.fail_first:
+            self.fail_first = False
+            raise ConnectionError("connection lost")
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        pass
+
+
+class FakeCache:
+    """RedisCache stand-in recording published messages."""
+
+    is_connected = True
+
+    def __init__(self, pubsubs=None):
+        self.published = []
+        self._pubsubs = list(pubsubs or [])
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    def pubsub(self):
+        return self._pubsubs.pop(0) if self._pubsubs else None
+
+
+def test_event_json_round_trip():
+    event = EntityChangeEvent(
+        entity_type=EntityType.AUTHORIZATION,
+        entity_id=str(uuid4()),
+        change=ChangeKind.DELETED,
+        operator_id=str(uuid4()),
+        application_id=str(uuid4()),
+        origin="worker-1",
+    )
+
+    assert EntityChangeEvent.from_json(event.to_json()) == event
+    assert EntityChangeEvent.from_json(event.to_json().encode()) == event
+
+
+@pytest.mark.asyncio
+async def test_publish_dispatches_locally_and_broadcasts(monkeypatch):
+    fake_cache = FakeCache()
+    monkeypatch.setattr(bus_module, "get_cache", lambda: fake_cache)
+    bus = InvalidationBus()
+    received = []
+    bus.subscribe(EntityType.APPLICATION, received.append)
+
+    await bus.publish(EntityChangeEvent(EntityType.APPLICATION, "app-1"))
+
+    assert [event.entity_id for event in received] == ["app-1"]
+    assert received[0].origin == bus.worker_id
+    channel, payload = fake_cache.published[0]
+    assert channel == bus.channel
+    assert EntityChangeEvent.from_json(payload).origin == bus.worker_id
+
+
+@pytest.mark.asyncio
+async def test_publish_without_redis_still_invalidates_locally():
+    # Global RedisCache is never connected in unit tests
+    bus = InvalidationBus()
+    cache = AuthContextCache()
+    cache.register(bus)
+    context = make_context()
+    put(cache, context)
+
+    await bus.publish(EntityChangeEvent(EntityType.SITE, str(context.site.id)))
+
+    assert lookup(cache, context) is None
+
+
+def test_own_messages_are_ignored():
+    bus = InvalidationBus()
+    received = []
+    bus.subscribe(EntityType.OPERATOR, received.append)
+
+    bus.handle_message(EntityChangeEvent(EntityType.OPERATOR, "op", origin=bus.worker_id).to_json())
+    bus.handle_message(EntityChangeEvent(EntityType.OPERATOR, "op", origin="other").to_json())
+    bus.handle_message("not json")
+
+    assert [event.origin for event in received] == ["other"]
+
+
+def test_balance_changes_do_not_evict_auth_context():
+    bus = InvalidationBus()
+    cache = AuthContextCache()
+    cache.register(bus)
+    context = make_context()
+    put(cache, context)
+
+    bus.handle_message(EntityChangeEvent(
+        EntityType.OPERATOR, str(context.operator.id), ChangeKind.BALANCE_CHANGED, origin="other"
+    ).to_json())
+    assert lookup(cache, context) is context
+
+    bus.handle_message(EntityChangeEvent(
+        EntityType.OPERATOR, str(context.operator.id), ChangeKind.CREDENTIALS_CHANGED, origin="other"
+    ).to_json())
+    assert lookup(cache, context) is None
+
+
+@pytest.mark.asyncio
+async def test_listener_dispatches_remote_events_and_resets_after_error(monkeypatch):
+    queue = asyncio.Queue()
+    fake_cache = FakeCache(pubsubs=[FakePubSub(queue, fail_first=True), FakePubSub(queue)])
+    monkeypatch.setattr(bus_module, "get_cache", lambda: fake_cache)
+
+    bus = InvalidationBus(reconnect_delay=0)
+    cache = AuthContextCache()
+    cache.register(bus)
+    unrelated, target = make_context(), make_context()
+    put(cache, unrelated)
+
+    await bus.start()
+    try:
+        # Give the listener time to fail once, re-subscribe and reset
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert lookup(cache, unrelated) is None
+
+        put(cache, target)
+        event = EntityChangeEvent(
+            EntityType.AUTHORIZATION,
+            str(uuid4()),
+            ChangeKind.DELETED,
+            operator_id=str(target.operator.id),
+            application_id=str(target.application.id),
+            origin="other-worker",
+        )
+        await queue.put({"type": "message", "data": event.to_json()})
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert lookup(cache, target) is None
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_idle_listener_does_not_reset_local_caches(monkeypatch):
+    pubsub = FakePubSub(asyncio.Queue())
+    fake_cache = FakeCache(pubsubs=[pubsub])
+    monkeypatch.setattr(bus_module, "get_cache", lambda: fake_cache)
+
+    bus = InvalidationBus(reconnect_delay=0, poll_timeout=0.01)
+    resets = []
+    bus.on_reset(lambda: resets.append(True))
+
+    await bus.start()
+    try:
+        # Many empty polls on a quiet channel
+        for _ in range(20):
+            if pubsub.polls >= 5:
+                break
+            await asyncio.sleep(0.01)
+        assert pubsub.polls >= 5
+        assert resets == []
+        assert pubsub.channels == [bus.channel]
+    finally:
+        await bus.stop()
@@ -6,15 +6,17 @@ IP 监控服务单元测试
 - 自动封禁机制
 - IP 解封
 - 信誉评分计算
+- 封禁哈希读写与旧封禁键迁移
 """
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from datetime import datetime
 
 from src.services.ip_monitoring_service import (
+    BLOCKED_IPS_KEY,
     IPMonitoringService,
     BlockReason,
-    IPReputationLevel
+    IPReputationLevel,
+    migrate_legacy_ip_blocks
 )
 
 
@@ -32,6 +34,15 @@ def mock_cache():
     cache.set = AsyncMock(return_value=True)
     cache.delete = AsyncMock(return_value=True)
     cache.get_by_pattern = AsyncMock(return_value=[])
+    cache.hget = AsyncMock(return_value=None)
+    cache.hset = AsyncMock(return_value=True)
+    cache.hdel = AsyncMock(return_value=1)
+    cache.hgetall = AsyncMock(return_value={})
+
+    # MGET 按键逐个委托给 get，测试只需模拟 get
+    async def mock_mget(keys):
+        return [await cache.get(key) for key in keys]
+    cache.mget = AsyncMock(side_effect=mock_mget)
     return cache
 
 
@@ -101,8 +112,12 @@ class TestIPMonitoring:
         assert result["failure_count"] == 5
         assert result["duration"] == ip_service.AUTO_BLOCK_DURATION
 
-        # 验证封禁信息已存入缓存
-        assert mock_cache.set.call_count >= 2  # 失败记录 + 封禁记录
+        # 验证失败记录和封禁记录已存入缓存
+        mock_cache.set.assert_called_once()
+        mock_cache.hset.assert_called_once()
+        key, field, stored = mock_cache.hset.call_args[0]
+        assert (key, field) == (BLOCKED_IPS_KEY, "192.168.1.100")
+        assert stored["auto_blocked"] is True
 
     @pytest.mark.asyncio
     async def test_record_login_success_clears_failures(self, ip_service, mock_cache):
@@ -126,7 +141,7 @@ class TestIPMonitoring:
             "expires_at": current_time + 3600,  # 1小时后
             "auto_blocked": True
         }
-        mock_cache.get = AsyncMock(return_value=block_info)
+        mock_cache.hget = AsyncMock(return_value=block_info)
 
         result = await ip_service.check_ip_blocked("192.168.1.100")
 
@@ -134,11 +149,28 @@ class TestIPMonitoring:
         assert result["blocked"] is True
         assert result["reason"] == BlockReason.BRUTE_FORCE
         assert "remaining_seconds" in result
+        mock_cache.hget.assert_called_once_with(BLOCKED_IPS_KEY, "192.168.1.100")
+
+    @pytest.mark.asyncio
+    async def test_check_ip_blocked_expired_is_removed(self, ip_service, mock_cache):
+        """测试已过期的封禁记录被清理"""
+        from src.core import get_current_timestamp
+        current_time = get_current_timestamp()
+
+        mock_cache.hget = AsyncMock(return_value={
+            "ip_address": "192.168.1.100",
+            "expires_at": current_time - 10
+        })
+
+        result = await ip_service.check_ip_blocked("192.168.1.100")
+
+        assert result["blocked"] is False
+        mock_cache.hdel.assert_called_once_with(BLOCKED_IPS_KEY, "192.168.1.100")
 
     @pytest.mark.asyncio
     async def test_check_ip_not_blocked(self, ip_service, mock_cache):
         """测试检查未封禁 IP"""
-        mock_cache.get = AsyncMock(return_value=None)
+        mock_cache.hget = AsyncMock(return_value=None)
 
         result = await ip_service.check_ip_blocked("192.168.1.100")
 
@@ -159,8 +191,8 @@ class TestIPMonitoring:
         assert result["auto_blocked"] is False
         assert result["admin_id"] == "admin-123"
 
-        # 验证缓存调用
-        mock_cache.set.assert_called_once()
+        # 验证写入封禁哈希
+        mock_cache.hset.assert_called_once_with(BLOCKED_IPS_KEY, "192.168.1.100", result)
 
     @pytest.mark.asyncio
     async def test_unblock_ip(self, ip_service, mock_cache):
@@ -172,8 +204,9 @@ class TestIPMonitoring:
 
         assert result is True
 
-        # 验证删除两个缓存键
-        assert mock_cache.delete.call_count == 2
+        # 验证删除封禁记录和失败计数
+        mock_cache.hdel.assert_called_once_with(BLOCKED_IPS_KEY, "192.168.1.100")
+        mock_cache.delete.assert_called_once_with("login_failures:192.168.1.100")
 
     @pytest.mark.asyncio
     async def test_calculate_ip_reputation_trusted(self, ip_service, mock_cache):
@@ -194,8 +227,6 @@ class TestIPMonitoring:
         async def mock_get(key):
             if "login_failures" in key:
                 return failures
-            if "blocked_ip" in key:
-                return None
             if "block_history" in key:
                 return []
             return None
@@ -216,25 +247,28 @@ class TestIPMonitoring:
         current_time = get_current_timestamp()
 
         # 模拟两个封禁 IP
-        blocked_ips = [
-            {
+        blocked_ips = {
+            "192.168.1.100": {
                 "ip_address": "192.168.1.100",
                 "expires_at": current_time + 3600,  # 未过期
                 "reason": BlockReason.BRUTE_FORCE
             },
-            {
+            "192.168.1.101": {
                 "ip_address": "192.168.1.101",
                 "expires_at": current_time - 1000,  # 已过期
                 "reason": BlockReason.MANUAL_BLOCK
             }
-        ]
-        mock_cache.get_by_pattern = AsyncMock(return_value=blocked_ips)
+        }
+        mock_cache.hgetall = AsyncMock(return_value=blocked_ips)
 
         result = await ip_service.get_blocked_ips()
 
-        # 只返回未过期的
+        # 只返回未过期的，一次 HGETALL，过期记录被清理
         assert len(result) == 1
         assert result[0]["ip_address"] == "192.168.1.100"
+        mock_cache.hgetall.assert_called_once_with(BLOCKED_IPS_KEY)
+        mock_cache.hdel.assert_called_once_with(BLOCKED_IPS_KEY, "192.168.1.101")
+        mock_cache.get_by_pattern.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_record_sensitive_access(self, ip_service, mock_cache):
@@ -287,3 +321,36 @@ class TestIPMonitoring:
         assert result["sensitive_accesses"] == 1
         assert result["blocked"] is False
         assert result["reputation"]["score"] == 10
+        mock_cache.mget.assert_called_once()
+
+
+@pytest.mark.unit
+class TestLegacyBlockMigration:
+    """旧封禁键迁移测试"""
+
+    @pytest.mark.asyncio
+    async def test_migrates_active_blocks_once(self, ip_service, mock_cache):
+        """测试未过期的旧封禁记录迁移到哈希，过期记录丢弃，旧键按 IP 删除"""
+        from src.core import get_current_timestamp
+        current_time = get_current_timestamp()
+
+        active = {"ip_address": "10.0.0.1", "expires_at": current_time + 600}
+        expired = {"ip_address": "10.0.0.2", "expires_at": current_time - 600}
+        mock_cache.set_if_absent = AsyncMock(return_value=True)
+        mock_cache.get_by_pattern = AsyncMock(return_value=[active, expired])
+
+        migrated = await migrate_legacy_ip_blocks()
+
+        assert migrated == 1
+        mock_cache.hset.assert_called_once_with(BLOCKED_IPS_KEY, "10.0.0.1", active)
+        deleted = [call.args[0] for call in mock_cache.delete.call_args_list]
+        assert deleted == ["blocked_ip:10.0.0.1", "blocked_ip:10.0.0.2"]
+        mock_cache.delete_pattern.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_skips_when_already_migrated(self, ip_service, mock_cache):
+        """测试迁移标记已存在时不再扫描键空间"""
+        mock_cache.set_if_absent = AsyncMock(return_value=False)
+
+        assert await migrate_legacy_ip_blocks() == 0
+        mock_cache.get_by_pattern.assert_not_called()
@@ -0,0 +1,612 @@
+"""Unit tests for the multi-level (in-process L1 + Redis L2) cache.
+
+Tests:
+- L1 eviction by entry count and by bytes (LRU and LFU), TTL expiry, size accounting
+- L1 hits served without touching Redis; L2 hits filling L1
+- Namespaced keys, deletes across tiers and across workers via the invalidation bus
+- Returned objects are copies (mutating them cannot corrupt the cache)
+- L1 disabled: every read goes to Redis
+- Hit/miss counters exported to Prometheus, per-tier get_stats(), CacheWarmer
+- get_or_compute / cache_result stampede protection: single flight per worker,
+  cross-worker lease, XFetch early refresh, stale-while-revalidate
+- Tag invalidation: Redis tag sets, L1 tag index, other workers via the bus,
+  cache_result(tags=...)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.core.invalidation_bus import (
+    ChangeKind,
+    EntityChangeEvent,
+    EntityType,
+    InvalidationBus,
+)
+from src.core.cache import cache_result, invalidate_cache_tags
+from src.core.metrics import prometheus
+from src.core.multilevel_cache import (
+    ENTRY_OVERHEAD_BYTES,
+    CacheWarmer,
+    EvictionPolicy,
+    LocalCache,
+    MultiLevelCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """In-memory stand-in for RedisCache (encoded payloads), counting calls."""
+
+    def __init__(self):
+        self.data = {}
+        self.calls = 0
+
+    async def get_raw(self, key):
+        self.calls += 1
+        return self.data.get(key)
+
+    async def set_raw(self, key, payload, ttl=None, tags=None):
+        self.calls += 1
+        self.data[key] = payload
+        for tag in tags or ():
+            self.data.setdefault(tag, set()).add(key)
+        return True
+
+    async def invalidate_tags(self, tags):
+        self.calls += 1
+        keys = set().union(*(self.data.pop(tag, set()) for tag in tags))
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def set_if_absent(self, key, value, ttl=None):
+        self.calls += 1
+        if key in self.data:
+            return False
+        self.data[key] = json.dumps(value)
+        return True
+
+    async def delete(self, key):
+        self.calls += 1
+        return self.data.pop(key, None) is not None
+
+    async def delete_if_equals(self, key, value):
+        self.calls += 1
+        if self.data.get(key) != json.dumps(value):
+            return False
+        del self.data[key]
+        return True
+
+
+def make_cache(redis=None, local=None, **kwargs):
+    return MultiLevelCache(
+        namespace="test",
+        local=local if local is not None else LocalCache(max_entries=100),
+        redis_cache=redis or FakeRedis(),
+        **kwargs,
+    )
+
+
+class TestLocalCache:
+    def test_lru_evicts_least_recently_used(self):
+        cache = LocalCache(max_entries=2)
+        cache.set("a", "1", ttl=60)
+        cache.set("b", "2", ttl=60)
+        cache.get("a")
+        cache.set("c", "3", ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+        assert cache.evictions == 1
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = LocalCache(max_entries=2, policy=EvictionPolicy.LFU)
+        cache.set("a", "1", ttl=60)
+        cache.set("b", "2", ttl=60)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.set("c", "3", ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_byte_limit_and_size_accounting(self):
+        entry_size = len("k1") + 100 + ENTRY_OVERHEAD_BYTES
+        cache = LocalCache(max_entries=100, max_bytes=entry_size * 2)
+        cache.set("k1", "x" * 100, ttl=60)
+        cache.set("k2", "y" * 100, ttl=60)
+        assert cache.size_bytes == entry_size * 2
+
+        cache.set("k3", "z" * 100, ttl=60)
+        assert len(cache) == 2
+        assert cache.get("k1") is None
+        assert cache.size_bytes == entry_size * 2
+
+        cache.set("k2", "y", ttl=60)
+        assert cache.size_bytes == entry_size + len("k2") + 1 + ENTRY_OVERHEAD_BYTES
+
+        cache.delete("k2")
+        cache.delete("k3")
+        assert cache.size_bytes == 0
+        assert len(cache) == 0
+
+    def test_payload_larger_than_limit_is_not_stored(self):
+        cache = LocalCache(max_bytes=200)
+
+        assert cache.set("big", "x" * 500, ttl=60) is False
+        assert cache.get("big") is None
+        assert cache.size_bytes == 0
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = LocalCache(clock=clock)
+        cache.set("a", "1", ttl=10)
+
+        clock.now += 9
+        assert cache.get("a") == "1"
+        clock.now += 2
+        assert cache.get("a") is None
+        assert cache.size_bytes == 0
+
+
+class TestMultiLevelCache:
+    @pytest.mark.asyncio
+    async def test_l1_hit_does_not_touch_redis(self):
+        redis = FakeRedis()
+        cache = make_cache(redis)
+        await cache.set("admin:info:1", {"id": "1"}, ttl=600)
+        calls = redis.calls
+
+        assert await cache.get("admin:info:1") == {"id": "1"}
+        assert redis.calls == calls
+        assert cache.stats.l1_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_fills_l1(self):
+        redis = FakeRedis()
+        redis.data["test:key"] = '{"v": 1}'
+        cache = make_cache(redis)
+
+        assert await cache.get("key") == {"v": 1}
+        assert cache.stats.l2_hits == 1
+        calls = redis.calls
+        assert await cache.get("key") == {"v": 1}
+        assert redis.calls == calls
+
+    @pytest.mark.asyncio
+    async def test_miss_in_both_tiers(self):
+        cache = make_cache()
+
+        assert await cache.get("missing") is None
+        assert cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_are_namespaced(self):
+        redis = FakeRedis()
+        cache = make_cache(redis)
+        await cache.set("k", 1)
+
+        assert list(redis.data) == ["test:k"]
+
+    @pytest.mark.asyncio
+    async def test_returned_values_are_independent_copies(self):
+        cache = make_cache()
+        await cache.set("admin", {"id": "abc"})
+
+        first = await cache.get("admin")
+        first["id"] = "mutated"
+
+        assert await cache.get("admin") == {"id": "abc"}
+
+    @pytest.mark.asyncio
+    async def test_l1_ttl_capped_by_local_ttl(self):
+        clock = FakeClock()
+        redis = FakeRedis()
+        cache = make_cache(redis, local=LocalCache(clock=clock), local_ttl=5)
+        await cache.set("k", 1, ttl=600)
+
+        clock.now += 6
+        calls = redis.calls
+        assert await cache.get("k") == 1
+        assert redis.calls == calls + 1
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_both_tiers(self):
+        redis = FakeRedis()
+        cache = make_cache(redis)
+        await cache.set("k", 1)
+
+        assert await cache.delete("k") is True
+        assert await cache.get("k") is None
+        assert redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_delete_on_other_worker_evicts_l1(self):
+        redis = FakeRedis()
+        worker_a = make_cache(redis)
+        worker_b = make_cache(redis)
+        bus_b = InvalidationBus()
+        worker_b.register(bus_b)
+
+        await worker_a.set("k", 1)
+        assert await worker_b.get("k") == 1
+
+        await redis.delete("test:k")
+        bus_b.handle_message(EntityChangeEvent(
+            entity_type=EntityType.CACHE_KEY,
+            entity_id="test:k",
+            change=ChangeKind.DELETED,
+            origin="worker-a",
+        ).to_json())
+
+        assert await worker_b.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_bus_reset_clears_local(self):
+        cache = make_cache()
+        bus = InvalidationBus()
+        cache.register(bus)
+        await cache.set("admin:info:1", 1)
+        await cache.set("other", 2)
+        assert len(cache.local) == 2
+
+        bus.reset_local()
+        assert len(cache.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_l1_disabled_goes_to_redis(self):
+        redis = FakeRedis()
+        cache = MultiLevelCache(namespace="test", local=None, redis_cache=redis)
+        await cache.set("k", 1)
+        calls = redis.calls
+
+        assert await cache.get("k") == 1
+        assert await cache.get("k") == 1
+        assert redis.calls == calls + 2
+
+    @pytest.mark.asyncio
+    async def test_get_stats_per_tier(self):
+        redis = FakeRedis()
+        redis.data["test:remote"] = "1"
+        cache = make_cache(redis, local=LocalCache(max_entries=4))
+        await cache.set("k", 1)
+        await cache.get("k")
+        await cache.get("remote")
+        await cache.get("missing")
+
+        stats = cache.get_stats()
+
+        assert stats["global"]["hit_rate"] == pytest.approx(2 / 3)
+        assert stats["local_cache"]["stats"]["hits"] == 1
+        assert stats["local_cache"]["stats"]["misses"] == 2
+        assert stats["local_cache"]["size_info"]["entries"] == 2
+        assert stats["local_cache"]["size_info"]["utilization_rate"] == 0.5
+        assert stats["redis_cache"]["stats"]["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_cache_warmer_stores_results(self):
+        cache = make_cache()
+
+        async def catalog():
+            return ["app"]
+
+        async def empty():
+            return None
+
+        async def broken():
+            raise RuntimeError("db down")
+
+        await CacheWarmer(cache).warm_cache({"catalog": catalog, "empty": empty, "broken": broken})
+
+        assert await cache.get("warm:catalog") == ["app"]
+        assert await cache.get("warm:empty") is None
+        assert await cache.get("warm:broken") is None
+
+    @pytest.mark.asyncio
+    async def test_prometheus_counters(self):
+        hits = prometheus.cache_requests_total.labels(tier="l1", result="hit")
+        misses = prometheus.cache_requests_total.labels(tier="l2", result="miss")
+        hits_before, misses_before = hits._value.get(), misses._value.get()
+        cache = make_cache()
+
+        await cache.get("missing")
+        await cache.set("k", 1)
+        await cache.get("k")
+
+        assert hits._value.get() == hits_before + 1
+        assert misses._value.get() == misses_before + 1
+
+
+class Loader:
+    """Coroutine function counting its calls, returning call number."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"version": self.calls}
+
+
+async def drain(cache):
+    """Wait for background refreshes."""
+    while cache._inflight:
+        await asyncio.gather(*cache._inflight.values(), return_exceptions=True)
+
+
+class TestGetOrCompute:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        cache = make_cache()
+        compute = Loader(delay=0.02)
+
+        results = await asyncio.gather(*(cache.get_or_compute("hot", compute, ttl=60) for _ in range(20)))
+
+        assert compute.calls == 1
+        assert all(result == {"version": 1} for result in results)
+        assert await cache.get_or_compute("hot", compute, ttl=60) == {"version": 1}
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_other_worker_waits_for_lease_holder(self):
+        redis = FakeRedis()
+        worker_a = make_cache(redis)
+        worker_b = make_cache(redis)
+        compute = Loader(delay=0.1)
+
+        results = await asyncio.gather(
+            worker_a.get_or_compute("hot", compute, ttl=60),
+            worker_b.get_or_compute("hot", compute, ttl=60),
+        )
+
+        assert compute.calls == 1
+        assert results == [{"version": 1}, {"version": 1}]
+        assert "test:lease:hot" not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_lease_timeout_computes_locally(self):
+        redis = FakeRedis()
+        redis.data["test:lease:hot"] = json.dumps("other-worker")
+        cache = make_cache(redis, lease_wait=0.1)
+        compute = Loader()
+
+        assert await cache.get_or_compute("hot", compute, ttl=60) == {"version": 1}
+        assert compute.calls == 1
+        assert redis.data["test:lease:hot"] == json.dumps("other-worker")
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self):
+        clock = FakeClock()
+        cache = make_cache(wall_clock=clock, beta=0)
+        compute = Loader(delay=0.01)
+        await cache.get_or_compute("hot", compute, ttl=60, stale_ttl=30)
+
+        clock.now += 70
+        assert await cache.get_or_compute("hot", compute, ttl=60, stale_ttl=30) == {"version": 1}
+        assert await cache.get_or_compute("hot", compute, ttl=60, stale_ttl=30) == {"version": 1}
+        await drain(cache)
+
+        assert compute.calls == 2
+        assert await cache.get_or_compute("hot", compute, ttl=60, stale_ttl=30) == {"version": 2}
+
+    @pytest.mark.asyncio
+    async def test_expired_beyond_stale_window_recomputes(self):
+        clock = FakeClock()
+        cache = make_cache(wall_clock=clock, beta=0)
+        compute = Loader()
+        await cache.get_or_compute("hot", compute, ttl=60, stale_ttl=30)
+
+        clock.now += 100
+        assert await cache.get_or_compute("hot", compute, ttl=60, stale_ttl=30) == {"version": 2}
+
+    @pytest.mark.asyncio
+    async def test_xfetch_refreshes_before_expiry(self):
+        clock = FakeClock()
+        cache = make_cache(wall_clock=clock)
+        compute = Loader(delay=0.01)
+        await cache.get_or_compute("hot", compute, ttl=60)
+
+        cache._random = lambda: 0.0
+        clock.now += 30
+        assert await cache.get_or_compute("hot", compute, ttl=60) == {"version": 1}
+        await drain(cache)
+        assert compute.calls == 1
+
+        cache._random = lambda: 0.999999
+        clock.now += 29.95
+        assert await cache.get_or_compute("hot", compute, ttl=60) == {"version": 1}
+        await drain(cache)
+        assert compute.calls == 2
+
+    def test_xfetch_disabled_with_zero_beta(self):
+        cache = make_cache(beta=0)
+        cache._random = lambda: 0.999999
+
+        assert cache._should_refresh_early(now=99.99, expires_at=100, delta=1.0) is False
+
+    @pytest.mark.asyncio
+    async def test_compute_error_reaches_all_waiters_and_is_not_cached(self):
+        redis = FakeRedis()
+        cache = make_cache(redis)
+        compute = Loader(delay=0.01, error=RuntimeError("db down"))
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("hot", compute, ttl=60) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+        assert compute.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_background_refresh_keeps_stale_value(self):
+        clock = FakeClock()
+        cache = make_cache(wall_clock=clock, beta=0)
+        await cache.get_or_compute("hot", Loader(), ttl=60, stale_ttl=30)
+
+        clock.now += 70
+        failing = Loader(error=RuntimeError("db down"))
+        assert await cache.get_or_compute("hot", failing, ttl=60, stale_ttl=30) == {"version": 1}
+        await drain(cache)
+
+        assert failing.calls == 1
+        assert await cache.get_or_compute("hot", failing, ttl=60, stale_ttl=30) == {"version": 1}
+
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached(self):
+        cache = make_cache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return None
+
+        assert await cache.get_or_compute("k", compute, ttl=60) is None
+        assert await cache.get_or_compute("k", compute, ttl=60) is None
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_result_coalesces_concurrent_calls(self):
+        calls = []
+
+        @cache_result("stampede", ttl=60)
+        async def load_catalog(site_id: str):
+            calls.append(site_id)
+            await asyncio.sleep(0.02)
+            return {"site": site_id}
+
+        results = await asyncio.gather(*(load_catalog("s1") for _ in range(10)))
+
+        assert calls == ["s1"]
+        assert results == [{"site": "s1"}] * 10
+
+    @pytest.mark.asyncio
+    async def test_cache_result_keys_methods_by_arguments(self):
+        calls = []
+
+        class Service:
+            @cache_result("catalog", ttl=60)
+            async def list_apps(self, search=None, page=1):
+                calls.append((search, page))
+                return [search, page]
+
+        assert await Service().list_apps() == [None, 1]
+        assert await Service().list_apps(page=1) == [None, 1]
+        assert await Service().list_apps(None, 2) == [None, 2]
+        assert await Service().list_apps(search="x") == ["x", 1]
+
+        assert calls == [(None, 1), (None, 2), ("x", 1)]
+
+
+class TestTagInvalidation:
+    def test_local_tag_index_follows_entries(self):
+        cache = LocalCache(max_entries=2)
+        cache.set("a", "1", ttl=60, tags=("op:1",))
+        cache.set("b", "2", ttl=60, tags=("op:1", "app:1"))
+        cache.set("c", "3", ttl=60, tags=("op:2",))
+
+        assert cache.get("a") is None
+        assert cache.delete_tag("op:1") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+        assert cache._tag_index == {"op:2": {"c"}}
+
+        cache.delete("c")
+        assert cache._tag_index == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_drops_tagged_entries_only(self):
+        redis = FakeRedis()
+        cache = make_cache(redis)
+        await cache.set("dashboard:1", {"total": 1}, ttl=60, tags=["operator:1"])
+        await cache.set("catalog:1", ["app"], ttl=60, tags=["operator:1", "app:9"])
+        await cache.set("dashboard:2", {"total": 2}, ttl=60, tags=["operator:2"])
+
+        assert await cache.get("catalog:1") == ["app"]
+        assert await cache.invalidate_tags("operator:1") == 2
+
+        assert await cache.get("dashboard:1") is None
+        assert await cache.get("catalog:1") is None
+        assert await cache.get("dashboard:2") == {"total": 2}
+        assert "test:tag:operator:1" not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_tag_event_evicts_l1_filled_from_redis(self):
+        redis = FakeRedis()
+        worker_a = make_cache(redis)
+        worker_b = make_cache(redis)
+        bus_b = InvalidationBus()
+        worker_b.register(bus_b)
+
+        await worker_a.set("dashboard:1", {"total": 1}, ttl=60, tags=["operator:1"])
+        assert await worker_b.get("dashboard:1") == {"total": 1}
+
+        await redis.invalidate_tags(["test:tag:operator:1"])
+        bus_b.handle_message(EntityChangeEvent(
+            entity_type=EntityType.CACHE_TAG,
+            entity_id="test:tag:operator:1",
+            change=ChangeKind.DELETED,
+            origin="worker-a",
+        ).to_json())
+
+        assert await worker_b.get("dashboard:1") is None
+
+    @pytest.mark.asyncio
+    async def test_recompute_racing_invalidation_is_not_cached(self):
+        redis = FakeRedis()
+        cache = make_cache(redis)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def compute():
+            started.set()
+            await release.wait()
+            return {"price": "old"}
+
+        task = asyncio.ensure_future(cache.get_or_compute("price", compute, ttl=60, tags=["app:1"]))
+        await started.wait()
+        await cache.invalidate_tags("app:1")
+        release.set()
+
+        assert await task == {"price": "old"}
+        assert await cache.get("price") is None
+
+    @pytest.mark.asyncio
+    async def test_cache_result_tags(self):
+        calls = []
+
+        @cache_result("tagged", ttl=60, tags=["operator:{operator_id}", "site:{site}"])
+        async def load_dashboard(operator_id: str, site: str = "all"):
+            calls.append(operator_id)
+            return {"operator": operator_id}
+
+        @cache_result("tagged", ttl=60, tags=lambda operator_id: [f"operator:{operator_id}"])
+        async def load_catalog(operator_id: str):
+            calls.append(operator_id)
+            return [operator_id]
+
+        await load_dashboard("op-1")
+        await load_catalog("op-1")
+        await load_dashboard("op-2")
+        await invalidate_cache_tags("operator:op-1")
+        await load_dashboard("op-1")
+        await load_catalog("op-1")
+        await load_dashboard("op-2")
+
+        assert calls == ["op-1", "op-1", "op-2", "op-1", "op-1"]
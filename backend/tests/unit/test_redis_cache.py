@@ -5,6 +5,7 @@ Tests the Redis cache manager including:
 - Basic get/set operations
 - TTL management
 - Pattern deletion
+- Tag-based invalidation
 - Cache decorator
 """
 
@@ -82,6 +83,108 @@ async def test_redis_cache_pattern_deletion():
         await cache.disconnect()
 
 
+@pytest.mark.asyncio
+async def test_redis_cache_tag_invalidation():
+    """Test tag-based invalidation (tag sets + pipelined DEL)."""
+    cache = RedisCache()
+
+    try:
+        await cache.connect()
+
+        serializer = cache.serializer
+        await cache.set_raw("test:tag:a", serializer.dumps(1), ttl=60, tags=["test:tagset:op1"])
+        await cache.set_raw("test:tag:b", serializer.dumps(2), ttl=600, tags=["test:tagset:op1", "test:tagset:app1"])
+        await cache.set_raw("test:tag:c", serializer.dumps(3), ttl=60, tags=["test:tagset:op2"])
+
+        # Tag set lives as long as its longest-lived member
+        assert await cache.ttl("test:tagset:op1") > 60
+
+        deleted_count = await cache.invalidate_tags(["test:tagset:op1"])
+        assert deleted_count == 2, f"Should delete 2 keys, deleted {deleted_count}"
+        assert await cache.get("test:tag:a") is None
+        assert await cache.get("test:tag:b") is None
+        assert await cache.get("test:tag:c") == 3
+        assert await cache.exists("test:tagset:op1") is False
+
+        await cache.invalidate_tags(["test:tagset:op2", "test:tagset:app1"])
+
+    except Exception as e:
+        pytest.skip(f"Redis not available: {e}")
+    finally:
+        await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_bulk_operations():
+    """Test MGET/MSET, chunked pattern reads and hash operations."""
+    cache = RedisCache()
+
+    try:
+        await cache.connect()
+
+        prefix = "test:bulk"
+        assert await cache.mset({f"{prefix}:{i}": {"n": i} for i in range(7)}, ttl=60)
+        assert await cache.ttl(f"{prefix}:0") > 0
+
+        values = await cache.mget([f"{prefix}:0", f"{prefix}:missing", f"{prefix}:6"])
+        assert values == [{"n": 0}, None, {"n": 6}]
+
+        # Batches smaller than the key count: several MGET chunks
+        values = await cache.get_by_pattern(f"{prefix}:*", batch_size=3)
+        assert sorted(v["n"] for v in values) == list(range(7))
+
+        hash_key = "test:bulk:hash"
+        assert await cache.hset(hash_key, "a", {"x": 1})
+        assert await cache.hset(hash_key, "b", [2])
+        assert await cache.hget(hash_key, "a") == {"x": 1}
+        assert await cache.hgetall(hash_key) == {"a": {"x": 1}, "b": [2]}
+        assert await cache.hdel(hash_key, "a", "missing") == 1
+        assert await cache.hget(hash_key, "a") is None
+
+        await cache.delete(hash_key)
+        await cache.delete_pattern(f"{prefix}:*")
+
+    except Exception as e:
+        pytest.skip(f"Redis not available: {e}")
+    finally:
+        await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_counter_operations():
+    """Test integer counter hashes with a companion set."""
+    cache = RedisCache()
+
+    try:
+        await cache.connect()
+
+        key = "test:counters"
+        members_key = "test:counters:members"
+        await cache.delete(key)
+        await cache.delete(members_key)
+
+        # Increments are dropped until the hash has been (re)built
+        assert await cache.incr_counters(key, {"a": 5}, members_key, ["x"]) is False
+        assert await cache.get_counters(key, members_key) is None
+
+        assert await cache.replace_counters(key, {"a": 10, "b": 0}, 60, members_key, ["x"])
+        assert await cache.incr_counters(key, {"a": -3, "b": 7}, members_key, ["x", "y"]) is True
+        assert await cache.get_counters(key, members_key) == ({"a": 7, "b": 7}, 2)
+        assert await cache.ttl(members_key) > 0
+
+        # Replacing drops previous fields and members
+        assert await cache.replace_counters(key, {"a": 1}, 60, members_key, [])
+        assert await cache.get_counters(key, members_key) == ({"a": 1}, 0)
+
+        await cache.delete(key)
+        await cache.delete(members_key)
+
+    except Exception as e:
+        pytest.skip(f"Redis not available: {e}")
+    finally:
+        await cache.disconnect()
+
+
 @pytest.mark.asyncio
 async def test_cache_decorator():
     """Test cache_result decorator."""
@@ -141,3 +244,6 @@ async def test_cache_handles_unavailable_redis():
 
     exists = await cache.exists("test:key")
     assert exists is False, "Exists should return False when Redis unavailable"
+
+    assert await cache.mget(["test:a", "test:b"]) == [None, None]
+    assert await cache.hgetall("test:hash") == {}
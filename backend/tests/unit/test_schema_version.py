@@ -0,0 +1,110 @@
+"""Unit tests for the startup schema handling.
+
+Tests:
+- Alembic head resolution from backend/alembic/versions
+- Revision check passing, failing on a stale revision and on a missing alembic_version table
+- Schema mode selection (create_all for SQLite/development, verify otherwise)
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.core.config import Settings
+from src.db import session as session_module
+from src.db.session import (
+    SchemaVersionMismatchError,
+    get_alembic_heads,
+    verify_schema_version,
+)
+
+
+@pytest.fixture
+async def stamped_engine(test_engine, monkeypatch):
+    """Point the global engine at the test database with an alembic_version table."""
+    monkeypatch.setattr(session_module, "_engine", test_engine)
+    async with test_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+    yield test_engine
+    async with test_engine.begin() as conn:
+        await conn.execute(text("DROP TABLE alembic_version"))
+
+
+async def stamp(engine, revision: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM alembic_version"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+
+def test_alembic_heads_single_head():
+    heads = get_alembic_heads()
+
+    assert len(heads) == 1
+
+
+def test_alembic_heads_branches_and_merge(tmp_path):
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    scripts = {
+        "a.py": "revision: str = 'a'\ndown_revision: Union[str, None] = None\n",
+        "b.py": "revision = 'b'\ndown_revision = 'a'\n",
+        "c.py": "revision: str = 'c'\ndown_revision: Union[str, None] = 'a'\n",
+    }
+    for name, content in scripts.items():
+        (versions / name).write_text(content)
+
+    assert get_alembic_heads(tmp_path) == {"b", "c"}
+
+    merge_dir = tmp_path / "merged"
+    (merge_dir / "versions").mkdir(parents=True)
+    for name, content in scripts.items():
+        (merge_dir / "versions" / name).write_text(content)
+    (merge_dir / "versions" / "d.py").write_text("revision = 'd'\ndown_revision = ('b', 'c')\n")
+
+    assert get_alembic_heads(merge_dir) == {"d"}
+
+
+@pytest.mark.asyncio
+async def test_verify_schema_version_at_head(stamped_engine):
+    (head,) = get_alembic_heads()
+    await stamp(stamped_engine, head)
+
+    assert await verify_schema_version() == head
+
+
+@pytest.mark.asyncio
+async def test_verify_schema_version_stale_revision(stamped_engine):
+    await stamp(stamped_engine, "001_initial")
+
+    with pytest.raises(SchemaVersionMismatchError, match="alembic upgrade head"):
+        await verify_schema_version()
+
+
+@pytest.mark.asyncio
+async def test_verify_schema_version_unstamped_database(test_engine, monkeypatch):
+    monkeypatch.setattr(session_module, "_engine", test_engine)
+
+    with pytest.raises(SchemaVersionMismatchError, match="Cannot read alembic_version"):
+        await verify_schema_version()
+
+
+@pytest.mark.parametrize(
+    "database_url,environment,mode,expected",
+    [
+        ("sqlite+aiosqlite:///./app.db", "production", "auto", True),
+        ("postgresql+asyncpg://u:p@db/app", "development", "auto", True),
+        ("postgresql+asyncpg://u:p@db/app", "production", "auto", False),
+        ("postgresql+asyncpg://u:p@db/app", "staging", "auto", False),
+        ("postgresql+asyncpg://u:p@db/app", "production", "create_all", True),
+        ("sqlite+aiosqlite:///./app.db", "development", "verify", False),
+    ],
+)
+def test_uses_create_all(database_url, environment, mode, expected):
+    settings = Settings(
+        DATABASE_URL=database_url,
+        ENVIRONMENT=environment,
+        DATABASE_SCHEMA_MODE=mode,
+        SECRET_KEY="x" * 32,
+        JWT_SECRET_KEY="y" * 32,
+    )
+
+    assert settings.uses_create_all is expected
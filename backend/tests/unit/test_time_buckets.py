@@ -0,0 +1,182 @@
+"""Unit tests for dialect-aware time bucketing (src.db.time_buckets).
+
+Tests:
+- PostgreSQL renders date_trunc(... AT TIME ZONE ...) identically in SELECT and GROUP BY
+- Statements are cacheable; granularity, zone and offset are part of the cache key
+- SQLite buckets hours/days/weeks/months in the zone's offset, weeks start on Monday
+- Local range bounds convert to UTC; series helpers fill empty buckets
+- The bucketed range query on usage_records uses idx_usage_operator
+"""
+
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, func, literal, select, text
+from sqlalchemy.dialects import postgresql
+
+from src.db.time_buckets import (
+    bucket_series,
+    fill_gaps,
+    floor_bucket,
+    get_zone,
+    is_utc,
+    next_bucket,
+    time_bucket,
+    to_local,
+    utc_range,
+)
+from src.models.usage_record import UsageRecord
+
+UTC = timezone.utc
+
+
+def sqlite_bucket(granularity, value: str, tz: str, offset_at: datetime) -> str:
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        return conn.execute(
+            select(time_bucket(granularity, literal(value), tz, offset_at=offset_at).label("bucket"))
+        ).scalar_one().strftime("%Y-%m-%d %H:%M")
+
+
+class TestPostgresqlCompile:
+    """PostgreSQL rendering"""
+
+    def test_renders_date_trunc_at_time_zone(self):
+        bucket = time_bucket("week", UsageRecord.game_started_at, "Asia/Shanghai")
+
+        sql = str(select(bucket).compile(dialect=postgresql.dialect()))
+
+        assert "date_trunc('week', usage_records.game_started_at AT TIME ZONE 'Asia/Shanghai')" in sql
+
+    def test_select_and_group_by_match(self):
+        bucket = time_bucket("month", UsageRecord.game_started_at, "America/New_York").label("bucket")
+        stmt = select(bucket, func.count()).group_by(bucket)
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        expression = "date_trunc('month', usage_records.game_started_at AT TIME ZONE 'America/New_York')"
+        assert sql.count(expression) == 2
+        # No bound parameters: the statement is cacheable as a whole by the server
+        assert "%(" not in sql
+
+    def test_cache_key_covers_rendered_attributes(self):
+        column = UsageRecord.game_started_at
+        offset_at = datetime(2026, 3, 1, tzinfo=UTC)
+
+        def key(*args, **kwargs):
+            cache_key = select(time_bucket(*args, **kwargs))._generate_cache_key()
+            assert cache_key is not None
+            return cache_key
+
+        assert key("day", column, "Asia/Shanghai", offset_at=offset_at) == key(
+            "day", column, "Asia/Shanghai", offset_at=offset_at
+        )
+        assert key("day", column, "Asia/Shanghai", offset_at=offset_at) != key(
+            "week", column, "Asia/Shanghai", offset_at=offset_at
+        )
+        assert key("day", column, "Asia/Shanghai", offset_at=offset_at) != key(
+            "day", column, "Asia/Tokyo", offset_at=offset_at
+        )
+        # Same zone, different UTC offset (New York in winter and summer)
+        assert key("day", column, "America/New_York", offset_at=offset_at) != key(
+            "day", column, "America/New_York", offset_at=datetime(2026, 7, 1, tzinfo=UTC)
+        )
+
+    def test_rejects_unknown_granularity_and_zone(self):
+        with pytest.raises(ValueError):
+            time_bucket("year", UsageRecord.game_started_at)
+        with pytest.raises(ValueError):
+            time_bucket("day", UsageRecord.game_started_at, "Mars/Base")
+
+
+class TestSqliteBuckets:
+    """SQLite fixed-offset buckets"""
+
+    @pytest.mark.parametrize("granularity,expected", [
+        ("hour", "2026-03-02 01:00"),
+        ("day", "2026-03-02 00:00"),
+        ("week", "2026-03-02 00:00"),
+        ("month", "2026-03-01 00:00"),
+    ])
+    def test_positive_offset(self, granularity, expected):
+        # 2026-03-01 17:30 UTC is Monday 2026-03-02 01:30 in Shanghai
+        offset_at = datetime(2026, 3, 1, tzinfo=UTC)
+        assert sqlite_bucket(granularity, "2026-03-01 17:30:00", "Asia/Shanghai", offset_at) == expected
+
+    @pytest.mark.parametrize("granularity,expected", [
+        ("hour", "2026-01-04 22:00"),
+        ("day", "2026-01-04 00:00"),
+        ("week", "2025-12-29 00:00"),
+        ("month", "2026-01-01 00:00"),
+    ])
+    def test_negative_offset(self, granularity, expected):
+        # 2026-01-05 03:00 UTC is Sunday 2026-01-04 22:00 in New York
+        offset_at = datetime(2026, 1, 5, tzinfo=UTC)
+        assert sqlite_bucket(granularity, "2026-01-05 03:00:00", "America/New_York", offset_at) == expected
+
+    def test_sunday_belongs_to_previous_monday(self):
+        offset_at = datetime(2026, 3, 1, tzinfo=UTC)
+        assert sqlite_bucket("week", "2026-03-01 10:00:00", "UTC", offset_at) == "2026-02-23 00:00"
+
+    def test_half_hour_offset(self):
+        offset_at = datetime(2026, 3, 1, tzinfo=UTC)
+        assert sqlite_bucket("day", "2026-03-01 18:40:00", "Asia/Kolkata", offset_at) == "2026-03-02 00:00"
+
+
+class TestPythonHelpers:
+    """Bucket arithmetic and gap filling"""
+
+    def test_floor_and_next_bucket(self):
+        value = datetime(2026, 12, 31, 18, 45)
+
+        assert floor_bucket(value, "hour") == datetime(2026, 12, 31, 18)
+        assert floor_bucket(value, "week") == datetime(2026, 12, 28)
+        assert next_bucket(floor_bucket(value, "month"), "month") == datetime(2027, 1, 1)
+
+    def test_utc_range_of_local_day(self):
+        start, end = utc_range(datetime(2026, 3, 1), datetime(2026, 3, 2), "Asia/Shanghai")
+
+        assert start == datetime(2026, 2, 28, 16, tzinfo=UTC)
+        assert end == datetime(2026, 3, 1, 16, tzinfo=UTC)
+        assert to_local(start, "Asia/Shanghai") == datetime(2026, 3, 1)
+
+    def test_bucket_series_is_inclusive(self):
+        series = bucket_series(datetime(2026, 11, 15, 8), datetime(2027, 2, 1), "month")
+
+        assert [bucket.date() for bucket in series] == [
+            date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1), date(2027, 2, 1)
+        ]
+
+    def test_fill_gaps(self):
+        series = bucket_series(datetime(2026, 3, 1), datetime(2026, 3, 4), "day")
+        values = {datetime(2026, 3, 2): 5}
+
+        assert [value for _, value in fill_gaps(values, series, int)] == [0, 5, 0, 0]
+
+    def test_zone_helpers(self):
+        assert is_utc("UTC") and is_utc(UTC)
+        assert not is_utc("Asia/Shanghai")
+        assert get_zone(UTC) is UTC
+
+
+@pytest.mark.asyncio
+async def test_bucketed_range_query_uses_operator_index(test_engine):
+    """The range filter stays on the raw column, so SQLite searches idx_usage_operator"""
+    start, end = utc_range(datetime(2026, 3, 1), datetime(2026, 4, 1), "Asia/Shanghai")
+    bucket = time_bucket("day", UsageRecord.game_started_at, "Asia/Shanghai")
+    stmt = (
+        select(bucket.label("bucket"), func.count(UsageRecord.id))
+        .where(
+            UsageRecord.operator_id == uuid4(),
+            UsageRecord.game_started_at >= start,
+            UsageRecord.game_started_at < end
+        )
+        .group_by(bucket)
+    )
+    compiled = stmt.compile(test_engine.sync_engine, compile_kwargs={"literal_binds": True})
+
+    async with test_engine.connect() as conn:
+        plan = (await conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+
+    assert any("idx_usage_operator" in row[-1] for row in plan), plan
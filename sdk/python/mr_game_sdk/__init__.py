@@ -4,6 +4,7 @@
 """
 
 from .client import MRGameClient
+from .token import AuthorizationTokenVerifier
 from .exceptions import (
     MRGameAPIError,
     MRGameAuthError,
@@ -25,6 +26,7 @@ __email__ = "support@mr-game.com"
 __all__ = [
     # Main client
     "MRGameClient",
+    "AuthorizationTokenVerifier",
     # Exceptions
     "MRGameAPIError",
     "MRGameAuthError",
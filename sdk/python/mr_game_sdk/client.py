@@ -6,13 +6,14 @@ import hmac
 import json
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from urllib.parse import urlencode
+from typing import Optional, Dict, Any, List, Union
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from .token import AuthorizationTokenVerifier
 from .exceptions import (
     MRGameAPIError,
     MRGameAuthError,
@@ -41,7 +42,7 @@ class MRGameClient:
     def __init__(
         self,
         api_key: str,
-        api_secret: str,
+        api_secret: Optional[str] = None,
         base_url: str = "https://api.mr-game.com",
         timeout: int = 30,
         max_retries: int = 3,
@@ -51,14 +52,14 @@ class MRGameClient:
 
         Args:
             api_key: 运营商API Key
-            api_secret: 运营商API Secret
+            api_secret: 签名密钥(默认使用API Key, 服务端目前以API Key验证签名)
             base_url: API基础URL
             timeout: 请求超时时间(秒)
             max_retries: 最大重试次数
             retry_backoff_factor: 重试间隔因子
         """
         self.api_key = api_key
-        self.api_secret = api_secret
+        self.api_secret = api_secret or api_key
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
 
@@ -69,74 +70,63 @@ class MRGameClient:
         retry_strategy = Retry(
             total=max_retries,
             status_forcelist=[429, 500, 502, 503, 504],
-            method_whitelist=["HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE"],
+            allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE"],
             backoff_factor=retry_backoff_factor,
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
+        # 授权令牌验证器(首次验证时获取公钥)
+        self._token_verifier: Optional[AuthorizationTokenVerifier] = None
+
         # 设置默认headers
         self.session.headers.update({
             'User-Agent': 'MRGameSDK-Python/1.0.0',
             'Content-Type': 'application/json',
         })
 
-    def _generate_signature(self, method: str, path: str, params: Dict[str, Any] = None,
-                          body: str = "", timestamp: int = None) -> str:
-        """生成HMAC签名
+    def _generate_signature(self, method: str, path: str, body: Union[str, bytes] = b"",
+                          timestamp: int = None, nonce: str = "") -> str:
+        """生成HMAC签名(与服务端 build_sign_message 格式一致)
+
+        待签名消息: METHOD\\nPATH\\nTIMESTAMP\\nNONCE\\nBODY
 
         Args:
             method: HTTP方法
-            path: API路径
-            params: 查询参数
-            body: 请求体
+            path: 请求路径(含base_url中的路径前缀, 不含查询参数)
+            body: 原始请求体(与实际发送的字节一致)
             timestamp: 时间戳
+            nonce: X-Nonce(未携带时为空字符串)
 
         Returns:
-            HMAC签名
+            HMAC签名(十六进制)
         """
         if timestamp is None:
             timestamp = int(time.time())
+        if isinstance(body, str):
+            body = body.encode('utf-8')
 
-        # 构建签名字符串
-        sign_parts = [
-            method.upper(),
-            path,
-            "",
-            str(timestamp),
-            self.api_key
-        ]
-
-        # 添加查询参数
-        if params:
-            sorted_params = sorted(params.items())
-            query_string = urlencode(sorted_params)
-            sign_parts[2] = query_string
-
-        # 添加请求体
-        if body:
-            sign_parts.append(body)
-
-        # 计算签名
-        sign_string = "\n".join(sign_parts)
-        signature = hmac.new(
+        message = f"{method.upper()}\n{path}\n{timestamp}\n{nonce}\n".encode('utf-8') + body
+        return hmac.new(
             self.api_secret.encode('utf-8'),
-            sign_string.encode('utf-8'),
+            message,
             hashlib.sha256
         ).hexdigest()
 
-        return signature
-
     def _make_request(self, method: str, path: str, params: Dict[str, Any] = None,
-                     data: Dict[str, Any] = None) -> Dict[str, Any]:
+                     data: Dict[str, Any] = None,
+                     headers: Dict[str, str] = None) -> Dict[str, Any]:
         """发起API请求
 
+        不携带X-Nonce: 重试会原样重发请求, 重放保护由时间戳窗口和会话ID幂等性提供。
+
         Args:
             method: HTTP方法
             path: API路径
             params: 查询参数
             data: 请求数据
+            headers: 额外的请求头
 
         Returns:
             API响应数据
@@ -149,20 +139,22 @@ class MRGameClient:
         url = f"{self.base_url}{path}"
         timestamp = int(time.time())
 
-        # 准备请求体
-        body = ""
+        # 准备请求体(签名与发送使用同一份字节)
+        body = b""
         if data is not None:
-            body = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
 
-        # 生成签名
-        signature = self._generate_signature(method, path, params, body, timestamp)
+        # 服务端按实际请求路径验证签名
+        signature = self._generate_signature(method, urlsplit(url).path, body, timestamp)
 
         # 设置认证headers
-        headers = {
+        request_headers = {
             'X-API-Key': self.api_key,
             'X-Timestamp': str(timestamp),
             'X-Signature': signature,
         }
+        if headers:
+            request_headers.update(headers)
 
         try:
             response = self.session.request(
@@ -170,7 +162,7 @@ class MRGameClient:
                 url=url,
                 params=params,
                 data=body,
-                headers=headers,
+                headers=request_headers,
                 timeout=self.timeout
             )
 
@@ -214,7 +206,7 @@ class MRGameClient:
 
     def authorize_game(
         self,
-        app_id: int,
+        app_id: str,
         player_count: int,
         session_id: str,
         site_id: Optional[str] = None,
@@ -225,40 +217,46 @@ class MRGameClient:
         Args:
             app_id: 应用ID
             player_count: 玩家数量
-            session_id: 会话唯一标识
-            site_id: 运营点ID (可选)
+            session_id: 会话ID(X-Session-ID, 格式: {operatorId}_{timestamp}_{random16})
+            site_id: 运营点ID (必填)
             metadata: 额外元数据 (可选)
 
         Returns:
             授权响应结果
         """
         # 参数验证
-        if not app_id or app_id <= 0:
-            raise MRGameValidationError("app_id必须是正整数")
+        if not app_id:
+            raise MRGameValidationError("app_id不能为空")
         if not player_count or player_count <= 0:
             raise MRGameValidationError("player_count必须是正整数")
         if not session_id or len(session_id) > 128:
             raise MRGameValidationError("session_id不能为空且长度不超过128字符")
+        if not site_id:
+            raise MRGameValidationError("site_id不能为空")
 
-        # 构建请求数据
+        # 构建请求数据(会话ID通过X-Session-ID请求头传递)
         data = {
-            'app_id': app_id,
+            'app_id': str(app_id),
+            'site_id': str(site_id),
             'player_count': player_count,
-            'session_id': session_id,
         }
-
-        if site_id:
-            data['site_id'] = site_id
         if metadata:
             data['metadata'] = metadata
 
         logger.info(f"请求游戏授权: app_id={app_id}, player_count={player_count}")
 
         # 发起请求
-        response_data = self._make_request('POST', '/v1/games/authorize', data=data)
+        response_data = self._make_request(
+            'POST', '/api/v1/auth/game/authorize',
+            data=data,
+            headers={'X-Session-ID': session_id}
+        )
 
-        # 解析响应
-        result = AuthorizeResponse(**response_data)
+        # 解析响应(授权信息在 data 字段中)
+        result = AuthorizeResponse(
+            success=response_data.get('success', False),
+            **(response_data.get('data') or {})
+        )
         logger.info(f"授权请求成功: success={result.success}, session_id={result.session_id}")
 
         return result
@@ -433,6 +431,42 @@ class MRGameClient:
 
         return result
 
+    def get_token_keys(self) -> Dict[str, Any]:
+        """获取授权令牌验证公钥(JWK Set)
+
+        公钥可长期缓存, 用于离线验证授权令牌。
+
+        Returns:
+            {"keys": [...]} 格式的公钥集合
+        """
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/auth/game/token/keys",
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise MRGameNetworkError(f"获取授权令牌公钥失败: {str(e)}")
+
+    def verify_authorization_token(self, token: str) -> Dict[str, Any]:
+        """离线验证授权令牌
+
+        首次调用时获取并缓存服务端公钥, 之后的验证不再请求服务端。
+
+        Args:
+            token: 游戏授权返回的 authorization_token
+
+        Returns:
+            令牌中的授权信息(sid/op/site/app/pc/iat/exp)
+
+        Raises:
+            MRGameAuthError: 令牌无效或已过期
+        """
+        if self._token_verifier is None:
+            self._token_verifier = AuthorizationTokenVerifier(self.get_token_keys())
+        return self._token_verifier.verify(token)
+
     def close(self):
         """关闭客户端连接"""
         if self.session:
@@ -14,12 +14,19 @@ class BaseResponse(BaseModel):
 
 class AuthorizeResponse(BaseResponse):
     """游戏授权响应"""
-    auth_token: Optional[str] = Field(None, description="授权令牌")
+    authorization_token: Optional[str] = Field(None, description="授权令牌")
     session_id: Optional[str] = Field(None, description="会话ID")
-    expires_at: Optional[datetime] = Field(None, description="过期时间")
+    app_name: Optional[str] = Field(None, description="应用名称")
     player_count: Optional[int] = Field(None, description="玩家数量")
-    billing_rate: Optional[float] = Field(None, description="计费费率")
-    estimated_cost: Optional[float] = Field(None, description="预估费用")
+    unit_price: Optional[str] = Field(None, description="单人价格")
+    total_cost: Optional[str] = Field(None, description="总费用")
+    balance_after: Optional[str] = Field(None, description="扣费后余额")
+    authorized_at: Optional[datetime] = Field(None, description="授权时间")
+
+    @property
+    def auth_token(self) -> Optional[str]:
+        """授权令牌(authorization_token 的别名)"""
+        return self.authorization_token
 
 
 class EndSessionResponse(BaseResponse):
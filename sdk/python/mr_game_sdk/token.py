@@ -0,0 +1,74 @@
+"""授权令牌离线验证
+
+游戏授权返回的 authorization_token 是 Ed25519 签名的 JWS 令牌, 携带会话ID、
+运营商、运营点、应用、玩家数量和过期时间。头显Server获取一次服务端发布的公钥
+(GET /v1/auth/game/token/keys)后即可在本地验证令牌, 无需再请求服务端。
+"""
+
+import base64
+import json
+import time
+from typing import Any, Dict, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from .exceptions import MRGameAuthError
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class AuthorizationTokenVerifier:
+    """授权令牌验证器(使用服务端发布的JWK Set)"""
+
+    def __init__(self, jwks: Dict[str, Any]):
+        """初始化验证器
+
+        Args:
+            jwks: 服务端发布的公钥集合 {"keys": [...]}
+        """
+        self._keys = {
+            key["kid"]: Ed25519PublicKey.from_public_bytes(_b64decode(key["x"]))
+            for key in jwks.get("keys", [])
+            if key.get("kty") == "OKP" and key.get("crv") == "Ed25519"
+        }
+
+    def verify(self, token: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """验证授权令牌
+
+        Args:
+            token: 授权令牌
+            now: 当前Unix时间(默认 time.time())
+
+        Returns:
+            令牌中的授权信息: sid(会话ID), op(运营商ID), site(运营点ID),
+            app(应用ID), pc(玩家数量), iat(授权时间), exp(过期时间)
+
+        Raises:
+            MRGameAuthError: 令牌无效(INVALID_AUTHORIZATION_TOKEN)
+                或已过期(AUTHORIZATION_TOKEN_EXPIRED)
+        """
+        try:
+            encoded_header, encoded_payload, encoded_signature = token.split(".")
+            header = json.loads(_b64decode(encoded_header))
+            payload = json.loads(_b64decode(encoded_payload))
+            signature = _b64decode(encoded_signature)
+        except (ValueError, TypeError, AttributeError):
+            raise MRGameAuthError("授权令牌格式错误", "INVALID_AUTHORIZATION_TOKEN")
+
+        public_key = self._keys.get(header.get("kid")) if isinstance(header, dict) else None
+        if public_key is None or header.get("alg") != "EdDSA":
+            raise MRGameAuthError("未知的授权令牌签名密钥", "INVALID_AUTHORIZATION_TOKEN")
+
+        try:
+            public_key.verify(signature, f"{encoded_header}.{encoded_payload}".encode("ascii"))
+        except InvalidSignature:
+            raise MRGameAuthError("授权令牌签名无效", "INVALID_AUTHORIZATION_TOKEN")
+
+        current_time = time.time() if now is None else now
+        if current_time >= payload.get("exp", 0):
+            raise MRGameAuthError("授权令牌已过期", "AUTHORIZATION_TOKEN_EXPIRED")
+
+        return payload
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """MR游戏SDK客户端测试"""
 
+import hashlib
+import hmac
+import json
 import pytest
 import time
 from unittest.mock import Mock, patch
@@ -35,19 +38,44 @@ class TestMRGameClient:
         assert self.client.timeout == 30
 
     def test_generate_signature(self):
-        """测试签名生成"""
+        """测试签名生成(METHOD\\nPATH\\nTIMESTAMP\\nNONCE\\nBODY)"""
         signature = self.client._generate_signature(
             method="POST",
-            path="/v1/test",
-            params={"param1": "value1"},
+            path="/api/v1/test",
             body='{"data": "test"}',
             timestamp=1234567890
         )
 
-        # 签名应该是32位十六进制字符串
-        assert isinstance(signature, str)
-        assert len(signature) == 64
-        assert all(c in "0123456789abcdef" for c in signature.lower())
+        expected = hmac.new(
+            b"test_api_secret",
+            b'POST\n/api/v1/test\n1234567890\n\n{"data": "test"}',
+            hashlib.sha256
+        ).hexdigest()
+        assert signature == expected
+
+    def test_api_key_is_default_signing_key(self):
+        """未提供api_secret时以API Key签名(与服务端一致)"""
+        client = MRGameClient(api_key="test_api_key")
+
+        assert client.api_secret == "test_api_key"
+
+    @patch('mr_game_sdk.client.requests.Session.request')
+    def test_request_signs_sent_body_and_full_path(self, mock_request):
+        """签名覆盖实际发送的请求体和含base_url前缀的路径"""
+        client = MRGameClient(api_key="test_api_key", base_url="http://test.example.com/gateway")
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"success": True}
+        mock_request.return_value = mock_response
+
+        client._make_request('POST', '/api/v1/test', data={"name": "测试"})
+
+        kwargs = mock_request.call_args.kwargs
+        headers = kwargs["headers"]
+        assert kwargs["url"] == "http://test.example.com/gateway/api/v1/test"
+        assert headers["X-Signature"] == client._generate_signature(
+            "POST", "/gateway/api/v1/test", kwargs["data"], int(headers["X-Timestamp"])
+        )
 
     def test_authorize_game_validation(self):
         """测试游戏授权参数验证"""
@@ -67,6 +95,10 @@ class TestMRGameClient:
         with pytest.raises(MRGameValidationError):
             self.client.authorize_game(app_id=1, player_count=5, session_id="x" * 129)
 
+        # 测试缺少site_id
+        with pytest.raises(MRGameValidationError):
+            self.client.authorize_game(app_id=1, player_count=5, session_id="test")
+
     @patch('mr_game_sdk.client.requests.Session.request')
     def test_authorize_game_success(self, mock_request):
         """测试游戏授权成功"""
@@ -75,26 +107,39 @@ class TestMRGameClient:
         mock_response.status_code = 200
         mock_response.json.return_value = {
             "success": True,
-            "auth_token": "test_token",
-            "session_id": "test_session",
-            "expires_at": "2025-01-01T12:00:00Z",
-            "player_count": 5,
-            "billing_rate": 10.0,
-            "estimated_cost": 50.0
+            "data": {
+                "authorization_token": "test_token",
+                "session_id": "test_session",
+                "app_name": "测试游戏",
+                "player_count": 5,
+                "unit_price": "10.00",
+                "total_cost": "50.00",
+                "balance_after": "950.00",
+                "authorized_at": "2025-01-01T12:00:00Z"
+            }
         }
         mock_request.return_value = mock_response
 
         result = self.client.authorize_game(
-            app_id=1,
+            app_id="app-uuid",
             player_count=5,
-            session_id="test_session"
+            session_id="test_session",
+            site_id="site-uuid"
         )
 
+        kwargs = mock_request.call_args.kwargs
+        assert kwargs["url"] == "http://test.example.com/api/v1/auth/game/authorize"
+        assert kwargs["headers"]["X-Session-ID"] == "test_session"
+        assert json.loads(kwargs["data"]) == {
+            "app_id": "app-uuid", "site_id": "site-uuid", "player_count": 5
+        }
+
         assert isinstance(result, AuthorizeResponse)
         assert result.success is True
         assert result.auth_token == "test_token"
         assert result.session_id == "test_session"
         assert result.player_count == 5
+        assert result.total_cost == "50.00"
 
     @patch('mr_game_sdk.client.requests.Session.request')
     def test_authorize_game_failure(self, mock_request):
@@ -110,7 +155,7 @@ class TestMRGameClient:
         mock_request.return_value = mock_response
 
         with pytest.raises(MRGameAPIError) as exc_info:
-            self.client.authorize_game(app_id=1, player_count=5, session_id="test")
+            self.client.authorize_game(app_id=1, player_count=5, session_id="test", site_id="site")
 
         assert "余额不足" in str(exc_info.value)
 